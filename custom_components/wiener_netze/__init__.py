@@ -1,28 +1,183 @@
 """The Wiener Netze Smart Meter integration."""
 import logging
 
+from aiohttp import ClientSession
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .api import (
+    RateLimiter,
+    TokenManager,
     WienerNetzeApiClient,
     WienerNetzeAuthError,
     WienerNetzeConnectionError,
 )
-from .const import CONF_API_KEY, CONF_CLIENT_ID, CONF_CLIENT_SECRET, DOMAIN
+from .const import (
+    CONF_API_KEY,
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    CONF_DEDICATED_SESSION,
+    DATA_HUBS,
+    DATA_RATE_LIMITERS,
+    DATA_TOKEN_MANAGERS,
+    DOMAIN,
+)
+from .backfill import WienerNetzeBackfill
 from .coordinator import WienerNetzeDataCoordinator
+from .services import async_setup_services
+from .session import async_close_api_session, async_get_api_session
+from .storage import WienerNetzeHistoryStore, WienerNetzeStore
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Wiener Netze Smart Meter services.
+
+    Args:
+        hass: Home Assistant instance
+        config: Configuration
+
+    Returns:
+        True if setup was successful
+
+    """
+    async_setup_services(hass)
+    return True
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant, client_id: str) -> RateLimiter:
+    """Get the rate limiter shared by all config entries of an account.
+
+    Args:
+        hass: Home Assistant instance
+        client_id: OAuth2 client ID of the account
+
+    Returns:
+        Rate limiter of the account
+
+    """
+    rate_limiters: dict[str, RateLimiter] = hass.data.setdefault(DATA_RATE_LIMITERS, {})
+    if client_id not in rate_limiters:
+        rate_limiters[client_id] = RateLimiter()
+    return rate_limiters[client_id]
+
+
+@callback
+def async_get_token_manager(
+    hass: HomeAssistant,
+    client_id: str,
+    client_secret: str,
+    session: ClientSession | None = None,
+) -> TokenManager:
+    """Get the access token manager shared by all config entries of an account.
+
+    Args:
+        hass: Home Assistant instance
+        client_id: OAuth2 client ID of the account
+        client_secret: OAuth2 client secret of the account
+        session: Session for token requests of a new token manager
+            (optional, default: shared Home Assistant session)
+
+    Returns:
+        Token manager of the account, refreshing its token in the background
+
+    """
+    token_managers: dict[str, TokenManager] = hass.data.setdefault(
+        DATA_TOKEN_MANAGERS, {}
+    )
+    token_manager = token_managers.get(client_id)
+    if token_manager is None or token_manager.client_secret != client_secret:
+        if token_manager is not None:
+            token_manager.close()
+        token_manager = token_managers[client_id] = TokenManager(
+            session or async_get_clientsession(hass),
+            client_id,
+            client_secret,
+            auto_refresh=True,
+        )
+    return token_manager
+
+
+@callback
+def _async_release_token_manager(hass: HomeAssistant, client_id: str) -> None:
+    """Stop the token manager of an account once no config entry uses it.
+
+    Args:
+        hass: Home Assistant instance
+        client_id: OAuth2 client ID of the account
+
+    """
+    if any(key[0] == client_id for key in hass.data.get(DATA_HUBS, {})):
+        return
+
+    if token_manager := hass.data.get(DATA_TOKEN_MANAGERS, {}).pop(client_id, None):
+        token_manager.close()
+
+
+def _hub_key(entry: ConfigEntry) -> tuple[str, str, str]:
+    """Get the credentials that config entries sharing a coordinator have in common.
+
+    Args:
+        entry: Config entry
+
+    Returns:
+        Tuple of (client_id, client_secret, api_key)
+
+    """
+    return (
+        entry.data[CONF_CLIENT_ID],
+        entry.data[CONF_CLIENT_SECRET],
+        entry.data[CONF_API_KEY],
+    )
+
+
+async def _async_leave_hub(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: WienerNetzeDataCoordinator,
+) -> None:
+    """Remove a config entry from its shared coordinator.
+
+    The coordinator is shut down when its last config entry leaves.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+        coordinator: Coordinator shared by the entries of the account
+
+    """
+    if coordinator.async_remove_entry(entry.entry_id):
+        hubs = hass.data.get(DATA_HUBS, {})
+        if hubs.get(_hub_key(entry)) is coordinator:
+            del hubs[_hub_key(entry)]
+        await coordinator.async_shutdown()
+
+    _async_release_token_manager(hass, entry.data[CONF_CLIENT_ID])
+
+    if not hass.data.get(DATA_HUBS):
+        await async_close_api_session(hass)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Wiener Netze Smart Meter from a config entry.
 
+    Config entries with the same credentials share one API client and one
+    coordinator (hub mode). The first entry creates them, authenticates and
+    fetches the initial data; later entries join and are included in the
+    next refresh.
+
     Args:
         hass: Home Assistant instance
         entry: Config entry
@@ -42,42 +197,78 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     client_secret = entry.data[CONF_CLIENT_SECRET]
     api_key = entry.data[CONF_API_KEY]
 
-    # Create API client
-    session = async_get_clientsession(hass)
-    api_client = WienerNetzeApiClient(
-        session=session,
-        client_id=client_id,
-        client_secret=client_secret,
-        api_key=api_key,
-    )
+    # Load persistent cache
+    store = WienerNetzeStore(hass, entry.entry_id)
+    await store.async_load()
 
-    # Test authentication
-    try:
-        await api_client.authenticate()
-        _LOGGER.info("Successfully authenticated with Wiener Netze API")
-    except WienerNetzeAuthError as err:
-        _LOGGER.error("Authentication failed: %s", err)
-        raise ConfigEntryAuthFailed from err
-    except WienerNetzeConnectionError as err:
-        _LOGGER.error("Connection failed: %s", err)
-        raise ConfigEntryNotReady from err
-
-    # Create coordinator
-    coordinator = WienerNetzeDataCoordinator(hass, api_client, entry)
-
-    # Fetch initial data
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except ConfigEntryAuthFailed:
-        raise
-    except Exception as err:
-        _LOGGER.error("Failed to fetch initial data: %s", err)
-        raise ConfigEntryNotReady from err
+    hubs: dict[tuple[str, str, str], WienerNetzeDataCoordinator] = hass.data.setdefault(
+        DATA_HUBS, {}
+    )
+    coordinator = hubs.get(_hub_key(entry))
+
+    if coordinator is not None:
+        # Another entry of the account is set up, share its coordinator
+        _LOGGER.debug("Joining coordinator of %s", coordinator.config_entry.title)
+        coordinator.async_add_entry(entry, store)
+        coordinator.backfills[entry.entry_id] = WienerNetzeBackfill(
+            coordinator.api_client, WienerNetzeHistoryStore(hass, entry.entry_id)
+        )
+
+        # Serve cached data, the meter points of the entry are fetched with
+        # the next refresh of the shared coordinator
+        coordinator.async_restore_cache(entry.entry_id)
+        entry.async_create_background_task(
+            hass, coordinator.async_request_refresh(), f"{DOMAIN} join refresh"
+        )
+    else:
+        # Create API client, on a dedicated connection pool if enabled
+        if entry.options.get(CONF_DEDICATED_SESSION, False):
+            session = async_get_api_session(hass)
+        else:
+            session = async_get_clientsession(hass)
+        token_manager = async_get_token_manager(hass, client_id, client_secret, session)
+        api_client = WienerNetzeApiClient(
+            session=session,
+            client_id=client_id,
+            client_secret=client_secret,
+            api_key=api_key,
+            rate_limiter=async_get_rate_limiter(hass, client_id),
+            token_manager=token_manager,
+        )
+
+        # Create coordinator, registered right away so that entries set up
+        # concurrently join it
+        coordinator = WienerNetzeDataCoordinator(hass, api_client, entry, store)
+        hubs[_hub_key(entry)] = coordinator
+
+        # History is only loaded once a backfill runs
+        coordinator.backfills[entry.entry_id] = WienerNetzeBackfill(
+            api_client, WienerNetzeHistoryStore(hass, entry.entry_id)
+        )
+
+        try:
+            await _async_first_refresh(
+                hass, entry, coordinator, api_client, token_manager, store
+            )
+        except Exception:
+            await _async_leave_hub(hass, entry, coordinator)
+            raise
 
     # Store coordinator in hass.data
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    # Apply changed options, updated meter point metadata needs no reload.
+    # The listener is added again with every setup, so it compares against
+    # the options this setup used.
+    options = dict(entry.options)
+
+    async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        if entry.options != options:
+            await hass.config_entries.async_reload(entry.entry_id)
+
+    entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
+
     # Forward setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -86,6 +277,63 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_first_refresh(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: WienerNetzeDataCoordinator,
+    api_client: WienerNetzeApiClient,
+    token_manager: TokenManager,
+    store: WienerNetzeStore,
+) -> None:
+    """Authenticate and fetch the initial data of a new coordinator.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry that created the coordinator
+        coordinator: New coordinator
+        api_client: API client of the coordinator
+        token_manager: Access token of the account
+        store: Persistent cache of the entry
+
+    Raises:
+        ConfigEntryAuthFailed: Authentication failed
+        ConfigEntryNotReady: API not reachable
+
+    """
+    # Reuse the token of the account or a stored one, otherwise authenticate
+    token = store.get_token()
+    if token_manager.has_valid_token:
+        _LOGGER.debug("Using access token shared with other config entries")
+    elif token and api_client.restore_token(*token):
+        _LOGGER.debug("Using stored access token")
+    else:
+        try:
+            await api_client.authenticate()
+            _LOGGER.info("Successfully authenticated with Wiener Netze API")
+        except WienerNetzeAuthError as err:
+            _LOGGER.error("Authentication failed: %s", err)
+            raise ConfigEntryAuthFailed from err
+        except WienerNetzeConnectionError as err:
+            _LOGGER.error("Connection failed: %s", err)
+            raise ConfigEntryNotReady from err
+
+    if coordinator.async_restore_cache():
+        # Serve cached data right away, fetch what is missing in the background
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+        )
+        return
+
+    # Fetch initial data
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except ConfigEntryAuthFailed:
+        raise
+    except Exception as err:
+        _LOGGER.error("Failed to fetch initial data: %s", err)
+        raise ConfigEntryNotReady from err
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry.
 
@@ -102,22 +350,23 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    # Remove coordinator from hass.data
+    # Remove coordinator from hass.data, shut it down if no entry uses it
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await _async_leave_hub(hass, entry, coordinator)
 
     _LOGGER.info("Wiener Netze Smart Meter integration unloaded")
 
     return unload_ok
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry.
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persistent cache and history of a deleted config entry.
 
     Args:
         hass: Home Assistant instance
         entry: Config entry
 
     """
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await WienerNetzeStore(hass, entry.entry_id).async_remove()
+    await WienerNetzeHistoryStore(hass, entry.entry_id).async_remove()
@@ -0,0 +1,268 @@
+"""Consumption aggregation for Wiener Netze Smart Meter."""
+from datetime import date, datetime, time, timedelta
+from itertools import pairwise
+import logging
+import math
+from typing import NamedTuple
+
+from .series import ConsumptionSeries
+from .timeseries import IntervalSeries
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bucket sizes
+BUCKET_HOUR = "hour"
+BUCKET_DAY = "day"
+BUCKET_WEEK = "week"
+BUCKET_MONTH = "month"
+BUCKETS = (BUCKET_HOUR, BUCKET_DAY, BUCKET_WEEK, BUCKET_MONTH)
+
+_EPOCH = date(1970, 1, 1)
+_DAY = 86400
+_ALL_WEEKDAYS = (0, 1, 2, 3, 4, 5, 6)
+
+
+class TariffWindow(NamedTuple):
+    """Daily time window of a tariff in local wall clock time.
+
+    A window that ends at or before its start wraps past midnight. Whether
+    it applies is decided by the weekday it starts on, but like intervals,
+    its hours count towards the bucket they fall into: a 22:00-06:00 window
+    adds 22:00-24:00 to the day it starts on and 00:00-06:00 to the next.
+    """
+
+    name: str
+    start: time
+    end: time
+    weekdays: tuple[int, ...] = _ALL_WEEKDAYS  # Monday is 0
+
+
+def _local_time(day: date, at: time = time()) -> int:
+    """Get a local wall clock time as epoch seconds."""
+    return (day - _EPOCH).days * _DAY + at.hour * 3600 + at.minute * 60 + at.second
+
+
+def _local_datetime(local_time: int) -> datetime:
+    """Get the naive local datetime of local epoch seconds."""
+    return datetime(1970, 1, 1) + timedelta(seconds=local_time)
+
+
+def bucket_bounds(bucket: str, first: date, last: date) -> list[int]:
+    """Get the boundaries of the buckets covering a range of days.
+
+    Args:
+        bucket: Bucket size (hour, day, week, month)
+        first: First day
+        last: Last day (inclusive)
+
+    Returns:
+        Local times (epoch seconds) of the start of every bucket plus the
+        end of the last one
+
+    Raises:
+        ValueError: Unknown bucket size
+
+    """
+    if bucket in (BUCKET_HOUR, BUCKET_DAY):
+        step = 3600 if bucket == BUCKET_HOUR else _DAY
+        return list(
+            range(_local_time(first), _local_time(last + timedelta(days=1)) + 1, step)
+        )
+
+    if bucket == BUCKET_WEEK:
+        monday = first - timedelta(days=first.weekday())
+        end = last + timedelta(days=7 - last.weekday())
+        return list(range(_local_time(monday), _local_time(end) + 1, 7 * _DAY))
+
+    if bucket == BUCKET_MONTH:
+        bounds = []
+        month = first.replace(day=1)
+        while True:
+            bounds.append(_local_time(month))
+            if month > last:
+                return bounds
+            month = (month + timedelta(days=32)).replace(day=1)
+
+    raise ValueError(f"Unknown bucket size: {bucket}")
+
+
+def tariff_segments(
+    tariff: TariffWindow, start: int, end: int
+) -> list[tuple[int, int]]:
+    """Get the parts of a time range that fall into a tariff window.
+
+    Args:
+        tariff: Tariff window
+        start: Local start time (epoch seconds)
+        end: Local end time (epoch seconds)
+
+    Returns:
+        List of (start, end) local times, in order
+
+    """
+    window_start = _local_time(_EPOCH, tariff.start)
+    window_end = _local_time(_EPOCH, tariff.end)
+    if window_end <= window_start:
+        window_end += _DAY
+
+    segments = []
+    # A window starting the day before can reach into the range
+    day = start // _DAY - 1
+    while day * _DAY < end:
+        midnight = day * _DAY
+        if (_EPOCH + timedelta(days=day)).weekday() in tariff.weekdays:
+            segment_start = max(midnight + window_start, start)
+            segment_end = min(midnight + window_end, end)
+            if segment_start < segment_end:
+                segments.append((segment_start, segment_end))
+        day += 1
+
+    return segments
+
+
+class ConsumptionAggregator:
+    """Cached bucket totals of the Zählwerke of a consumption series.
+
+    Totals are computed per OBIS code on the columnar register buffers: the
+    bucket (or tariff segment) boundaries are located by bisection and each
+    bucket is summed as one array slice. Totals are cached per OBIS code,
+    bucket size, tariff and bucket; when the series changes, only buckets
+    overlapping the changed time ranges are computed again. Intervals are
+    assigned to the bucket their local start falls into.
+    """
+
+    def __init__(self, series: ConsumptionSeries) -> None:
+        """Initialize the aggregator.
+
+        Args:
+            series: Consumption series to aggregate
+
+        """
+        self.series = series
+        self._revision = series.revision
+        self._cache: dict[
+            tuple[str, str, TariffWindow | None], dict[int, tuple[int, float]]
+        ] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def totals(
+        self,
+        obis_code: str,
+        bucket: str,
+        first: date,
+        last: date,
+        tariff: TariffWindow | None = None,
+    ) -> dict[datetime, float]:
+        """Get the totals of the buckets covering a range of days.
+
+        Args:
+            obis_code: OBIS code of the Zählwerk
+            bucket: Bucket size (hour, day, week, month)
+            first: First day
+            last: Last day (inclusive)
+            tariff: Only include intervals in this tariff window (optional)
+
+        Returns:
+            Totals keyed by the local start of the bucket, in order. Buckets
+            without readings total 0.
+
+        Raises:
+            ValueError: Unknown bucket size
+
+        """
+        self._invalidate()
+
+        register = self.series.registers.get(obis_code)
+        cache = self._cache.setdefault((obis_code, bucket, tariff), {})
+        totals: dict[datetime, float] = {}
+
+        for start, end in pairwise(bucket_bounds(bucket, first, last)):
+            cached = cache.get(start)
+            if cached is None:
+                self.misses += 1
+                cached = cache[start] = (end, self._sum(register, start, end, tariff))
+            else:
+                self.hits += 1
+            totals[_local_datetime(start)] = cached[1]
+
+        return totals
+
+    def total(
+        self,
+        obis_code: str,
+        bucket: str,
+        day: date,
+        tariff: TariffWindow | None = None,
+    ) -> float:
+        """Get the total of the bucket a day falls into.
+
+        For hour buckets this is the total of the whole day.
+
+        Args:
+            obis_code: OBIS code of the Zählwerk
+            bucket: Bucket size (hour, day, week, month)
+            day: Day in the bucket
+            tariff: Only include intervals in this tariff window (optional)
+
+        Returns:
+            Total of the bucket
+
+        """
+        return math.fsum(self.totals(obis_code, bucket, day, day, tariff).values())
+
+    @staticmethod
+    def _sum(
+        register: IntervalSeries | None,
+        start: int,
+        end: int,
+        tariff: TariffWindow | None,
+    ) -> float:
+        """Sum the intervals of a register starting within a local time range."""
+        if register is None or not len(register):
+            return 0.0
+
+        if tariff is None:
+            segments = [(start, end)]
+        else:
+            segments = tariff_segments(tariff, start, end)
+
+        return math.fsum(
+            register.total(
+                register.local_start_index(segment_start),
+                register.local_start_index(segment_end),
+            )
+            for segment_start, segment_end in segments
+        )
+
+    def _invalidate(self) -> None:
+        """Drop the cached buckets that overlap changes of the series."""
+        if self._revision == self.series.revision:
+            return
+
+        changes = self.series.changes_since(self._revision)
+        self._revision = self.series.revision
+        if changes is None:
+            _LOGGER.debug("Change log of %s exceeded", self.series.meter_point)
+            self._cache.clear()
+            return
+
+        for (obis_code, _, _), cache in self._cache.items():
+            for changed_obis, changed_start, changed_end in changes:
+                if changed_obis != obis_code:
+                    continue
+                for start in [
+                    start
+                    for start, (end, _) in cache.items()
+                    if start < changed_end and changed_start < end
+                ]:
+                    del cache[start]
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Get cache statistics."""
+        return {
+            "buckets": sum(len(cache) for cache in self._cache.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
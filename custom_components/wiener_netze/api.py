@@ -1,21 +1,58 @@
 """API client for Wiener Netze Smart Meter."""
 import asyncio
+import heapq
+import itertools
 import logging
-from datetime import date, datetime, timedelta
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any, TypedDict
 
 import aiohttp
 from aiohttp import ClientSession, ClientTimeout
 
-from .const import GRANULARITY_QUARTER_HOUR, QUALITY_VAL
+from .cache import ResponseCache, consumption_cache_ttl
+from .const import (
+    CACHE_TTL_METER_POINTS,
+    CACHE_TTL_RECENT,
+    GRANULARITY_QUARTER_HOUR,
+    PRIORITY_BACKFILL,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_UPDATE,
+    QUALITY_VAL,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_DEFAULT_RETRY_AFTER,
+    RATE_LIMIT_REQUESTS_PER_MINUTE,
+)
+from .metrics import ApiMetrics, CallStats
+from .profiling import PHASE_DECODE, PHASE_THROTTLE, PHASE_TOKEN, record_phase
+from .stream import JsonLoads, iter_zaehlwerke
 
 _LOGGER = logging.getLogger(__name__)
 
 # API Constants
 API_BASE_URL = "https://api.wstw.at/gateway/WN_SMART_METER_API/1.0"
 OAUTH_TOKEN_URL = "https://api.wstw.at/oauth2/token"
-DEFAULT_TIMEOUT = 30
+DEFAULT_TIMEOUT = 30  # seconds for a whole request
+CONNECT_TIMEOUT = 10  # seconds to get a connection, including DNS and TLS
+READ_TIMEOUT = 20  # seconds to wait for the next part of a response
+REQUEST_TIMEOUT = ClientTimeout(
+    total=DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+)
+# Streamed responses may take long as a whole, as long as data keeps coming
+STREAM_TIMEOUT = ClientTimeout(connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
 RETRY_ATTEMPTS = 3
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_MAX = 30.0
+RECENT_CALLS = 50
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)
+TOKEN_REFRESH_AHEAD = timedelta(minutes=10)
+TOKEN_REFRESH_RETRY = 60
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 # Data Models
@@ -112,6 +149,17 @@ class WienerNetzeTimeoutError(WienerNetzeApiError):
 class WienerNetzeRateLimitError(WienerNetzeApiError):
     """Rate limit exceeded error."""
 
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize the error.
+
+        Args:
+            message: Error message
+            retry_after: Seconds until requests are accepted again, if known
+
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
 
 class WienerNetzeNotFoundError(WienerNetzeApiError):
     """Resource not found error."""
@@ -121,75 +169,378 @@ class WienerNetzeBadRequestError(WienerNetzeApiError):
     """Bad request error."""
 
 
-class WienerNetzeApiClient:
-    """Client for Wiener Netze Smart Meter API."""
+class WienerNetzeServerError(WienerNetzeApiError):
+    """Server error (5xx)."""
+
+
+class _TokenRejectedError(WienerNetzeAuthError):
+    """The gateway rejected the access token (401)."""
+
+
+class RateLimiter:
+    """Token bucket rate limiter with prioritized waiters.
+
+    Requests take a token from a bucket that refills at a constant rate up
+    to a burst size. Callers that find the bucket empty wait in a priority
+    queue, so interactive requests go ahead of queued background requests.
+    Rate limit response headers (Retry-After, X-RateLimit-Remaining,
+    X-RateLimit-Reset) drain or block the bucket.
+
+    All state is only touched from the event loop, no lock is needed.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = RATE_LIMIT_REQUESTS_PER_MINUTE,
+        burst: int = RATE_LIMIT_BURST,
+    ) -> None:
+        """Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Sustained request rate
+            burst: Maximum number of requests sent without waiting
+
+        """
+        self.rate = requests_per_minute / 60
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated: float | None = None
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.total_requests = 0
+        self.total_wait = 0.0
+        self.rate_limited = 0
+        self.quota_remaining: float | None = None
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Get rate limiter statistics."""
+        return {
+            "tokens": round(self._tokens, 2),
+            "waiting": sum(not future.done() for _, _, future in self._waiters),
+            "total_requests": self.total_requests,
+            "total_wait": round(self.total_wait, 3),
+            "rate_limited": self.rate_limited,
+            "quota_remaining": self.quota_remaining,
+        }
+
+    async def acquire(self, priority: int = PRIORITY_UPDATE) -> None:
+        """Wait for permission to send a request.
+
+        Args:
+            priority: Request priority, lower values are served first
+
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._refill(now)
+
+        if not self._waiters and now >= self._blocked_until and self._tokens >= 1:
+            self._tokens -= 1
+            self.total_requests += 1
+            return
+
+        future: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted right before the cancellation, return the token
+                self._tokens = min(self.burst, self._tokens + 1)
+                self.total_requests -= 1
+            raise
+
+        self.total_wait += loop.time() - now
+
+    def block(self, seconds: float) -> None:
+        """Hold back all requests for a while.
+
+        Args:
+            seconds: Seconds to wait before the next request
+
+        """
+        loop = asyncio.get_running_loop()
+        self._refill(loop.time())
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, loop.time() + seconds)
+        _LOGGER.debug("Rate limiter blocked for %.1f seconds", seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> float | None:
+        """Update the bucket from rate limit response headers.
+
+        Args:
+            headers: Response headers
+
+        Returns:
+            Seconds to wait before the next request, if the headers say so
+
+        """
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        if remaining is not None:
+            self.quota_remaining = remaining
+            loop = asyncio.get_running_loop()
+            self._refill(loop.time())
+            self._tokens = min(self._tokens, max(remaining, 0.0))
+
+            if remaining < 1 and retry_after is None:
+                reset = _parse_float(headers.get("X-RateLimit-Reset"))
+                if reset is not None and reset > 1e9:
+                    # Epoch timestamp instead of seconds
+                    reset -= time.time()
+                retry_after = reset
+
+        if retry_after is not None and retry_after > 0:
+            self.block(retry_after)
+            return retry_after
+
+        return None
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accumulated since the last update."""
+        if self._updated is not None and now > self._updated:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        """Grant tokens to waiters and schedule the next dispatch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._refill(now)
+
+        while self._waiters:
+            if now < self._blocked_until:
+                delay = self._blocked_until - now
+                break
+
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                break
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Cancelled while waiting
+                continue
+
+            future.set_result(None)
+            self._tokens -= 1
+            self.total_requests += 1
+        else:
+            return
+
+        self._timer = loop.call_later(delay, self._dispatch)
+
+
+def _parse_float(value: str | None) -> float | None:
+    """Parse a numeric header value."""
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (seconds or HTTP date)."""
+    seconds = _parse_float(value)
+    if seconds is not None or value is None:
+        return seconds
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return retry_at.timestamp() - time.time()
+
+
+class TokenManager:
+    """OAuth2 access token of an account, shared by all its API clients.
+
+    Concurrent callers that need a new token wait for a single token
+    request instead of each sending their own. With auto refresh enabled
+    the token is renewed in the background TOKEN_REFRESH_AHEAD before it
+    expires, so requests do not wait for an OAuth round trip. Call close()
+    when the token is no longer needed to stop the background refresh.
+    """
 
     def __init__(
         self,
         session: ClientSession,
         client_id: str,
         client_secret: str,
-        api_key: str,
+        auto_refresh: bool = False,
     ) -> None:
-        """Initialize the API client.
+        """Initialize the token manager.
 
         Args:
             session: aiohttp ClientSession
             client_id: OAuth2 client ID
             client_secret: OAuth2 client secret
-            api_key: API Gateway key
+            auto_refresh: Renew the token in the background before it expires
 
         """
         self._session = session
-        self._client_id = client_id
-        self._client_secret = client_secret
-        self._api_key = api_key
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.auto_refresh = auto_refresh
 
-        self._access_token: str | None = None
-        self._token_expires_at: datetime | None = None
+        self.access_token: str | None = None
+        self.expires_at: datetime | None = None
 
-        _LOGGER.debug("Wiener Netze API client initialized")
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._timer: asyncio.TimerHandle | None = None
+
+        self.refreshes = 0
 
     @property
-    def _headers(self) -> dict[str, str]:
-        """Get request headers."""
-        headers = {
-            "x-Gateway-APIKey": self._api_key,
-            "Content-Type": "application/json",
-        }
+    def has_valid_token(self) -> bool:
+        """Return True if the access token is valid for at least 5 minutes."""
+        if not self.access_token or not self.expires_at:
+            return False
 
-        if self._access_token:
-            headers["Authorization"] = f"Bearer {self._access_token}"
+        return datetime.now() < self.expires_at - TOKEN_EXPIRY_MARGIN
 
-        return headers
+    def restore(self, access_token: str, expires_at: datetime) -> bool:
+        """Restore a previously obtained access token.
 
-    async def _ensure_token(self) -> None:
-        """Ensure we have a valid access token."""
-        if self._access_token and self._token_expires_at:
-            # Check if token is still valid (with 5 minute buffer)
-            if datetime.now() < self._token_expires_at - timedelta(minutes=5):
-                return
+        A valid token that expires later than the restored one is kept.
 
-        # Token missing or expired, authenticate
-        await self.authenticate()
+        Args:
+            access_token: OAuth2 access token
+            expires_at: Token expiry
 
-    async def authenticate(self) -> None:
-        """Authenticate with OAuth2 and obtain access token."""
+        Returns:
+            True if a valid token is available afterwards
+
+        """
+        if not (
+            self.has_valid_token and self.expires_at and self.expires_at > expires_at
+        ):
+            self.access_token = access_token
+            self.expires_at = expires_at
+            self._schedule_refresh()
+
+        return self.has_valid_token
+
+    def invalidate(self, access_token: str | None) -> None:
+        """Discard an access token the API rejected.
+
+        A token that has already been replaced is not discarded again, so
+        concurrent rejections lead to a single token request.
+
+        Args:
+            access_token: The rejected token
+
+        """
+        if access_token is not None and access_token == self.access_token:
+            self.access_token = None
+            self.expires_at = None
+
+    async def async_ensure_token(self) -> None:
+        """Obtain a new access token unless the current one is valid."""
+        if not self.has_valid_token:
+            await self.async_refresh()
+
+    async def async_refresh(self) -> None:
+        """Obtain a new access token, joining a token request in progress.
+
+        Raises:
+            WienerNetzeAuthError: Invalid credentials
+            WienerNetzeApiError: Token request failed
+
+        """
+        # Shielded so a cancelled caller does not abort the shared request
+        await asyncio.shield(self._start_refresh())
+
+    def close(self) -> None:
+        """Stop the background refresh."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def _start_refresh(self) -> asyncio.Task[None]:
+        """Get the running token request or start a new one."""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.get_running_loop().create_task(
+                self._async_authenticate()
+            )
+            self._refresh_task.add_done_callback(self._refresh_done)
+
+        return self._refresh_task
+
+    def _refresh_done(self, task: asyncio.Task[None]) -> None:
+        """Forget a finished token request and plan the next one."""
+        if self._refresh_task is task:
+            self._refresh_task = None
+
+        if task.cancelled():
+            return
+
+        if (err := task.exception()) is None:
+            self._schedule_refresh()
+        elif self.auto_refresh and self.has_valid_token:
+            _LOGGER.warning("Background token refresh failed: %s", err)
+            self._schedule_refresh(TOKEN_REFRESH_RETRY)
+
+    def _schedule_refresh(self, delay: float | None = None) -> None:
+        """Schedule the background refresh of the current token."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self.auto_refresh or self.expires_at is None:
+            return
+
+        if delay is None:
+            refresh_at = self.expires_at - TOKEN_REFRESH_AHEAD
+            delay = max((refresh_at - datetime.now()).total_seconds(), 0)
+
+        self._timer = asyncio.get_running_loop().call_later(
+            delay, self._background_refresh
+        )
+
+    def _background_refresh(self) -> None:
+        """Renew the token in the background."""
+        self._timer = None
+        _LOGGER.debug("Refreshing access token before it expires")
+        self._start_refresh()
+
+    async def _async_authenticate(self) -> None:
+        """Request a new access token with the client credentials grant."""
         _LOGGER.debug("Authenticating with Wiener Netze API")
 
         try:
-            timeout = ClientTimeout(total=DEFAULT_TIMEOUT)
-
             data = {
                 "grant_type": "client_credentials",
-                "client_id": self._client_id,
-                "client_secret": self._client_secret,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
             }
 
             async with self._session.post(
                 OAUTH_TOKEN_URL,
                 data=data,
-                timeout=timeout,
+                timeout=REQUEST_TIMEOUT,
             ) as response:
                 if response.status == 401:
                     raise WienerNetzeAuthError("Invalid credentials")
@@ -202,9 +553,10 @@ class WienerNetzeApiClient:
 
                 result = await response.json()
 
-                self._access_token = result["access_token"]
+                self.access_token = result["access_token"]
                 expires_in = result.get("expires_in", 3600)
-                self._token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+                self.expires_at = datetime.now() + timedelta(seconds=expires_in)
+                self.refreshes += 1
 
                 _LOGGER.info("Successfully authenticated with Wiener Netze API")
 
@@ -213,10 +565,202 @@ class WienerNetzeApiClient:
         except asyncio.TimeoutError as err:
             raise WienerNetzeTimeoutError("Authentication timeout") from err
 
+
+class RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter.
+
+    Only idempotent requests are retried, and only on transient errors:
+    server errors (5xx), timeouts and connection errors. The delay before
+    retry n is drawn uniformly from [0, min(max_delay, base_delay * 2**n)],
+    which spreads retries of concurrent requests instead of sending them in
+    lockstep.
+    """
+
+    RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+    RETRY_ERRORS = (
+        WienerNetzeServerError,
+        WienerNetzeTimeoutError,
+        WienerNetzeConnectionError,
+    )
+
+    def __init__(
+        self,
+        attempts: int = RETRY_ATTEMPTS,
+        base_delay: float = RETRY_BACKOFF_BASE,
+        max_delay: float = RETRY_BACKOFF_MAX,
+    ) -> None:
+        """Initialize the retry policy.
+
+        Args:
+            attempts: Maximum number of attempts per request, including the
+                first one
+            base_delay: Backoff ceiling of the first retry in seconds
+            max_delay: Upper bound of the backoff ceiling in seconds
+
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, method: str, error: Exception, retries: int) -> bool:
+        """Return True if a failed request should be sent again.
+
+        Args:
+            method: HTTP method of the request
+            error: Error of the last attempt
+            retries: Number of retries already made
+
+        """
+        return (
+            retries + 1 < self.attempts
+            and method.upper() in self.RETRY_METHODS
+            and isinstance(error, self.RETRY_ERRORS)
+        )
+
+    def delay(self, retries: int) -> float:
+        """Get the backoff before the next retry.
+
+        Args:
+            retries: Number of retries already made
+
+        Returns:
+            Seconds to wait
+
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retries))
+
+
+class WienerNetzeApiClient:
+    """Client for Wiener Netze Smart Meter API."""
+
+    def __init__(
+        self,
+        session: ClientSession,
+        client_id: str,
+        client_secret: str,
+        api_key: str,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        token_manager: TokenManager | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        """Initialize the API client.
+
+        Args:
+            session: aiohttp ClientSession
+            client_id: OAuth2 client ID
+            client_secret: OAuth2 client secret
+            api_key: API Gateway key
+            rate_limiter: Rate limiter shared with other clients of the
+                same account (optional)
+            retry_policy: Retry policy for failed requests (optional)
+            token_manager: Access token shared with other clients of the
+                same account (optional)
+            cache: Response cache (optional)
+
+        """
+        self._session = session
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._api_key = api_key
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.token_manager = token_manager or TokenManager(
+            session, client_id, client_secret
+        )
+
+        # Request headers only change with the access token
+        self._base_headers = {
+            "x-Gateway-APIKey": api_key,
+            "Content-Type": "application/json",
+        }
+        self._cached_headers: tuple[str | None, dict[str, str]] = (
+            None,
+            self._base_headers,
+        )
+
+        self.cache = cache or ResponseCache()
+        self.metrics = ApiMetrics()
+        self.recent_calls: deque[CallStats] = deque(maxlen=RECENT_CALLS)
+        self.total_calls = 0
+        self.total_retries = 0
+        self.total_retry_wait = 0.0
+        self.reauthentications = 0
+
+        _LOGGER.debug("Wiener Netze API client initialized")
+
+    @property
+    def _headers(self) -> dict[str, str]:
+        """Get request headers."""
+        access_token = self.token_manager.access_token
+        cached_token, headers = self._cached_headers
+        if access_token == cached_token:
+            return headers
+
+        headers = dict(self._base_headers)
+        if access_token:
+            headers["Authorization"] = f"Bearer {access_token}"
+        self._cached_headers = (access_token, headers)
+
+        return headers
+
+    @property
+    def access_token(self) -> str | None:
+        """Return the current access token."""
+        return self.token_manager.access_token
+
+    @property
+    def token_expires_at(self) -> datetime | None:
+        """Return the expiry of the current access token."""
+        return self.token_manager.expires_at
+
+    @property
+    def has_valid_token(self) -> bool:
+        """Return True if the access token is valid for at least 5 minutes."""
+        return self.token_manager.has_valid_token
+
+    @property
+    def retry_stats(self) -> dict[str, Any]:
+        """Get retry statistics of all calls made by this client."""
+        return {
+            "total_calls": self.total_calls,
+            "total_retries": self.total_retries,
+            "total_retry_wait": round(self.total_retry_wait, 3),
+            "reauthentications": self.reauthentications,
+        }
+
+    def restore_token(self, access_token: str, expires_at: datetime) -> bool:
+        """Restore a previously obtained access token.
+
+        Args:
+            access_token: OAuth2 access token
+            expires_at: Token expiry
+
+        Returns:
+            True if a valid token is available afterwards
+
+        """
+        return self.token_manager.restore(access_token, expires_at)
+
+    async def _ensure_token(self) -> None:
+        """Ensure we have a valid access token."""
+        await self.token_manager.async_ensure_token()
+
+    async def authenticate(self) -> None:
+        """Authenticate with OAuth2 and obtain access token.
+
+        Raises:
+            WienerNetzeAuthError: Invalid credentials
+            WienerNetzeApiError: Token request failed
+
+        """
+        await self.token_manager.async_refresh()
+
     async def _request(
         self,
         method: str,
         endpoint: str,
+        priority: int = PRIORITY_UPDATE,
         **kwargs: Any,
     ) -> dict[str, Any]:
         """Make an API request.
@@ -224,6 +768,7 @@ class WienerNetzeApiClient:
         Args:
             method: HTTP method
             endpoint: API endpoint (relative to base URL)
+            priority: Rate limiter priority, lower values are served first
             **kwargs: Additional arguments for aiohttp request
 
         Returns:
@@ -233,10 +778,202 @@ class WienerNetzeApiClient:
             WienerNetzeApiError: On API errors
 
         """
-        await self._ensure_token()
+        async with self._response(method, endpoint, priority, **kwargs) as response:
+            return await self._read_json(endpoint, response)
+
+    async def _get_cached(
+        self,
+        endpoint: str,
+        priority: int,
+        ttl: Callable[[Any], float | None],
+        params: Any = None,
+        revalidate: bool = False,
+    ) -> Any:
+        """Make a GET request, served from the response cache if possible.
+
+        A fresh cached response is returned without a request. A stale one
+        is revalidated with If-None-Match/If-Modified-Since if the server
+        sent validators; a 304 response keeps the cached body.
+
+        Args:
+            endpoint: API endpoint (relative to base URL)
+            priority: Rate limiter priority, lower values are served first
+            ttl: Function returning how long a decoded response stays fresh
+                (None: never expires)
+            params: Query parameters
+            revalidate: Revalidate a cached response even if it is fresh
+
+        Returns:
+            Response JSON data, shared with the cache
+
+        Raises:
+            WienerNetzeApiError: On API errors
+
+        """
+        key = self.cache.key(endpoint, params)
+        cached = self.cache.get(key)
+        if cached is not None and cached.is_fresh and not revalidate:
+            self.cache.hits += 1
+            return cached.data
+
+        self.cache.misses += 1
+        headers = cached.validators if cached is not None else None
+
+        async with self._response(
+            "GET", endpoint, priority, params=params, headers=headers
+        ) as response:
+            if response.status == 304 and cached is not None:
+                self.cache.not_modified += 1
+                cached.refresh(ttl(cached.data))
+                return cached.data
+
+            data = await self._read_json(endpoint, response)
+
+        self.cache.put(key, data, response.headers, ttl(data))
+        return data
+
+    async def _read_json(self, endpoint: str, response: aiohttp.ClientResponse) -> Any:
+        """Read and decode a JSON response body, recording its metrics."""
+        body = await response.read()
+        started = time.perf_counter()
+        data = await response.json()
+        decode_time = time.perf_counter() - started
+        self.metrics.record_body(endpoint, len(body), decode_time)
+        record_phase(PHASE_DECODE, decode_time)
+        return data
+
+    @asynccontextmanager
+    async def _response(
+        self,
+        method: str,
+        endpoint: str,
+        priority: int = PRIORITY_UPDATE,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Make an API request and provide the successful response.
+
+        Transient errors are retried according to the retry policy. A
+        rejected access token is renewed once; if the new token is rejected
+        as well the request fails. Errors raised after the response has been
+        provided are never retried.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (relative to base URL)
+            priority: Rate limiter priority, lower values are served first
+            **kwargs: Additional arguments for aiohttp request
+
+        Yields:
+            Response with status 200, the body is not read yet
+
+        Raises:
+            WienerNetzeApiError: On API errors
+
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        attempts = 0
+        reauthenticated = False
+        retry_wait = 0.0
+        error: WienerNetzeApiError | None = None
+
+        try:
+            while True:
+                attempts += 1
+                stack = AsyncExitStack()
+                try:
+                    token_wait = time.perf_counter()
+                    await self._ensure_token()
+                    record_phase(PHASE_TOKEN, time.perf_counter() - token_wait)
+                    access_token = self.token_manager.access_token
+                    response = await stack.enter_async_context(
+                        self._attempt(method, endpoint, priority, **kwargs)
+                    )
+                except _TokenRejectedError as err:
+                    if reauthenticated:
+                        raise WienerNetzeAuthError(
+                            "Access token rejected after re-authentication"
+                        ) from err
+
+                    _LOGGER.warning("Access token invalid, re-authenticating")
+                    self.token_manager.invalidate(access_token)
+                    self.reauthentications += 1
+                    reauthenticated = True
+                    continue
+                except WienerNetzeApiError as err:
+                    # The attempt rejected for the token is not a retry
+                    retries = attempts - 1 - reauthenticated
+                    if not self.retry_policy.should_retry(method, err, retries):
+                        raise
+
+                    delay = self.retry_policy.delay(retries)
+                    _LOGGER.debug(
+                        "API request %s %s failed (attempt %d), retrying in "
+                        "%.2fs: %s",
+                        method,
+                        endpoint,
+                        attempts,
+                        delay,
+                        err,
+                    )
+                    retry_wait += delay
+                    await asyncio.sleep(delay)
+                    continue
+
+                async with stack:
+                    yield response
+                return
+
+        except WienerNetzeApiError as err:
+            error = err
+            raise
+
+        finally:
+            self._record_call(
+                {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "attempts": attempts,
+                    "reauthenticated": reauthenticated,
+                    "retry_wait": retry_wait,
+                    "duration": loop.time() - started,
+                    "error": None if error is None else str(error),
+                }
+            )
+
+    @asynccontextmanager
+    async def _attempt(
+        self,
+        method: str,
+        endpoint: str,
+        priority: int,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request once and provide the successful response.
 
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (relative to base URL)
+            priority: Rate limiter priority, lower values are served first
+            **kwargs: Additional arguments for aiohttp request
+
+        Yields:
+            Response with status 200, or 304 for a conditional request; the
+            body is not read yet
+
+        Raises:
+            WienerNetzeApiError: On API errors
+
+        """
         url = f"{API_BASE_URL}/{endpoint.lstrip('/')}"
-        timeout = ClientTimeout(total=DEFAULT_TIMEOUT)
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        headers = self._headers
+        if extra_headers := kwargs.pop("headers", None):
+            headers = {**headers, **extra_headers}
+
+        throttle_wait = time.perf_counter()
+        await self.rate_limiter.acquire(priority)
+        record_phase(PHASE_THROTTLE, time.perf_counter() - throttle_wait)
 
         _LOGGER.debug("API request: %s %s", method, url)
 
@@ -244,12 +981,14 @@ class WienerNetzeApiClient:
             async with self._session.request(
                 method,
                 url,
-                headers=self._headers,
-                timeout=timeout,
+                headers=headers,
                 **kwargs,
             ) as response:
                 # Log response status
                 _LOGGER.debug("API response: %s %s", response.status, url)
+                self.metrics.record_response(endpoint, response.status)
+
+                retry_after = self.rate_limiter.update_from_headers(response.headers)
 
                 # Handle error responses
                 if response.status == 400:
@@ -257,12 +996,7 @@ class WienerNetzeApiClient:
                     raise WienerNetzeBadRequestError(f"Bad request: {text}")
 
                 if response.status == 401:
-                    # Token might be invalid, try to re-authenticate once
-                    _LOGGER.warning("Access token invalid, re-authenticating")
-                    self._access_token = None
-                    await self._ensure_token()
-                    # Retry request
-                    return await self._request(method, endpoint, **kwargs)
+                    raise _TokenRejectedError("Unauthorized: access token rejected")
 
                 if response.status == 403:
                     raise WienerNetzeAuthError("Forbidden: insufficient permissions")
@@ -274,38 +1008,90 @@ class WienerNetzeApiClient:
                     raise WienerNetzeTimeoutError("Request timeout")
 
                 if response.status == 429:
-                    raise WienerNetzeRateLimitError("Rate limit exceeded")
+                    self.rate_limiter.rate_limited += 1
+                    if retry_after is None:
+                        retry_after = RATE_LIMIT_DEFAULT_RETRY_AFTER
+                        self.rate_limiter.block(retry_after)
+                    raise WienerNetzeRateLimitError(
+                        f"Rate limit exceeded, retry after {retry_after:.0f}s",
+                        retry_after,
+                    )
 
                 if response.status >= 500:
                     text = await response.text()
-                    raise WienerNetzeApiError(
+                    raise WienerNetzeServerError(
                         f"Server error: {response.status} - {text}"
                     )
 
+                if response.status == 304 and extra_headers:
+                    yield response
+                    return
+
                 if response.status != 200:
                     text = await response.text()
                     raise WienerNetzeApiError(
                         f"Unexpected response: {response.status} - {text}"
                     )
 
-                return await response.json()
+                yield response
 
         except aiohttp.ClientError as err:
             raise WienerNetzeConnectionError(f"Connection error: {err}") from err
         except asyncio.TimeoutError as err:
             raise WienerNetzeTimeoutError(f"Request timeout: {err}") from err
 
-    async def _get(self, endpoint: str, **kwargs: Any) -> dict[str, Any]:
+    def _record_call(self, call: CallStats) -> None:
+        """Record the retry statistics of a finished call."""
+        retries = call["attempts"] - 1 - call["reauthenticated"]
+        self.recent_calls.append(call)
+        self.total_calls += 1
+        self.total_retries += retries
+        self.total_retry_wait += call["retry_wait"]
+        self.metrics.record_call(call)
+
+        if retries or call["reauthenticated"]:
+            _LOGGER.debug(
+                "API call %s %s took %d attempt(s), %.2fs spent in backoff",
+                call["method"],
+                call["endpoint"],
+                call["attempts"],
+                call["retry_wait"],
+            )
+
+    async def _count_bytes(
+        self, endpoint: str, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Pass a streamed response body through, recording its size."""
+        async for chunk in chunks:
+            self.metrics.record_body(endpoint, len(chunk))
+            yield chunk
+
+    async def _get(
+        self, endpoint: str, priority: int = PRIORITY_UPDATE, **kwargs: Any
+    ) -> dict[str, Any]:
         """Make a GET request."""
-        return await self._request("GET", endpoint, **kwargs)
+        return await self._request("GET", endpoint, priority, **kwargs)
 
-    async def _post(self, endpoint: str, **kwargs: Any) -> dict[str, Any]:
+    async def _post(
+        self, endpoint: str, priority: int = PRIORITY_UPDATE, **kwargs: Any
+    ) -> dict[str, Any]:
         """Make a POST request."""
-        return await self._request("POST", endpoint, **kwargs)
+        return await self._request("POST", endpoint, priority, **kwargs)
 
-    async def get_meter_points(self) -> list[MeterPoint]:
+    async def get_meter_points(
+        self,
+        priority: int = PRIORITY_INTERACTIVE,
+        meter_ids: list[str] | None = None,
+        revalidate: bool = False,
+    ) -> list[MeterPoint]:
         """Get all meter points for the authenticated user.
 
+        Args:
+            priority: Rate limiter priority, lower values are served first
+            meter_ids: Only get these meter points (optional, default: all)
+            revalidate: Ask the API even if the cached list is fresh, e.g.
+                when the user picks a meter point
+
         Returns:
             List of meter points with address and metadata
 
@@ -316,8 +1102,20 @@ class WienerNetzeApiClient:
         """
         _LOGGER.debug("Fetching meter points")
 
+        params = (
+            None
+            if meter_ids is None
+            else [("zaehlpunkt", meter_id) for meter_id in meter_ids]
+        )
+
         try:
-            response = await self._get("zaehlpunkte")
+            response = await self._get_cached(
+                "zaehlpunkte",
+                priority,
+                lambda _: CACHE_TTL_METER_POINTS,
+                params=params,
+                revalidate=revalidate,
+            )
 
             # The API returns items array (or might be a list directly)
             meter_points = response.get(
@@ -338,6 +1136,7 @@ class WienerNetzeApiClient:
         date_from: str,
         date_to: str,
         granularity: str = GRANULARITY_QUARTER_HOUR,
+        priority: int = PRIORITY_UPDATE,
     ) -> ConsumptionData:
         """Get consumption data for a meter point.
 
@@ -346,6 +1145,7 @@ class WienerNetzeApiClient:
             date_from: Start date (YYYY-MM-DD)
             date_to: End date (YYYY-MM-DD)
             granularity: Data granularity (QUARTER_HOUR, DAY, METER_READ)
+            priority: Rate limiter priority, lower values are served first
 
         Returns:
             Consumption data with readings
@@ -370,8 +1170,11 @@ class WienerNetzeApiClient:
             "wertetyp": granularity,
         }
 
+        def ttl(response: ConsumptionData) -> float | None:
+            return consumption_cache_ttl(date_to, response.get("zaehlwerke", []))
+
         try:
-            response = await self._get(endpoint, params=params)
+            response = await self._get_cached(endpoint, priority, ttl, params=params)
 
             # Count total readings across all Zaehlwerke
             total_readings = sum(
@@ -393,6 +1196,149 @@ class WienerNetzeApiClient:
             _LOGGER.error("Failed to fetch consumption data")
             raise
 
+    async def stream_consumption_data(
+        self,
+        meter_point: str,
+        date_from: str,
+        date_to: str,
+        granularity: str = GRANULARITY_QUARTER_HOUR,
+        loads: JsonLoads | None = None,
+        priority: int = PRIORITY_BACKFILL,
+    ) -> AsyncIterator[ZaehlwerkMesswerte]:
+        """Stream consumption data for a meter point.
+
+        The response body is decoded while it is received, so large
+        historical ranges never have to be held as a whole. A Zählwerk can
+        be yielded several times with consecutive parts of its readings.
+
+        Args:
+            meter_point: Meter point number (Zählpunktnummer)
+            date_from: Start date (YYYY-MM-DD)
+            date_to: End date (YYYY-MM-DD)
+            granularity: Data granularity (QUARTER_HOUR, DAY, METER_READ)
+            loads: JSON decode function (orjson if installed, otherwise json)
+            priority: Rate limiter priority, lower values are served first
+
+        Yields:
+            Zählwerk with a part of its readings
+
+        Raises:
+            WienerNetzeNotFoundError: Meter point not found
+            WienerNetzeApiError: API request failed or invalid response
+
+        """
+        _LOGGER.debug(
+            "Streaming consumption data for %s from %s to %s (granularity: %s)",
+            meter_point,
+            date_from,
+            date_to,
+            granularity,
+        )
+
+        endpoint = f"zaehlpunkte/{meter_point}/messwerte"
+        params = {
+            "datumVon": date_from,
+            "datumBis": date_to,
+            "wertetyp": granularity,
+        }
+
+        total_readings = 0
+        try:
+            async with self._response(
+                "GET", endpoint, priority, params=params, timeout=STREAM_TIMEOUT
+            ) as response:
+                async for zaehlwerk in iter_zaehlwerke(
+                    self._count_bytes(
+                        endpoint, response.content.iter_chunked(STREAM_CHUNK_SIZE)
+                    ),
+                    loads,
+                ):
+                    total_readings += len(zaehlwerk["messwerte"])
+                    yield zaehlwerk
+
+        except WienerNetzeNotFoundError:
+            _LOGGER.error("Meter point not found: %s", meter_point)
+            raise
+        except WienerNetzeApiError:
+            _LOGGER.error("Failed to stream consumption data")
+            raise
+        except ValueError as err:
+            raise WienerNetzeApiError(f"Invalid response: {err}") from err
+
+        _LOGGER.info(
+            "Streamed %d reading(s) for meter point %s", total_readings, meter_point
+        )
+
+    async def get_consumption_data_batch(
+        self,
+        meter_points: list[str],
+        date_from: str,
+        date_to: str,
+        granularity: str = GRANULARITY_QUARTER_HOUR,
+        priority: int = PRIORITY_UPDATE,
+    ) -> dict[str, ConsumptionData]:
+        """Get consumption data for several meter points in one request.
+
+        Uses the multi meter point endpoint ``zaehlpunkte/messwerte`` and
+        splits the response back into per meter point consumption data.
+
+        Args:
+            meter_points: Meter point numbers (Zählpunktnummern)
+            date_from: Start date (YYYY-MM-DD)
+            date_to: End date (YYYY-MM-DD)
+            granularity: Data granularity (QUARTER_HOUR, DAY, METER_READ)
+            priority: Rate limiter priority, lower values are served first
+
+        Returns:
+            Consumption data keyed by meter point number. Meter points
+            missing from the response are not included.
+
+        Raises:
+            WienerNetzeApiError: API request failed
+
+        """
+        _LOGGER.debug(
+            "Fetching consumption data for %d meter point(s) from %s to %s "
+            "(granularity: %s)",
+            len(meter_points),
+            date_from,
+            date_to,
+            granularity,
+        )
+
+        endpoint = "zaehlpunkte/messwerte"
+        params: list[tuple[str, str]] = [
+            ("datumVon", date_from),
+            ("datumBis", date_to),
+            ("wertetyp", granularity),
+        ]
+        params.extend(("zaehlpunkt", meter_point) for meter_point in meter_points)
+
+        def ttl(response: Any) -> float | None:
+            result = split_consumption_batch(response)
+            if len(result) < len(set(meter_points)):
+                # Missing meter points might still be delivered
+                return CACHE_TTL_RECENT
+            return consumption_cache_ttl(
+                date_to, [zw for data in result.values() for zw in data["zaehlwerke"]]
+            )
+
+        try:
+            response = await self._get_cached(endpoint, priority, ttl, params=params)
+        except WienerNetzeApiError:
+            _LOGGER.error("Failed to fetch batch consumption data")
+            raise
+
+        result = split_consumption_batch(response)
+
+        _LOGGER.info(
+            "Retrieved consumption data for %d of %d meter point(s)",
+            len(result),
+            len(meter_points),
+        )
+
+        return result
+
 
 def format_meter_point_address(meter_point: MeterPoint) -> str:
     """Format meter point address as string.
@@ -511,6 +1457,123 @@ def parse_consumption_timestamp(timestamp: str) -> datetime:
         return parser.isoparse(timestamp)
 
 
+# Bulk timestamp parsing. The API emits a fixed shape
+# ("2024-11-10T00:00:00.000+01:00") with only two offsets, so parsed day
+# bases, offsets and whole timestamps are interned in bounded caches.
+_TIMESTAMP_LENGTH = 29
+_TIMESTAMP_CACHE_SIZE = 8192
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_DAY_BASES: dict[str, int] = {}
+_OFFSETS: dict[str, int] = {}
+_EPOCHS: dict[str, tuple[int, int]] = {}
+_TIMEZONES: dict[int, timezone] = {}
+
+
+def offset_timezone(offset: int) -> timezone:
+    """Get a cached fixed offset timezone.
+
+    Args:
+        offset: UTC offset in minutes
+
+    Returns:
+        Timezone with the given offset
+
+    """
+    tz = _TIMEZONES.get(offset)
+    if tz is None:
+        tz = _TIMEZONES[offset] = timezone(timedelta(minutes=offset))
+    return tz
+
+
+def parse_consumption_epoch(timestamp: str) -> tuple[int, int]:
+    """Parse ISO 8601 timestamp from API to epoch seconds.
+
+    Timestamps in the API shape are decoded by slicing, other ISO 8601
+    timestamps fall back to datetime.fromisoformat.
+
+    Args:
+        timestamp: ISO 8601 timestamp string (e.g., "2024-11-10T00:00:00.000+01:00")
+
+    Returns:
+        Tuple of (UTC epoch seconds, UTC offset in minutes)
+
+    Raises:
+        ValueError: If the timestamp is not valid ISO 8601
+
+    """
+    parsed = _EPOCHS.get(timestamp)
+    if parsed is not None:
+        return parsed
+
+    if (
+        len(timestamp) == _TIMESTAMP_LENGTH
+        and timestamp[10] == "T"
+        and timestamp[23] in "+-"
+    ):
+        day = timestamp[:10]
+        day_base = _DAY_BASES.get(day)
+        if day_base is None:
+            if len(_DAY_BASES) >= _TIMESTAMP_CACHE_SIZE:
+                _DAY_BASES.clear()
+            day_base = _DAY_BASES[day] = (
+                date.fromisoformat(day).toordinal() - _EPOCH_ORDINAL
+            ) * 86400
+
+        suffix = timestamp[23:]
+        offset = _OFFSETS.get(suffix)
+        if offset is None:
+            offset = int(suffix[1:3]) * 60 + int(suffix[4:6])
+            offset = _OFFSETS[suffix] = -offset if suffix[0] == "-" else offset
+
+        seconds = (
+            int(timestamp[11:13]) * 3600
+            + int(timestamp[14:16]) * 60
+            + int(timestamp[17:19])
+        )
+        parsed = (day_base + seconds - offset * 60, offset)
+    else:
+        value = datetime.fromisoformat(timestamp)
+        utc_offset = value.utcoffset()
+        parsed = (
+            int(value.timestamp()),
+            int(utc_offset.total_seconds()) // 60 if utc_offset else 0,
+        )
+
+    if len(_EPOCHS) >= _TIMESTAMP_CACHE_SIZE:
+        _EPOCHS.clear()
+    _EPOCHS[timestamp] = parsed
+    return parsed
+
+
+def parse_consumption_epochs(
+    readings: Iterable[ConsumptionReading],
+) -> list[tuple[int, int, int, int]]:
+    """Parse the timestamps of a list of readings at once.
+
+    Args:
+        readings: Consumption readings (Messwerte)
+
+    Returns:
+        List of (start, end, start offset, end offset) per reading, with
+        epoch seconds and UTC offsets in minutes
+
+    Raises:
+        ValueError: If a timestamp is not valid ISO 8601
+
+    """
+    epochs = _EPOCHS
+    parse = parse_consumption_epoch
+    parsed = []
+    for reading in readings:
+        zeit_von = reading["zeitVon"]
+        zeit_bis = reading["zeitBis"]
+        start, start_offset = epochs.get(zeit_von) or parse(zeit_von)
+        end, end_offset = epochs.get(zeit_bis) or parse(zeit_bis)
+        parsed.append((start, end, start_offset, end_offset))
+    return parsed
+
+
 def calculate_total_consumption(readings: list[ConsumptionReading]) -> float:
     """Calculate total consumption from readings.
 
@@ -553,3 +1616,34 @@ def extract_all_readings(consumption_data: ConsumptionData) -> list[ConsumptionR
     for zaehlwerk in consumption_data.get("zaehlwerke", []):
         readings.extend(zaehlwerk.get("messwerte", []))
     return readings
+
+
+def split_consumption_batch(response: Any) -> dict[str, ConsumptionData]:
+    """Split a multi meter point response into per meter point data.
+
+    Args:
+        response: Response of ``zaehlpunkte/messwerte`` (a list of
+            consumption data, or an object with an ``items`` list)
+
+    Returns:
+        Consumption data keyed by meter point number
+
+    """
+    items = response if isinstance(response, list) else response.get("items", [])
+
+    result: dict[str, ConsumptionData] = {}
+    for item in items:
+        meter_point = item.get("zaehlpunkt")
+        if not meter_point:
+            continue
+
+        if meter_point in result:
+            # Same meter point split across several entries
+            result[meter_point]["zaehlwerke"].extend(item.get("zaehlwerke", []))
+        else:
+            result[meter_point] = {
+                "zaehlpunkt": meter_point,
+                "zaehlwerke": list(item.get("zaehlwerke", [])),
+            }
+
+    return result
@@ -0,0 +1,257 @@
+"""Historical backfill for Wiener Netze Smart Meter."""
+import asyncio
+from datetime import date, timedelta
+import logging
+
+from .api import (
+    WienerNetzeApiClient,
+    WienerNetzeApiError,
+    WienerNetzeAuthError,
+    WienerNetzeRateLimitError,
+    WienerNetzeTimeoutError,
+)
+from .const import (
+    BACKFILL_MAX_ATTEMPTS,
+    BACKFILL_MAX_CONCURRENT,
+    BACKFILL_RETRY_DELAY,
+    GRANULARITY_QUARTER_HOUR,
+    MAX_REVISION_DAYS,
+    PRIORITY_BACKFILL,
+)
+from .storage import WienerNetzeHistoryStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def plan_chunks(
+    date_from: date, date_to: date, granularity: str
+) -> list[tuple[date, date]]:
+    """Split a date range into chunks of one API request each.
+
+    Quarter hour data is requested per calendar month, daily data and meter
+    readings per calendar year. The first and last chunk are clipped to the
+    range.
+
+    Args:
+        date_from: First day
+        date_to: Last day (inclusive)
+        granularity: Data granularity (QUARTER_HOUR, DAY, METER_READ)
+
+    Returns:
+        List of (first day, last day) tuples, oldest first
+
+    """
+    chunks: list[tuple[date, date]] = []
+    start = date_from
+
+    while start <= date_to:
+        if granularity == GRANULARITY_QUARTER_HOUR:
+            if start.month == 12:
+                next_start = date(start.year + 1, 1, 1)
+            else:
+                next_start = date(start.year, start.month + 1, 1)
+        else:
+            next_start = date(start.year + 1, 1, 1)
+
+        end = min(next_start - timedelta(days=1), date_to)
+        chunks.append((start, end))
+        start = next_start
+
+    return chunks
+
+
+class WienerNetzeBackfill:
+    """Import historical consumption data into the history store.
+
+    A date range is split into chunks (see plan_chunks) that are fetched
+    concurrently, bounded by BACKFILL_MAX_CONCURRENT. Rate limited or timed
+    out chunks are retried with exponential backoff. Every completed chunk
+    is checkpointed in the history store, so an interrupted backfill only
+    fetches the missing chunks when it is started again.
+    """
+
+    def __init__(
+        self,
+        api_client: WienerNetzeApiClient,
+        store: WienerNetzeHistoryStore,
+    ) -> None:
+        """Initialize the backfill.
+
+        Args:
+            api_client: API client instance
+            store: History store
+
+        """
+        self.api_client = api_client
+        self.store = store
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if a backfill is in progress."""
+        return self._lock.locked()
+
+    async def async_backfill(
+        self,
+        meter_ids: list[str],
+        date_from: date,
+        date_to: date,
+        granularity: str = GRANULARITY_QUARTER_HOUR,
+    ) -> int:
+        """Backfill a date range for several meter points.
+
+        Backfills run one at a time; a second call waits for the first.
+
+        Args:
+            meter_ids: Meter point numbers
+            date_from: First day
+            date_to: Last day (inclusive)
+            granularity: Data granularity (QUARTER_HOUR, DAY, METER_READ)
+
+        Returns:
+            Number of new or changed intervals
+
+        Raises:
+            WienerNetzeAuthError: Authentication failed
+            WienerNetzeApiError: At least one chunk failed, completed chunks
+                are kept
+
+        """
+        async with self._lock:
+            await self.store.async_load()
+
+            chunks = plan_chunks(date_from, date_to, granularity)
+            pending = [
+                (meter_id, chunk)
+                for meter_id in meter_ids
+                for chunk in chunks
+                if not self.store.is_chunk_done(meter_id, granularity, chunk)
+            ]
+
+            _LOGGER.info(
+                "Backfilling %d of %d chunk(s) from %s to %s (granularity: %s)",
+                len(pending),
+                len(chunks) * len(meter_ids),
+                date_from,
+                date_to,
+                granularity,
+            )
+
+            semaphore = asyncio.Semaphore(BACKFILL_MAX_CONCURRENT)
+            try:
+                results = await asyncio.gather(
+                    *(
+                        self._async_fetch_chunk(meter_id, granularity, chunk, semaphore)
+                        for meter_id, chunk in pending
+                    ),
+                    return_exceptions=True,
+                )
+            finally:
+                # Persist what was fetched, also when cancelled
+                self.store.async_schedule_save()
+
+            changed = 0
+            errors: list[Exception] = []
+            for (meter_id, chunk), result in zip(pending, results):
+                if isinstance(result, WienerNetzeAuthError):
+                    raise result
+
+                if isinstance(result, BaseException):
+                    if not isinstance(result, Exception):
+                        raise result
+
+                    _LOGGER.warning(
+                        "Failed to backfill %s from %s to %s: %s",
+                        meter_id,
+                        chunk[0],
+                        chunk[1],
+                        result,
+                    )
+                    errors.append(result)
+                    continue
+
+                changed += result
+
+            _LOGGER.info(
+                "Backfill merged %d interval(s), %d chunk(s) failed",
+                changed,
+                len(errors),
+            )
+
+            if errors:
+                raise WienerNetzeApiError(
+                    f"{len(errors)} of {len(pending)} chunk(s) failed: {errors[0]}"
+                )
+
+            return changed
+
+    async def _async_fetch_chunk(
+        self,
+        meter_id: str,
+        granularity: str,
+        chunk: tuple[date, date],
+        semaphore: asyncio.Semaphore,
+    ) -> int:
+        """Fetch a single chunk and merge it into the history.
+
+        Args:
+            meter_id: Meter point number
+            granularity: Data granularity
+            chunk: First and last day of the chunk
+            semaphore: Limits the number of concurrent requests
+
+        Returns:
+            Number of new or changed intervals
+
+        """
+        series = self.store.get_series(meter_id, granularity)
+
+        for attempt in range(BACKFILL_MAX_ATTEMPTS):
+            changed = 0
+            try:
+                async with semaphore:
+                    async for zaehlwerk in self.api_client.stream_consumption_data(
+                        meter_id,
+                        chunk[0].isoformat(),
+                        chunk[1].isoformat(),
+                        granularity,
+                        priority=PRIORITY_BACKFILL,
+                    ):
+                        changed += series.merge(
+                            {"zaehlpunkt": meter_id, "zaehlwerke": [zaehlwerk]},
+                            force=True,
+                        )
+                break
+            except (WienerNetzeRateLimitError, WienerNetzeTimeoutError) as err:
+                if attempt == BACKFILL_MAX_ATTEMPTS - 1:
+                    raise
+
+                # The server knows best when to try again
+                if isinstance(err, WienerNetzeRateLimitError) and err.retry_after:
+                    delay = err.retry_after
+                else:
+                    delay = BACKFILL_RETRY_DELAY * 2**attempt
+                _LOGGER.debug(
+                    "Backfill of %s from %s delayed by %ss: %s",
+                    meter_id,
+                    chunk[0],
+                    delay,
+                    err,
+                )
+                # The slot is free for other chunks while waiting
+                await asyncio.sleep(delay)
+
+        # Recent days might still be revised, fetch them again next time
+        if chunk[1] < date.today() - timedelta(days=MAX_REVISION_DAYS):
+            self.store.set_chunk_done(meter_id, granularity, chunk)
+        self.store.async_schedule_save()
+
+        _LOGGER.debug(
+            "Backfilled %s from %s to %s: %d interval(s)",
+            meter_id,
+            chunk[0],
+            chunk[1],
+            changed,
+        )
+
+        return changed
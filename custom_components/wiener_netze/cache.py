@@ -0,0 +1,221 @@
+"""HTTP response cache for the Wiener Netze API client."""
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, timedelta
+import time
+from typing import Any
+
+from aiohttp import hdrs
+
+from .const import CACHE_TTL_RECENT, QUALITY_VAL, RESPONSE_CACHE_SIZE
+
+CacheKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+class CacheEntry:
+    """Cached response body with its validators."""
+
+    def __init__(
+        self,
+        data: Any,
+        etag: str | None,
+        last_modified: str | None,
+        ttl: float | None,
+    ) -> None:
+        """Initialize the entry.
+
+        Args:
+            data: Decoded response body
+            etag: ETag response header
+            last_modified: Last-Modified response header
+            ttl: Seconds the entry is fresh, None if it never expires
+
+        """
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires: float | None = None
+        self.refresh(ttl)
+
+    @property
+    def is_fresh(self) -> bool:
+        """Return True if the entry can be used without asking the server."""
+        return self.expires is None or time.monotonic() < self.expires
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Get the headers of a conditional request for this entry."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers[hdrs.IF_NONE_MATCH] = self.etag
+        if self.last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = self.last_modified
+        return headers
+
+    def refresh(self, ttl: float | None) -> None:
+        """Mark the entry as fresh again.
+
+        Args:
+            ttl: Seconds the entry is fresh, None if it never expires
+
+        """
+        self.expires = None if ttl is None else time.monotonic() + ttl
+
+
+class ResponseCache:
+    """Least recently used cache of decoded GET responses.
+
+    Entries are keyed by endpoint and query parameters. A fresh entry is
+    returned without a request. A stale entry with an ETag or
+    Last-Modified validator is revalidated with a conditional request, so
+    an unchanged body is neither downloaded nor decoded again. Returned
+    data is shared with the cache and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Number of responses kept
+
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def key(
+        endpoint: str,
+        params: Mapping[str, str] | Iterable[tuple[str, str]] | None = None,
+    ) -> CacheKey:
+        """Get the cache key of a request.
+
+        Args:
+            endpoint: API endpoint (relative to base URL)
+            params: Query parameters
+
+        Returns:
+            Hashable key, independent of the parameter order
+
+        """
+        if params is None:
+            items: Iterable[tuple[str, str]] = ()
+        elif isinstance(params, Mapping):
+            items = params.items()
+        else:
+            items = params
+        return endpoint.strip("/"), tuple(sorted(items))
+
+    def get(self, key: CacheKey) -> CacheEntry | None:
+        """Get a cached response, fresh or stale.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cache entry or None
+
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        key: CacheKey,
+        data: Any,
+        headers: Mapping[str, str],
+        ttl: float | None,
+    ) -> None:
+        """Cache a response.
+
+        Args:
+            key: Cache key
+            data: Decoded response body
+            headers: Response headers
+            ttl: Seconds the response is fresh, None if it never expires
+
+        """
+        self._entries[key] = CacheEntry(
+            data, headers.get(hdrs.ETAG), headers.get(hdrs.LAST_MODIFIED), ttl
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "entries": len(self._entries),
+            "permanent": sum(e.expires is None for e in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+def consumption_cache_ttl(date_to: str, zaehlwerke: Iterable[Mapping]) -> float | None:
+    """Get how long consumption data may be served from the cache.
+
+    Days before today do not change any more once all their values are
+    validated (VAL) and delivered, so such responses never expire. Anything
+    that includes today, estimated values, or has readings missing up to
+    the end of date_to (e.g. yesterday's value is not published yet) gets a
+    short TTL.
+
+    Args:
+        date_to: Last requested day (YYYY-MM-DD)
+        zaehlwerke: Zählwerke of the response
+
+    Returns:
+        Seconds the response is fresh, None if it never expires
+
+    """
+    last_day = date.fromisoformat(date_to)
+    if last_day >= date.today():
+        return CACHE_TTL_RECENT
+
+    end = datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+    zaehlwerke = list(zaehlwerke)
+    if zaehlwerke and all(
+        _is_final(zaehlwerk.get("messwerte", []), end) for zaehlwerk in zaehlwerke
+    ):
+        return None
+
+    return CACHE_TTL_RECENT
+
+
+def _is_final(readings: list[Mapping], end: datetime) -> bool:
+    """Check that readings are validated and complete without gaps up to end.
+
+    Args:
+        readings: Readings of a Zählwerk, sorted by time
+        end: Local midnight after the last requested day (naive)
+
+    Returns:
+        True if the readings will not change any more
+
+    """
+    previous: datetime | None = None
+    for reading in readings:
+        if reading.get("qualitaet") != QUALITY_VAL:
+            return False
+        try:
+            start = datetime.fromisoformat(reading["zeitVon"])
+            stop = datetime.fromisoformat(reading["zeitBis"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        if previous is not None and start != previous:
+            return False
+        previous = stop
+
+    # Timestamps carry the local offset, so their wall clock time is local
+    return previous is not None and previous.replace(tzinfo=None) >= end
@@ -21,9 +21,12 @@ from .api import (
     format_meter_point_address,
 )
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_API_KEY,
     CONF_CLIENT_ID,
     CONF_CLIENT_SECRET,
+    CONF_DEDICATED_SESSION,
+    DATA_HUBS,
     DOMAIN,
 )
 
@@ -59,22 +62,38 @@ class WienerNetzeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             # Store credentials
             self._credentials = user_input
 
-            # Create API client
-            session = async_get_clientsession(self.hass)
-            self._api_client = WienerNetzeApiClient(
-                session=session,
-                client_id=user_input[CONF_CLIENT_ID],
-                client_secret=user_input[CONF_CLIENT_SECRET],
-                api_key=user_input[CONF_API_KEY],
+            # Reuse the API client of a set up entry with the same
+            # credentials, its token is valid
+            hub = self.hass.data.get(DATA_HUBS, {}).get(
+                (
+                    user_input[CONF_CLIENT_ID],
+                    user_input[CONF_CLIENT_SECRET],
+                    user_input[CONF_API_KEY],
+                )
             )
+            if hub is not None and hub.api_client.token_manager.has_valid_token:
+                self._api_client = hub.api_client
+            else:
+                hub = None
+                session = async_get_clientsession(self.hass)
+                self._api_client = WienerNetzeApiClient(
+                    session=session,
+                    client_id=user_input[CONF_CLIENT_ID],
+                    client_secret=user_input[CONF_CLIENT_SECRET],
+                    api_key=user_input[CONF_API_KEY],
+                )
 
             # Test authentication
             try:
-                await self._api_client.authenticate()
-                _LOGGER.info("Authentication successful")
+                if hub is None:
+                    await self._api_client.authenticate()
+                    _LOGGER.info("Authentication successful")
 
-                # Fetch meter points
-                self._meter_points = await self._api_client.get_meter_points()
+                # Fetch meter points, including ones added since the hub
+                # cached the list
+                self._meter_points = await self._api_client.get_meter_points(
+                    revalidate=True
+                )
 
                 if not self._meter_points:
                     errors["base"] = "no_meter_points"
@@ -196,6 +215,22 @@ class WienerNetzeOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        # For now, no options to configure
-        # Future: update interval, granularity, etc.
-        return self.async_show_form(step_id="init")
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_DEDICATED_SESSION,
+                        default=self.config_entry.options.get(
+                            CONF_DEDICATED_SESSION, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self.config_entry.options.get(
+                            CONF_ADAPTIVE_POLLING, True
+                        ),
+                    ): bool,
+                }
+            ),
+        )
@@ -6,15 +6,70 @@ DOMAIN = "wiener_netze"
 API_BASE_URL = "https://api.wstw.at/gateway/WN_SMART_METER_API/1.0"
 OAUTH_TOKEN_URL = "https://api.wstw.at/oauth2/token"
 API_TIMEOUT = 30
+MAX_CONCURRENT_REQUESTS = 4  # Parallel meter point requests per refresh
+MAX_BATCH_METER_POINTS = 20  # Meter points per zaehlpunkte/messwerte request
+
+# Rate Limiting (shared by all config entries of an account)
+RATE_LIMIT_REQUESTS_PER_MINUTE = 60
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_DEFAULT_RETRY_AFTER = 60  # seconds, if a 429 response has no hint
+
+# Request Priorities (lower is served first)
+PRIORITY_INTERACTIVE = 0  # Setup and config flow
+PRIORITY_UPDATE = 1  # Coordinator refresh
+PRIORITY_BACKFILL = 2  # Historical backfill
+
+# hass.data keys
+DATA_API_SESSION = f"{DOMAIN}_api_session"  # Client session shared by all entries
+DATA_HUBS = f"{DOMAIN}_hubs"  # Coordinators shared per set of credentials
+DATA_RATE_LIMITERS = f"{DOMAIN}_rate_limiters"  # Rate limiters per client ID
+DATA_TOKEN_MANAGERS = f"{DOMAIN}_token_managers"  # Access tokens per client ID
 
 # Configuration Keys
 CONF_CLIENT_ID = "client_id"
 CONF_CLIENT_SECRET = "client_secret"
 CONF_API_KEY = "api_key"
 CONF_METER_POINTS = "meter_points"
+CONF_DEDICATED_SESSION = "dedicated_session"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
 
 # Update Interval
 DEFAULT_SCAN_INTERVAL = 15  # minutes
+MAX_REVISION_DAYS = 3  # Days estimated (EST) values are re-requested for
+SERIES_RETENTION_DAYS = 35  # Days of readings kept in memory per meter point
+CHANGE_LOG_SIZE = 64  # Changed ranges kept per series for derived caches
+
+# Fetch Planning
+DAILY_HISTORY_DAYS = 400  # Days of day values kept for long-range totals
+RECONCILE_TOLERANCE = 0.01  # kWh, allowed difference between granularities
+
+# Adaptive Polling
+POLL_ARRIVAL_WINDOW = 60  # minutes polled around the expected data arrival
+POLL_MAX_INTERVAL = 6  # hours between polls at most
+POLL_SMOOTHING = 0.3  # Weight of a new publication lag sample
+
+# Meter Point Metadata
+METADATA_REFRESH_INTERVAL = 24  # hours between metadata checks
+
+# Long-term Statistics
+STATISTICS_BATCH_SIZE = 500  # Hours per recorder insert
+
+# Persistent Cache
+CACHE_RETENTION_DAYS = 7  # Days of consumption data kept on disk
+
+# Historical Backfill
+BACKFILL_MAX_CONCURRENT = 2  # Parallel chunk requests
+BACKFILL_MAX_ATTEMPTS = 5  # Attempts per chunk on rate limit or timeout
+BACKFILL_RETRY_DELAY = 30  # seconds, doubled on every attempt
+
+# Response Cache
+RESPONSE_CACHE_SIZE = 256  # Responses kept per API client
+CACHE_TTL_RECENT = 300  # seconds, data that may still change (today, EST)
+CACHE_TTL_METER_POINTS = 3600  # seconds
+
+# Refresh Profiling
+PROFILE_CYCLES = 20  # Refresh cycles kept for diagnostics
+PROFILE_TOP_FUNCTIONS = 30  # Functions listed in a cProfile capture
 
 # API Parameters
 GRANULARITY_QUARTER_HOUR = "QUARTER_HOUR"
@@ -24,6 +79,10 @@ GRANULARITY_METER_READ = "METER_READ"
 RESULT_TYPE_SMART_METER = "SMART_METER"
 RESULT_TYPE_ALL = "ALL"
 
+# OBIS Codes
+OBIS_CONSUMPTION = "1-1:1.8.0"  # Active energy drawn from the grid
+OBIS_FEED_IN = "1-1:2.8.0"  # Active energy fed into the grid
+
 # Quality Indicators
 QUALITY_VAL = "VAL"  # Validated actual value
 QUALITY_EST = "EST"  # Estimated/calculated value
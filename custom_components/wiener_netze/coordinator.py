@@ -1,40 +1,102 @@
 """DataUpdateCoordinator for Wiener Netze Smart Meter."""
-from datetime import date, timedelta
+import asyncio
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta
 import logging
+import time
+from types import MappingProxyType
 from typing import Any
 
+from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
+from .aggregate import BUCKET_DAY, ConsumptionAggregator
 from .api import (
+    ConsumptionData,
+    MeterPoint,
     WienerNetzeApiClient,
     WienerNetzeApiError,
     WienerNetzeAuthError,
+    WienerNetzeBadRequestError,
     WienerNetzeConnectionError,
+    WienerNetzeNotFoundError,
 )
+from .backfill import WienerNetzeBackfill
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_METER_POINTS,
+    DAILY_HISTORY_DAYS,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    GRANULARITY_DAY,
+    GRANULARITY_METER_READ,
     GRANULARITY_QUARTER_HOUR,
+    MAX_BATCH_METER_POINTS,
+    MAX_CONCURRENT_REQUESTS,
+    METADATA_REFRESH_INTERVAL,
+    OBIS_CONSUMPTION,
+    PRIORITY_UPDATE,
 )
+from .entity import meter_device_info
+from .planner import FetchPlanner, Mismatch, reconcile
+from .profiling import PHASE_PROCESS, PHASE_SAVE, CycleProfile, RefreshProfiler
+from .scheduler import PollScheduler
+from .series import ConsumptionSeries
+from .statistics import StatisticsImporter
+from .storage import WienerNetzeStore
+from .values import MeterValues
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class WienerNetzeDataCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Wiener Netze data."""
+    """Class to manage fetching Wiener Netze data.
+
+    Config entries with the same credentials share one coordinator (hub
+    mode): their meter points are fetched together in one scheduled pass.
+    The first entry is the primary entry; further entries join with
+    async_add_entry and leave with async_remove_entry. The coordinator is
+    not bound to the lifetime of any single entry, the caller shuts it down
+    once the last entry has left.
+
+    Meter point metadata (address, device, installation) is checked at
+    most once per METADATA_REFRESH_INTERVAL, alongside a regular refresh.
+    Until the check succeeds the known metadata keeps being served.
+
+    With adaptive polling (the default) the update interval follows the
+    learned publication pattern of the meter points instead of a fixed
+    DEFAULT_SCAN_INTERVAL, see PollScheduler.
+
+    Quarter hours are only fetched for the recent window. Day values (for
+    long-range totals) and meter readings (for the counter) are fetched
+    as planned by FetchPlanner and reconciled with the quarter hours.
+
+    New final quarter hours are imported into the recorder as hourly
+    long-term statistics, see StatisticsImporter.
+
+    The data of each meter point is an immutable snapshot. A refresh that
+    leaves the readings (by series revision), metadata and error of a meter
+    point unchanged keeps its previous snapshot object, and the meter
+    points that got a new one are listed in ``changed_meters``, so meter
+    point entities can skip writing an unchanged state. At local midnight
+    every meter point counts as changed, as the values of the day start
+    over without a refresh.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         api_client: WienerNetzeApiClient,
         config_entry: ConfigEntry,
+        store: WienerNetzeStore | None = None,
     ) -> None:
         """Initialize coordinator.
 
@@ -42,21 +104,380 @@ class WienerNetzeDataCoordinator(DataUpdateCoordinator):
             hass: Home Assistant instance
             api_client: API client instance
             config_entry: Config entry
+            store: Persistent cache (optional)
 
         """
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=DEFAULT_SCAN_INTERVAL),
-        )
+        # Do not let the entry being set up shut the coordinator down on
+        # unload, other entries might still use it
+        token = config_entries.current_entry.set(None)
+        try:
+            super().__init__(
+                hass,
+                _LOGGER,
+                name=DOMAIN,
+                update_interval=timedelta(minutes=DEFAULT_SCAN_INTERVAL),
+            )
+        finally:
+            config_entries.current_entry.reset(token)
+
         self.api_client = api_client
         self.config_entry = config_entry
-        self.meter_points = config_entry.data.get(CONF_METER_POINTS, [])
+        self.entries: dict[str, ConfigEntry] = {}
+        self.meter_points: list[dict[str, Any]] = []
+        self.meter_errors: dict[str, Exception] = {}
+        self.backfills: dict[str, WienerNetzeBackfill] = {}
+        self._batch_supported = True
+        self._stores: dict[str, WienerNetzeStore] = {}
+        self._meter_entries: dict[str, str] = {}
+        self._series: dict[str, ConsumptionSeries] = {}
+        self._coarse_series: dict[str, dict[str, ConsumptionSeries]] = {
+            GRANULARITY_DAY: {},
+            GRANULARITY_METER_READ: {},
+        }
+        self.planner = FetchPlanner()
+        self._aggregators: dict[tuple[str, str], ConsumptionAggregator] = {}
+        self._values: dict[
+            str, tuple[Mapping[str, Any], date, int | None, MeterValues]
+        ] = {}
+        self.mismatches: dict[str, list[Mismatch]] = {}
+        self._changed_meters: set[str] = set()
+        self._changed_coarse: set[tuple[str, str]] = set()
+        self.changed_meters: set[str] = set()
+        self._metadata_checked: dict[str, datetime | None] = {}
+        self._update_lock = asyncio.Lock()
+        self._unsub_midnight: CALLBACK_TYPE | None = None
+        self.profiler = RefreshProfiler()
+        self.scheduler = PollScheduler()
+        self.statistics = StatisticsImporter(hass)
+        self.adaptive_polling = config_entry.options.get(CONF_ADAPTIVE_POLLING, True)
+
+        self.async_add_entry(config_entry, store)
+
+    @callback
+    def async_add_entry(
+        self, entry: ConfigEntry, store: WienerNetzeStore | None = None
+    ) -> None:
+        """Add the meter points of a config entry to this coordinator.
+
+        Args:
+            entry: Config entry with the same credentials
+            store: Persistent cache of the entry (optional)
+
+        """
+        self.entries[entry.entry_id] = entry
+        if store is not None:
+            self._stores[entry.entry_id] = store
+        self._metadata_checked[entry.entry_id] = (
+            None if store is None else store.get_metadata_checked()
+        )
+
+        for meter_point in entry.data.get(CONF_METER_POINTS, []):
+            meter_id = meter_point["zaehlpunktnummer"]
+            if meter_id not in self._meter_entries:
+                self._meter_entries[meter_id] = entry.entry_id
+                self.meter_points.append(meter_point)
+                if store is not None:
+                    self.scheduler.restore(meter_id, store.get_schedule(meter_id))
+
+        _LOGGER.debug(
+            "Coordinator serves %d meter point(s) of %d config entries",
+            len(self.meter_points),
+            len(self.entries),
+        )
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> bool:
+        """Remove the meter points of a config entry from this coordinator.
+
+        Args:
+            entry_id: Config entry ID
+
+        Returns:
+            True if no config entry is left and the coordinator can be shut
+            down
+
+        """
+        self.entries.pop(entry_id, None)
+        self._stores.pop(entry_id, None)
+        self._metadata_checked.pop(entry_id, None)
+        self.backfills.pop(entry_id, None)
+
+        removed = {
+            meter_id
+            for meter_id, owner in self._meter_entries.items()
+            if owner == entry_id
+        }
+        self.meter_points = [
+            meter_point
+            for meter_point in self.meter_points
+            if meter_point["zaehlpunktnummer"] not in removed
+        ]
+        for meter_id in removed:
+            del self._meter_entries[meter_id]
+            self._series.pop(meter_id, None)
+            self.meter_errors.pop(meter_id, None)
+            self.scheduler.remove(meter_id)
+            self.planner.remove(meter_id)
+            self.statistics.remove(meter_id)
+            self.mismatches.pop(meter_id, None)
+            for granularity, coarse_series in self._coarse_series.items():
+                coarse_series.pop(meter_id, None)
+                self._aggregators.pop((meter_id, granularity), None)
+            self._aggregators.pop((meter_id, GRANULARITY_QUARTER_HOUR), None)
+            self._values.pop(meter_id, None)
+            if self.data:
+                self.data.pop(meter_id, None)
+
+        if not self.entries:
+            return True
+
+        if self.config_entry.entry_id == entry_id:
+            # Authentication failures are reported on the primary entry
+            self.config_entry = next(iter(self.entries.values()))
+
+        return False
+
+    def entry_meter_points(self, entry_id: str) -> list[dict[str, Any]]:
+        """Get the meter points of a config entry.
+
+        Args:
+            entry_id: Config entry ID
+
+        Returns:
+            Meter points added with the entry
+
+        """
+        return [
+            meter_point
+            for meter_point in self.meter_points
+            if self._meter_entries[meter_point["zaehlpunktnummer"]] == entry_id
+        ]
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from API.
 
+        Entries with more than one meter point use the batch endpoint first.
+        Meter points the batch did not return are fetched individually and
+        concurrently (bounded by MAX_CONCURRENT_REQUESTS). A failing meter
+        point does not fail the whole refresh: its error is recorded in
+        ``meter_errors`` and its previous data is kept. The refresh only
+        fails if every meter point failed or authentication was rejected.
+        When the meter point metadata is due for a check, it is requested
+        concurrently and applied once the refresh succeeded.
+
+        Returns:
+            Dictionary of meter point data
+
+        Raises:
+            ConfigEntryAuthFailed: Authentication failed
+            UpdateFailed: Update failed
+
+        """
+        async with self._update_lock:
+            profile = self.profiler.start_cycle()
+            metadata = (
+                self.hass.async_create_task(self._async_fetch_metadata())
+                if self._metadata_due()
+                else None
+            )
+            try:
+                data = await self._async_update_meter_points(profile, metadata)
+            except Exception as err:
+                if metadata is not None:
+                    metadata.cancel()
+                profile.finish(err)
+                if self.adaptive_polling:
+                    # Retry at the regular interval
+                    self.update_interval = timedelta(minutes=DEFAULT_SCAN_INTERVAL)
+                raise
+            profile.finish()
+            if self.adaptive_polling:
+                self.update_interval = self.scheduler.next_interval()
+            return data
+
+    def _metadata_due(self) -> bool:
+        """Check if the meter point metadata should be requested again.
+
+        Returns:
+            True if any config entry was not checked within
+            METADATA_REFRESH_INTERVAL
+
+        """
+        if not self.meter_points:
+            return False
+
+        threshold = datetime.now() - timedelta(hours=METADATA_REFRESH_INTERVAL)
+        return any(
+            checked is None or checked < threshold
+            for checked in self._metadata_checked.values()
+        )
+
+    async def _async_fetch_metadata(self) -> list[MeterPoint] | None:
+        """Request the metadata of the tracked meter points.
+
+        The meter points are requested in chunks of MAX_BATCH_METER_POINTS,
+        so the query string stays short for any number of meter points.
+
+        Returns:
+            Meter points returned by the API or None if a request failed
+
+        """
+        meter_ids = [mp["zaehlpunktnummer"] for mp in self.meter_points]
+        meter_points: list[MeterPoint] = []
+        try:
+            for index in range(0, len(meter_ids), MAX_BATCH_METER_POINTS):
+                end = index + MAX_BATCH_METER_POINTS
+                meter_points.extend(
+                    await self.api_client.get_meter_points(
+                        PRIORITY_UPDATE, meter_ids=meter_ids[index:end]
+                    )
+                )
+        except WienerNetzeApiError as err:
+            _LOGGER.debug("Meter point metadata check failed: %s", err)
+            return None
+        return meter_points
+
+    @callback
+    def _async_apply_metadata(
+        self, meter_points: list[MeterPoint] | None, data: dict[str, Any]
+    ) -> None:
+        """Update meter points, config entries and devices with new metadata.
+
+        Only meter points whose metadata differs from the known metadata are
+        updated. Meter points missing from the response keep their metadata.
+
+        Args:
+            meter_points: Meter points returned by the API, None if the
+                check failed and should be retried with the next refresh
+            data: Meter point data of the current refresh
+
+        """
+        if meter_points is None:
+            return
+
+        fetched = {mp.get("zaehlpunktnummer"): mp for mp in meter_points}
+        changed_entries: set[str] = set()
+        for index, meter_point in enumerate(self.meter_points):
+            meter_id = meter_point["zaehlpunktnummer"]
+            new = fetched.get(meter_id)
+            if new is None or new == meter_point:
+                continue
+
+            _LOGGER.debug("Metadata of meter point %s changed", meter_id)
+            self.meter_points[index] = new
+            if meter_id in data:
+                data[meter_id] = MappingProxyType(
+                    {**data[meter_id], "meter_point": new}
+                )
+            changed_entries.add(self._meter_entries[meter_id])
+            self._async_update_device(new)
+
+        current = {mp["zaehlpunktnummer"]: mp for mp in self.meter_points}
+        for entry_id in changed_entries:
+            entry = self.entries[entry_id]
+            self.hass.config_entries.async_update_entry(
+                entry,
+                data={
+                    **entry.data,
+                    CONF_METER_POINTS: [
+                        current.get(mp["zaehlpunktnummer"], mp)
+                        for mp in entry.data[CONF_METER_POINTS]
+                    ],
+                },
+            )
+
+        checked = datetime.now()
+        for entry_id in self._metadata_checked:
+            self._metadata_checked[entry_id] = checked
+
+    @callback
+    def _async_update_device(self, meter_point: MeterPoint) -> None:
+        """Update the device of a meter point if its details changed.
+
+        Args:
+            meter_point: Meter point data
+
+        """
+        device_registry = dr.async_get(self.hass)
+        device_info = meter_device_info(meter_point)
+        device = device_registry.async_get_device(
+            identifiers=device_info["identifiers"]
+        )
+        if device is None:
+            return
+
+        changes = {
+            key: device_info[key]
+            for key in ("name", "model", "serial_number")
+            if getattr(device, key) != device_info.get(key)
+        }
+        if changes:
+            device_registry.async_update_device(device.id, **changes)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates, and for the day change while listened to."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if self._unsub_midnight is None:
+            self._async_schedule_midnight()
+
+        @callback
+        def remove() -> None:
+            remove_listener()
+            if not self._listeners and self._unsub_midnight is not None:
+                self._unsub_midnight()
+                self._unsub_midnight = None
+
+        return remove
+
+    @callback
+    def _async_schedule_midnight(self) -> None:
+        """Schedule the state update at the next local midnight."""
+        midnight = datetime.combine(
+            date.today() + timedelta(days=1), datetime.min.time()
+        ).astimezone()
+        self._unsub_midnight = async_track_point_in_time(
+            self.hass, self._async_handle_midnight, midnight
+        )
+
+    @callback
+    def _async_handle_midnight(self, now: datetime) -> None:
+        """Write the states of all meter points for the new day."""
+        self._async_schedule_midnight()
+        if not self.data:
+            return
+
+        _LOGGER.debug("Day changed, updating %d meter point(s)", len(self.data))
+        self.changed_meters = set(self.data)
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the day change update and shut the coordinator down."""
+        if self._unsub_midnight is not None:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+        await super().async_shutdown()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing the entity state writes."""
+        started = time.perf_counter()
+        super().async_update_listeners()
+        self.profiler.record_state_write(time.perf_counter() - started)
+
+    async def _async_update_meter_points(
+        self,
+        profile: CycleProfile,
+        metadata: asyncio.Task[list[MeterPoint] | None] | None = None,
+    ) -> dict[str, Any]:
+        """Fetch data for all meter points of all config entries.
+
+        Args:
+            profile: Phase timings of this refresh
+            metadata: Pending meter point metadata request (optional)
+
         Returns:
             Dictionary of meter point data
 
@@ -67,48 +488,111 @@ class WienerNetzeDataCoordinator(DataUpdateCoordinator):
         """
         _LOGGER.debug("Fetching Wiener Netze Smart Meter data")
 
+        self._changed_meters = set()
+        self._changed_coarse = set()
+        self.changed_meters = set()
+
         try:
-            data = {}
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+            results: dict[str, Any] = {}
+
+            pending = list(self.meter_points)
+            if self._batch_supported and len(pending) > 1:
+                results.update(
+                    await self._async_fetch_batch(pending, semaphore, profile)
+                )
+                pending = [
+                    meter_point
+                    for meter_point in pending
+                    if meter_point["zaehlpunktnummer"] not in results
+                ]
+
+            fetched = await asyncio.gather(
+                *(
+                    self._async_fetch_meter_point(meter_point, semaphore, profile)
+                    for meter_point in pending
+                ),
+                return_exceptions=True,
+            )
+            results.update(
+                (meter_point["zaehlpunktnummer"], result)
+                for meter_point, result in zip(pending, fetched)
+            )
+
+            data: dict[str, Any] = {}
+            errors: dict[str, Exception] = {}
 
             for meter_point in self.meter_points:
                 meter_id = meter_point["zaehlpunktnummer"]
+                result = results[meter_id]
 
-                # Get today's data
-                today = date.today()
-                date_from = today.isoformat()
-                date_to = today.isoformat()
+                if isinstance(result, WienerNetzeAuthError):
+                    # Credentials are shared by all meter points
+                    raise result
 
-                _LOGGER.debug("Fetching consumption data for %s", meter_id)
+                if isinstance(result, BaseException):
+                    if not isinstance(result, Exception):
+                        raise result
 
-                consumption_data = await self.api_client.get_consumption_data(
-                    meter_point=meter_id,
-                    date_from=date_from,
-                    date_to=date_to,
-                    granularity=GRANULARITY_QUARTER_HOUR,
-                )
+                    _LOGGER.warning(
+                        "Failed to update meter point %s: %s", meter_id, result
+                    )
+                    errors[meter_id] = result
 
-                # Store data for this meter point
-                data[meter_id] = {
-                    "meter_point": meter_point,
-                    "consumption": consumption_data,
-                    "last_update": self.hass.loop.time(),
-                }
+                    # Keep serving the last known data for this meter point
+                    previous = self.get_meter_data(meter_id)
+                    if previous and previous.get("error") == str(result):
+                        data[meter_id] = previous
+                    elif previous:
+                        data[meter_id] = MappingProxyType(
+                            {**previous, "error": str(result)}
+                        )
+                    continue
 
-                _LOGGER.debug(
-                    "Retrieved %d readings for %s",
-                    len(consumption_data.get("messwerte", [])),
-                    meter_id,
-                )
+                data[meter_id] = result
+
+            self.meter_errors = errors
+
+            if errors and len(errors) == len(self.meter_points):
+                # Nothing could be fetched, report the first failure
+                raise next(iter(errors.values()))
+
+            coarse_changed = await self._async_fetch_coarse(
+                [meter_id for meter_id in data if meter_id not in errors],
+                semaphore,
+                profile,
+            )
+
+            if metadata is not None:
+                self._async_apply_metadata(await metadata, data)
+
+            for meter_id, series in self._series.items():
+                if meter_id not in errors:
+                    latest_end = series.latest_end()
+                    self.scheduler.observe(
+                        meter_id, None if latest_end is None else latest_end.timestamp()
+                    )
+
+            with profile.phase(PHASE_SAVE):
+                self._async_save_cache()
+
+            await self._async_import_statistics()
+
+            self.changed_meters = self._get_changed_meters(data) | coarse_changed
 
             _LOGGER.info(
                 "Successfully updated data for %d meter point(s)",
-                len(data),
+                len(data) - len(errors),
             )
 
             return data
 
         except WienerNetzeAuthError as err:
             _LOGGER.error("Authentication failed: %s", err)
+            # The primary entry is handled by the DataUpdateCoordinator
+            for entry in self.entries.values():
+                if entry is not self.config_entry:
+                    entry.async_start_reauth(self.hass)
             raise ConfigEntryAuthFailed from err
         except WienerNetzeConnectionError as err:
             _LOGGER.warning("Connection failed: %s", err)
@@ -120,7 +604,529 @@ class WienerNetzeDataCoordinator(DataUpdateCoordinator):
             _LOGGER.exception("Unexpected error: %s", err)
             raise UpdateFailed(f"Unexpected error: {err}") from err
 
-    def get_meter_data(self, meter_id: str) -> dict[str, Any] | None:
+    async def _async_import_statistics(self) -> None:
+        """Import the new final hours of the changed meter points.
+
+        A failed import does not fail the refresh, it is picked up again
+        with the next new readings.
+        """
+        for meter_id in self._changed_meters:
+            series = self._series.get(meter_id)
+            if series is None:
+                continue
+            try:
+                await self.statistics.async_import(meter_id, series)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning(
+                    "Failed to import statistics of meter point %s: %s", meter_id, err
+                )
+
+    async def _async_fetch_meter_point(
+        self,
+        meter_point: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        profile: CycleProfile,
+    ) -> dict[str, Any]:
+        """Fetch new and revisable data for a single meter point.
+
+        Args:
+            meter_point: Meter point data
+            semaphore: Semaphore limiting concurrent requests
+            profile: Phase timings of the refresh
+
+        Returns:
+            Meter point data entry
+
+        """
+        meter_id = meter_point["zaehlpunktnummer"]
+        date_from, date_to = self._get_fetch_window([meter_id])
+
+        async with semaphore:
+            _LOGGER.debug(
+                "Fetching consumption data for %s from %s to %s",
+                meter_id,
+                date_from,
+                date_to,
+            )
+
+            with profile.request([meter_id]):
+                consumption_data = await self.api_client.get_consumption_data(
+                    meter_point=meter_id,
+                    date_from=date_from,
+                    date_to=date_to,
+                    granularity=GRANULARITY_QUARTER_HOUR,
+                )
+
+        _LOGGER.debug(
+            "Retrieved %d readings for %s",
+            sum(len(zw.get("messwerte", [])) for zw in consumption_data["zaehlwerke"]),
+            meter_id,
+        )
+
+        with profile.phase(PHASE_PROCESS, meter_id):
+            return self._build_meter_data(meter_point, consumption_data)
+
+    async def _async_fetch_batch(
+        self,
+        meter_points: list[dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+        profile: CycleProfile,
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch data for several meter points via the batch endpoint.
+
+        Args:
+            meter_points: Meter point data
+            semaphore: Semaphore limiting concurrent requests
+            profile: Phase timings of the refresh
+
+        Returns:
+            Meter point data entries keyed by meter point number. Empty if
+            the batch request failed and per meter requests should be used.
+
+        Raises:
+            WienerNetzeAuthError: Authentication failed
+
+        """
+        by_id = {mp["zaehlpunktnummer"]: mp for mp in meter_points}
+        chunks: list[list[str]] = []
+        for meter_id in by_id:
+            if not chunks or len(chunks[-1]) >= MAX_BATCH_METER_POINTS:
+                chunks.append([])
+            chunks[-1].append(meter_id)
+
+        async def fetch_chunk(chunk: list[str]) -> dict[str, Any]:
+            # One window per request, wide enough for every meter point in it
+            date_from, date_to = self._get_fetch_window(chunk)
+            async with semaphore:
+                with profile.request(chunk):
+                    return await self.api_client.get_consumption_data_batch(
+                        meter_points=chunk,
+                        date_from=date_from,
+                        date_to=date_to,
+                        granularity=GRANULARITY_QUARTER_HOUR,
+                    )
+
+        try:
+            responses = await asyncio.gather(*(fetch_chunk(c) for c in chunks))
+        except WienerNetzeAuthError:
+            raise
+        except (WienerNetzeNotFoundError, WienerNetzeBadRequestError) as err:
+            _LOGGER.info(
+                "Batch endpoint not available, using per meter point requests: %s",
+                err,
+            )
+            self._batch_supported = False
+            return {}
+        except WienerNetzeApiError as err:
+            _LOGGER.debug(
+                "Batch request failed, using per meter point requests: %s", err
+            )
+            return {}
+
+        data: dict[str, dict[str, Any]] = {}
+        for response in responses:
+            for meter_id, consumption_data in response.items():
+                if meter_id in by_id:
+                    with profile.phase(PHASE_PROCESS, meter_id):
+                        data[meter_id] = self._build_meter_data(
+                            by_id[meter_id], consumption_data
+                        )
+
+        return data
+
+    async def _async_fetch_coarse(
+        self,
+        meter_ids: list[str],
+        semaphore: asyncio.Semaphore,
+        profile: CycleProfile,
+    ) -> set[str]:
+        """Fetch the day values and meter readings that are due.
+
+        Meter points that got new data are reconciled afterwards. A failed
+        request is logged and planned again with the next refresh, it does
+        not fail the refresh.
+
+        Args:
+            meter_ids: Meter points updated in this refresh
+            semaphore: Semaphore limiting concurrent requests
+            profile: Phase timings of the refresh
+
+        Returns:
+            Meter points whose day values or meter readings changed
+
+        Raises:
+            WienerNetzeAuthError: Authentication failed
+
+        """
+        today = date.today()
+
+        async def fetch(meter_id: str, granularity: str) -> bool:
+            series = self._get_coarse_series(meter_id, granularity)
+            revision = series.revision
+
+            requests = self.planner.plan(
+                meter_id, granularity, series, meter_id in self._changed_meters, today
+            )
+            for request in requests:
+                async with semaphore:
+                    with profile.request([meter_id]):
+                        consumption_data = await self.api_client.get_consumption_data(
+                            meter_point=meter_id,
+                            date_from=request.date_from.isoformat(),
+                            date_to=request.date_to.isoformat(),
+                            granularity=granularity,
+                        )
+                with profile.phase(PHASE_PROCESS, meter_id):
+                    series.merge(consumption_data)
+
+            self.planner.mark_fetched(meter_id, granularity)
+            if series.revision == revision:
+                return False
+            self._changed_coarse.add((meter_id, granularity))
+            return True
+
+        jobs = [
+            (meter_id, granularity)
+            for meter_id in meter_ids
+            for granularity in self.planner.coarse_granularities
+        ]
+        results = await asyncio.gather(
+            *(fetch(meter_id, granularity) for meter_id, granularity in jobs),
+            return_exceptions=True,
+        )
+
+        updated: set[str] = set()
+        for (meter_id, granularity), result in zip(jobs, results):
+            if isinstance(result, WienerNetzeAuthError):
+                raise result
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                _LOGGER.debug(
+                    "Failed to fetch %s data for %s: %s", granularity, meter_id, result
+                )
+            elif result:
+                updated.add(meter_id)
+
+        for meter_id in updated:
+            with profile.phase(PHASE_PROCESS, meter_id):
+                self._reconcile(meter_id)
+
+        return updated
+
+    def _get_coarse_series(self, meter_id: str, granularity: str) -> ConsumptionSeries:
+        """Get the day values or meter readings of a meter point, creating them.
+
+        Args:
+            meter_id: Meter point number
+            granularity: DAY or METER_READ
+
+        Returns:
+            Series of the granularity
+
+        """
+        series = self._coarse_series[granularity].get(meter_id)
+        if series is None:
+            series = self._coarse_series[granularity][meter_id] = ConsumptionSeries(
+                meter_id,
+                DAILY_HISTORY_DAYS if granularity == GRANULARITY_DAY else None,
+            )
+        return series
+
+    def _reconcile(self, meter_id: str) -> None:
+        """Check the granularities of a meter point against each other.
+
+        Args:
+            meter_id: Meter point number
+
+        """
+        series = self._series.get(meter_id)
+        if series is None:
+            return
+
+        mismatches = reconcile(
+            series,
+            self.get_series(meter_id, GRANULARITY_DAY),
+            self.get_series(meter_id, GRANULARITY_METER_READ),
+        )
+        if len(mismatches) > len(self.mismatches.get(meter_id, [])):
+            _LOGGER.warning(
+                "Data of %s is inconsistent across granularities, "
+                "%d value(s) do not match: %s",
+                meter_id,
+                len(mismatches),
+                mismatches[-1],
+            )
+        self.mismatches[meter_id] = mismatches
+
+    async def async_apply_backfill(
+        self,
+        backfill: WienerNetzeBackfill,
+        meter_ids: list[str],
+        date_from: date,
+        granularity: str,
+    ) -> None:
+        """Make backfilled history available to the meter point consumers.
+
+        Day values and meter readings are merged into the series used for
+        long-range totals and the meter reading, which keep them within
+        their retention. Quarter hours are too many to keep in memory: the
+        known recent quarter hours are merged into the history instead, and
+        the long-term statistics are imported again from the start of the
+        backfill on, so the sums stay continuous.
+
+        Args:
+            backfill: Backfill that fetched the history
+            meter_ids: Backfilled meter point numbers
+            date_from: First backfilled day
+            granularity: Backfilled granularity
+
+        """
+        async with self._update_lock:
+            changed = await self._async_merge_backfill(
+                backfill, meter_ids, date_from, granularity
+            )
+
+        _LOGGER.debug(
+            "Applied %s backfill of %d meter point(s), %d changed",
+            granularity,
+            len(meter_ids),
+            len(changed),
+        )
+        if changed:
+            self._changed_meters = set()
+            self._changed_coarse = {(meter_id, granularity) for meter_id in changed}
+            self._async_save_cache()
+            self.changed_meters = changed
+            self.async_update_listeners()
+
+    async def _async_merge_backfill(
+        self,
+        backfill: WienerNetzeBackfill,
+        meter_ids: list[str],
+        date_from: date,
+        granularity: str,
+    ) -> set[str]:
+        """Merge backfilled history, see async_apply_backfill.
+
+        Returns:
+            Meter points whose day values or meter readings changed
+
+        """
+        since = datetime.combine(date_from, datetime.min.time()).astimezone()
+        changed: set[str] = set()
+        for meter_id in meter_ids:
+            if meter_id not in self._meter_entries:
+                continue
+            history = backfill.store.get_series(meter_id, granularity)
+            if history.is_empty:
+                continue
+
+            if granularity != GRANULARITY_QUARTER_HOUR:
+                if self._get_coarse_series(meter_id, granularity).merge_series(history):
+                    self._reconcile(meter_id)
+                    changed.add(meter_id)
+                continue
+
+            if (series := self._series.get(meter_id)) is not None:
+                history.merge_series(series)
+                backfill.store.async_schedule_save()
+            try:
+                await self.statistics.async_import(meter_id, history, since=since)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning(
+                    "Failed to import backfilled statistics of %s: %s", meter_id, err
+                )
+
+        return changed
+
+    def _get_fetch_window(self, meter_ids: list[str]) -> tuple[str, str]:
+        """Get the date range to request for the given meter points.
+
+        The range starts today, or earlier while a meter point still has
+        intervals that are missing or open for revision (estimated values).
+
+        Args:
+            meter_ids: Meter point numbers
+
+        Returns:
+            Tuple of (date_from, date_to) in YYYY-MM-DD format
+
+        """
+        today = date.today()
+        start = today
+        for meter_id in meter_ids:
+            series = self._series.get(meter_id)
+            if series is not None:
+                start = min(start, series.fetch_start(today))
+
+        return start.isoformat(), today.isoformat()
+
+    def _build_meter_data(
+        self,
+        meter_point: dict[str, Any],
+        consumption_data: ConsumptionData,
+    ) -> Mapping[str, Any]:
+        """Merge fetched data and build the data entry for a meter point.
+
+        Args:
+            meter_point: Meter point data
+            consumption_data: Consumption data response
+
+        Returns:
+            Meter point data snapshot, the previous one if nothing changed
+
+        """
+        meter_id = meter_point["zaehlpunktnummer"]
+        series = self._series.get(meter_id)
+        if series is None:
+            series = self._series[meter_id] = ConsumptionSeries(meter_id)
+
+        if series.merge(consumption_data):
+            self._changed_meters.add(meter_id)
+
+        previous = self.get_meter_data(meter_id)
+        if (
+            previous is not None
+            and previous.get("revision") == series.revision
+            and "error" not in previous
+            and previous["meter_point"] == meter_point
+        ):
+            return previous
+
+        return MappingProxyType(
+            {
+                "meter_point": meter_point,
+                "consumption": series.as_consumption_data(),
+                "revision": series.revision,
+                "last_update": self.hass.loop.time(),
+            }
+        )
+
+    def _get_changed_meters(self, data: dict[str, Any]) -> set[str]:
+        """Get the meter points whose snapshot differs from the current data.
+
+        Args:
+            data: New meter point data
+
+        Returns:
+            Meter point numbers with a new snapshot
+
+        """
+        previous = self.data or {}
+        return {
+            meter_id
+            for meter_id, snapshot in data.items()
+            if previous.get(meter_id) is not snapshot
+        }
+
+    @callback
+    def async_restore_cache(self, entry_id: str | None = None) -> bool:
+        """Restore data from the persistent cache.
+
+        Cached readings are merged into the series, so the next refresh only
+        requests what is missing or still open for revision.
+
+        Args:
+            entry_id: Only restore the meter points of this config entry
+                (optional, default: all entries)
+
+        Returns:
+            True if cached data was restored for at least one meter point
+
+        """
+        restored: dict[str, Any] = {}
+        for meter_point in self.meter_points:
+            meter_id = meter_point["zaehlpunktnummer"]
+            owner = self._meter_entries[meter_id]
+            store = self._stores.get(owner)
+            if store is None or entry_id not in (None, owner):
+                continue
+
+            for consumption_data in store.get_consumption(
+                meter_id, GRANULARITY_QUARTER_HOUR
+            ):
+                restored[meter_id] = self._build_meter_data(
+                    meter_point, consumption_data
+                )
+
+            # Only the days missing from the day values and meter readings
+            # are requested again, see FetchPlanner
+            for granularity in self._coarse_series:
+                for consumption_data in store.get_consumption(meter_id, granularity):
+                    self._get_coarse_series(meter_id, granularity).merge(
+                        consumption_data
+                    )
+
+        # Restored readings are already on disk
+        self._changed_meters = set()
+        self._changed_coarse = set()
+
+        if not restored:
+            return False
+
+        _LOGGER.debug("Restored cached data for %d meter point(s)", len(restored))
+        self.changed_meters = self._get_changed_meters(restored)
+        self.async_set_updated_data({**(self.data or {}), **restored})
+
+        return True
+
+    @callback
+    def _async_save_cache(self) -> None:
+        """Write changed meter point data and token state to the caches."""
+        changed_stores: set[str] = set()
+        for meter_id, granularity in self._changed_coarse:
+            owner = self._meter_entries.get(meter_id)
+            store = self._stores.get(owner) if owner else None
+            series = self.get_series(meter_id, granularity)
+            if store is None or series is None:
+                continue
+
+            store.set_consumption(
+                meter_id,
+                granularity,
+                series.as_consumption_data(complete=True),
+                DAILY_HISTORY_DAYS,
+            )
+            changed_stores.add(owner)
+
+        for meter_id in self._changed_meters:
+            owner = self._meter_entries.get(meter_id)
+            store = self._stores.get(owner) if owner else None
+            if store is None:
+                continue
+
+            store.set_consumption(
+                meter_id,
+                GRANULARITY_QUARTER_HOUR,
+                self._series[meter_id].as_consumption_data(),
+            )
+            # The publication pattern only changes along with new readings
+            if schedule := self.scheduler.meters.get(meter_id):
+                store.set_schedule(meter_id, schedule.as_dict())
+            changed_stores.add(owner)
+
+        # Every entry keeps the token, any of them may be set up first
+        access_token = self.api_client.access_token
+        expires_at = self.api_client.token_expires_at
+        for owner, store in self._stores.items():
+            if (
+                access_token
+                and expires_at
+                and store.get_token() != (access_token, expires_at)
+            ):
+                store.set_token(access_token, expires_at)
+                changed_stores.add(owner)
+
+            checked = self._metadata_checked.get(owner)
+            if checked and store.get_metadata_checked() != checked:
+                store.set_metadata_checked(checked)
+                changed_stores.add(owner)
+
+        for owner in changed_stores:
+            self._stores[owner].async_schedule_save()
+
+    def get_meter_data(self, meter_id: str) -> Mapping[str, Any] | None:
         """Get data for specific meter point.
 
         Args:
@@ -135,6 +1141,23 @@ class WienerNetzeDataCoordinator(DataUpdateCoordinator):
 
         return self.data.get(meter_id)
 
+    def get_series(
+        self, meter_id: str, granularity: str = GRANULARITY_QUARTER_HOUR
+    ) -> ConsumptionSeries | None:
+        """Get the known readings of a meter point.
+
+        Args:
+            meter_id: Meter point number
+            granularity: QUARTER_HOUR, DAY or METER_READ
+
+        Returns:
+            Series or None if nothing was fetched yet
+
+        """
+        if granularity == GRANULARITY_QUARTER_HOUR:
+            return self._series.get(meter_id)
+        return self._coarse_series[granularity].get(meter_id)
+
     def get_latest_reading(self, meter_id: str) -> dict[str, Any] | None:
         """Get latest reading for meter point.
 
@@ -142,47 +1165,102 @@ class WienerNetzeDataCoordinator(DataUpdateCoordinator):
             meter_id: Meter point number
 
         Returns:
-            Latest reading or None
+            Latest reading of the first Zählwerk or None
 
         """
-        meter_data = self.get_meter_data(meter_id)
-        if not meter_data:
+        if not self.get_meter_data(meter_id):
             return None
 
-        consumption = meter_data.get("consumption", {})
-        zaehlwerke = consumption.get("zaehlwerke", [])
-        if not zaehlwerke:
+        series = self._series.get(meter_id)
+        if series is None:
             return None
 
-        # Get readings from first Zählwerk
-        readings = zaehlwerke[0].get("messwerte", [])
-        if not readings:
+        return series.latest_reading()
+
+    def get_aggregator(
+        self, meter_id: str, granularity: str = GRANULARITY_QUARTER_HOUR
+    ) -> ConsumptionAggregator | None:
+        """Get the cached bucket totals of a meter point.
+
+        Args:
+            meter_id: Meter point number
+            granularity: Granularity of the aggregated series
+
+        Returns:
+            Aggregator or None if nothing was fetched yet
+
+        """
+        series = self.get_series(meter_id, granularity)
+        if series is None:
             return None
 
-        # Return most recent reading
-        return readings[-1]
+        aggregator = self._aggregators.get((meter_id, granularity))
+        if aggregator is None or aggregator.series is not series:
+            aggregator = self._aggregators[
+                (meter_id, granularity)
+            ] = ConsumptionAggregator(series)
+        return aggregator
+
+    def get_values(self, meter_id: str) -> MeterValues | None:
+        """Get the derived values of a meter point.
 
-    def get_total_consumption_today(self, meter_id: str) -> float:
+        The same instance is returned until the snapshot or the meter
+        readings of the meter point or the day change, so every value is
+        computed once and shared by all entities.
+
+        Args:
+            meter_id: Meter point number
+
+        Returns:
+            Derived values or None if nothing was fetched yet
+
+        """
+        snapshot = self.get_meter_data(meter_id)
+        aggregator = self.get_aggregator(meter_id)
+        if snapshot is None or aggregator is None:
+            return None
+
+        today = date.today()
+        meter_reads = self.get_series(meter_id, GRANULARITY_METER_READ)
+        revision = None if meter_reads is None else meter_reads.revision
+
+        cached = self._values.get(meter_id)
+        if (
+            cached is not None
+            and cached[0] is snapshot
+            and cached[1] == today
+            and cached[2] == revision
+        ):
+            return cached[3]
+
+        values = MeterValues(aggregator, meter_reads, today)
+        self._values[meter_id] = (snapshot, today, revision, values)
+        return values
+
+    def get_total_consumption_today(
+        self, meter_id: str, obis_code: str = OBIS_CONSUMPTION
+    ) -> float:
         """Get total consumption for today.
 
+        Only the Zählwerk with the given OBIS code is summed. Meter points
+        without it fall back to their first Zählwerk.
+
         Args:
             meter_id: Meter point number
+            obis_code: OBIS code of the Zählwerk (default: grid consumption)
 
         Returns:
             Total consumption in kWh
 
         """
-        meter_data = self.get_meter_data(meter_id)
-        if not meter_data:
+        if not self.get_meter_data(meter_id):
             return 0.0
 
-        consumption = meter_data.get("consumption", {})
-        zaehlwerke = consumption.get("zaehlwerke", [])
+        aggregator = self.get_aggregator(meter_id)
+        if aggregator is None or not aggregator.series.registers:
+            return 0.0
 
-        # Sum all readings from all Zählwerke
-        total = 0.0
-        for zaehlwerk in zaehlwerke:
-            readings = zaehlwerk.get("messwerte", [])
-            total += sum(reading.get("messwert", 0.0) for reading in readings)
+        if obis_code not in aggregator.series.registers:
+            obis_code = next(iter(aggregator.series.registers))
 
-        return total
+        return aggregator.total(obis_code, BUCKET_DAY, date.today())
@@ -0,0 +1,123 @@
+"""Diagnostics support for Wiener Netze Smart Meter."""
+from collections.abc import Mapping
+import re
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_KEY, CONF_CLIENT_ID, CONF_CLIENT_SECRET, DOMAIN
+from .coordinator import WienerNetzeDataCoordinator
+
+TO_REDACT = {
+    CONF_API_KEY,
+    CONF_CLIENT_ID,
+    CONF_CLIENT_SECRET,
+    # Meter point numbers, addresses and device IDs in CONF_METER_POINTS
+    "zaehlpunktnummer",
+    "zaehlpunktname",
+    "verbrauchsstelle",
+    "geraet",
+    "anlage",
+}
+
+# Meter point numbers (Zählpunktnummern), also lower case in statistic IDs
+_METER_ID = re.compile(r"AT[0-9A-Z]{31}", re.IGNORECASE)
+
+
+def _mask_meter_ids(data: Any, placeholders: dict[str, str]) -> Any:
+    """Replace meter point numbers in keys and strings with placeholders.
+
+    Args:
+        data: Diagnostics data
+        placeholders: Placeholder per upper case meter point number, new
+            numbers get the next free one
+
+    Returns:
+        Copy of the data without meter point numbers
+
+    """
+
+    def placeholder(match: re.Match[str]) -> str:
+        meter_id = match.group().upper()
+        if meter_id not in placeholders:
+            placeholders[meter_id] = f"meter_{len(placeholders) + 1}"
+        return placeholders[meter_id]
+
+    if isinstance(data, str):
+        return _METER_ID.sub(placeholder, data)
+    if isinstance(data, Mapping):
+        return {
+            _mask_meter_ids(key, placeholders): _mask_meter_ids(value, placeholders)
+            for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [_mask_meter_ids(value, placeholders) for value in data]
+    return data
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+
+    Returns:
+        Config entry, coordinator state, API request metrics and refresh
+        timings, with meter point numbers replaced by meter_1, meter_2, ...
+        in the order of the meter points of the coordinator
+
+    """
+    coordinator: WienerNetzeDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+    api_client = coordinator.api_client
+    token_manager = api_client.token_manager
+    placeholders = {
+        meter_point["zaehlpunktnummer"].upper(): f"meter_{index}"
+        for index, meter_point in enumerate(coordinator.meter_points, 1)
+    }
+
+    diagnostics = {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "adaptive_polling": coordinator.adaptive_polling,
+            "poll_schedule": coordinator.scheduler.as_dict(),
+            "mismatches": {
+                meter_id: [mismatch._asdict() for mismatch in mismatches]
+                for meter_id, mismatches in coordinator.mismatches.items()
+                if mismatches
+            },
+            "statistics": coordinator.statistics.stats,
+            "entries": len(coordinator.entries),
+            "meter_points": len(coordinator.meter_points),
+            "meter_errors": {
+                meter_id: str(err) for meter_id, err in coordinator.meter_errors.items()
+            },
+        },
+        "api": {
+            "metrics": api_client.metrics.as_dict(),
+            "retries": api_client.retry_stats,
+            "rate_limiter": api_client.rate_limiter.stats,
+            "cache": api_client.cache.stats,
+            "token": {
+                "valid": token_manager.has_valid_token,
+                "expires_at": (
+                    None
+                    if token_manager.expires_at is None
+                    else token_manager.expires_at.isoformat()
+                ),
+                "refreshes": token_manager.refreshes,
+            },
+            "recent_calls": list(api_client.recent_calls),
+        },
+        "profiling": coordinator.profiler.as_dict(),
+    }
+    return _mask_meter_ids(diagnostics, placeholders)
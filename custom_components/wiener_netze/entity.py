@@ -0,0 +1,92 @@
+"""Entity helpers for Wiener Netze Smart Meter."""
+import time
+from typing import TYPE_CHECKING
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import MeterPoint, format_meter_point_address
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import WienerNetzeDataCoordinator
+
+MANUFACTURER = "Wiener Netze"
+
+
+def meter_device_info(meter_point: MeterPoint) -> DeviceInfo:
+    """Get the device of a meter point.
+
+    Args:
+        meter_point: Meter point data
+
+    Returns:
+        Device info, identified by the meter point number
+
+    """
+    return DeviceInfo(
+        identifiers={(DOMAIN, meter_point["zaehlpunktnummer"])},
+        name=(
+            meter_point.get("zaehlpunktname") or format_meter_point_address(meter_point)
+        ),
+        manufacturer=MANUFACTURER,
+        model="Smart Meter",
+        serial_number=meter_point.get("geraet", {}).get("geraetenummer"),
+    )
+
+
+class WienerNetzeMeterEntity(CoordinatorEntity["WienerNetzeDataCoordinator"]):
+    """Entity of a single meter point.
+
+    The state is only written when the snapshot of the meter point changed
+    in a refresh (see WienerNetzeDataCoordinator.changed_meters) or the
+    availability changed, not on every coordinator update.
+    """
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self, coordinator: "WienerNetzeDataCoordinator", meter_point: MeterPoint
+    ) -> None:
+        """Initialize the entity.
+
+        Args:
+            coordinator: Data coordinator
+            meter_point: Meter point data
+
+        """
+        super().__init__(coordinator)
+        self.meter_id = meter_point["zaehlpunktnummer"]
+        self._attr_device_info = meter_device_info(meter_point)
+        self._written_available: bool | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return True if data of the meter point is known."""
+        return (
+            super().available
+            and self.coordinator.get_meter_data(self.meter_id) is not None
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the availability of the first written state."""
+        await super().async_added_to_hass()
+        self._written_available = self.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the meter point changed in the refresh."""
+        available = self.available
+        if (
+            self.meter_id not in self.coordinator.changed_meters
+            and available == self._written_available
+        ):
+            return
+
+        self._written_available = available
+        started = time.perf_counter()
+        self.async_write_ha_state()
+        self.coordinator.profiler.record_state_write(
+            time.perf_counter() - started, self.meter_id
+        )
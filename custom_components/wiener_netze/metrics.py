@@ -0,0 +1,266 @@
+"""Request metrics for the Wiener Netze API client."""
+from collections import Counter, deque
+import re
+import time
+from typing import Any, TypedDict
+
+# Upper bounds of the latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Window for the current request rate
+REQUEST_RATE_WINDOW = 60  # seconds
+
+_METER_POINT_ID = re.compile(r"AT[0-9A-Z]{31}")
+
+
+class CallStats(TypedDict):
+    """Retry statistics of a single API call."""
+
+    method: str
+    endpoint: str
+    attempts: int
+    reauthenticated: bool
+    retry_wait: float
+    duration: float
+    error: str | None
+
+
+def endpoint_name(endpoint: str) -> str:
+    """Get the metrics name of an API endpoint.
+
+    Meter point numbers are replaced by a placeholder, so requests for
+    different meter points are counted together.
+
+    Args:
+        endpoint: API endpoint (relative to base URL)
+
+    Returns:
+        Endpoint template, e.g. ``zaehlpunkte/{zaehlpunkt}/messwerte``
+
+    """
+    return _METER_POINT_ID.sub("{zaehlpunkt}", endpoint.strip("/"))
+
+
+class LatencyHistogram:
+    """Histogram of latencies with fixed buckets."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize the histogram.
+
+        Args:
+            buckets: Ascending upper bounds of the buckets in seconds, a
+                last bucket for larger values is added
+
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Add a latency.
+
+        Args:
+            seconds: Latency in seconds
+
+        """
+        index = 0
+        while index < len(self.buckets) and seconds > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean latency in seconds."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Estimate a percentile of the latencies.
+
+        Args:
+            percent: Percentile (0-100)
+
+        Returns:
+            Upper bound of the bucket the percentile falls into (the largest
+            latency for the last bucket), None without latencies
+
+        """
+        if not self.count:
+            return None
+
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index < len(self.buckets):
+                    return min(self.buckets[index], self.max)
+                break
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the histogram for diagnostics."""
+        labels = [f"<={bound}" for bound in self.buckets]
+        labels.append(f">{self.buckets[-1]}")
+        return {
+            "count": self.count,
+            "mean": None if self.mean is None else round(self.mean, 4),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": round(self.max, 4),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class EndpointMetrics:
+    """Request metrics of a single API endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.calls = 0
+        self.errors = 0
+        self.statuses: Counter[int] = Counter()
+        self.latency = LatencyHistogram()
+        self.bytes_received = 0
+        self.decode_time = 0.0
+        self.retries = 0
+        self.reauthentications = 0
+        self.rate_limited = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the metrics for diagnostics."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "statuses": {str(status): n for status, n in sorted(self.statuses.items())},
+            "latency": self.latency.as_dict(),
+            "bytes_received": self.bytes_received,
+            "decode_time": round(self.decode_time, 4),
+            "retries": self.retries,
+            "reauthentications": self.reauthentications,
+            "rate_limited": self.rate_limited,
+        }
+
+
+class ApiMetrics:
+    """Request metrics of an API client, per endpoint.
+
+    A call is one API method invocation including its retries; every retry
+    or re-authentication sends another request. Status codes are counted
+    per request, latencies per call (including retries and reading the
+    body), so they show the time a refresh actually waits. JSON decode time
+    is only measured for fully read responses, streamed responses are
+    decoded while they are received.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        self._sent: deque[float] = deque()
+
+    def endpoint(self, endpoint: str) -> EndpointMetrics:
+        """Get the metrics of an endpoint.
+
+        Args:
+            endpoint: API endpoint (relative to base URL)
+
+        Returns:
+            Metrics of the endpoint template
+
+        """
+        name = endpoint_name(endpoint)
+        metrics = self.endpoints.get(name)
+        if metrics is None:
+            metrics = self.endpoints[name] = EndpointMetrics()
+        return metrics
+
+    def record_response(self, endpoint: str, status: int) -> None:
+        """Record the status of a sent request.
+
+        Args:
+            endpoint: API endpoint
+            status: HTTP status code
+
+        """
+        metrics = self.endpoint(endpoint)
+        metrics.statuses[status] += 1
+        if status == 429:
+            metrics.rate_limited += 1
+
+        now = time.monotonic()
+        self._sent.append(now)
+        self._expire(now)
+
+    def record_body(self, endpoint: str, size: int, decode_time: float = 0.0) -> None:
+        """Record a received response body.
+
+        Args:
+            endpoint: API endpoint
+            size: Body size in bytes (after decompression)
+            decode_time: Seconds spent decoding JSON
+
+        """
+        metrics = self.endpoint(endpoint)
+        metrics.bytes_received += size
+        metrics.decode_time += decode_time
+
+    def record_call(self, call: CallStats) -> None:
+        """Record a finished call.
+
+        Args:
+            call: Retry statistics of the call
+
+        """
+        metrics = self.endpoint(call["endpoint"])
+        metrics.calls += 1
+        metrics.errors += call["error"] is not None
+        metrics.latency.observe(call["duration"])
+        metrics.retries += call["attempts"] - 1 - call["reauthenticated"]
+        metrics.reauthentications += call["reauthenticated"]
+
+    @property
+    def requests_last_minute(self) -> int:
+        """Return the number of requests sent in the last minute."""
+        self._expire(time.monotonic())
+        return len(self._sent)
+
+    def total(self, key: str) -> int | float:
+        """Sum a counter over all endpoints.
+
+        Args:
+            key: Attribute of EndpointMetrics, e.g. ``calls``
+
+        """
+        return sum(getattr(metrics, key) for metrics in self.endpoints.values())
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        """Return the latencies of all endpoints in one histogram."""
+        merged = LatencyHistogram()
+        for metrics in self.endpoints.values():
+            histogram = metrics.latency
+            merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+            merged.count += histogram.count
+            merged.total += histogram.total
+            merged.max = max(merged.max, histogram.max)
+        return merged
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the metrics for diagnostics."""
+        return {
+            "requests_last_minute": self.requests_last_minute,
+            "latency": self.latency.as_dict(),
+            "endpoints": {
+                name: metrics.as_dict() for name, metrics in self.endpoints.items()
+            },
+        }
+
+    def _expire(self, now: float) -> None:
+        """Forget requests sent before the rate window."""
+        cutoff = now - REQUEST_RATE_WINDOW
+        while self._sent and self._sent[0] < cutoff:
+            self._sent.popleft()
@@ -0,0 +1,294 @@
+"""Fetch planning across data granularities for Wiener Netze Smart Meter."""
+from bisect import bisect_left
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+import logging
+from typing import NamedTuple
+
+from .backfill import plan_chunks
+from .const import (
+    DAILY_HISTORY_DAYS,
+    GRANULARITY_DAY,
+    GRANULARITY_METER_READ,
+    GRANULARITY_QUARTER_HOUR,
+    MAX_REVISION_DAYS,
+    RECONCILE_TOLERANCE,
+)
+from .series import ConsumptionSeries
+from .timeseries import QUALITY_FLAG_VALIDATED, IntervalSeries
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consumers of meter data and the cheapest granularity that serves them
+CONSUMER_RECENT = "recent"  # Intraday detail of the revision window
+CONSUMER_TOTALS = "totals"  # Long-range totals (months, years)
+CONSUMER_COUNTER = "counter"  # Cumulative energy counter
+CONSUMER_GRANULARITIES = {
+    CONSUMER_RECENT: GRANULARITY_QUARTER_HOUR,
+    CONSUMER_TOTALS: GRANULARITY_DAY,
+    CONSUMER_COUNTER: GRANULARITY_METER_READ,
+}
+
+# Kinds of reconciliation mismatches
+CHECK_DAY_QUARTER_HOURS = "day_vs_quarter_hours"
+CHECK_METER_READ_DAYS = "meter_read_vs_days"
+
+# Factors to kWh
+_UNIT_FACTORS = {"kWh": 1.0, "Wh": 0.001}
+
+_QUARTER_HOUR = 900  # seconds
+
+
+class FetchRequest(NamedTuple):
+    """A consumption data request for one meter point."""
+
+    granularity: str
+    date_from: date
+    date_to: date
+
+
+class Mismatch(NamedTuple):
+    """Disagreement between a coarse value and the finer values it covers."""
+
+    check: str
+    obis_code: str
+    start: datetime
+    end: datetime
+    expected: float  # kWh, coarse value (day total or counter difference)
+    actual: float  # kWh, sum of the finer values
+
+
+class FetchPlanner:
+    """Choose which granularities and date ranges to request per meter point.
+
+    Every consumer is served by the cheapest granularity that carries what
+    it needs: quarter hours only for the recent window (planned by the
+    series watermark, see ConsumptionSeries.fetch_start), day values for
+    long-range totals and meter readings for the cumulative counter. Day
+    values and meter readings are requested once at start and then only
+    when new quarter hours were published, as all three are published
+    together.
+    """
+
+    def __init__(self, consumers: Iterable[str] = CONSUMER_GRANULARITIES) -> None:
+        """Initialize the planner.
+
+        Args:
+            consumers: Consumers to plan for (default: all)
+
+        """
+        self.granularities = {CONSUMER_GRANULARITIES[c] for c in consumers}
+        self._fetched: set[tuple[str, str]] = set()
+
+    @property
+    def coarse_granularities(self) -> list[str]:
+        """Get the granularities planned besides quarter hours."""
+        return [
+            granularity
+            for granularity in (GRANULARITY_DAY, GRANULARITY_METER_READ)
+            if granularity in self.granularities
+        ]
+
+    def plan(
+        self,
+        meter_id: str,
+        granularity: str,
+        series: ConsumptionSeries,
+        published: bool,
+        today: date,
+    ) -> list[FetchRequest]:
+        """Plan the requests of a coarse granularity for a meter point.
+
+        Args:
+            meter_id: Meter point number
+            granularity: DAY or METER_READ
+            series: Known readings of that granularity
+            published: True if new quarter hours arrived in this refresh
+            today: Current date
+
+        Returns:
+            Requests to make, oldest first (empty if nothing is due)
+
+        """
+        if (meter_id, granularity) in self._fetched and not published:
+            return []
+
+        if granularity == GRANULARITY_METER_READ:
+            return [
+                FetchRequest(
+                    granularity, today - timedelta(days=MAX_REVISION_DAYS), today
+                )
+            ]
+
+        # Day values are complete for yesterday at the latest
+        yesterday = today - timedelta(days=1)
+        if series.is_empty:
+            start = today - timedelta(days=DAILY_HISTORY_DAYS)
+        else:
+            start = series.fetch_start(yesterday)
+
+        return [
+            FetchRequest(granularity, date_from, date_to)
+            for date_from, date_to in plan_chunks(start, yesterday, granularity)
+        ]
+
+    def mark_fetched(self, meter_id: str, granularity: str) -> None:
+        """Record that the planned requests of a granularity succeeded.
+
+        Args:
+            meter_id: Meter point number
+            granularity: DAY or METER_READ
+
+        """
+        self._fetched.add((meter_id, granularity))
+
+    def remove(self, meter_id: str) -> None:
+        """Forget a meter point.
+
+        Args:
+            meter_id: Meter point number
+
+        """
+        self._fetched = {key for key in self._fetched if key[0] != meter_id}
+
+
+def reconcile(
+    quarter_hours: ConsumptionSeries,
+    days: ConsumptionSeries | None = None,
+    meter_reads: ConsumptionSeries | None = None,
+) -> list[Mismatch]:
+    """Check the series of a meter point against each other.
+
+    Validated day values are compared with the sum of their quarter hours,
+    if all quarter hours of the day are known and validated. The difference
+    of two validated meter readings is compared with the day values
+    between them, if those cover the whole span. Registers are matched by
+    OBIS code.
+
+    Args:
+        quarter_hours: Quarter hour series
+        days: Day value series (optional)
+        meter_reads: Meter reading series (optional)
+
+    Returns:
+        Mismatches larger than RECONCILE_TOLERANCE
+
+    """
+    mismatches: list[Mismatch] = []
+
+    for obis_code, day_register in (days.registers if days else {}).items():
+        fine = quarter_hours.registers.get(obis_code)
+        if fine is None:
+            continue
+
+        for index in range(len(day_register)):
+            if not day_register.quality[index] & QUALITY_FLAG_VALIDATED:
+                continue
+            start, end = day_register.starts[index], day_register.ends[index]
+            actual = _validated_sum(fine, start, end, _QUARTER_HOUR)
+            if actual is None:
+                continue
+            _check(
+                mismatches,
+                Mismatch(
+                    CHECK_DAY_QUARTER_HOURS,
+                    obis_code,
+                    day_register.start_datetime(index),
+                    day_register.end_datetime(index),
+                    day_register.values[index] * _factor(day_register),
+                    actual * _factor(fine),
+                ),
+            )
+
+    for obis_code, read_register in (
+        meter_reads.registers if meter_reads else {}
+    ).items():
+        day_register = days.registers.get(obis_code) if days else None
+        if day_register is None:
+            continue
+
+        for index in range(1, len(read_register)):
+            if not (
+                read_register.quality[index - 1] & QUALITY_FLAG_VALIDATED
+                and read_register.quality[index] & QUALITY_FLAG_VALIDATED
+            ):
+                continue
+            start, end = read_register.ends[index - 1], read_register.ends[index]
+            actual = _validated_sum(day_register, start, end)
+            if actual is None:
+                continue
+            _check(
+                mismatches,
+                Mismatch(
+                    CHECK_METER_READ_DAYS,
+                    obis_code,
+                    read_register.end_datetime(index - 1),
+                    read_register.end_datetime(index),
+                    (read_register.values[index] - read_register.values[index - 1])
+                    * _factor(read_register),
+                    actual * _factor(day_register),
+                ),
+            )
+
+    for mismatch in mismatches:
+        _LOGGER.debug(
+            "%s of %s: %s from %s to %s is %.3f kWh, parts sum to %.3f kWh",
+            mismatch.check,
+            quarter_hours.meter_point,
+            mismatch.obis_code,
+            mismatch.start,
+            mismatch.end,
+            mismatch.expected,
+            mismatch.actual,
+        )
+
+    return mismatches
+
+
+def _factor(register: IntervalSeries) -> float:
+    """Get the factor converting the values of a register to kWh."""
+    return _UNIT_FACTORS.get(register.einheit, 1.0)
+
+
+def _validated_sum(
+    register: IntervalSeries, start: int, end: int, step: int | None = None
+) -> float | None:
+    """Sum the validated intervals that exactly cover a span.
+
+    Args:
+        register: Finer register
+        start: Start of the span (epoch)
+        end: End of the span (epoch)
+        step: Expected interval length in seconds (optional)
+
+    Returns:
+        Sum, or None if the span is not completely covered by validated
+        intervals
+
+    """
+    first = bisect_left(register.starts, start)
+    position = start
+    total = 0.0
+    index = first
+    while index < len(register) and register.ends[index] <= end:
+        if (
+            register.starts[index] != position
+            or not register.quality[index] & QUALITY_FLAG_VALIDATED
+            or (step and register.ends[index] - position != step)
+        ):
+            return None
+        total += register.values[index]
+        position = register.ends[index]
+        index += 1
+
+    return total if index > first and position == end else None
+
+
+def _check(mismatches: list[Mismatch], mismatch: Mismatch) -> None:
+    """Record a mismatch if its values differ by more than the tolerance."""
+    if abs(mismatch.expected - mismatch.actual) > RECONCILE_TOLERANCE:
+        mismatches.append(
+            mismatch._replace(
+                expected=round(mismatch.expected, 3), actual=round(mismatch.actual, 3)
+            )
+        )
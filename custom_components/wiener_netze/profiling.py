@@ -0,0 +1,249 @@
+"""Refresh cycle profiling for Wiener Netze Smart Meter."""
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import cProfile
+from datetime import datetime
+import io
+import logging
+import pstats
+import time
+from typing import Any
+
+from .const import PROFILE_CYCLES, PROFILE_TOP_FUNCTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Phases of a refresh cycle, in the order they happen
+PHASE_TOKEN = "token"  # Waiting for a valid access token
+PHASE_THROTTLE = "throttle"  # Waiting for the rate limiter
+PHASE_NETWORK = "network"  # Sending requests and receiving responses
+PHASE_DECODE = "decode"  # Decoding JSON responses
+PHASE_PROCESS = "process"  # Merging readings into the series
+PHASE_SAVE = "save"  # Scheduling cache writes
+PHASE_STATE_WRITE = "state_write"  # Updating entity states
+PHASES = (
+    PHASE_TOKEN,
+    PHASE_THROTTLE,
+    PHASE_NETWORK,
+    PHASE_DECODE,
+    PHASE_PROCESS,
+    PHASE_SAVE,
+    PHASE_STATE_WRITE,
+)
+
+# Phase times of the API request running in the current task
+_request_phases: ContextVar[dict[str, float] | None] = ContextVar(
+    "wiener_netze_request_phases", default=None
+)
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """Add time to a phase of the API request being profiled.
+
+    Called by the API client; does nothing outside a profiled request.
+
+    Args:
+        phase: Phase name
+        seconds: Time spent in the phase
+
+    """
+    phases = _request_phases.get()
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+class CycleProfile:
+    """Phase timings of a single refresh cycle.
+
+    Phase times are summed over all meter points and requests. Requests
+    run concurrently, so the sum of the phases can exceed the duration of
+    the cycle. A batch request is attributed to every meter point in it.
+    """
+
+    def __init__(self) -> None:
+        """Start the cycle."""
+        self.started_at = datetime.now()
+        self.duration: float | None = None
+        self.phases: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.meters: dict[str, dict[str, float]] = {}
+        self.error: str | None = None
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, phase: str, meter_id: str | None = None) -> Iterator[None]:
+        """Time a block of work.
+
+        Args:
+            phase: Phase name
+            meter_id: Meter point the work is done for (optional)
+
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(phase, time.perf_counter() - started, meter_id)
+
+    @contextmanager
+    def request(self, meter_ids: list[str]) -> Iterator[None]:
+        """Time an API request for one or more meter points.
+
+        The time the API client reports for token, throttle and decode
+        phases is taken out, the rest of the request counts as network
+        time.
+
+        Args:
+            meter_ids: Meter points the request is made for
+
+        """
+        phases: dict[str, float] = {}
+        token = _request_phases.set(phases)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            _request_phases.reset(token)
+            phases[PHASE_NETWORK] = max(
+                time.perf_counter() - started - sum(phases.values()), 0.0
+            )
+            for phase, seconds in phases.items():
+                self.phases[phase] += seconds
+                for meter_id in meter_ids:
+                    meter = self.meter_phases(meter_id)
+                    meter[phase] = meter.get(phase, 0.0) + seconds
+
+    def finish(self, error: BaseException | None = None) -> None:
+        """End the cycle.
+
+        Args:
+            error: Error the cycle failed with (optional)
+
+        """
+        self.duration = time.perf_counter() - self._started
+        self.error = None if error is None else str(error) or type(error).__name__
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the timings for diagnostics, in milliseconds."""
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": _ms(self.duration),
+            "phases_ms": {
+                phase: _ms(seconds) for phase, seconds in self.phases.items()
+            },
+            "meters_ms": {
+                meter_id: {phase: _ms(seconds) for phase, seconds in phases.items()}
+                for meter_id, phases in self.meters.items()
+            },
+            "error": self.error,
+        }
+
+    def _add(self, phase: str, seconds: float, meter_id: str | None) -> None:
+        """Add time to a phase of the cycle and of a meter point."""
+        self.phases[phase] += seconds
+        if meter_id is not None:
+            meter = self.meter_phases(meter_id)
+            meter[phase] = meter.get(phase, 0.0) + seconds
+
+    def meter_phases(self, meter_id: str) -> dict[str, float]:
+        """Get the phase times of a meter point."""
+        meter = self.meters.get(meter_id)
+        if meter is None:
+            meter = self.meters[meter_id] = {}
+        return meter
+
+
+class RefreshProfiler:
+    """Rolling window of refresh cycle timings.
+
+    Every refresh records a CycleProfile; the last PROFILE_CYCLES cycles
+    are kept. On demand a single refresh can be run under cProfile, which
+    also profiles whatever else the event loop runs during that refresh.
+    """
+
+    def __init__(self, size: int = PROFILE_CYCLES) -> None:
+        """Initialize the profiler.
+
+        Args:
+            size: Number of cycles kept
+
+        """
+        self.cycles: deque[CycleProfile] = deque(maxlen=size)
+        self.last_capture: str | None = None
+
+    def start_cycle(self) -> CycleProfile:
+        """Start recording a refresh cycle.
+
+        Returns:
+            Profile of the new cycle
+
+        """
+        profile = CycleProfile()
+        self.cycles.append(profile)
+        return profile
+
+    def record_state_write(self, seconds: float, meter_id: str | None = None) -> None:
+        """Add entity state write time to the last cycle.
+
+        Args:
+            seconds: Time spent notifying entities
+            meter_id: Meter point whose entity states were written (optional).
+                Its time is only added to the meter point, as it is part of
+                the time recorded for notifying all entities.
+
+        """
+        if not self.cycles:
+            return
+
+        profile = self.cycles[-1]
+        if meter_id is None:
+            profile.phases[PHASE_STATE_WRITE] += seconds
+        else:
+            phases = profile.meter_phases(meter_id)
+            phases[PHASE_STATE_WRITE] = phases.get(PHASE_STATE_WRITE, 0.0) + seconds
+
+    async def async_capture(
+        self,
+        target: Callable[[], Awaitable[Any]],
+        limit: int = PROFILE_TOP_FUNCTIONS,
+    ) -> str:
+        """Run a coroutine under cProfile.
+
+        Args:
+            target: Function returning the coroutine to profile
+            limit: Number of functions listed
+
+        Returns:
+            Functions with the highest cumulative time
+
+        Raises:
+            ValueError: Another profiler is active
+
+        """
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await target()
+        finally:
+            profile.disable()
+
+        output = io.StringIO()
+        stats = pstats.Stats(profile, stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        self.last_capture = output.getvalue()
+        _LOGGER.debug("Captured profile of a refresh cycle")
+
+        return self.last_capture
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the recorded cycles for diagnostics, oldest first."""
+        return {
+            "cycles": [profile.as_dict() for profile in self.cycles],
+            "last_capture": self.last_capture,
+        }
+
+
+def _ms(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 2)
@@ -0,0 +1,230 @@
+"""Adaptive polling for Wiener Netze Smart Meter."""
+from datetime import timedelta
+import logging
+import time
+from typing import Any
+
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    POLL_ARRIVAL_WINDOW,
+    POLL_MAX_INTERVAL,
+    POLL_SMOOTHING,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_BACKOFF_EXPONENT = 6
+
+
+def _smooth(average: float | None, sample: float) -> float:
+    """Add a sample to an exponential moving average."""
+    if average is None:
+        return sample
+    return average + POLL_SMOOTHING * (sample - average)
+
+
+class MeterSchedule:
+    """Observed publication pattern of a single meter point.
+
+    Readings are published in batches some time after the end of their
+    last interval. The schedule learns two averages from the polls that
+    saw new readings appear:
+
+    - lag: seconds between the end of the newest interval and the time it
+      was published
+    - period: seconds of readings added per publication
+
+    The next batch is expected at data_end + period + lag.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty schedule."""
+        self.data_end: float | None = None
+        self.lag: float | None = None
+        self.period: float | None = None
+        self.last_poll: float | None = None
+        self.overdue_polls = 0
+
+    @property
+    def expected_arrival(self) -> float | None:
+        """Get the expected publication time of the next batch (epoch)."""
+        if self.data_end is None or self.lag is None or self.period is None:
+            return None
+        return self.data_end + self.period + self.lag
+
+    def observe(self, data_end: float | None, now: float) -> bool:
+        """Record the result of a poll.
+
+        The publication time of new readings is only known to lie between
+        the previous and this poll; the middle of that window is used.
+
+        Args:
+            data_end: End of the newest interval (epoch), None if no
+                readings are known
+            now: Time of the poll (epoch)
+
+        Returns:
+            True if new readings appeared
+
+        """
+        last_poll, self.last_poll = self.last_poll, now
+
+        if data_end is None or (
+            self.data_end is not None and data_end <= self.data_end
+        ):
+            expected = self.expected_arrival
+            if expected is not None and now > expected + POLL_ARRIVAL_WINDOW * 60:
+                self.overdue_polls += 1
+            return False
+
+        previous_end, self.data_end = self.data_end, data_end
+        self.overdue_polls = 0
+
+        if previous_end is None or last_poll is None:
+            # First readings or first poll after a restart: when they were
+            # published is unknown
+            return True
+
+        published = max((last_poll + now) / 2, data_end)
+        self.lag = _smooth(self.lag, published - data_end)
+        self.period = _smooth(self.period, data_end - previous_end)
+
+        return True
+
+    def interval(self, now: float) -> float:
+        """Get the seconds until this meter point should be polled again.
+
+        Args:
+            now: Current time (epoch)
+
+        Returns:
+            Seconds between DEFAULT_SCAN_INTERVAL and POLL_MAX_INTERVAL
+
+        """
+        min_interval = DEFAULT_SCAN_INTERVAL * 60.0
+        max_interval = POLL_MAX_INTERVAL * 3600.0
+        window = POLL_ARRIVAL_WINDOW * 60.0
+
+        expected = self.expected_arrival
+        if expected is None:
+            # Still learning
+            return min_interval
+
+        if now < expected - window:
+            # Sleep until the arrival window opens
+            return min(max(expected - window - now, min_interval), max_interval)
+
+        if now <= expected + window:
+            return min_interval
+
+        # Overdue, back off while nothing new shows up
+        exponent = min(self.overdue_polls, MAX_BACKOFF_EXPONENT)
+        return min(min_interval * 2**exponent, max_interval)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the learned pattern for storage."""
+        return {"data_end": self.data_end, "lag": self.lag, "period": self.period}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MeterSchedule":
+        """Restore a learned pattern from storage.
+
+        Args:
+            data: Stored pattern
+
+        Returns:
+            Restored schedule
+
+        """
+        schedule = cls()
+        schedule.data_end = data.get("data_end")
+        schedule.lag = data.get("lag")
+        schedule.period = data.get("period")
+        return schedule
+
+
+class PollScheduler:
+    """Poll interval planning for the meter points of a coordinator.
+
+    Each meter point is polled every DEFAULT_SCAN_INTERVAL while its
+    publication pattern is unknown and during the POLL_ARRIVAL_WINDOW
+    around the expected arrival of its next batch. Before that window the
+    coordinator sleeps (at most POLL_MAX_INTERVAL); after it, the interval
+    doubles with every poll that finds nothing new. The coordinator
+    follows the meter point that is due first.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self.meters: dict[str, MeterSchedule] = {}
+
+    def restore(self, meter_id: str, data: dict[str, Any] | None) -> None:
+        """Restore the learned pattern of a meter point.
+
+        Args:
+            meter_id: Meter point number
+            data: Stored pattern (optional)
+
+        """
+        if data and meter_id not in self.meters:
+            self.meters[meter_id] = MeterSchedule.from_dict(data)
+
+    def remove(self, meter_id: str) -> None:
+        """Forget a meter point.
+
+        Args:
+            meter_id: Meter point number
+
+        """
+        self.meters.pop(meter_id, None)
+
+    def observe(
+        self, meter_id: str, data_end: float | None, now: float | None = None
+    ) -> bool:
+        """Record the result of a poll of a meter point.
+
+        Args:
+            meter_id: Meter point number
+            data_end: End of the newest interval (epoch), None if no
+                readings are known
+            now: Time of the poll (epoch, default: now)
+
+        Returns:
+            True if new readings appeared
+
+        """
+        schedule = self.meters.get(meter_id)
+        if schedule is None:
+            schedule = self.meters[meter_id] = MeterSchedule()
+        return schedule.observe(data_end, time.time() if now is None else now)
+
+    def next_interval(self, now: float | None = None) -> timedelta:
+        """Get the time until the next poll.
+
+        Args:
+            now: Current time (epoch, default: now)
+
+        Returns:
+            Interval of the meter point that is due first
+
+        """
+        if now is None:
+            now = time.time()
+
+        seconds = min(
+            (schedule.interval(now) for schedule in self.meters.values()),
+            default=DEFAULT_SCAN_INTERVAL * 60.0,
+        )
+        _LOGGER.debug("Next poll in %.0f seconds", seconds)
+        return timedelta(seconds=seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the state of all meter points for diagnostics."""
+        return {
+            meter_id: {
+                **schedule.as_dict(),
+                "expected_arrival": schedule.expected_arrival,
+                "overdue_polls": schedule.overdue_polls,
+            }
+            for meter_id, schedule in self.meters.items()
+        }
@@ -1 +1,284 @@
 """Sensor platform for Wiener Netze Smart Meter."""
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfPower,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .api import MeterPoint, WienerNetzeApiClient
+from .const import DOMAIN
+from .coordinator import WienerNetzeDataCoordinator
+from .entity import WienerNetzeMeterEntity
+from .values import MeterValues
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _latency_ms(seconds: float | None) -> float | None:
+    """Convert a latency to milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def _quota_usage(client: WienerNetzeApiClient) -> float:
+    """Get the share of the request rate budget used in the last minute."""
+    budget = client.rate_limiter.rate * 60
+    return round(client.metrics.requests_last_minute / budget * 100, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class WienerNetzeApiSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the API client metrics."""
+
+    value_fn: Callable[[WienerNetzeApiClient], StateType]
+
+
+API_SENSORS: tuple[WienerNetzeApiSensorEntityDescription, ...] = (
+    WienerNetzeApiSensorEntityDescription(
+        key="api_calls",
+        translation_key="api_calls",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.total("calls"),
+    ),
+    WienerNetzeApiSensorEntityDescription(
+        key="api_errors",
+        translation_key="api_errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.total("errors"),
+    ),
+    WienerNetzeApiSensorEntityDescription(
+        key="api_retries",
+        translation_key="api_retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.total("retries"),
+    ),
+    WienerNetzeApiSensorEntityDescription(
+        key="api_rate_limited",
+        translation_key="api_rate_limited",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.total("rate_limited"),
+    ),
+    WienerNetzeApiSensorEntityDescription(
+        key="api_latency_mean",
+        translation_key="api_latency_mean",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda client: _latency_ms(client.metrics.latency.mean),
+    ),
+    WienerNetzeApiSensorEntityDescription(
+        key="api_latency_p95",
+        translation_key="api_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda client: _latency_ms(client.metrics.latency.percentile(95)),
+    ),
+    WienerNetzeApiSensorEntityDescription(
+        key="api_bytes_received",
+        translation_key="api_bytes_received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.KILOBYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.total("bytes_received"),
+    ),
+    WienerNetzeApiSensorEntityDescription(
+        key="api_quota_usage",
+        translation_key="api_quota_usage",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_quota_usage,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class WienerNetzeMeterSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the derived values of a meter point."""
+
+    value_fn: Callable[[MeterValues], StateType | datetime]
+
+
+METER_SENSORS: tuple[WienerNetzeMeterSensorEntityDescription, ...] = (
+    WienerNetzeMeterSensorEntityDescription(
+        key="energy_today",
+        translation_key="energy_today",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda values: values.energy_today,
+    ),
+    WienerNetzeMeterSensorEntityDescription(
+        key="energy_yesterday",
+        translation_key="energy_yesterday",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        value_fn=lambda values: values.energy_yesterday,
+    ),
+    WienerNetzeMeterSensorEntityDescription(
+        key="last_interval",
+        translation_key="last_interval",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        value_fn=lambda values: values.last_interval,
+    ),
+    WienerNetzeMeterSensorEntityDescription(
+        key="last_interval_start",
+        translation_key="last_interval_start",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda values: values.last_interval_start,
+    ),
+    WienerNetzeMeterSensorEntityDescription(
+        key="current_power",
+        translation_key="current_power",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda values: values.current_power,
+    ),
+    WienerNetzeMeterSensorEntityDescription(
+        key="peak_power_today",
+        translation_key="peak_power_today",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.KILO_WATT,
+        value_fn=lambda values: values.peak_power_today,
+    ),
+    WienerNetzeMeterSensorEntityDescription(
+        key="meter_reading",
+        translation_key="meter_reading",
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda values: values.meter_reading,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Wiener Netze sensors from a config entry.
+
+    Args:
+        hass: Home Assistant instance
+        entry: Config entry
+        async_add_entities: Callback to add entities
+
+    """
+    coordinator: WienerNetzeDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_entities(
+        WienerNetzeApiSensor(coordinator, entry, description)
+        for description in API_SENSORS
+    )
+    async_add_entities(
+        WienerNetzeMeterSensor(coordinator, meter_point, description)
+        for meter_point in coordinator.entry_meter_points(entry.entry_id)
+        for description in METER_SENSORS
+    )
+
+
+class WienerNetzeApiSensor(CoordinatorEntity[WienerNetzeDataCoordinator], SensorEntity):
+    """Diagnostic sensor of the API client metrics.
+
+    Config entries that share a coordinator share its API client, so their
+    API sensors show the same values. The values are updated with every
+    coordinator refresh.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: WienerNetzeApiSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: WienerNetzeDataCoordinator,
+        entry: ConfigEntry,
+        description: WienerNetzeApiSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor.
+
+        Args:
+            coordinator: Data coordinator
+            entry: Config entry
+            description: Sensor description
+
+        """
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Wiener Netze",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are also of interest when updates fail."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the metric."""
+        return self.entity_description.value_fn(self.coordinator.api_client)
+
+
+class WienerNetzeMeterSensor(WienerNetzeMeterEntity, SensorEntity):
+    """Sensor of a derived value of a meter point.
+
+    Values come from the shared MeterValues of the coordinator, which
+    computes each value once per change of the meter point.
+    """
+
+    entity_description: WienerNetzeMeterSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: WienerNetzeDataCoordinator,
+        meter_point: MeterPoint,
+        description: WienerNetzeMeterSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor.
+
+        Args:
+            coordinator: Data coordinator
+            meter_point: Meter point data
+            description: Sensor description
+
+        """
+        super().__init__(coordinator, meter_point)
+        self.entity_description = description
+        self._attr_unique_id = f"{self.meter_id}_{description.key}"
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the derived value."""
+        values = self.coordinator.get_values(self.meter_id)
+        if values is None:
+            return None
+        return self.entity_description.value_fn(values)
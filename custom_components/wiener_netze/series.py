@@ -0,0 +1,339 @@
+"""In-memory consumption series for Wiener Netze Smart Meter."""
+from collections import deque
+from datetime import date, datetime, timedelta
+import logging
+from typing import Any
+
+from .api import ConsumptionData, ConsumptionReading, parse_consumption_epochs
+from .const import CHANGE_LOG_SIZE, MAX_REVISION_DAYS, SERIES_RETENTION_DAYS
+from .timeseries import IntervalSeries, quality_flag
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConsumptionSeries:
+    """Merged consumption readings of a single meter point.
+
+    Readings are kept per Zählwerk (OBIS code) in columnar interval series.
+    A watermark marks the end of the last finalized (validated) interval
+    before the first open or missing one: readings up to the watermark are
+    never touched again, so each refresh only merges new or revised
+    intervals.
+
+    The series holds retention_days of data. The consumption data
+    view only contains the latest day plus any earlier days that still
+    contain intervals open for revision (at most MAX_REVISION_DAYS back).
+
+    Every merge that changes readings increments the revision and logs the
+    changed local time range per Zählwerk, so derived data (see
+    ConsumptionAggregator) only has to recompute what was touched.
+    """
+
+    def __init__(
+        self,
+        meter_point: str,
+        retention_days: int | None = SERIES_RETENTION_DAYS,
+    ) -> None:
+        """Initialize the series.
+
+        Args:
+            meter_point: Meter point number (Zählpunktnummer)
+            retention_days: Days of readings to keep (None keeps everything)
+
+        """
+        self.meter_point = meter_point
+        self.retention_days = retention_days
+        self.watermark: datetime | None = None
+        self._open_from: datetime | None = None
+        self.registers: dict[str, IntervalSeries] = {}
+        self.revision = 0
+        self._changes: deque[tuple[int, str, int, int]] = deque(maxlen=CHANGE_LOG_SIZE)
+
+    @property
+    def is_empty(self) -> bool:
+        """Return True if the series holds no readings."""
+        return not any(len(register) for register in self.registers.values())
+
+    def merge(self, consumption_data: ConsumptionData, force: bool = False) -> int:
+        """Merge a consumption data response into the series.
+
+        Args:
+            consumption_data: Consumption data response
+            force: Also merge readings at or before the watermark (backfill)
+
+        Returns:
+            Number of new or changed intervals
+
+        """
+        changed = 0
+        watermark = None
+        if self.watermark is not None and not force:
+            watermark = self.watermark.timestamp()
+
+        for zaehlwerk in consumption_data.get("zaehlwerke", []):
+            obis_code = zaehlwerk.get("obisCode", "")
+            register = self.registers.get(obis_code)
+            if register is None:
+                register = self.registers[obis_code] = IntervalSeries(
+                    obis_code, zaehlwerk.get("einheit", "")
+                )
+
+            readings = zaehlwerk.get("messwerte", [])
+            rows = [
+                (
+                    start,
+                    end,
+                    start_offset,
+                    end_offset,
+                    float(reading["messwert"]),
+                    quality_flag(reading["qualitaet"]),
+                )
+                for reading, (start, end, start_offset, end_offset) in zip(
+                    readings, parse_consumption_epochs(readings)
+                )
+                # Finalized intervals are never revised
+                if watermark is None or end > watermark
+            ]
+            register_changed = register.upsert_many(rows)
+            if register_changed:
+                self._changes.append(
+                    (
+                        self.revision + 1,
+                        obis_code,
+                        min(row[0] + row[2] * 60 for row in rows),
+                        max(row[1] + row[3] * 60 for row in rows),
+                    )
+                )
+            changed += register_changed
+
+        if changed:
+            self.revision += 1
+            self._update_watermark()
+            self._prune()
+
+        _LOGGER.debug(
+            "Merged %d new or changed interval(s) for %s", changed, self.meter_point
+        )
+
+        return changed
+
+    def merge_series(self, other: "ConsumptionSeries") -> int:
+        """Merge all readings of another series of the meter point.
+
+        Readings at or before the watermark are merged too, as the other
+        series might fill gaps (e.g. backfilled history).
+
+        Args:
+            other: Series to merge
+
+        Returns:
+            Number of new or changed intervals
+
+        """
+        return self.merge(other.as_consumption_data(complete=True), force=True)
+
+    def changes_since(self, revision: int) -> list[tuple[str, int, int]] | None:
+        """Get the time ranges changed after a revision.
+
+        Args:
+            revision: Revision the caller has seen
+
+        Returns:
+            List of (OBIS code, local start, local end) with local wall
+            clock times as epoch seconds, or None if the log does not reach
+            back that far and everything has to be considered changed
+
+        """
+        if revision == self.revision:
+            return []
+        if revision > self.revision or not self._changes:
+            return None
+        if self._changes[0][0] > revision + 1:
+            return None
+        return [
+            (obis_code, start, end)
+            for change, obis_code, start, end in self._changes
+            if change > revision
+        ]
+
+    def fetch_start(self, today: date) -> date:
+        """Get the first day that has to be requested from the API.
+
+        Args:
+            today: Current date
+
+        Returns:
+            Start date for the next request. Today if everything before is
+            finalized, otherwise the day of the first open interval (at most
+            MAX_REVISION_DAYS back).
+
+        """
+        open_from = self._open_from or self.watermark
+        if open_from is None:
+            return today
+
+        earliest = today - timedelta(days=MAX_REVISION_DAYS)
+        return min(today, max(earliest, open_from.date()))
+
+    def latest_day(self) -> date | None:
+        """Get the latest local day with readings."""
+        days = [
+            register.local_day(len(register) - 1)
+            for register in self.registers.values()
+            if len(register)
+        ]
+        return max(days) if days else None
+
+    def latest_end(self) -> datetime | None:
+        """Get the end of the most recent interval of any Zählwerk."""
+        ends = [
+            register.end_datetime(len(register) - 1)
+            for register in self.registers.values()
+            if len(register)
+        ]
+        return max(ends) if ends else None
+
+    def latest_reading(self) -> ConsumptionReading | None:
+        """Get the most recent reading of the first Zählwerk."""
+        for register in self.registers.values():
+            return register.reading(len(register) - 1) if len(register) else None
+        return None
+
+    def total(self, day: date) -> float:
+        """Get the total of all Zählwerke for a local day.
+
+        Args:
+            day: Local day
+
+        Returns:
+            Sum of the readings
+
+        """
+        return sum(
+            register.total(*register.day_range(day))
+            for register in self.registers.values()
+        )
+
+    def as_consumption_data(self, complete: bool = False) -> ConsumptionData:
+        """Get the latest and still revisable days as consumption data.
+
+        Args:
+            complete: Get all readings of the series instead
+
+        Returns:
+            Consumption data with readings sorted by start timestamp
+
+        """
+        view_from = None if complete else self._view_start()
+
+        zaehlwerke: list[Any] = []
+        for obis_code, register in self.registers.items():
+            first = register.day_start_index(view_from) if view_from else 0
+            zaehlwerke.append(
+                {
+                    "obisCode": obis_code,
+                    "einheit": register.einheit,
+                    "messwerte": register.readings(first),
+                }
+            )
+
+        return {"zaehlpunkt": self.meter_point, "zaehlwerke": zaehlwerke}
+
+    def _view_start(self) -> date | None:
+        """Get the first day of the consumption data view."""
+        latest_day = self.latest_day()
+        if latest_day is None:
+            return None
+
+        view_from = latest_day
+        if self._open_from is not None:
+            view_from = min(view_from, self._open_from.date())
+
+        return max(view_from, latest_day - timedelta(days=MAX_REVISION_DAYS))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the series."""
+        return {
+            "registers": [register.as_dict() for register in self.registers.values()]
+        }
+
+    @classmethod
+    def from_dict(
+        cls,
+        meter_point: str,
+        data: dict[str, Any],
+        retention_days: int | None = SERIES_RETENTION_DAYS,
+    ) -> "ConsumptionSeries":
+        """Restore a series serialized with as_dict.
+
+        Args:
+            meter_point: Meter point number (Zählpunktnummer)
+            data: Serialized series
+            retention_days: Days of readings to keep (None keeps everything)
+
+        Returns:
+            Restored series
+
+        Raises:
+            ValueError: If the data is invalid
+
+        """
+        series = cls(meter_point, retention_days)
+        for register_data in data.get("registers", []):
+            register = IntervalSeries.from_dict(register_data)
+            series.registers[register.obis_code] = register
+
+        series._update_watermark()  # pylint: disable=protected-access
+        return series
+
+    def _update_watermark(self) -> None:
+        """Recalculate the watermark and the first open interval."""
+        watermark: datetime | None = None
+        open_from: datetime | None = None
+
+        for register in self.registers.values():
+            if not len(register):
+                continue
+
+            index = register.first_open_index()
+            if index < len(register):
+                start = register.start_datetime(index)
+                if open_from is None or start < open_from:
+                    open_from = start
+
+            # Missing intervals may still be delivered, so the prefix also
+            # ends before the first gap
+            index = min(index, register.first_gap_index())
+
+            # End of the validated prefix, or the start of the first open
+            # interval if nothing is final yet in this register
+            if index > 0:
+                register_end = register.end_datetime(index - 1)
+            else:
+                register_end = register.start_datetime(0)
+
+            if watermark is None or register_end < watermark:
+                watermark = register_end
+
+        # Never move the watermark backwards
+        if self.watermark is not None and (
+            watermark is None or watermark < self.watermark
+        ):
+            watermark = self.watermark
+
+        self.watermark = watermark
+        self._open_from = open_from
+
+    def _prune(self) -> None:
+        """Drop days outside the retention window."""
+        latest_day = self.latest_day()
+        if latest_day is None or self.retention_days is None:
+            return
+
+        keep_from = latest_day - timedelta(days=self.retention_days)
+        for obis_code, register in self.registers.items():
+            index = register.day_start_index(keep_from)
+            if index > 0:
+                register.drop_before(index)
+                midnight = (keep_from - date(1970, 1, 1)).days * 86400
+                self._changes.append((self.revision, obis_code, 0, midnight))
@@ -0,0 +1,152 @@
+"""Services for Wiener Netze Smart Meter."""
+from datetime import date, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .api import WienerNetzeApiError
+from .backfill import WienerNetzeBackfill
+from .const import (
+    DOMAIN,
+    GRANULARITY_DAY,
+    GRANULARITY_METER_READ,
+    GRANULARITY_QUARTER_HOUR,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import WienerNetzeDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_BACKFILL = "backfill"
+SERVICE_PROFILE = "profile"
+
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_METER_POINT = "meter_point"
+ATTR_GRANULARITY = "granularity"
+ATTR_CAPTURE = "capture"
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_METER_POINT): cv.string,
+        vol.Optional(ATTR_GRANULARITY, default=GRANULARITY_QUARTER_HOUR): vol.In(
+            [GRANULARITY_QUARTER_HOUR, GRANULARITY_DAY, GRANULARITY_METER_READ]
+        ),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema({vol.Optional(ATTR_CAPTURE, default=False): cv.boolean})
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services.
+
+    Args:
+        hass: Home Assistant instance
+
+    """
+
+    async def async_handle_backfill(call: ServiceCall) -> None:
+        """Start a backfill for the matching meter points."""
+        date_from: date = call.data[ATTR_START_DATE]
+        date_to: date = call.data.get(ATTR_END_DATE, date.today() - timedelta(days=1))
+        meter_point: str | None = call.data.get(ATTR_METER_POINT)
+        granularity: str = call.data[ATTR_GRANULARITY]
+
+        if date_from > date_to:
+            raise ServiceValidationError("Start date must not be after end date")
+
+        started = False
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items():
+            # Coordinators are shared, each entry backfills its own meters
+            backfill = coordinator.backfills.get(entry_id)
+            meter_ids = [
+                meter["zaehlpunktnummer"]
+                for meter in coordinator.entry_meter_points(entry_id)
+                if meter_point in (None, meter["zaehlpunktnummer"])
+            ]
+            if not meter_ids or backfill is None:
+                continue
+
+            coordinator.entries[entry_id].async_create_background_task(
+                hass,
+                _async_run_backfill(
+                    coordinator, backfill, meter_ids, date_from, date_to, granularity
+                ),
+                f"{DOMAIN} backfill",
+            )
+            started = True
+
+        if not started:
+            raise ServiceValidationError(
+                f"No configured meter point matches {meter_point}"
+                if meter_point
+                else "No configured meter points"
+            )
+
+    async def async_handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Return the refresh timings, optionally profiling a new refresh."""
+        coordinators = {
+            coordinator.config_entry.entry_id: coordinator
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+        }
+
+        response: dict[str, Any] = {}
+        for entry_id, coordinator in coordinators.items():
+            if call.data[ATTR_CAPTURE]:
+                try:
+                    await coordinator.profiler.async_capture(coordinator.async_refresh)
+                except ValueError as err:
+                    raise HomeAssistantError(f"Cannot profile refresh: {err}") from err
+
+            response[entry_id] = coordinator.profiler.as_dict()
+
+        return response
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, async_handle_backfill, schema=BACKFILL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def _async_run_backfill(
+    coordinator: "WienerNetzeDataCoordinator",
+    backfill: WienerNetzeBackfill,
+    meter_ids: list[str],
+    date_from: date,
+    date_to: date,
+    granularity: str,
+) -> None:
+    """Run a backfill in the background, log its outcome and apply it."""
+    try:
+        changed = await backfill.async_backfill(
+            meter_ids, date_from, date_to, granularity
+        )
+    except WienerNetzeApiError as err:
+        _LOGGER.error("Backfill incomplete, run it again to resume: %s", err)
+    else:
+        _LOGGER.info("Backfill complete: %d interval(s) imported", changed)
+
+    # Completed chunks are kept, also when others failed
+    await coordinator.async_apply_backfill(backfill, meter_ids, date_from, granularity)
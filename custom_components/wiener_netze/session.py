@@ -0,0 +1,104 @@
+"""Dedicated HTTP session for the Wiener Netze API."""
+import logging
+from ssl import SSLContext
+
+from aiohttp import ClientSession, TCPConnector, hdrs
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import (
+    ENABLE_CLEANUP_CLOSED,
+    SERVER_SOFTWARE,
+)
+from homeassistant.util import ssl as ssl_util
+
+from .const import BACKFILL_MAX_CONCURRENT, DATA_API_SESSION, MAX_CONCURRENT_REQUESTS
+
+_LOGGER = logging.getLogger(__name__)
+
+# All requests go to api.wstw.at: allow as many connections as requests can
+# run concurrently (coordinator, backfill and a token request)
+CONNECTION_LIMIT_PER_HOST = MAX_CONCURRENT_REQUESTS + BACKFILL_MAX_CONCURRENT + 1
+KEEPALIVE_TIMEOUT = 60  # seconds an idle connection is kept open
+DNS_CACHE_TTL = 300  # seconds a resolved address is reused
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+def create_api_session(ssl_context: SSLContext | bool | None = None) -> ClientSession:
+    """Create a session tuned for the single API host.
+
+    Connections are kept alive and reused across requests, resolved
+    addresses are cached and responses are requested compressed. The
+    caller must close the session.
+
+    Args:
+        ssl_context: SSL context for HTTPS connections (optional, default:
+            aiohttp default context)
+
+    Returns:
+        New client session
+
+    """
+    connector = TCPConnector(
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        enable_cleanup_closed=ENABLE_CLEANUP_CLOSED,
+        ssl=ssl_context,
+    )
+
+    return ClientSession(
+        connector=connector,
+        headers={
+            hdrs.USER_AGENT: SERVER_SOFTWARE,
+            hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING,
+        },
+    )
+
+
+@callback
+def async_get_api_session(hass: HomeAssistant) -> ClientSession:
+    """Get the dedicated API session, created on first use.
+
+    The session is shared by all config entries and closed when Home
+    Assistant shuts down.
+
+    Args:
+        hass: Home Assistant instance
+
+    Returns:
+        Dedicated client session
+
+    """
+    session: ClientSession | None = hass.data.get(DATA_API_SESSION)
+    if session is not None and not session.closed:
+        return session
+
+    session = hass.data[DATA_API_SESSION] = create_api_session(
+        ssl_util.get_default_context()
+    )
+    _LOGGER.debug(
+        "Created dedicated API session (%d connections, keep-alive %ds)",
+        CONNECTION_LIMIT_PER_HOST,
+        KEEPALIVE_TIMEOUT,
+    )
+
+    async def _async_close_session(event: Event) -> None:
+        """Close the dedicated session."""
+        await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+
+    return session
+
+
+async def async_close_api_session(hass: HomeAssistant) -> None:
+    """Close the dedicated API session if it was created.
+
+    Args:
+        hass: Home Assistant instance
+
+    """
+    session: ClientSession | None = hass.data.pop(DATA_API_SESSION, None)
+    if session is not None:
+        await session.close()
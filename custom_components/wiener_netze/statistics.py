@@ -0,0 +1,343 @@
+"""Long-term statistics import for Wiener Netze Smart Meter."""
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+import logging
+import re
+from typing import Any
+
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    MAX_REVISION_DAYS,
+    OBIS_CONSUMPTION,
+    OBIS_FEED_IN,
+    STATISTICS_BATCH_SIZE,
+)
+from .series import ConsumptionSeries
+from .timeseries import IntervalSeries
+
+_LOGGER = logging.getLogger(__name__)
+
+_HOUR = 3600
+
+_UNITS = {"kWh": UnitOfEnergy.KILO_WATT_HOUR, "Wh": UnitOfEnergy.WATT_HOUR}
+_NAMES = {OBIS_CONSUMPTION: "consumption", OBIS_FEED_IN: "feed-in"}
+
+
+def statistic_id(meter_id: str, obis_code: str) -> str:
+    """Get the external statistic ID of a Zählwerk.
+
+    Args:
+        meter_id: Meter point number
+        obis_code: OBIS code of the Zählwerk
+
+    Returns:
+        Statistic ID, e.g. wiener_netze:at0010000000000000001000000000001_1_1_1_8_0
+
+    """
+    object_id = re.sub(r"[^a-z0-9]+", "_", f"{meter_id}_{obis_code}".lower())
+    return f"{DOMAIN}:{object_id.strip('_')}"
+
+
+def importable_end(register: IntervalSeries, cutoff: float) -> int | None:
+    """Get the end of the readings of a register that will not change anymore.
+
+    Validated readings are final. Estimated and missing readings older than
+    the revision window are final too, as they are never requested again.
+    Within the window, the range ends at the first missing reading, which
+    may still be delivered.
+
+    Args:
+        register: Register of a consumption series
+        cutoff: Start of the revision window (epoch)
+
+    Returns:
+        Start of the first reading that may still change or be added, or the
+        end of the last reading if all are final (epoch). None if the
+        register is empty.
+
+    """
+    if not len(register):
+        return None
+
+    start = bisect_left(register.starts, cutoff)
+    index = register.first_open_index(start)
+    gap = register.first_gap_index(start)
+    if gap <= index and gap < len(register):
+        return register.ends[gap - 1]
+    if index == len(register):
+        return register.ends[-1]
+    return register.starts[index]
+
+
+def hourly_statistics(
+    register: IntervalSeries,
+    after: float | None,
+    until: float,
+    base_sum: float = 0.0,
+) -> list[dict[str, Any]]:
+    """Sum the readings of a register into hourly statistics.
+
+    Only complete hours are included. Hours without readings are left out,
+    the running sum continues across them, so until has to end before
+    missing readings that may still be delivered (see importable_end).
+    Readings are assigned to the hour they start in.
+
+    Args:
+        register: Register of a consumption series
+        after: Start of the last imported hour (epoch), None if nothing was
+            imported yet
+        until: End of the readings to include (epoch)
+        base_sum: Sum of the last imported hour
+
+    Returns:
+        Statistics rows (start, state, sum), oldest first
+
+    """
+    if not len(register):
+        return []
+
+    if after is None:
+        hour = register.starts[0] // _HOUR * _HOUR
+    else:
+        hour = int(after) // _HOUR * _HOUR + _HOUR
+
+    rows: list[dict[str, Any]] = []
+    total = base_sum
+    first = bisect_left(register.starts, hour)
+    while hour + _HOUR <= until and first < len(register):
+        last = bisect_left(register.starts, hour + _HOUR, first)
+        if last > first:
+            state = register.total(first, last)
+            total += state
+            rows.append(
+                {
+                    "start": datetime.fromtimestamp(hour, timezone.utc),
+                    "state": state,
+                    "sum": total,
+                }
+            )
+        hour += _HOUR
+        first = last
+
+    return rows
+
+
+def _restart(register: IntervalSeries, since: float) -> tuple[float, float] | None:
+    """Get the last imported hour and sum to import a register again from.
+
+    Args:
+        register: Register of a consumption series
+        since: Time to import again from (epoch)
+
+    Returns:
+        Start and sum of the hour before since, None to import everything
+
+    """
+    hour = int(since) // _HOUR * _HOUR
+    first = bisect_left(register.starts, hour)
+    if first == 0:
+        return None
+    return hour - _HOUR, register.total(0, first)
+
+
+def _has_missing_hours(register: IntervalSeries, since: float) -> bool:
+    """Check whether complete hours to import again have no readings.
+
+    Such hours would keep the sums of an earlier import, so the running sum
+    would jump, e.g. between a backfill and the readings held in memory.
+    Hours before the first reading of the register are not missing.
+
+    Args:
+        register: Register of a consumption series
+        since: Time to import again from (epoch)
+
+    Returns:
+        True if any complete hour between since and the last reading has no
+        readings
+
+    """
+    hour = int(since) // _HOUR * _HOUR
+    index = bisect_left(register.starts, hour)
+    if index == len(register):
+        return True
+
+    starts = register.starts
+    while (index := register.first_gap_index(index)) < len(register):
+        missing = max(starts[index - 1] // _HOUR * _HOUR + _HOUR, hour)
+        if missing < starts[index] // _HOUR * _HOUR:
+            return True
+        index += 1
+
+    return False
+
+
+class StatisticsImporter:
+    """Incremental import of hourly energy statistics into the recorder.
+
+    Every Zählwerk of a meter point becomes an external statistic with a
+    running sum, which the Energy dashboard can use. Each import continues
+    after the last imported hour and only adds hours whose readings are
+    final, so readings published late land at their real hour and already
+    imported hours are never written again. The last imported hour and sum
+    are kept in memory; the recorder is only queried once per statistic
+    after a restart. Backfilled history is imported again from its start,
+    see the since argument of async_import.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the importer.
+
+        Args:
+            hass: Home Assistant instance
+
+        """
+        self.hass = hass
+        self._last: dict[str, tuple[float, float] | None] = {}
+        self.imported = 0
+
+    async def async_import(
+        self,
+        meter_id: str,
+        series: ConsumptionSeries,
+        now: datetime | None = None,
+        since: datetime | None = None,
+    ) -> int:
+        """Import the new final hours of a meter point.
+
+        Args:
+            meter_id: Meter point number
+            series: Quarter hour series of the meter point
+            now: Current time (default: now)
+            since: Import all final hours again from this time on, with the
+                sum continuing from the readings of the series before it,
+                e.g. after a backfill (optional). Registers missing complete
+                hours after it are only imported incrementally, as those
+                hours would keep their old sums.
+
+        Returns:
+            Number of imported hours
+
+        """
+        if "recorder" not in self.hass.config.components:
+            return 0
+
+        if now is None:
+            now = datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=MAX_REVISION_DAYS)).timestamp()
+
+        imported = 0
+        for obis_code, register in series.registers.items():
+            until = importable_end(register, cutoff)
+            if until is None:
+                continue
+
+            stat_id = statistic_id(meter_id, obis_code)
+            if since is not None and _has_missing_hours(register, since.timestamp()):
+                _LOGGER.warning(
+                    "Not importing %s again from %s, hours after it are missing "
+                    "from the series",
+                    stat_id,
+                    since,
+                )
+            elif since is not None:
+                self._last[stat_id] = _restart(register, since.timestamp())
+            if stat_id not in self._last:
+                self._last[stat_id] = await self._async_last_statistic(stat_id)
+            last = self._last[stat_id]
+
+            rows = hourly_statistics(
+                register,
+                None if last is None else last[0],
+                until,
+                0.0 if last is None else last[1],
+            )
+            if not rows:
+                continue
+
+            metadata = {
+                "has_mean": False,
+                "has_sum": True,
+                "name": (
+                    f"{series.meter_point} " f"{_NAMES.get(obis_code, obis_code)}"
+                ),
+                "source": DOMAIN,
+                "statistic_id": stat_id,
+                "unit_of_measurement": _UNITS.get(register.einheit, register.einheit),
+            }
+            for index in range(0, len(rows), STATISTICS_BATCH_SIZE):
+                end = index + STATISTICS_BATCH_SIZE
+                self._async_add_statistics(metadata, rows[index:end])
+
+            self._last[stat_id] = (rows[-1]["start"].timestamp(), rows[-1]["sum"])
+            imported += len(rows)
+            _LOGGER.debug(
+                "Imported %d hour(s) of %s up to %s",
+                len(rows),
+                stat_id,
+                rows[-1]["start"],
+            )
+
+        self.imported += imported
+        return imported
+
+    def remove(self, meter_id: str) -> None:
+        """Forget the import state of a meter point.
+
+        The statistics stay in the recorder.
+
+        Args:
+            meter_id: Meter point number
+
+        """
+        prefix = f"{statistic_id(meter_id, '')}_"
+        self._last = {
+            stat_id: last
+            for stat_id, last in self._last.items()
+            if not stat_id.startswith(prefix)
+        }
+
+    async def _async_last_statistic(self, stat_id: str) -> tuple[float, float] | None:
+        """Get the start and sum of the last imported hour from the recorder."""
+        # The recorder is an after dependency, only import it when loaded
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder import get_instance
+
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder.statistics import (
+            get_last_statistics,
+        )
+
+        result = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, stat_id, True, {"sum"}
+        )
+        if not result.get(stat_id):
+            return None
+
+        row = result[stat_id][0]
+        return row["start"], row.get("sum") or 0.0
+
+    def _async_add_statistics(
+        self, metadata: dict[str, Any], rows: list[dict[str, Any]]
+    ) -> None:
+        """Queue a batch of statistics rows for insertion by the recorder."""
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        async_add_external_statistics(self.hass, metadata, rows)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Get import statistics."""
+        return {
+            "imported_hours": self.imported,
+            "last_imported": {
+                stat_id: datetime.fromtimestamp(last[0], timezone.utc).isoformat()
+                for stat_id, last in self._last.items()
+                if last is not None
+            },
+        }
@@ -0,0 +1,341 @@
+"""Persistent cache for Wiener Netze Smart Meter."""
+from datetime import date, datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import ConsumptionData
+from .const import CACHE_RETENTION_DAYS, DOMAIN
+from .series import ConsumptionSeries
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30  # seconds
+HISTORY_SAVE_DELAY = 10  # seconds
+
+
+class WienerNetzeStore:
+    """Persist consumption data and token state of a config entry.
+
+    Consumption data is kept per meter point, granularity and day:
+
+        {"consumption": {meter_id: {granularity: {"YYYY-MM-DD": zaehlwerke}}},
+         "token": {"access_token": str, "expires_at": ISO 8601},
+         "metadata_checked": ISO 8601,
+         "schedule": {meter_id: {"data_end": float, "lag": float,
+                                 "period": float}}}
+
+    Days older than CACHE_RETENTION_DAYS (relative to the latest stored day)
+    are dropped, unless a longer retention is given (day values and meter
+    readings).
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store.
+
+        Args:
+            hass: Home Assistant instance
+            entry_id: Config entry ID
+
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}", private=True
+        )
+        self._data: dict[str, Any] = {}
+
+    async def async_load(self) -> None:
+        """Load the cache from disk."""
+        data = await self._store.async_load()
+        self._data = data if isinstance(data, dict) else {}
+
+        _LOGGER.debug(
+            "Loaded cached data for %d meter point(s)",
+            len(self._data.get("consumption", {})),
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cache from disk."""
+        self._data = {}
+        await self._store.async_remove()
+
+    def get_token(self) -> tuple[str, datetime] | None:
+        """Get the stored access token.
+
+        Returns:
+            Tuple of (access_token, expires_at) or None if not stored
+
+        """
+        token = self._data.get("token")
+        if not token:
+            return None
+
+        try:
+            return token["access_token"], datetime.fromisoformat(token["expires_at"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def set_token(self, access_token: str, expires_at: datetime) -> None:
+        """Store the access token.
+
+        Args:
+            access_token: OAuth2 access token
+            expires_at: Token expiry
+
+        """
+        self._data["token"] = {
+            "access_token": access_token,
+            "expires_at": expires_at.isoformat(),
+        }
+
+    def get_metadata_checked(self) -> datetime | None:
+        """Get when the meter point metadata was last checked.
+
+        Returns:
+            Time of the last check or None if never checked
+
+        """
+        try:
+            return datetime.fromisoformat(self._data["metadata_checked"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def set_metadata_checked(self, checked: datetime) -> None:
+        """Store when the meter point metadata was last checked.
+
+        Args:
+            checked: Time of the check
+
+        """
+        self._data["metadata_checked"] = checked.isoformat()
+
+    def get_schedule(self, meter_id: str) -> dict[str, Any] | None:
+        """Get the learned publication pattern of a meter point.
+
+        Args:
+            meter_id: Meter point number
+
+        Returns:
+            Stored pattern or None if not stored
+
+        """
+        return self._data.get("schedule", {}).get(meter_id)
+
+    def set_schedule(self, meter_id: str, schedule: dict[str, Any]) -> None:
+        """Store the learned publication pattern of a meter point.
+
+        Args:
+            meter_id: Meter point number
+            schedule: Pattern to store
+
+        """
+        self._data.setdefault("schedule", {})[meter_id] = schedule
+
+    def get_consumption(self, meter_id: str, granularity: str) -> list[ConsumptionData]:
+        """Get stored consumption data of a meter point.
+
+        Args:
+            meter_id: Meter point number
+            granularity: Data granularity (QUARTER_HOUR, DAY, METER_READ)
+
+        Returns:
+            Consumption data per stored day, oldest first
+
+        """
+        days = self._data.get("consumption", {}).get(meter_id, {}).get(granularity, {})
+
+        return [
+            {"zaehlpunkt": meter_id, "zaehlwerke": days[day]} for day in sorted(days)
+        ]
+
+    def set_consumption(
+        self,
+        meter_id: str,
+        granularity: str,
+        consumption_data: ConsumptionData,
+        retention_days: int = CACHE_RETENTION_DAYS,
+    ) -> None:
+        """Store consumption data of a meter point.
+
+        Days contained in the consumption data replace the stored days.
+
+        Args:
+            meter_id: Meter point number
+            granularity: Data granularity (QUARTER_HOUR, DAY, METER_READ)
+            consumption_data: Consumption data to store
+            retention_days: Days to keep, relative to the latest stored day
+
+        """
+        new_days: dict[str, list[Any]] = {}
+        for zaehlwerk in consumption_data.get("zaehlwerke", []):
+            by_day: dict[str, list[Any]] = {}
+            for reading in zaehlwerk.get("messwerte", []):
+                by_day.setdefault(reading["zeitVon"][:10], []).append(reading)
+
+            for day, readings in by_day.items():
+                new_days.setdefault(day, []).append(
+                    {
+                        "obisCode": zaehlwerk.get("obisCode", ""),
+                        "einheit": zaehlwerk.get("einheit", ""),
+                        "messwerte": readings,
+                    }
+                )
+
+        if not new_days:
+            return
+
+        days = (
+            self._data.setdefault("consumption", {})
+            .setdefault(meter_id, {})
+            .setdefault(granularity, {})
+        )
+        days.update(new_days)
+
+        # Drop days outside the retention window
+        keep_from = (
+            date.fromisoformat(max(days)) - timedelta(days=retention_days)
+        ).isoformat()
+        for day in [day for day in days if day < keep_from]:
+            del days[day]
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule writing the cache to disk."""
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+
+class WienerNetzeHistoryStore:
+    """Persist backfilled history and its checkpoints of a config entry.
+
+    History is kept per meter point and granularity together with the
+    chunks that were completely fetched, so an interrupted backfill resumes
+    with the missing chunks only:
+
+        {"meters": {meter_id: {granularity: {"chunks": ["YYYY-MM-DD/YYYY-MM-DD"],
+                                             "series": ConsumptionSeries dict}}}}
+
+    The series are only serialized when the store is written.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store.
+
+        Args:
+            hass: Home Assistant instance
+            entry_id: Config entry ID
+
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.history", private=True
+        )
+        self._chunks: dict[tuple[str, str], set[str]] = {}
+        self._series: dict[tuple[str, str], ConsumptionSeries] = {}
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the history from disk (once)."""
+        if self._loaded:
+            return
+
+        data = await self._store.async_load()
+        meters = data.get("meters", {}) if isinstance(data, dict) else {}
+
+        for meter_id, granularities in meters.items():
+            for granularity, history in granularities.items():
+                key = (meter_id, granularity)
+                try:
+                    self._series[key] = ConsumptionSeries.from_dict(
+                        meter_id, history.get("series", {}), retention_days=None
+                    )
+                except (KeyError, TypeError, ValueError) as err:
+                    # Corrupt history is fetched again
+                    _LOGGER.warning(
+                        "Discarding stored history of %s (%s): %s",
+                        meter_id,
+                        granularity,
+                        err,
+                    )
+                    continue
+                self._chunks[key] = set(history.get("chunks", []))
+
+        self._loaded = True
+
+        _LOGGER.debug("Loaded history for %d meter point(s)", len(meters))
+
+    async def async_remove(self) -> None:
+        """Remove the history from disk."""
+        self._chunks = {}
+        self._series = {}
+        await self._store.async_remove()
+
+    def get_series(self, meter_id: str, granularity: str) -> ConsumptionSeries:
+        """Get the history of a meter point, creating it if needed.
+
+        Args:
+            meter_id: Meter point number
+            granularity: Data granularity (QUARTER_HOUR, DAY, METER_READ)
+
+        Returns:
+            History series without retention limit
+
+        """
+        key = (meter_id, granularity)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ConsumptionSeries(
+                meter_id, retention_days=None
+            )
+        return series
+
+    def is_chunk_done(
+        self, meter_id: str, granularity: str, chunk: tuple[date, date]
+    ) -> bool:
+        """Return True if a chunk was completely fetched before.
+
+        Args:
+            meter_id: Meter point number
+            granularity: Data granularity
+            chunk: First and last day of the chunk
+
+        """
+        return _chunk_key(chunk) in self._chunks.get((meter_id, granularity), ())
+
+    def set_chunk_done(
+        self, meter_id: str, granularity: str, chunk: tuple[date, date]
+    ) -> None:
+        """Record a completely fetched chunk.
+
+        Args:
+            meter_id: Meter point number
+            granularity: Data granularity
+            chunk: First and last day of the chunk
+
+        """
+        self._chunks.setdefault((meter_id, granularity), set()).add(_chunk_key(chunk))
+
+    @callback
+    def async_schedule_save(self, delay: float = HISTORY_SAVE_DELAY) -> None:
+        """Schedule writing the history to disk.
+
+        Args:
+            delay: Delay in seconds
+
+        """
+        self._store.async_delay_save(self._data_to_save, delay)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Serialize the history."""
+        meters: dict[str, Any] = {}
+        for (meter_id, granularity), series in self._series.items():
+            meters.setdefault(meter_id, {})[granularity] = {
+                "chunks": sorted(self._chunks.get((meter_id, granularity), ())),
+                "series": series.as_dict(),
+            }
+        return {"meters": meters}
+
+
+def _chunk_key(chunk: tuple[date, date]) -> str:
+    """Get the checkpoint key of a chunk."""
+    return f"{chunk[0].isoformat()}/{chunk[1].isoformat()}"
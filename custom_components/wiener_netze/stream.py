@@ -0,0 +1,230 @@
+"""Streaming JSON decoding for Wiener Netze Smart Meter responses."""
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+import codecs
+import json
+import re
+from typing import Any
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
+JsonLoads = Callable[[str], Any]
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# A run of comma separated flat objects (no nested objects or arrays), e.g.
+# consecutive Messwerte. Possessive quantifiers keep incomplete objects at
+# the end of the buffer from backtracking.
+_FLAT_OBJECT = r'\{(?:[^{}\[\]"]++|"(?:[^"\\]++|\\.)*+")*+\}'
+_FLAT_OBJECTS = re.compile(rf"{_FLAT_OBJECT}(?:[ \t\n\r]*,[ \t\n\r]*{_FLAT_OBJECT})*")
+
+
+class _JsonReader:
+    """Incremental reader over a stream of JSON text chunks."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]) -> None:
+        """Initialize the reader.
+
+        Args:
+            chunks: Raw response body chunks
+
+        """
+        self._chunks = aiter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Read the next chunk into the buffer.
+
+        Returns:
+            False if the stream is exhausted
+
+        """
+        if self.eof:
+            return False
+
+        try:
+            chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            self.eof = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            text = self._decoder.decode(chunk)
+
+        # Drop the consumed part of the buffer
+        consumed, self.pos = self.pos, 0
+        self.buffer = self.buffer[consumed:] + text
+        return True
+
+    async def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not await self.fill():
+                return ""
+
+    async def expect(self, chars: str) -> str:
+        """Consume one of the expected structural characters.
+
+        Args:
+            chars: Allowed characters
+
+        Returns:
+            Consumed character
+
+        Raises:
+            ValueError: If the next character is not expected
+
+        """
+        char = await self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r}, got {char!r}")
+        self.pos += 1
+        return char
+
+    async def value(self) -> Any:
+        """Decode the next complete JSON value.
+
+        Raises:
+            ValueError: If the value is not valid JSON
+
+        """
+        await self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not await self.fill():
+                    raise
+                continue
+
+            # A number at the end of the buffer might continue in the next chunk
+            if end == len(self.buffer) and await self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+    async def members(self) -> AsyncIterator[str]:
+        """Iterate over the keys of an object.
+
+        The caller has to consume the value of each key before resuming.
+        """
+        await self.expect("{")
+        if await self.peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = await self.value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected object key, got {key!r}")
+            await self.expect(":")
+            yield key
+            if await self.expect(",}") == "}":
+                return
+
+    async def batches(self, loads: JsonLoads) -> AsyncIterator[list[Any]]:
+        """Iterate over the elements of an array in batches.
+
+        Runs of flat objects already in the buffer are decoded with a single
+        loads call, other elements one at a time.
+
+        Args:
+            loads: JSON decode function
+
+        """
+        await self.expect("[")
+        if await self.peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            await self.peek()
+            match = _FLAT_OBJECTS.match(self.buffer, self.pos)
+            if match:
+                self.pos = match.end()
+                yield loads(f"[{match.group()}]")
+            else:
+                # Incomplete or nested element
+                yield [await self.value()]
+
+            if await self.expect(",]") == "]":
+                return
+
+
+async def iter_zaehlwerke(
+    chunks: AsyncIterable[bytes],
+    loads: JsonLoads | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Decode a consumption data response incrementally.
+
+    Yields the Zählwerke of the response with the Messwerte decoded so far,
+    so a single Zählwerk can be yielded several times with consecutive parts
+    of its readings. Other members of a Zählwerk (obisCode, einheit) are
+    included once they are known; readings preceding them are held back
+    until the Zählwerk is complete.
+
+    Args:
+        chunks: Raw response body chunks
+        loads: JSON decode function (orjson if installed, otherwise json)
+
+    Yields:
+        Zählwerk dicts with a part of the Messwerte
+
+    Raises:
+        ValueError: If the response is not valid JSON or not an object
+
+    """
+    loads = loads or json_loads
+    reader = _JsonReader(chunks)
+
+    async for key in reader.members():
+        if key != "zaehlwerke":
+            await reader.value()
+            continue
+
+        await reader.expect("[")
+        if await reader.peek() == "]":
+            reader.pos += 1
+            continue
+
+        while True:
+            async for zaehlwerk in _iter_zaehlwerk(reader, loads):
+                yield zaehlwerk
+            if await reader.expect(",]") == "]":
+                break
+
+    if await reader.peek():
+        raise ValueError("Unexpected data after the response object")
+
+
+async def _iter_zaehlwerk(
+    reader: _JsonReader, loads: JsonLoads
+) -> AsyncIterator[dict[str, Any]]:
+    """Decode a single Zählwerk incrementally."""
+    fields: dict[str, Any] = {}
+    pending: list[Any] = []
+    yielded = False
+
+    async for key in reader.members():
+        if key != "messwerte":
+            fields[key] = await reader.value()
+            continue
+
+        async for batch in reader.batches(loads):
+            if "obisCode" in fields:
+                yielded = True
+                yield {**fields, "messwerte": batch}
+            else:
+                pending.extend(batch)
+
+    if pending or not yielded:
+        yield {**fields, "messwerte": pending}
@@ -0,0 +1,377 @@
+"""Columnar interval storage for Wiener Netze Smart Meter."""
+from array import array
+import base64
+from bisect import bisect_left
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from itertools import pairwise
+import math
+import sys
+from typing import Any
+
+from .api import ConsumptionReading, offset_timezone
+from .const import QUALITY_EST, QUALITY_VAL
+
+# Quality bitmask
+QUALITY_FLAG_VALIDATED = 0x01
+QUALITY_FLAG_ESTIMATED = 0x02
+
+_QUALITY_FLAGS = {
+    QUALITY_VAL: QUALITY_FLAG_VALIDATED,
+    QUALITY_EST: QUALITY_FLAG_ESTIMATED,
+}
+_QUALITY_NAMES = {flag: name for name, flag in _QUALITY_FLAGS.items()}
+
+# Maps every quality byte to 1 if validated, else 0 (for bytes.find)
+_VALIDATED_TABLE = bytes(
+    1 if flag & QUALITY_FLAG_VALIDATED else 0 for flag in range(256)
+)
+
+
+# Interval row: (start, end, start offset, end offset, value, quality)
+IntervalRow = tuple[int, int, int, int, float, int]
+
+
+def quality_flag(qualitaet: str) -> int:
+    """Get the quality bitmask of an API quality indicator.
+
+    Args:
+        qualitaet: Quality indicator (VAL, EST)
+
+    Returns:
+        Quality bitmask, 0 for unknown indicators
+
+    """
+    return _QUALITY_FLAGS.get(qualitaet, 0)
+
+
+class IntervalSeries:
+    """Readings of one Zählwerk (OBIS code) in flat typed arrays.
+
+    Each interval is stored as UTC epoch seconds for start and end, the UTC
+    offsets in minutes of the original timestamps, the value and a quality
+    bitmask. Intervals are kept sorted by start, so ranges are found by
+    bisection and aggregated with a single slice instead of walking dicts.
+    """
+
+    __slots__ = (
+        "obis_code",
+        "einheit",
+        "starts",
+        "ends",
+        "offsets",
+        "end_offsets",
+        "values",
+        "quality",
+    )
+
+    def __init__(self, obis_code: str, einheit: str) -> None:
+        """Initialize the series.
+
+        Args:
+            obis_code: OBIS code of the Zählwerk
+            einheit: Unit (e.g., "kWh")
+
+        """
+        self.obis_code = obis_code
+        self.einheit = einheit
+        self.starts = array("q")
+        self.ends = array("q")
+        self.offsets = array("h")
+        self.end_offsets = array("h")
+        self.values = array("d")
+        self.quality = array("B")
+
+    def __len__(self) -> int:
+        """Return the number of intervals."""
+        return len(self.starts)
+
+    @property
+    def buffers(self) -> tuple[array, ...]:
+        """Return the interval buffers in IntervalRow order."""
+        return (
+            self.starts,
+            self.ends,
+            self.offsets,
+            self.end_offsets,
+            self.values,
+            self.quality,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Return the size of the interval buffers in bytes."""
+        return sum(len(buffer) * buffer.itemsize for buffer in self.buffers)
+
+    def upsert(
+        self,
+        start: int,
+        end: int,
+        offset: int,
+        end_offset: int,
+        value: float,
+        quality: int,
+    ) -> bool:
+        """Insert an interval or update it if the start is already known.
+
+        Args:
+            start: Start as UTC epoch seconds
+            end: End as UTC epoch seconds
+            offset: UTC offset of the original start timestamp in minutes
+            end_offset: UTC offset of the original end timestamp in minutes
+            value: Reading value
+            quality: Quality bitmask
+
+        Returns:
+            True if the series changed
+
+        """
+        starts = self.starts
+        # Appending in order is the common case
+        if not starts or start > starts[-1]:
+            index = len(starts)
+        else:
+            index = bisect_left(starts, start)
+            if index < len(starts) and starts[index] == start:
+                if self.values[index] == value and self.quality[index] == quality:
+                    return False
+                self.ends[index] = end
+                self.offsets[index] = offset
+                self.end_offsets[index] = end_offset
+                self.values[index] = value
+                self.quality[index] = quality
+                return True
+
+        starts.insert(index, start)
+        self.ends.insert(index, end)
+        self.offsets.insert(index, offset)
+        self.end_offsets.insert(index, end_offset)
+        self.values.insert(index, value)
+        self.quality.insert(index, quality)
+        return True
+
+    def upsert_many(self, rows: Sequence[IntervalRow]) -> int:
+        """Insert or update several intervals.
+
+        Rows sorted by start that fall into a gap of the series (e.g. a
+        backfilled month) are spliced into the buffers at once, other rows
+        are upserted one by one.
+
+        Args:
+            rows: Interval rows
+
+        Returns:
+            Number of new or changed intervals
+
+        """
+        if not rows:
+            return 0
+
+        index = bisect_left(self.starts, rows[0][0])
+        if (index == len(self) or self.starts[index] > rows[-1][0]) and all(
+            row[0] < next_row[0] for row, next_row in pairwise(rows)
+        ):
+            for buffer, column in zip(self.buffers, zip(*rows)):
+                buffer[index:index] = array(buffer.typecode, column)
+            return len(rows)
+
+        return sum(self.upsert(*row) for row in rows)
+
+    def first_open_index(self, start: int = 0) -> int:
+        """Get the index of the first interval that is not validated.
+
+        Args:
+            start: Index to search from
+
+        Returns:
+            Index of the first open interval, or the length if all are final
+
+        """
+        index = self.quality.tobytes().translate(_VALIDATED_TABLE).find(b"\x00", start)
+        return len(self) if index < 0 else index
+
+    def first_gap_index(self, start: int = 0) -> int:
+        """Get the index of the first interval after missing intervals.
+
+        Args:
+            start: Index to search from
+
+        Returns:
+            Index of the first interval that does not start at the end of
+            the previous one, or the length if there is no gap
+
+        """
+        starts, ends = self.starts, self.ends
+        start = max(start, 1)
+        previous = start - 1
+        # Contiguous intervals are the common case
+        if starts[start:] == ends[previous:-1]:
+            return len(self)
+        return next(
+            index
+            for index in range(start, len(self))
+            if starts[index] != ends[index - 1]
+        )
+
+    def day_start_index(self, day: date) -> int:
+        """Get the index of the first interval starting on or after a day.
+
+        Days are local days of the original timestamps.
+
+        Args:
+            day: Local day
+
+        Returns:
+            Index of the first interval of the day (or later)
+
+        """
+        return self.local_start_index((day - date(1970, 1, 1)).days * 86400)
+
+    def local_start_index(self, local_time: int) -> int:
+        """Get the index of the first interval starting at or after a local time.
+
+        Args:
+            local_time: Local wall clock time as epoch seconds
+
+        Returns:
+            Index of the first interval starting at or after the time
+
+        """
+        return bisect_left(
+            range(len(self)),
+            local_time,
+            key=lambda i: self.starts[i] + self.offsets[i] * 60,
+        )
+
+    def day_range(self, day: date) -> tuple[int, int]:
+        """Get the index range of a local day.
+
+        Args:
+            day: Local day
+
+        Returns:
+            Tuple of (first, last + 1) indexes
+
+        """
+        return self.day_start_index(day), self.day_start_index(day + timedelta(days=1))
+
+    def local_day(self, index: int) -> date:
+        """Get the local day an interval starts on.
+
+        Args:
+            index: Interval index
+
+        Returns:
+            Local day
+
+        """
+        local_start = self.starts[index] + self.offsets[index] * 60
+        return date(1970, 1, 1) + timedelta(days=local_start // 86400)
+
+    def total(self, first: int = 0, last: int | None = None) -> float:
+        """Sum the values of an index range.
+
+        Args:
+            first: First index
+            last: Last index + 1 (end of series if None)
+
+        Returns:
+            Sum of the values
+
+        """
+        return math.fsum(self.values[first:last])
+
+    def start_datetime(self, index: int) -> datetime:
+        """Get the start of an interval as aware datetime."""
+        return datetime.fromtimestamp(
+            self.starts[index], offset_timezone(self.offsets[index])
+        )
+
+    def end_datetime(self, index: int) -> datetime:
+        """Get the end of an interval as aware datetime."""
+        return datetime.fromtimestamp(
+            self.ends[index], offset_timezone(self.end_offsets[index])
+        )
+
+    def reading(self, index: int) -> ConsumptionReading:
+        """Get an interval as API reading.
+
+        Args:
+            index: Interval index
+
+        Returns:
+            Consumption reading
+
+        """
+        return {
+            "zeitVon": self.start_datetime(index).isoformat(timespec="milliseconds"),
+            "zeitBis": self.end_datetime(index).isoformat(timespec="milliseconds"),
+            "messwert": self.values[index],
+            "qualitaet": _QUALITY_NAMES.get(self.quality[index], ""),
+        }
+
+    def readings(
+        self, first: int = 0, last: int | None = None
+    ) -> list[ConsumptionReading]:
+        """Get an index range as API readings.
+
+        Args:
+            first: First index
+            last: Last index + 1 (end of series if None)
+
+        Returns:
+            Consumption readings
+
+        """
+        return [self.reading(i) for i in range(*slice(first, last).indices(len(self)))]
+
+    def drop_before(self, index: int) -> None:
+        """Drop all intervals before an index.
+
+        Args:
+            index: First index to keep
+
+        """
+        if index <= 0:
+            return
+
+        for buffer in self.buffers:
+            del buffer[:index]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the series with base64 encoded buffers."""
+        return {
+            "obis_code": self.obis_code,
+            "einheit": self.einheit,
+            "byteorder": sys.byteorder,
+            "buffers": [
+                base64.b64encode(buffer.tobytes()).decode() for buffer in self.buffers
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "IntervalSeries":
+        """Restore a series serialized with as_dict.
+
+        Args:
+            data: Serialized series
+
+        Returns:
+            Restored series
+
+        Raises:
+            ValueError: If the buffers are invalid
+
+        """
+        series = cls(data["obis_code"], data["einheit"])
+        swap = data.get("byteorder", sys.byteorder) != sys.byteorder
+
+        for buffer, encoded in zip(series.buffers, data["buffers"], strict=True):
+            buffer.frombytes(base64.b64decode(encoded))
+            if swap:
+                buffer.byteswap()
+
+        if any(len(buffer) != len(series) for buffer in series.buffers):
+            raise ValueError(f"Inconsistent buffers for {series.obis_code}")
+
+        return series
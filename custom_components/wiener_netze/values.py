@@ -0,0 +1,125 @@
+"""Derived values of a meter point for Wiener Netze Smart Meter."""
+from datetime import date, datetime, timedelta
+from functools import cached_property
+
+from .aggregate import BUCKET_DAY, ConsumptionAggregator
+from .const import OBIS_CONSUMPTION
+from .series import ConsumptionSeries
+from .timeseries import IntervalSeries
+
+# Factors to kWh
+_UNIT_FACTORS = {"kWh": 1.0, "Wh": 0.001}
+
+
+def _factor(register: IntervalSeries) -> float:
+    """Get the factor converting the values of a register to kWh."""
+    return _UNIT_FACTORS.get(register.einheit, 1.0)
+
+
+def _power(register: IntervalSeries, index: int) -> float:
+    """Get the mean power of an interval in kW."""
+    hours = (register.ends[index] - register.starts[index]) / 3600
+    return register.values[index] * _factor(register) / hours
+
+
+class MeterValues:
+    """Derived values of one version of a meter point's data.
+
+    Every value is computed on first access and then shared by all
+    entities that read it. The coordinator hands out the same instance
+    until the data of the meter point (snapshot or meter readings) or the
+    day changes, see WienerNetzeDataCoordinator.get_values. Energy is in
+    kWh, power in kW, of the Zählwerk with the given OBIS code (or the
+    first Zählwerk if the meter point has none with it).
+    """
+
+    def __init__(
+        self,
+        aggregator: ConsumptionAggregator,
+        meter_reads: ConsumptionSeries | None,
+        today: date,
+        obis_code: str = OBIS_CONSUMPTION,
+    ) -> None:
+        """Initialize the values.
+
+        Args:
+            aggregator: Aggregator of the quarter hour series
+            meter_reads: Meter reading series (optional)
+            today: Current local day
+            obis_code: OBIS code of the Zählwerk
+
+        """
+        self.aggregator = aggregator
+        self.meter_reads = meter_reads
+        self.today = today
+        registers = aggregator.series.registers
+        if obis_code not in registers and registers:
+            obis_code = next(iter(registers))
+        self.obis_code = obis_code
+
+    @cached_property
+    def register(self) -> IntervalSeries | None:
+        """Get the quarter hours of the Zählwerk."""
+        register = self.aggregator.series.registers.get(self.obis_code)
+        return register if register is not None and len(register) else None
+
+    @cached_property
+    def energy_today(self) -> float | None:
+        """Get the energy of today."""
+        return self._energy(self.today)
+
+    @cached_property
+    def energy_yesterday(self) -> float | None:
+        """Get the energy of yesterday."""
+        return self._energy(self.today - timedelta(days=1))
+
+    @cached_property
+    def last_interval(self) -> float | None:
+        """Get the energy of the newest interval."""
+        if self.register is None:
+            return None
+        return round(self.register.values[-1] * _factor(self.register), 3)
+
+    @cached_property
+    def last_interval_start(self) -> datetime | None:
+        """Get the start of the newest interval."""
+        if self.register is None:
+            return None
+        return self.register.start_datetime(len(self.register) - 1)
+
+    @cached_property
+    def current_power(self) -> float | None:
+        """Estimate the current power from the mean of the newest interval."""
+        if self.register is None:
+            return None
+        return round(_power(self.register, len(self.register) - 1), 3)
+
+    @cached_property
+    def peak_power_today(self) -> float | None:
+        """Get the highest mean power of an interval of today."""
+        if self.register is None:
+            return None
+        first, last = self.register.day_range(self.today)
+        if first == last:
+            return None
+        return round(max(_power(self.register, i) for i in range(first, last)), 3)
+
+    @cached_property
+    def meter_reading(self) -> float | None:
+        """Get the newest meter reading."""
+        if self.meter_reads is None:
+            return None
+        register = self.meter_reads.registers.get(self.obis_code)
+        if register is None or not len(register):
+            return None
+        return round(register.values[-1] * _factor(register), 3)
+
+    def _energy(self, day: date) -> float | None:
+        """Get the energy of a day, None if no interval of it is known."""
+        if self.register is None:
+            return None
+        first, last = self.register.day_range(day)
+        if first == last:
+            return None
+        total = self.aggregator.total(self.obis_code, BUCKET_DAY, day)
+        return round(total * _factor(self.register), 3)
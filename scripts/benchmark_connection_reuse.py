@@ -0,0 +1,103 @@
+"""Benchmark connection reuse of the dedicated API session.
+
+Starts a local stub of the token and consumption endpoints and runs update
+cycles with a session that opens a new connection per request and with the
+dedicated keep-alive session. The stub serves plain HTTP, so the saved TLS
+handshakes to api.wstw.at come on top of the measured difference.
+
+Run from the repository root:
+
+    python scripts/benchmark_connection_reuse.py
+"""
+import asyncio
+import json
+from pathlib import Path
+import sys
+import time
+
+from aiohttp import ClientSession, TCPConnector, web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.wiener_netze import api  # noqa: E402
+from custom_components.wiener_netze.session import create_api_session  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+METER_ID = "AT0010000000000000001000000000001"
+CYCLES = 200
+CONCURRENCY = 4
+
+
+def create_app(connections: set[asyncio.BaseTransport]) -> web.Application:
+    """Create the stub API, recording the connections used."""
+    token = json.loads((FIXTURES / "oauth_token.json").read_text())
+    consumption = json.loads((FIXTURES / "consumption_quarter_hour.json").read_text())
+
+    async def handle_token(request: web.Request) -> web.Response:
+        connections.add(request.transport)
+        return web.json_response(token)
+
+    async def handle_messwerte(request: web.Request) -> web.Response:
+        connections.add(request.transport)
+        response = web.json_response(consumption)
+        response.enable_compression()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/oauth2/token", handle_token)
+    app.router.add_get("/api/zaehlpunkte/{meter_id}/messwerte", handle_messwerte)
+    return app
+
+
+async def run_cycles(session: ClientSession) -> float:
+    """Authenticate and fetch consumption data, return seconds per request."""
+    client = api.WienerNetzeApiClient(
+        session, "id", "secret", "key", api.RateLimiter(requests_per_minute=10**6)
+    )
+    await client.authenticate()
+
+    async def fetch() -> None:
+        await client.get_consumption_data(METER_ID, "2024-11-10", "2024-11-10")
+
+    start = time.perf_counter()
+    for _ in range(CYCLES // CONCURRENCY):
+        await asyncio.gather(*(fetch() for _ in range(CONCURRENCY)))
+    return (time.perf_counter() - start) / CYCLES
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    connections: set[asyncio.BaseTransport] = set()
+    runner = web.AppRunner(create_app(connections))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    api.API_BASE_URL = f"http://127.0.0.1:{port}/api"
+    api.OAUTH_TOKEN_URL = f"http://127.0.0.1:{port}/oauth2/token"
+
+    print(f"{CYCLES} requests, {CONCURRENCY} concurrent")
+    try:
+        for name, factory in (
+            ("new connection per request", _create_closing_session),
+            ("dedicated keep-alive session", create_api_session),
+        ):
+            connections.clear()
+            async with factory() as session:
+                per_request = await run_cycles(session)
+            print(
+                f"{name:30} {per_request * 1e3:7.3f} ms/request"
+                f"  {len(connections):4} connection(s)"
+            )
+    finally:
+        await runner.cleanup()
+
+
+def _create_closing_session() -> ClientSession:
+    """Create a session that closes every connection after use."""
+    return ClientSession(connector=TCPConnector(force_close=True))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
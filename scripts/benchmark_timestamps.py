@@ -0,0 +1,88 @@
+"""Benchmark bulk timestamp parsing against parse_consumption_timestamp.
+
+Run from the repository root:
+
+    python scripts/benchmark_timestamps.py
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.wiener_netze import api  # noqa: E402
+
+DAYS = 7
+REPEAT = 5
+
+
+def make_readings(days: int) -> list[dict]:
+    """Create quarter hour readings in the API timestamp format."""
+    start = datetime(2024, 10, 21, tzinfo=timezone.utc)
+    readings = []
+    for i in range(days * 96):
+        zeit_von = start + timedelta(minutes=15 * i)
+        zeit_bis = zeit_von + timedelta(minutes=15)
+        readings.append(
+            {
+                "zeitVon": _format(zeit_von),
+                "zeitBis": _format(zeit_bis),
+                "messwert": 0.1,
+                "qualitaet": "VAL",
+            }
+        )
+    return readings
+
+
+def _format(timestamp: datetime) -> str:
+    """Format a timestamp like the API (Vienna local time)."""
+    # CET/CEST change on 2024-10-27 01:00 UTC
+    hours = 2 if timestamp < datetime(2024, 10, 27, 1, tzinfo=timezone.utc) else 1
+    local = timestamp.astimezone(timezone(timedelta(hours=hours)))
+    return local.isoformat(timespec="milliseconds")
+
+
+def parse_single(readings: list[dict]) -> list[tuple[int, int, int, int]]:
+    """Parse readings one timestamp at a time (previous approach)."""
+    parsed = []
+    for reading in readings:
+        start = api.parse_consumption_timestamp(reading["zeitVon"])
+        end = api.parse_consumption_timestamp(reading["zeitBis"])
+        parsed.append(
+            (
+                int(start.timestamp()),
+                int(end.timestamp()),
+                int(start.utcoffset().total_seconds()) // 60,
+                int(end.utcoffset().total_seconds()) // 60,
+            )
+        )
+    return parsed
+
+
+def parse_bulk_cold(readings: list[dict]) -> list[tuple[int, int, int, int]]:
+    """Parse readings in bulk with empty caches."""
+    api._EPOCHS.clear()  # pylint: disable=protected-access
+    api._DAY_BASES.clear()  # pylint: disable=protected-access
+    return api.parse_consumption_epochs(readings)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    readings = make_readings(DAYS)
+    assert parse_single(readings) == parse_bulk_cold(readings)
+
+    number = 20
+    print(f"{len(readings)} readings, best of {REPEAT} x {number} runs")
+    for name, func in (
+        ("parse_consumption_timestamp", parse_single),
+        ("parse_consumption_epochs (cold)", parse_bulk_cold),
+        ("parse_consumption_epochs (warm)", api.parse_consumption_epochs),
+    ):
+        best = min(timeit.repeat(lambda: func(readings), number=number, repeat=REPEAT))
+        per_reading = best / number / len(readings) * 1e9
+        print(f"{name:35} {best / number * 1e3:8.3f} ms  {per_reading:7.1f} ns/reading")
+
+
+if __name__ == "__main__":
+    main()
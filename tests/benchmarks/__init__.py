@@ -0,0 +1 @@
+"""Benchmarks of the Wiener Netze Smart Meter integration."""
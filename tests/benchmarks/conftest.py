@@ -0,0 +1,93 @@
+"""Fixtures for the benchmarks."""
+import json
+import os
+from pathlib import Path
+
+from _pytest.terminal import TerminalReporter
+import pytest
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+# Allowed slowdown against the baseline before a benchmark fails
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "1.5"))
+# Absolute slack, so timer noise of very short benchmarks does not fail them
+SLACK = 0.05
+
+
+class BenchmarkResults:
+    """Measured durations, checked against the stored baseline."""
+
+    def __init__(self, update: bool) -> None:
+        """Initialize the results.
+
+        Args:
+            update: Store the results as new baseline instead of checking
+
+        """
+        self.update = update
+        self.baseline: dict[str, float] = (
+            json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+        )
+        self.results: dict[str, float] = {}
+        self.details: dict[str, str] = {}
+
+    def check(self, name: str, seconds: float, details: str = "") -> None:
+        """Record a duration and fail if it regressed.
+
+        Args:
+            name: Name of the measurement
+            seconds: Measured duration
+            details: Further figures for the terminal summary (optional)
+
+        """
+        self.results[name] = round(seconds, 4)
+        if details:
+            self.details[name] = details
+        reference = self.baseline.get(name)
+        if self.update or reference is None:
+            return
+        if seconds > reference * TOLERANCE + SLACK:
+            pytest.fail(
+                f"{name} regressed: {seconds:.4f}s, baseline {reference:.4f}s "
+                f"(tolerance {TOLERANCE:.1f}x)"
+            )
+
+    def save(self) -> None:
+        """Store the results as new baseline."""
+        BASELINE.write_text(
+            json.dumps({**self.baseline, **self.results}, indent=2, sort_keys=True)
+            + "\n"
+        )
+
+
+_RESULTS = pytest.StashKey[BenchmarkResults]()
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request: pytest.FixtureRequest) -> BenchmarkResults:
+    """Collect the benchmark results of the session."""
+    results = BenchmarkResults(request.config.getoption("--benchmark-update"))
+    request.config.stash[_RESULTS] = results
+    yield results
+
+    if results.update:
+        results.save()
+
+
+def pytest_terminal_summary(
+    terminalreporter: TerminalReporter, config: pytest.Config
+) -> None:
+    """Report the benchmark results next to the baseline."""
+    results = config.stash.get(_RESULTS, None)
+    if results is None or not results.results:
+        return
+
+    terminalreporter.section("benchmarks")
+    for name, seconds in sorted(results.results.items()):
+        line = f"{name:20} {seconds * 1e3:10.1f} ms"
+        reference = results.baseline.get(name)
+        if reference is not None:
+            line += f"  (baseline {reference * 1e3:.1f} ms)"
+        if name in results.details:
+            line += f"  {results.details[name]}"
+        terminalreporter.write_line(line)
@@ -0,0 +1,101 @@
+"""Refresh benchmarks against the local mock API.
+
+The coordinator refreshes 1 to 500 meter points through the real API
+client (rate limiter, retries, JSON decoding) and the mock API in
+tests/mock_server.py. The cold refresh includes the history of day values
+and meter readings, warm refreshes only the recent quarter hours. A
+benchmark fails when it is slower than BENCHMARK_TOLERANCE (default 1.5)
+times the stored baseline of tests/benchmarks/baseline.json.
+
+Run from the repository root:
+
+    python -m pytest tests/benchmarks --benchmark
+
+and after an intended change, or on a different machine, store a new
+baseline with --benchmark-update.
+"""
+import statistics
+import time
+
+from aiohttp import ClientSession
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.wiener_netze.api import (
+    RateLimiter,
+    RetryPolicy,
+    WienerNetzeApiClient,
+)
+from custom_components.wiener_netze.const import CONF_METER_POINTS, DOMAIN
+from custom_components.wiener_netze.coordinator import WienerNetzeDataCoordinator
+from tests.mock_server import MockWienerNetzeApi
+
+from .conftest import BenchmarkResults
+
+pytestmark = pytest.mark.benchmark
+
+METER_COUNTS = (1, 10, 100, 500)
+WARM_REFRESHES = 5
+LATENCY = 0.005  # seconds per API response
+
+
+@pytest.mark.parametrize("meters", METER_COUNTS)
+async def test_refresh(
+    hass: HomeAssistant,
+    mock_api_server: MockWienerNetzeApi,
+    benchmark_results: BenchmarkResults,
+    meters: int,
+) -> None:
+    """Measure cold and warm refresh latency of a number of meter points."""
+    mock_api_server.config.meters = meters
+    mock_api_server.config.latency = LATENCY
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Wiener Netze",
+        data={
+            "client_id": "client_id",
+            "client_secret": "client_secret",
+            "api_key": "api_key",
+            CONF_METER_POINTS: [
+                mock_api_server.meter_point(meter_id)
+                for meter_id in mock_api_server.meter_ids
+            ],
+        },
+    )
+
+    async with ClientSession() as session:
+        client = WienerNetzeApiClient(
+            session,
+            "client_id",
+            "client_secret",
+            "api_key",
+            RateLimiter(requests_per_minute=10**6, burst=10**3),
+            RetryPolicy(attempts=1),
+        )
+        coordinator = WienerNetzeDataCoordinator(hass, client, entry)
+
+        started = time.perf_counter()
+        await coordinator.async_refresh()
+        cold = time.perf_counter() - started
+        assert coordinator.last_update_success
+        assert len(coordinator.data) == meters
+
+        warm = []
+        for _ in range(WARM_REFRESHES):
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+            warm.append(time.perf_counter() - started)
+            assert coordinator.last_update_success
+
+        await coordinator.async_shutdown()
+        client.token_manager.close()
+
+    latency = statistics.median(warm)
+    benchmark_results.check(f"refresh_cold_{meters}", cold)
+    benchmark_results.check(
+        f"refresh_{meters}",
+        latency,
+        f"{meters / latency:.0f} meter points/s, "
+        f"{sum(mock_api_server.requests.values())} requests",
+    )
@@ -0,0 +1,76 @@
+"""Parsing, aggregation and storage benchmarks on synthetic data sets.
+
+The payloads come from tests/synthetic.py (quarter hours with estimated
+readings, gaps and DST days) and are generated before timing. Each stage
+is timed on its own:
+
+- merge: parsing the API payloads into consumption series
+- aggregate: day and month totals of every meter point, uncached
+- store: serializing the series as the history store does and restoring
+  them from the JSON
+"""
+import time
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+import pytest
+
+from custom_components.wiener_netze.aggregate import (
+    BUCKET_DAY,
+    BUCKET_MONTH,
+    ConsumptionAggregator,
+)
+from custom_components.wiener_netze.series import ConsumptionSeries
+from tests.synthetic import OBIS_CODES, SyntheticConfig, generate
+
+from .conftest import BenchmarkResults
+
+pytestmark = pytest.mark.benchmark
+
+# (meter points, years)
+DATA_SETS = ((1, 1), (1, 5), (20, 1))
+
+
+@pytest.mark.parametrize(("meters", "years"), DATA_SETS)
+def test_pipeline(benchmark_results: BenchmarkResults, meters: int, years: int):
+    """Measure merging, aggregating and storing a synthetic data set."""
+    config = SyntheticConfig(meters=meters, years=years, registers=2)
+    payloads = list(generate(config))
+    name = f"{meters}x{years}y"
+
+    started = time.perf_counter()
+    series = []
+    for data in payloads:
+        meter_series = ConsumptionSeries(data["zaehlpunkt"], retention_days=None)
+        meter_series.merge(data, force=True)
+        series.append(meter_series)
+    benchmark_results.check(f"merge_{name}", time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for meter_series in series:
+        aggregator = ConsumptionAggregator(meter_series)
+        for obis_code in OBIS_CODES:
+            for bucket in (BUCKET_DAY, BUCKET_MONTH):
+                aggregator.totals(obis_code, bucket, config.first_day, config.last_day)
+    benchmark_results.check(f"aggregate_{name}", time.perf_counter() - started)
+
+    started = time.perf_counter()
+    stored = json_bytes(
+        {meter_series.meter_point: meter_series.as_dict() for meter_series in series}
+    )
+    restored = [
+        ConsumptionSeries.from_dict(meter_point, data, retention_days=None)
+        for meter_point, data in json_loads(stored).items()
+    ]
+    benchmark_results.check(f"store_{name}", time.perf_counter() - started)
+
+    intervals = sum(
+        len(register)
+        for meter_series in restored
+        for register in meter_series.registers.values()
+    )
+    assert intervals == sum(
+        len(zaehlwerk["messwerte"])
+        for data in payloads
+        for zaehlwerk in data["zaehlwerke"]
+    )
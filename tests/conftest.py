@@ -1,12 +1,45 @@
 """Pytest configuration and fixtures for Wiener Netze Smart Meter tests."""
 
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.wiener_netze.const import DOMAIN
+from tests.mock_server import MockWienerNetzeApi
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run the benchmarks against the mock API",
+    )
+    parser.addoption(
+        "--benchmark-update",
+        action="store_true",
+        help="Run the benchmarks and store the results as new baseline",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the benchmark marker."""
+    config.addinivalue_line("markers", "benchmark: benchmark, needs --benchmark")
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip the benchmarks unless they were requested."""
+    if config.getoption("--benchmark") or config.getoption("--benchmark-update"):
+        return
+
+    skip = pytest.mark.skip(reason="benchmark, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
 
 
 @pytest.fixture(autouse=True)
@@ -38,12 +71,14 @@ def mock_api_client():
     ) as mock_client:
         client = mock_client.return_value
         client.authenticate.return_value = True
-        client.get_meter_points.return_value = [
-            {
-                "zaehlpunktnummer": "AT0000000000000000000000000000001",
-                "geraet": {"geraetenummer": "12345678"},
-            }
-        ]
+        client.get_meter_points = AsyncMock(
+            return_value=[
+                {
+                    "zaehlpunktnummer": "AT0000000000000000000000000000001",
+                    "geraet": {"geraetenummer": "12345678"},
+                }
+            ]
+        )
         client.get_consumption.return_value = {
             "messwert": 1234.5,
             "qualitaet": "VAL",
@@ -69,6 +104,18 @@ async def setup_integration(
     yield
 
 
+@pytest.fixture
+async def mock_api_server(socket_enabled):
+    """Run the local mock API and point the API client at it."""
+    server = MockWienerNetzeApi()
+    await server.start()
+    with patch(
+        "custom_components.wiener_netze.api.API_BASE_URL", server.api_base_url
+    ), patch("custom_components.wiener_netze.api.OAUTH_TOKEN_URL", server.token_url):
+        yield server
+    await server.stop()
+
+
 @pytest.fixture
 def mock_oauth_response():
     """Return mock OAuth2 token response."""
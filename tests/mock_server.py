@@ -0,0 +1,367 @@
+"""Local stand-in for the Wiener Netze Smart Meter API.
+
+Serves the OAuth token endpoint and the endpoints of
+dokumentation/Export_WN_SMART_METER_API.yaml that the integration uses
+(``zaehlpunkte``, ``zaehlpunkte/{zaehlpunkt}``, ``zaehlpunkte/messwerte``
+and ``zaehlpunkte/{zaehlpunkt}/messwerte``) with synthetic readings of any
+number of meter points. Latency, server errors, rate limiting (429) and
+the response size can be configured, so the real request path of the API
+client (headers, JSON decoding, error mapping) can be timed.
+
+Run standalone from the repository root:
+
+    python -m tests.mock_server --meters 50 --latency 0.05 --rate-limit-rate 0.1
+"""
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import random
+import time
+
+from aiohttp import web
+
+from tests.synthetic import OBIS_CODES, VIENNA, day_readings, meter_ids
+
+ACCESS_TOKEN = "mock-access-token"
+API_PREFIX = "/gateway/WN_SMART_METER_API/1.0"
+TOKEN_PATH = "/oauth2/token"
+
+
+@dataclass
+class MockApiConfig:
+    """Behaviour of the mock API."""
+
+    meters: int = 1  # Number of meter points
+    registers: int = 1  # Zählwerke per meter point (consumption, feed-in)
+    latency: float = 0.0  # seconds added to every API response
+    jitter: float = 0.0  # seconds of random latency on top
+    error_rate: float = 0.0  # Share of API requests answered with 500
+    rate_limit_rate: float = 0.0  # Share of API requests answered with 429
+    retry_after: int = 1  # seconds, Retry-After header of 429 responses
+    padding: int = 0  # Bytes of filler added to every messwerte response
+    seed: int = 0  # Seed of the random latency and failures
+
+
+@lru_cache(maxsize=8)
+def _meter_id_set(count: int) -> frozenset[str]:
+    """Get the meter point numbers of the first mock meter points as set."""
+    return frozenset(meter_ids(count))
+
+
+class MockWienerNetzeApi:
+    """Mock API server with synthetic meter points and readings.
+
+    Readings come from tests/synthetic.py without gaps: quarter hours
+    follow a household profile in local time (so DST days have 92 or 100
+    of them), day values are their sums and meter readings the running
+    total of the day values, all in whole Wh. Days before today are
+    validated (VAL), today is estimated (EST); intervals that have not ended
+    yet are not served.
+    """
+
+    def __init__(self, config: MockApiConfig | None = None) -> None:
+        """Initialize the mock API.
+
+        Args:
+            config: Behaviour of the mock API (optional)
+
+        """
+        self.config = config or MockApiConfig()
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(self.config.seed)
+        self._readings: dict[tuple[str, str, str, date], list[dict]] = {}
+        self._runner: web.AppRunner | None = None
+        self.url: str | None = None
+
+    @property
+    def meter_ids(self) -> tuple[str, ...]:
+        """Get the meter point numbers served (config.meters can be changed)."""
+        return meter_ids(self.config.meters)
+
+    def _known(self, zaehlpunkt: str) -> bool:
+        """Check if a meter point is served."""
+        return zaehlpunkt in _meter_id_set(self.config.meters)
+
+    @property
+    def api_base_url(self) -> str:
+        """Get the API base URL of the running server."""
+        return f"{self.url}{API_PREFIX}"
+
+    @property
+    def token_url(self) -> str:
+        """Get the OAuth token URL of the running server."""
+        return f"{self.url}{TOKEN_PATH}"
+
+    def create_app(self) -> web.Application:
+        """Create the web application."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post(TOKEN_PATH, self._handle_token)
+        app.router.add_get(f"{API_PREFIX}/zaehlpunkte", self._handle_meter_points)
+        app.router.add_get(
+            f"{API_PREFIX}/zaehlpunkte/messwerte", self._handle_batch_messwerte
+        )
+        app.router.add_get(
+            f"{API_PREFIX}/zaehlpunkte/{{zaehlpunkt}}", self._handle_meter_point
+        )
+        app.router.add_get(
+            f"{API_PREFIX}/zaehlpunkte/{{zaehlpunkt}}/messwerte", self._handle_messwerte
+        )
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start the server.
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on (default: any free port)
+
+        Returns:
+            Base URL of the server
+
+        """
+        self._runner = web.AppRunner(self.create_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.url = f"http://{host}:{self._runner.addresses[0][1]}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count requests, check credentials and inject latency and failures."""
+        route = request.match_info.route.resource
+        name = route.canonical if route is not None else request.path
+        self.requests[name] += 1
+        if request.path == TOKEN_PATH:
+            return await handler(request)
+
+        if request.headers.get("Authorization") != f"Bearer {ACCESS_TOKEN}":
+            return web.json_response({"error": "invalid_token"}, status=401)
+        if not request.headers.get("x-Gateway-APIKey"):
+            return web.json_response({"error": "missing API key"}, status=403)
+
+        config = self.config
+        delay = config.latency + self._random.uniform(0, config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = self._random.random()
+        if roll < config.rate_limit_rate:
+            return web.json_response(
+                {"error": "Too many requests"},
+                status=429,
+                headers={"Retry-After": str(config.retry_after)},
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            return web.json_response({"error": "Internal Server Error"}, status=500)
+
+        return await handler(request)
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """Issue an access token for the client credentials grant."""
+        form = await request.post()
+        if form.get("grant_type") != "client_credentials" or not form.get("client_id"):
+            return web.json_response({"error": "invalid_client"}, status=401)
+        return web.json_response(
+            {
+                "access_token": ACCESS_TOKEN,
+                "token_type": "Bearer",
+                "expires_in": 3600,
+                "scope": "smart-meter-api",
+            }
+        )
+
+    async def _handle_meter_points(self, request: web.Request) -> web.Response:
+        """List the meter points, optionally filtered by zaehlpunkt."""
+        wanted = set(request.query.getall("zaehlpunkt", []))
+        return web.json_response(
+            {
+                "items": [
+                    self.meter_point(mid)
+                    for mid in self.meter_ids
+                    if not wanted or mid in wanted
+                ]
+            }
+        )
+
+    async def _handle_meter_point(self, request: web.Request) -> web.Response:
+        """Get a single meter point."""
+        zaehlpunkt = request.match_info["zaehlpunkt"]
+        if not self._known(zaehlpunkt):
+            return web.json_response({"error": "Not found"}, status=404)
+        return web.json_response(self.meter_point(zaehlpunkt))
+
+    async def _handle_messwerte(self, request: web.Request) -> web.Response:
+        """Get the readings of a single meter point."""
+        zaehlpunkt = request.match_info["zaehlpunkt"]
+        if not self._known(zaehlpunkt):
+            return web.json_response({"error": "Not found"}, status=404)
+        try:
+            first, last, wertetyp = self._range(request)
+        except ValueError as err:
+            return web.json_response({"error": str(err)}, status=400)
+        return self._json(self.consumption(zaehlpunkt, wertetyp, first, last))
+
+    async def _handle_batch_messwerte(self, request: web.Request) -> web.Response:
+        """Get the readings of several meter points."""
+        try:
+            first, last, wertetyp = self._range(request)
+        except ValueError as err:
+            return web.json_response({"error": str(err)}, status=400)
+        wanted = request.query.getall("zaehlpunkt", []) or self.meter_ids
+        return self._json(
+            [
+                self.consumption(zaehlpunkt, wertetyp, first, last)
+                for zaehlpunkt in wanted
+                if self._known(zaehlpunkt)
+            ]
+        )
+
+    def _json(self, body: dict | list) -> web.Response:
+        """Create a JSON response, padded to the configured size."""
+        if self.config.padding:
+            filler = "x" * self.config.padding
+            body = (
+                {**body, "padding": filler}
+                if isinstance(body, dict)
+                else [{**item, "padding": filler} for item in body]
+            )
+        return web.json_response(body)
+
+    @staticmethod
+    def _range(request: web.Request) -> tuple[date, date, str]:
+        """Get the requested days and granularity."""
+        try:
+            first = date.fromisoformat(request.query["datumVon"])
+            last = date.fromisoformat(request.query["datumBis"])
+            wertetyp = request.query["wertetyp"]
+        except (KeyError, ValueError) as err:
+            raise ValueError(f"Invalid query: {err}") from err
+        if wertetyp not in ("QUARTER_HOUR", "DAY", "METER_READ") or last < first:
+            raise ValueError("Invalid query")
+        return first, last, wertetyp
+
+    def meter_point(self, zaehlpunkt: str) -> dict:
+        """Get the metadata of a meter point."""
+        number = int(zaehlpunkt[-6:])
+        return {
+            "zaehlpunktnummer": zaehlpunkt,
+            "zaehlpunktname": f"Zähler {number}",
+            "verbrauchsstelle": {
+                "strasse": "Teststraße",
+                "hausnummer1": str(number % 200 + 1),
+                "hausnummer2": "",
+                "strasseZusatz": "",
+                "haus": "",
+                "stockwerk": "",
+                "tuernummer": "",
+                "postleitzahl": "1010",
+                "ort": "Wien",
+                "land": "AT",
+            },
+            "geraet": {
+                "geraetenummer": f"{number:08d}",
+                "equipmentnummer": f"EQ{number:06d}",
+            },
+            "anlage": {"anlage": f"{number:06d}", "sparte": "STROM", "typ": "NZ"},
+            "idex": {
+                "customerInterface": "WEBPORTAL",
+                "displayLocked": False,
+                "granularity": "QH",
+            },
+        }
+
+    def consumption(
+        self, zaehlpunkt: str, wertetyp: str, first: date, last: date
+    ) -> dict:
+        """Get the consumption data of a meter point.
+
+        Args:
+            zaehlpunkt: Meter point number
+            wertetyp: QUARTER_HOUR, DAY or METER_READ
+            first: First day
+            last: Last day (inclusive)
+
+        Returns:
+            Consumption data in the format of the API
+
+        """
+        today = datetime.now(VIENNA).date()
+        days = [
+            first + timedelta(days=offset)
+            for offset in range((min(last, today) - first).days + 1)
+        ]
+        return {
+            "zaehlpunkt": zaehlpunkt,
+            "zaehlwerke": [
+                {
+                    "obisCode": obis_code,
+                    "einheit": "kWh",
+                    "messwerte": [
+                        reading
+                        for day in days
+                        for reading in self._day_readings(
+                            zaehlpunkt, obis_code, wertetyp, day, today
+                        )
+                    ],
+                }
+                for obis_code in OBIS_CODES[: self.config.registers]
+            ],
+        }
+
+    def _day_readings(
+        self, zaehlpunkt: str, obis_code: str, wertetyp: str, day: date, today: date
+    ) -> list[dict]:
+        """Get the readings of a local day, cached for past days."""
+        if day == today:
+            return day_readings(
+                zaehlpunkt, obis_code, wertetyp, day, "EST", time.time()
+            )
+
+        key = (zaehlpunkt, obis_code, wertetyp, day)
+        readings = self._readings.get(key)
+        if readings is None:
+            readings = self._readings[key] = day_readings(
+                zaehlpunkt, obis_code, wertetyp, day
+            )
+        return readings
+
+
+async def _main() -> None:
+    """Run the mock API until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    for field, default in vars(MockApiConfig()).items():
+        parser.add_argument(
+            f"--{field.replace('_', '-')}", type=type(default), default=default
+        )
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+
+    server = MockWienerNetzeApi(MockApiConfig(**args))
+    url = await server.start(host, port)
+    print(f"API base URL: {server.api_base_url}")
+    print(f"Token URL:    {server.token_url}")
+    print(f"Meter points: {len(server.meter_ids)} (from {server.meter_ids[0]})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(f"Stopped {url}: {dict(server.requests)}")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,373 @@
+"""Synthetic consumption data in the format of the Wiener Netze API.
+
+Generates ConsumptionData payloads of any number of meter points over
+several years at QUARTER_HOUR, DAY and METER_READ granularity. Quarter
+hours follow a household profile in local time, so the DST transition
+days have 92 and 100 of them. Day values are the sums of the quarter hours
+and meter readings the running total, all in whole Wh, so the granularities
+agree exactly. On top of that, some days have estimated (EST) quarter hours,
+missing quarter hours or are missing completely, and the newest days are
+not validated yet. Everything is deterministic per seed, meter point and
+day, so any range can be generated on its own.
+
+Write payloads to disk from the repository root:
+
+    python -m tests.synthetic --meters 10 --years 3 --output /tmp/synthetic
+"""
+import argparse
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+import json
+import math
+from pathlib import Path
+import random
+from typing import Iterator, NamedTuple
+from zoneinfo import ZoneInfo
+import zlib
+
+from custom_components.wiener_netze.api import ConsumptionData
+
+VIENNA = ZoneInfo("Europe/Vienna")
+
+OBIS_CODES = ("1-1:1.8.0", "1-1:2.8.0")
+GRANULARITIES = ("QUARTER_HOUR", "DAY", "METER_READ")
+COUNTER_EPOCH = date(2020, 1, 1)
+
+# Share of the daily consumption per local quarter hour of a household
+_PROFILE = [
+    0.6
+    + 0.8 * math.exp(-((q / 4 - 7.5) ** 2) / 2)
+    + 1.4 * math.exp(-((q / 4 - 19) ** 2) / 4)
+    for q in range(96)
+]
+_WEIGHTS = [weight / sum(_PROFILE) for weight in _PROFILE]
+
+
+@dataclass
+class SyntheticConfig:
+    """Shape of a synthetic data set."""
+
+    meters: int = 1  # Number of meter points
+    years: int = 1  # Years of readings up to the last day
+    last_day: date = field(default_factory=lambda: date(2024, 12, 31))
+    registers: int = 1  # Zählwerke per meter point (consumption, feed-in)
+    estimated_days: int = 2  # Newest days that are not validated yet
+    estimated_rate: float = 0.02  # Share of days with estimated quarter hours
+    gap_rate: float = 0.01  # Share of days with missing quarter hours
+    missing_day_rate: float = 0.002  # Share of days without any readings
+    seed: int = 0
+
+    @property
+    def first_day(self) -> date:
+        """Get the first day of the data set."""
+        return self.last_day.replace(year=self.last_day.year - self.years) + (
+            timedelta(days=1)
+        )
+
+
+class DayFaults(NamedTuple):
+    """Deviations of a day from complete, validated readings."""
+
+    missing: bool = False  # No readings at all
+    gap: range = range(0)  # Quarter hours (by index) without readings
+    estimated: range = range(0)  # Quarter hours (by index) that are EST
+
+
+NO_FAULTS = DayFaults()
+
+
+def meter_id(index: int) -> str:
+    """Get the meter point number of a synthetic meter point."""
+    return f"AT00100000000000000010{index:011d}"
+
+
+@lru_cache(maxsize=8)
+def meter_ids(count: int) -> tuple[str, ...]:
+    """Get the meter point numbers of the first synthetic meter points."""
+    return tuple(meter_id(index) for index in range(count))
+
+
+def dst_days(year: int) -> tuple[date, date]:
+    """Get the days DST starts (92 quarter hours) and ends (100) in Vienna."""
+    days = []
+    for month in (3, 10):
+        # Last Sunday of the month
+        last = date(year, month, 31)
+        days.append(last - timedelta(days=(last.weekday() + 1) % 7))
+    return days[0], days[1]
+
+
+def day_faults(config: SyntheticConfig, zaehlpunkt: str, day: date) -> DayFaults:
+    """Get the deviations of a day of a meter point.
+
+    Args:
+        config: Shape of the data set
+        zaehlpunkt: Meter point number
+        day: Local day
+
+    Returns:
+        Deviations of the day, the same for every granularity and Zählwerk
+
+    """
+    quarter_hours = len(quarter_hours_of(day))
+    if (config.last_day - day).days < config.estimated_days:
+        return DayFaults(estimated=range(quarter_hours))
+
+    rng = random.Random(f"{config.seed}:{zaehlpunkt}:{day}")
+    roll = rng.random()
+    if roll < config.missing_day_rate:
+        return DayFaults(missing=True)
+    roll -= config.missing_day_rate
+    if roll < config.gap_rate:
+        # A communication outage of up to a few hours
+        start = rng.randrange(quarter_hours)
+        return DayFaults(
+            gap=range(start, min(start + rng.randint(1, 16), quarter_hours))
+        )
+    roll -= config.gap_rate
+    if roll < config.estimated_rate:
+        start = rng.randrange(quarter_hours)
+        return DayFaults(
+            estimated=range(start, min(start + rng.randint(1, 32), quarter_hours))
+        )
+    return NO_FAULTS
+
+
+def counter(zaehlpunkt: str, obis_code: str, day: date) -> int:
+    """Get the meter reading at the start of a day in Wh.
+
+    The reading is a closed form of the day, a seasonal curve plus bounded
+    noise, so that the consumption of any day (the difference of two
+    readings) is known without summing up all days before it.
+    """
+    days = (day - COUNTER_EPOCH).days
+    mean = 4000 + zlib.crc32(zaehlpunkt.encode()) % 10000  # Wh per day
+    if obis_code != OBIS_CODES[0]:
+        mean //= 3
+    noise = zlib.crc32(f"{zaehlpunkt}:{obis_code}:{day}".encode()) / 2**32
+    season = 0.25 * 365 / (2 * math.pi) * math.sin(2 * math.pi * (days - 15) / 365)
+    return 10**7 + round(mean * (days + season + 0.15 * noise))
+
+
+@lru_cache(maxsize=4096)
+def quarter_hours_of(day: date) -> tuple[tuple[datetime, datetime], ...]:
+    """Get the quarter hours of a local day (92 or 100 on DST days)."""
+    start = datetime.combine(day, datetime.min.time(), VIENNA).astimezone(timezone.utc)
+    end = datetime.combine(
+        day + timedelta(days=1), datetime.min.time(), VIENNA
+    ).astimezone(timezone.utc)
+    step = timedelta(minutes=15)
+    return tuple(
+        (start + i * step, start + (i + 1) * step)
+        for i in range(int((end - start) / step))
+    )
+
+
+@lru_cache(maxsize=4096)
+def _day_weights(day: date) -> tuple[float, ...]:
+    """Get the profile weights of the quarter hours of a local day."""
+    return tuple(
+        _WEIGHTS[local.hour * 4 + local.minute // 15]
+        for local in (
+            zeit_von.astimezone(VIENNA) for zeit_von, _ in quarter_hours_of(day)
+        )
+    )
+
+
+def format_timestamp(timestamp: datetime) -> str:
+    """Format a timestamp like the API (Vienna local time)."""
+    return timestamp.astimezone(VIENNA).isoformat(timespec="milliseconds")
+
+
+def day_readings(
+    zaehlpunkt: str,
+    obis_code: str,
+    wertetyp: str,
+    day: date,
+    qualitaet: str = "VAL",
+    now: float | None = None,
+    faults: DayFaults = NO_FAULTS,
+) -> list[dict]:
+    """Build the readings of a local day.
+
+    The consumption of the day is spread over its quarter hours along the
+    household profile, in whole Wh so that the quarter hours add up to the
+    day value and the meter readings exactly. Missing quarter hours leave
+    the day value and meter reading untouched; estimated quarter hours make
+    the day value estimated as well.
+
+    Args:
+        zaehlpunkt: Meter point number
+        obis_code: OBIS code of the Zählwerk
+        wertetyp: QUARTER_HOUR, DAY or METER_READ
+        day: Local day
+        qualitaet: Quality of the readings of the day
+        now: Only include intervals that ended by then (epoch, optional)
+        faults: Deviations of the day
+
+    Returns:
+        Readings of the day in the format of the API
+
+    """
+    if faults.missing:
+        return []
+
+    day_counter = counter(zaehlpunkt, obis_code, day)
+    total = counter(zaehlpunkt, obis_code, day + timedelta(days=1)) - day_counter
+    if wertetyp != "QUARTER_HOUR" and now is None:
+        # Complete day, no need to spread it
+        if wertetyp == "DAY" and faults.estimated:
+            qualitaet = "EST"
+        start = datetime.combine(day, datetime.min.time(), VIENNA)
+        end = datetime.combine(day + timedelta(days=1), datetime.min.time(), VIENNA)
+        return [
+            {
+                "zeitVon": format_timestamp(start),
+                "zeitBis": format_timestamp(end),
+                "messwert": (total if wertetyp == "DAY" else day_counter + total)
+                / 1000,
+                "qualitaet": qualitaet,
+            }
+        ]
+
+    weights = _day_weights(day)
+    scale = total / sum(weights)
+
+    intervals: list[tuple[datetime, datetime, int, str]] = []
+    cumulative = 0.0
+    previous = 0
+    for index, ((zeit_von, zeit_bis), weight) in enumerate(
+        zip(quarter_hours_of(day), weights)
+    ):
+        if now is not None and zeit_bis.timestamp() > now:
+            break
+        cumulative += weight * scale
+        value = round(cumulative) - previous
+        previous += value
+        if index not in faults.gap:
+            intervals.append(
+                (
+                    zeit_von,
+                    zeit_bis,
+                    value,
+                    "EST" if index in faults.estimated else qualitaet,
+                )
+            )
+    if not intervals:
+        return []
+
+    if wertetyp == "QUARTER_HOUR":
+        return [
+            {
+                "zeitVon": format_timestamp(zeit_von),
+                "zeitBis": format_timestamp(zeit_bis),
+                "messwert": value / 1000,
+                "qualitaet": quality,
+            }
+            for zeit_von, zeit_bis, value, quality in intervals
+        ]
+
+    if wertetyp == "DAY" and faults.estimated:
+        qualitaet = "EST"
+    return [
+        {
+            "zeitVon": format_timestamp(intervals[0][0]),
+            "zeitBis": format_timestamp(intervals[-1][1]),
+            "messwert": (previous if wertetyp == "DAY" else day_counter + previous)
+            / 1000,
+            "qualitaet": qualitaet,
+        }
+    ]
+
+
+def consumption_data(
+    config: SyntheticConfig,
+    zaehlpunkt: str,
+    wertetyp: str,
+    first: date | None = None,
+    last: date | None = None,
+) -> ConsumptionData:
+    """Get the consumption data of a meter point.
+
+    Args:
+        config: Shape of the data set
+        zaehlpunkt: Meter point number
+        wertetyp: QUARTER_HOUR, DAY or METER_READ
+        first: First day (default: first day of the data set)
+        last: Last day, inclusive (default: last day of the data set)
+
+    Returns:
+        Consumption data in the format of the API
+
+    """
+    first = max(first or config.first_day, config.first_day)
+    last = min(last or config.last_day, config.last_day)
+    days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    faults = [day_faults(config, zaehlpunkt, day) for day in days]
+    return {
+        "zaehlpunkt": zaehlpunkt,
+        "zaehlwerke": [
+            {
+                "obisCode": obis_code,
+                "einheit": "kWh",
+                "messwerte": [
+                    reading
+                    for day, day_fault in zip(days, faults)
+                    for reading in day_readings(
+                        zaehlpunkt, obis_code, wertetyp, day, faults=day_fault
+                    )
+                ],
+            }
+            for obis_code in OBIS_CODES[: config.registers]
+        ],
+    }
+
+
+def generate(
+    config: SyntheticConfig, wertetyp: str = "QUARTER_HOUR"
+) -> Iterator[ConsumptionData]:
+    """Generate the consumption data of every meter point of a data set.
+
+    Args:
+        config: Shape of the data set
+        wertetyp: QUARTER_HOUR, DAY or METER_READ
+
+    Yields:
+        Consumption data of one meter point over the whole data set
+
+    """
+    for zaehlpunkt in meter_ids(config.meters):
+        yield consumption_data(config, zaehlpunkt, wertetyp)
+
+
+def _main() -> None:
+    """Write a data set as one JSON file per meter point and granularity."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument(
+        "--granularity", choices=GRANULARITIES, action="append", dest="granularities"
+    )
+    parser.add_argument("--last-day", type=date.fromisoformat, default=None)
+    for name, default in vars(SyntheticConfig()).items():
+        if name != "last_day":
+            parser.add_argument(
+                f"--{name.replace('_', '-')}", type=type(default), default=default
+            )
+    args = vars(parser.parse_args())
+    output = args.pop("output")
+    granularities = args.pop("granularities") or GRANULARITIES
+    if args["last_day"] is None:
+        del args["last_day"]
+    config = SyntheticConfig(**args)
+
+    output.mkdir(parents=True, exist_ok=True)
+    for wertetyp in granularities:
+        for data in generate(config, wertetyp):
+            path = output / f"{data['zaehlpunkt']}_{wertetyp.lower()}.json"
+            path.write_text(json.dumps(data))
+            print(f"{path}: {sum(len(z['messwerte']) for z in data['zaehlwerke'])}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,159 @@
+"""Tests for aggregate.py."""
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from custom_components.wiener_netze.aggregate import (
+    BUCKET_DAY,
+    BUCKET_HOUR,
+    BUCKET_MONTH,
+    BUCKET_WEEK,
+    ConsumptionAggregator,
+    TariffWindow,
+    bucket_bounds,
+)
+from custom_components.wiener_netze.series import ConsumptionSeries
+
+METER_ID = "AT0010000000000000001000000000001"
+CONSUMPTION = "1-1:1.8.0"
+FEED_IN = "1-1:2.8.0"
+START = datetime.fromisoformat("2024-10-30T00:00:00+01:00")  # Wednesday
+
+
+def consumption_data(days: int, value: float = 0.25, first_day: int = 0) -> dict:
+    """Return quarter hours of both Zählwerke for consecutive days."""
+    step = timedelta(minutes=15)
+    first = START + timedelta(days=first_day)
+    readings = [
+        {
+            "zeitVon": (first + i * step).isoformat(),
+            "zeitBis": (first + (i + 1) * step).isoformat(),
+            "messwert": value,
+            "qualitaet": "EST",
+        }
+        for i in range(96 * days)
+    ]
+    return {
+        "zaehlpunkt": METER_ID,
+        "zaehlwerke": [
+            {"obisCode": CONSUMPTION, "einheit": "kWh", "messwerte": readings},
+            {
+                "obisCode": FEED_IN,
+                "einheit": "kWh",
+                "messwerte": [{**r, "messwert": 1.0} for r in readings],
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def aggregator() -> ConsumptionAggregator:
+    """Return an aggregator of four days of readings."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(4))
+    return ConsumptionAggregator(series)
+
+
+def test_bucket_bounds():
+    """Test bucket boundaries of the supported sizes."""
+    first, last = date(2024, 10, 30), date(2024, 11, 2)
+
+    assert len(bucket_bounds(BUCKET_HOUR, first, last)) == 4 * 24 + 1
+    assert len(bucket_bounds(BUCKET_DAY, first, last)) == 5
+    weeks = bucket_bounds(BUCKET_WEEK, first, last)
+    assert [datetime.utcfromtimestamp(b).date() for b in weeks] == [
+        date(2024, 10, 28),
+        date(2024, 11, 4),
+    ]
+    months = bucket_bounds(BUCKET_MONTH, first, last)
+    assert [datetime.utcfromtimestamp(b).date() for b in months] == [
+        date(2024, 10, 1),
+        date(2024, 11, 1),
+        date(2024, 12, 1),
+    ]
+    with pytest.raises(ValueError):
+        bucket_bounds("year", first, last)
+
+
+def test_totals_by_bucket(aggregator: ConsumptionAggregator):
+    """Test totals per bucket size, separated by OBIS code."""
+    first, last = date(2024, 10, 30), date(2024, 11, 2)
+
+    days = aggregator.totals(CONSUMPTION, BUCKET_DAY, first, last)
+    assert list(days.values()) == [24.0] * 4
+    assert list(days)[0] == datetime(2024, 10, 30)
+
+    hours = aggregator.totals(CONSUMPTION, BUCKET_HOUR, first, first)
+    assert list(hours.values()) == [1.0] * 24
+
+    assert aggregator.totals(CONSUMPTION, BUCKET_MONTH, first, last) == {
+        datetime(2024, 10, 1): 48.0,
+        datetime(2024, 11, 1): 48.0,
+    }
+    assert aggregator.total(CONSUMPTION, BUCKET_WEEK, first) == 96.0
+    assert aggregator.total(FEED_IN, BUCKET_DAY, first) == 96.0
+    assert aggregator.total("1-1:1.9.0", BUCKET_DAY, first) == 0.0
+
+
+def test_tariff_windows(aggregator: ConsumptionAggregator):
+    """Test totals restricted to tariff windows."""
+    day = date(2024, 10, 30)
+    peak = TariffWindow("peak", time(8), time(20), weekdays=(0, 1, 2, 3, 4))
+    night = TariffWindow("night", time(22), time(6))
+
+    assert aggregator.total(CONSUMPTION, BUCKET_DAY, day, peak) == 12.0
+    # Saturday is not a peak day
+    assert aggregator.total(CONSUMPTION, BUCKET_DAY, date(2024, 11, 2), peak) == 0.0
+    # 00:00-06:00 of the previous window plus 22:00-24:00
+    assert aggregator.total(CONSUMPTION, BUCKET_DAY, day, night) == 8.0
+    assert (
+        aggregator.totals(CONSUMPTION, BUCKET_HOUR, day, day, night)[
+            datetime(2024, 10, 30, 5)
+        ]
+        == 1.0
+    )
+
+
+def test_tariff_window_across_midnight(aggregator: ConsumptionAggregator):
+    """Test a window past midnight is split between the days it covers."""
+    friday_night = TariffWindow("night", time(22), time(6), weekdays=(4,))
+    thursday, friday, saturday = (
+        date(2024, 10, 31) + timedelta(days=d) for d in range(3)
+    )
+
+    assert aggregator.total(CONSUMPTION, BUCKET_DAY, thursday, friday_night) == 0.0
+    assert aggregator.total(CONSUMPTION, BUCKET_DAY, friday, friday_night) == 2.0
+    # Saturday is not in the weekdays, but the window of Friday reaches into it
+    assert aggregator.total(CONSUMPTION, BUCKET_DAY, saturday, friday_night) == 6.0
+    assert aggregator.total(CONSUMPTION, BUCKET_WEEK, friday, friday_night) == 8.0
+
+
+def test_cache_invalidates_touched_buckets(aggregator: ConsumptionAggregator):
+    """Test that only buckets touched by new data are computed again."""
+    first, last = date(2024, 10, 30), date(2024, 11, 4)
+
+    aggregator.totals(CONSUMPTION, BUCKET_DAY, first, last)
+    assert aggregator.misses == 6
+
+    aggregator.totals(CONSUMPTION, BUCKET_DAY, first, last)
+    assert aggregator.hits == 6
+
+    # Readings for the fifth day only touch that day
+    aggregator.series.merge(consumption_data(1, value=0.5, first_day=4))
+    totals = aggregator.totals(CONSUMPTION, BUCKET_DAY, first, last)
+    assert aggregator.misses == 7
+    assert totals[datetime(2024, 11, 3)] == 48.0
+    assert aggregator.stats["buckets"] == 6
+
+
+def test_cache_cleared_when_change_log_exceeded(aggregator: ConsumptionAggregator):
+    """Test that everything is computed again if changes were missed."""
+    day = date(2024, 10, 30)
+    aggregator.total(CONSUMPTION, BUCKET_DAY, day)
+
+    series = aggregator.series
+    for revision in range(100):
+        series.merge(consumption_data(1, value=revision / 100, first_day=0))
+
+    assert series.changes_since(0) is None
+    assert aggregator.total(CONSUMPTION, BUCKET_DAY, day) == pytest.approx(0.99 * 96)
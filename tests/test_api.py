@@ -1,5 +1,6 @@
 """Tests for api.py."""
 import asyncio
+import json
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -8,6 +9,11 @@ import pytest
 from aiohttp import ClientSession
 
 from custom_components.wiener_netze.api import (
+    REQUEST_TIMEOUT,
+    STREAM_TIMEOUT,
+    TOKEN_REFRESH_AHEAD,
+    RetryPolicy,
+    TokenManager,
     WienerNetzeApiClient,
     WienerNetzeApiError,
     WienerNetzeAuthError,
@@ -15,6 +21,7 @@ from custom_components.wiener_netze.api import (
     WienerNetzeConnectionError,
     WienerNetzeNotFoundError,
     WienerNetzeRateLimitError,
+    WienerNetzeServerError,
     WienerNetzeTimeoutError,
     calculate_total_consumption,
     extract_all_readings,
@@ -24,7 +31,10 @@ from custom_components.wiener_netze.api import (
     get_date_range_for_yesterday,
     get_meter_point_id,
     get_validated_readings,
+    parse_consumption_epoch,
+    parse_consumption_epochs,
     parse_consumption_timestamp,
+    split_consumption_batch,
 )
 from custom_components.wiener_netze.const import GRANULARITY_QUARTER_HOUR
 from tests.utils import load_json_fixture
@@ -44,6 +54,7 @@ def api_client(mock_session):
         client_id="test_client",
         client_secret="test_secret",
         api_key="test_key",
+        retry_policy=RetryPolicy(base_delay=0),
     )
 
 
@@ -55,8 +66,8 @@ class TestApiClientInitialization:
         assert api_client._client_id == "test_client"
         assert api_client._client_secret == "test_secret"
         assert api_client._api_key == "test_key"
-        assert api_client._access_token is None
-        assert api_client._token_expires_at is None
+        assert api_client.access_token is None
+        assert api_client.token_expires_at is None
 
     def test_headers_without_token(self, api_client):
         """Test headers without access token."""
@@ -68,13 +79,24 @@ class TestApiClientInitialization:
 
     def test_headers_with_token(self, api_client):
         """Test headers with access token."""
-        api_client._access_token = "test_token"
+        api_client.token_manager.access_token = "test_token"
         headers = api_client._headers
 
         assert headers["x-Gateway-APIKey"] == "test_key"
         assert headers["Content-Type"] == "application/json"
         assert headers["Authorization"] == "Bearer test_token"
 
+    def test_headers_cached_per_token(self, api_client):
+        """Test that headers are only rebuilt when the token changes."""
+        api_client.token_manager.access_token = "test_token"
+        headers = api_client._headers
+
+        assert api_client._headers is headers
+
+        api_client.token_manager.access_token = "new_token"
+        assert api_client._headers is not headers
+        assert api_client._headers["Authorization"] == "Bearer new_token"
+
 
 class TestAuthentication:
     """Tests for authentication."""
@@ -85,6 +107,7 @@ class TestAuthentication:
 
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value=token_data)
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -93,8 +116,8 @@ class TestAuthentication:
 
         await api_client.authenticate()
 
-        assert api_client._access_token == token_data["access_token"]
-        assert api_client._token_expires_at is not None
+        assert api_client.access_token == token_data["access_token"]
+        assert api_client.token_expires_at is not None
 
         # Verify post was called with correct parameters
         mock_session.post.assert_called_once()
@@ -106,6 +129,7 @@ class TestAuthentication:
         """Test authentication with invalid credentials."""
         mock_response = AsyncMock()
         mock_response.status = 401
+        mock_response.headers = {}
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -118,6 +142,7 @@ class TestAuthentication:
         """Test authentication with server error."""
         mock_response = AsyncMock()
         mock_response.status = 500
+        mock_response.headers = {}
         mock_response.text = AsyncMock(return_value="Internal Server Error")
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -145,8 +170,7 @@ class TestAuthentication:
 
     async def test_ensure_token_valid(self, api_client):
         """Test ensure_token with valid token."""
-        api_client._access_token = "valid_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("valid_token", datetime.now() + timedelta(hours=1))
 
         # Should not call authenticate
         with patch.object(api_client, "authenticate") as mock_auth:
@@ -155,12 +179,12 @@ class TestAuthentication:
 
     async def test_ensure_token_expired(self, api_client, mock_session):
         """Test ensure_token with expired token."""
-        api_client._access_token = "expired_token"
-        api_client._token_expires_at = datetime.now() - timedelta(hours=1)
+        api_client.restore_token("expired_token", datetime.now() - timedelta(hours=1))
 
         token_data = load_json_fixture("oauth_token.json")
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value=token_data)
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -169,13 +193,14 @@ class TestAuthentication:
 
         await api_client._ensure_token()
 
-        assert api_client._access_token == token_data["access_token"]
+        assert api_client.access_token == token_data["access_token"]
 
     async def test_ensure_token_missing(self, api_client, mock_session):
         """Test ensure_token with missing token."""
         token_data = load_json_fixture("oauth_token.json")
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value=token_data)
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -184,7 +209,7 @@ class TestAuthentication:
 
         await api_client._ensure_token()
 
-        assert api_client._access_token == token_data["access_token"]
+        assert api_client.access_token == token_data["access_token"]
 
 
 class TestApiRequests:
@@ -193,11 +218,11 @@ class TestApiRequests:
     async def test_request_success(self, api_client, mock_session):
         """Test successful API request."""
         # Setup token
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value={"data": "test"})
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -208,14 +233,15 @@ class TestApiRequests:
 
         assert result == {"data": "test"}
         mock_session.request.assert_called_once()
+        assert mock_session.request.call_args.kwargs["timeout"] is REQUEST_TIMEOUT
 
     async def test_request_bad_request(self, api_client, mock_session):
         """Test API request with bad request error."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 400
+        mock_response.headers = {}
         mock_response.text = AsyncMock(return_value="Bad Request")
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -227,18 +253,19 @@ class TestApiRequests:
 
     async def test_request_unauthorized_retry(self, api_client, mock_session):
         """Test API request retry on 401."""
-        api_client._access_token = "expired_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("expired_token", datetime.now() + timedelta(hours=1))
 
         # First response: 401 (unauthorized)
         mock_response_401 = AsyncMock()
         mock_response_401.status = 401
+        mock_response_401.headers = {}
         mock_response_401.__aenter__ = AsyncMock(return_value=mock_response_401)
         mock_response_401.__aexit__ = AsyncMock(return_value=None)
 
         # Second response: 200 (success after re-auth)
         mock_response_200 = AsyncMock()
         mock_response_200.status = 200
+        mock_response_200.headers = {}
         mock_response_200.json = AsyncMock(return_value={"data": "test"})
         mock_response_200.__aenter__ = AsyncMock(return_value=mock_response_200)
         mock_response_200.__aexit__ = AsyncMock(return_value=None)
@@ -247,6 +274,7 @@ class TestApiRequests:
         token_data = load_json_fixture("oauth_token.json")
         mock_token_response = AsyncMock()
         mock_token_response.status = 200
+        mock_token_response.headers = {}
         mock_token_response.json = AsyncMock(return_value=token_data)
         mock_token_response.__aenter__ = AsyncMock(return_value=mock_token_response)
         mock_token_response.__aexit__ = AsyncMock(return_value=None)
@@ -263,11 +291,11 @@ class TestApiRequests:
 
     async def test_request_forbidden(self, api_client, mock_session):
         """Test API request with forbidden error."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 403
+        mock_response.headers = {}
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -278,11 +306,11 @@ class TestApiRequests:
 
     async def test_request_not_found(self, api_client, mock_session):
         """Test API request with not found error."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 404
+        mock_response.headers = {}
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -293,11 +321,11 @@ class TestApiRequests:
 
     async def test_request_timeout_408(self, api_client, mock_session):
         """Test API request with 408 timeout."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 408
+        mock_response.headers = {}
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -308,11 +336,11 @@ class TestApiRequests:
 
     async def test_request_rate_limit(self, api_client, mock_session):
         """Test API request with rate limit error."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 429
+        mock_response.headers = {}
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -323,11 +351,11 @@ class TestApiRequests:
 
     async def test_request_server_error(self, api_client, mock_session):
         """Test API request with server error."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 500
+        mock_response.headers = {}
         mock_response.text = AsyncMock(return_value="Internal Server Error")
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -339,8 +367,7 @@ class TestApiRequests:
 
     async def test_request_connection_error(self, api_client, mock_session):
         """Test API request with connection error."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_session.request = MagicMock(
             side_effect=aiohttp.ClientError("Connection failed")
@@ -351,8 +378,7 @@ class TestApiRequests:
 
     async def test_request_timeout_exception(self, api_client, mock_session):
         """Test API request with timeout exception."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_session.request = MagicMock(side_effect=asyncio.TimeoutError())
 
@@ -361,11 +387,11 @@ class TestApiRequests:
 
     async def test_get_method(self, api_client, mock_session):
         """Test GET method wrapper."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value={"data": "test"})
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -380,11 +406,11 @@ class TestApiRequests:
 
     async def test_post_method(self, api_client, mock_session):
         """Test POST method wrapper."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value={"data": "test"})
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -398,18 +424,250 @@ class TestApiRequests:
         assert call_args[0][0] == "POST"
 
 
+def make_response(status: int, data: dict | None = None) -> AsyncMock:
+    """Return a mock response with the given status."""
+    mock_response = AsyncMock()
+    mock_response.status = status
+    mock_response.headers = {}
+    mock_response.json = AsyncMock(return_value=data)
+    mock_response.text = AsyncMock(return_value="error")
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    return mock_response
+
+
+class TestRetries:
+    """Tests for retrying failed requests."""
+
+    @pytest.fixture(autouse=True)
+    def valid_token(self, api_client):
+        """Give the client a valid access token."""
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+
+    def test_retry_policy_delay(self):
+        """Test that the backoff is jittered below an exponential ceiling."""
+        policy = RetryPolicy(attempts=5, base_delay=1.0, max_delay=4.0)
+
+        for retries, ceiling in enumerate([1.0, 2.0, 4.0, 4.0]):
+            for _ in range(20):
+                assert 0 <= policy.delay(retries) <= ceiling
+
+    def test_retry_policy_should_retry(self):
+        """Test which errors are retried."""
+        policy = RetryPolicy(attempts=3)
+        error = WienerNetzeServerError("Server error: 503")
+
+        assert policy.should_retry("GET", error, 0)
+        assert policy.should_retry("GET", WienerNetzeTimeoutError("timeout"), 1)
+        assert not policy.should_retry("GET", error, 2)
+        assert not policy.should_retry("POST", error, 0)
+        assert not policy.should_retry("GET", WienerNetzeNotFoundError("404"), 0)
+        assert not policy.should_retry("GET", WienerNetzeRateLimitError("429"), 0)
+
+    async def test_server_error_retried(self, api_client, mock_session):
+        """Test that a GET is retried after a server error."""
+        mock_session.request = MagicMock(
+            side_effect=[make_response(503), make_response(200, {"data": "test"})]
+        )
+
+        result = await api_client._get("/test")
+
+        assert result == {"data": "test"}
+        assert mock_session.request.call_count == 2
+        assert api_client.recent_calls[-1]["attempts"] == 2
+        assert api_client.recent_calls[-1]["error"] is None
+        assert api_client.retry_stats["total_retries"] == 1
+
+    async def test_connection_error_retried(self, api_client, mock_session):
+        """Test that a GET is retried after a connection error."""
+        mock_session.request = MagicMock(
+            side_effect=[
+                aiohttp.ClientError("Connection reset"),
+                asyncio.TimeoutError(),
+                make_response(200, {"data": "test"}),
+            ]
+        )
+
+        assert await api_client._get("/test") == {"data": "test"}
+        assert mock_session.request.call_count == 3
+
+    async def test_retries_bounded(self, api_client, mock_session):
+        """Test that retries stop after the configured attempts."""
+        mock_session.request = MagicMock(return_value=make_response(500))
+
+        with pytest.raises(WienerNetzeServerError):
+            await api_client._get("/test")
+
+        assert mock_session.request.call_count == 3
+        assert api_client.recent_calls[-1]["attempts"] == 3
+        assert "Server error" in api_client.recent_calls[-1]["error"]
+
+    async def test_post_not_retried(self, api_client, mock_session):
+        """Test that non idempotent requests are not retried."""
+        mock_session.request = MagicMock(return_value=make_response(500))
+
+        with pytest.raises(WienerNetzeServerError):
+            await api_client._post("/test")
+
+        assert mock_session.request.call_count == 1
+
+    async def test_backoff_sleep(self, mock_session):
+        """Test that retries wait for the jittered backoff."""
+        client = WienerNetzeApiClient(mock_session, "id", "secret", "key")
+        client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+        mock_session.request = MagicMock(return_value=make_response(502))
+
+        with patch(
+            "custom_components.wiener_netze.api.random.uniform", return_value=0.5
+        ), patch(
+            "custom_components.wiener_netze.api.asyncio.sleep"
+        ) as mock_sleep, pytest.raises(
+            WienerNetzeServerError
+        ):
+            await client._get("/test")
+
+        assert mock_sleep.call_count == 2
+        assert client.retry_stats["total_retry_wait"] == 1.0
+
+    async def test_reauthenticate_once(self, api_client, mock_session):
+        """Test that a token rejected after re-authentication fails."""
+        token_response = make_response(200, load_json_fixture("oauth_token.json"))
+        mock_session.post = MagicMock(return_value=token_response)
+        mock_session.request = MagicMock(return_value=make_response(401))
+
+        with pytest.raises(WienerNetzeAuthError, match="after re-authentication"):
+            await api_client._get("/test")
+
+        assert mock_session.request.call_count == 2
+        assert mock_session.post.call_count == 1
+        assert api_client.retry_stats["reauthentications"] == 1
+        assert api_client.recent_calls[-1]["reauthenticated"]
+
+    async def test_retries_after_reauthentication(self, api_client, mock_session):
+        """Test that re-authentication does not use up a retry."""
+        token_response = make_response(200, load_json_fixture("oauth_token.json"))
+        mock_session.post = MagicMock(return_value=token_response)
+        mock_session.request = MagicMock(
+            side_effect=[
+                make_response(401),
+                make_response(503),
+                make_response(503),
+                make_response(200, {"data": "test"}),
+            ]
+        )
+
+        assert await api_client._get("/test") == {"data": "test"}
+        assert mock_session.request.call_count == 4
+        assert api_client.recent_calls[-1]["attempts"] == 4
+        assert api_client.retry_stats["total_retries"] == 2
+
+
+class TestTokenManager:
+    """Tests for the shared access token."""
+
+    @pytest.fixture
+    def token_response(self):
+        """Return a token response that completes after a short delay."""
+
+        async def delayed_enter():
+            await asyncio.sleep(0.01)
+            return mock_response
+
+        mock_response = make_response(200, load_json_fixture("oauth_token.json"))
+        mock_response.__aenter__ = AsyncMock(side_effect=delayed_enter)
+        return mock_response
+
+    async def test_single_flight(self, mock_session, token_response):
+        """Test that concurrent callers share one token request."""
+        mock_session.post = MagicMock(return_value=token_response)
+        token_manager = TokenManager(mock_session, "id", "secret")
+
+        await asyncio.gather(*(token_manager.async_ensure_token() for _ in range(5)))
+
+        assert mock_session.post.call_count == 1
+        assert token_manager.has_valid_token
+        assert token_manager.refreshes == 1
+
+    async def test_single_flight_error(self, mock_session):
+        """Test that a failed token request fails all waiters once."""
+        mock_session.post = MagicMock(return_value=make_response(401))
+        token_manager = TokenManager(mock_session, "id", "secret")
+
+        results = await asyncio.gather(
+            token_manager.async_refresh(),
+            token_manager.async_refresh(),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, WienerNetzeAuthError) for result in results)
+        assert mock_session.post.call_count == 1
+
+        # The next call sends a new request
+        with pytest.raises(WienerNetzeAuthError):
+            await token_manager.async_refresh()
+        assert mock_session.post.call_count == 2
+
+    async def test_restore_and_invalidate(self, mock_session):
+        """Test that newer tokens are kept and replaced tokens not discarded."""
+        token_manager = TokenManager(mock_session, "id", "secret")
+        expires_at = datetime.now() + timedelta(hours=1)
+
+        assert token_manager.restore("new", expires_at)
+        assert token_manager.restore("old", expires_at - timedelta(minutes=30))
+        assert token_manager.access_token == "new"
+
+        token_manager.invalidate("old")
+        assert token_manager.access_token == "new"
+
+        token_manager.invalidate("new")
+        assert not token_manager.has_valid_token
+
+    async def test_background_refresh(self, mock_session, token_response):
+        """Test that the token is renewed before it expires."""
+        mock_session.post = MagicMock(return_value=token_response)
+        token_manager = TokenManager(mock_session, "id", "secret", auto_refresh=True)
+
+        # Due for renewal right away
+        token_manager.restore("old", datetime.now() + TOKEN_REFRESH_AHEAD)
+        await asyncio.sleep(0.05)
+
+        assert mock_session.post.call_count == 1
+        assert token_manager.access_token != "old"
+        assert token_manager._timer is not None
+
+        token_manager.close()
+        assert token_manager._timer is None
+
+    async def test_clients_share_token(self, mock_session, token_response):
+        """Test that clients of one account authenticate once."""
+        mock_session.post = MagicMock(return_value=token_response)
+        mock_session.request = MagicMock(return_value=make_response(200, {}))
+        token_manager = TokenManager(mock_session, "id", "secret")
+        clients = [
+            WienerNetzeApiClient(
+                mock_session, "id", "secret", "key", token_manager=token_manager
+            )
+            for _ in range(3)
+        ]
+
+        await asyncio.gather(*(client._get("/test") for client in clients))
+
+        assert mock_session.post.call_count == 1
+        assert mock_session.request.call_count == 3
+
+
 class TestMeterPoints:
     """Tests for meter point retrieval."""
 
     async def test_get_meter_points_success(self, api_client, mock_session):
         """Test successful meter points retrieval."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         meter_points_data = load_json_fixture("meter_points.json")
 
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value=meter_points_data)
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -423,13 +681,38 @@ class TestMeterPoints:
         assert result[0]["verbrauchsstelle"]["strasse"] == "Teststraße"
         assert result[1]["verbrauchsstelle"]["postleitzahl"] == "1020"
 
+    async def test_get_meter_points_filtered(self, api_client, mock_session):
+        """Test that only the requested meter points are queried."""
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+
+        meter_points_data = load_json_fixture("meter_points.json")
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+        mock_response.json = AsyncMock(
+            return_value={"items": meter_points_data["items"][:1]}
+        )
+        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_response.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session.request = MagicMock(return_value=mock_response)
+
+        meter_id = meter_points_data["items"][0]["zaehlpunktnummer"]
+        result = await api_client.get_meter_points(meter_ids=[meter_id])
+
+        assert [mp["zaehlpunktnummer"] for mp in result] == [meter_id]
+        assert mock_session.request.call_args.kwargs["params"] == [
+            ("zaehlpunkt", meter_id)
+        ]
+
     async def test_get_meter_points_empty(self, api_client, mock_session):
         """Test meter points retrieval with no meters."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value={"items": []})
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -442,11 +725,11 @@ class TestMeterPoints:
 
     async def test_get_meter_points_auth_error(self, api_client, mock_session):
         """Test meter points retrieval with auth error."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 403
+        mock_response.headers = {}
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -457,11 +740,11 @@ class TestMeterPoints:
 
     async def test_get_meter_points_not_found(self, api_client, mock_session):
         """Test meter points retrieval with not found error."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 404
+        mock_response.headers = {}
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -561,13 +844,13 @@ class TestConsumptionData:
 
     async def test_get_consumption_data_quarter_hour(self, api_client, mock_session):
         """Test consumption data retrieval with 15-minute intervals."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         consumption_data = load_json_fixture("consumption_quarter_hour.json")
 
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value=consumption_data)
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -590,13 +873,13 @@ class TestConsumptionData:
 
     async def test_get_consumption_data_with_params(self, api_client, mock_session):
         """Test consumption data retrieval with correct query parameters."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         consumption_data = load_json_fixture("consumption_quarter_hour.json")
 
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value=consumption_data)
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -620,11 +903,11 @@ class TestConsumptionData:
 
     async def test_get_consumption_data_not_found(self, api_client, mock_session):
         """Test consumption data retrieval with invalid meter point."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         mock_response = AsyncMock()
         mock_response.status = 404
+        mock_response.headers = {}
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
 
@@ -639,8 +922,7 @@ class TestConsumptionData:
 
     async def test_get_consumption_data_empty(self, api_client, mock_session):
         """Test consumption data retrieval with no readings."""
-        api_client._access_token = "test_token"
-        api_client._token_expires_at = datetime.now() + timedelta(hours=1)
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
 
         empty_data = {
             "zaehlpunkt": "AT0010000000000000001000000000001",
@@ -649,6 +931,7 @@ class TestConsumptionData:
 
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.headers = {}
         mock_response.json = AsyncMock(return_value=empty_data)
         mock_response.__aenter__ = AsyncMock(return_value=mock_response)
         mock_response.__aexit__ = AsyncMock(return_value=None)
@@ -663,6 +946,151 @@ class TestConsumptionData:
 
         assert len(result["zaehlwerke"]) == 0
 
+    async def test_get_consumption_data_batch(self, api_client, mock_session):
+        """Test batch consumption data retrieval for several meter points."""
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+
+        consumption_data = load_json_fixture("consumption_quarter_hour.json")
+        second = {**consumption_data, "zaehlpunkt": "AT0010000000000000001000000000002"}
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+        mock_response.json = AsyncMock(return_value=[consumption_data, second])
+        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_response.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session.request = MagicMock(return_value=mock_response)
+
+        result = await api_client.get_consumption_data_batch(
+            meter_points=[
+                "AT0010000000000000001000000000001",
+                "AT0010000000000000001000000000002",
+            ],
+            date_from="2024-11-10",
+            date_to="2024-11-10",
+        )
+
+        assert set(result) == {
+            "AT0010000000000000001000000000001",
+            "AT0010000000000000001000000000002",
+        }
+        assert result["AT0010000000000000001000000000002"]["zaehlwerke"] == (
+            consumption_data["zaehlwerke"]
+        )
+
+        # One request with a repeated zaehlpunkt query parameter
+        mock_session.request.assert_called_once()
+        call_args = mock_session.request.call_args
+        assert call_args.args[1].endswith("/zaehlpunkte/messwerte")
+        params = call_args.kwargs["params"]
+        assert ("datumVon", "2024-11-10") in params
+        assert ("wertetyp", GRANULARITY_QUARTER_HOUR) in params
+        assert [value for key, value in params if key == "zaehlpunkt"] == [
+            "AT0010000000000000001000000000001",
+            "AT0010000000000000001000000000002",
+        ]
+
+    async def test_get_consumption_data_batch_error(self, api_client, mock_session):
+        """Test batch consumption data retrieval with API error."""
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+
+        mock_response = AsyncMock()
+        mock_response.status = 400
+        mock_response.headers = {}
+        mock_response.text = AsyncMock(return_value="Invalid parameter")
+        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_response.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session.request = MagicMock(return_value=mock_response)
+
+        with pytest.raises(WienerNetzeBadRequestError):
+            await api_client.get_consumption_data_batch(
+                meter_points=["AT0010000000000000001000000000001"],
+                date_from="2024-11-10",
+                date_to="2024-11-10",
+            )
+
+    async def test_stream_consumption_data(self, api_client, mock_session):
+        """Test streaming consumption data."""
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+
+        consumption_data = load_json_fixture("consumption_quarter_hour.json")
+        body = json.dumps(consumption_data).encode()
+
+        async def iter_chunked(size):
+            for start in range(0, len(body), 100):
+                end = start + 100
+                yield body[start:end]
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+        mock_response.content.iter_chunked = iter_chunked
+        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_response.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session.request = MagicMock(return_value=mock_response)
+
+        readings = []
+        async for zaehlwerk in api_client.stream_consumption_data(
+            meter_point="AT0010000000000000001000000000001",
+            date_from="2024-11-10",
+            date_to="2024-11-10",
+        ):
+            assert zaehlwerk["obisCode"] == "1-1:1.8.0"
+            readings.extend(zaehlwerk["messwerte"])
+
+        assert readings == consumption_data["zaehlwerke"][0]["messwerte"]
+        mock_response.json.assert_not_called()
+        assert mock_session.request.call_args.kwargs["timeout"] is STREAM_TIMEOUT
+
+    async def test_stream_consumption_data_invalid(self, api_client, mock_session):
+        """Test streaming an invalid response."""
+        api_client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+
+        async def iter_chunked(size):
+            yield b'{"zaehlwerke": [{'
+
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {}
+        mock_response.content.iter_chunked = iter_chunked
+        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_response.__aexit__ = AsyncMock(return_value=None)
+
+        mock_session.request = MagicMock(return_value=mock_response)
+
+        with pytest.raises(WienerNetzeApiError, match="Invalid response"):
+            async for _ in api_client.stream_consumption_data(
+                meter_point="AT0010000000000000001000000000001",
+                date_from="2024-11-10",
+                date_to="2024-11-10",
+            ):
+                pass
+
+    def test_split_consumption_batch(self):
+        """Test splitting a batch response into per meter point data."""
+        consumption_data = load_json_fixture("consumption_quarter_hour.json")
+        meter_id = consumption_data["zaehlpunkt"]
+        extra_register = {"obisCode": "1-1:2.8.0", "einheit": "kWh", "messwerte": []}
+
+        result = split_consumption_batch(
+            {
+                "items": [
+                    consumption_data,
+                    {"zaehlpunkt": meter_id, "zaehlwerke": [extra_register]},
+                    {"zaehlwerke": []},
+                ]
+            }
+        )
+
+        assert list(result) == [meter_id]
+        assert len(result[meter_id]["zaehlwerke"]) == 2
+        assert result[meter_id]["zaehlwerke"][1] == extra_register
+        # The input data is not modified
+        assert len(consumption_data["zaehlwerke"]) == 1
+
     def test_calculate_total_consumption(self):
         """Test total consumption calculation."""
         readings = [
@@ -755,3 +1183,47 @@ class TestConsumptionData:
         assert result.day == 10
         assert result.hour == 0
         assert result.minute == 15
+
+    @pytest.mark.parametrize(
+        "timestamp",
+        [
+            "2024-11-10T00:15:00.000+01:00",
+            "2024-07-01T23:45:00.000+02:00",
+            "2024-10-27T02:00:00.000+01:00",
+            "2024-10-27T02:00:00.000+02:00",
+            "2024-01-01T00:00:00.000-05:30",
+            "2024-11-10T00:15:00Z",
+            "2024-11-10T00:15:00+01:00",
+        ],
+    )
+    def test_parse_consumption_epoch(self, timestamp):
+        """Test that the fast path matches datetime.fromisoformat."""
+        expected = datetime.fromisoformat(timestamp)
+
+        epoch, offset = parse_consumption_epoch(timestamp)
+
+        assert epoch == expected.timestamp()
+        assert offset == expected.utcoffset().total_seconds() // 60
+        # Interned result
+        assert parse_consumption_epoch(timestamp) == (epoch, offset)
+
+    def test_parse_consumption_epoch_invalid(self):
+        """Test that invalid timestamps raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_consumption_epoch("2024-13-10T00:15:00.000+01:00")
+
+        with pytest.raises(ValueError):
+            parse_consumption_epoch("not a timestamp")
+
+    def test_parse_consumption_epochs(self):
+        """Test parsing the timestamps of a list of readings."""
+        data = load_json_fixture("consumption_quarter_hour.json")
+        readings = data["zaehlwerke"][0]["messwerte"]
+
+        result = parse_consumption_epochs(readings)
+
+        assert len(result) == len(readings)
+        for reading, (start, end, start_offset, end_offset) in zip(readings, result):
+            assert start == parse_consumption_timestamp(reading["zeitVon"]).timestamp()
+            assert end == parse_consumption_timestamp(reading["zeitBis"]).timestamp()
+            assert start_offset == end_offset == 60
@@ -0,0 +1,298 @@
+"""Tests for backfill.py."""
+import asyncio
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.wiener_netze.api import (
+    WienerNetzeApiError,
+    WienerNetzeAuthError,
+    WienerNetzeRateLimitError,
+)
+from custom_components.wiener_netze.backfill import WienerNetzeBackfill, plan_chunks
+from custom_components.wiener_netze.const import (
+    DOMAIN,
+    GRANULARITY_DAY,
+    GRANULARITY_QUARTER_HOUR,
+    PRIORITY_BACKFILL,
+)
+from custom_components.wiener_netze.services import async_setup_services
+from custom_components.wiener_netze.storage import WienerNetzeHistoryStore
+
+METER_ID = "AT0010000000000000001000000000001"
+ENTRY_ID = "test_entry"
+
+
+def make_zaehlwerk(date_from: str, date_to: str) -> dict:
+    """Create one daily reading per day of a range."""
+    day = date.fromisoformat(date_from)
+    readings = []
+    while day <= date.fromisoformat(date_to):
+        start = datetime(day.year, day.month, day.day).isoformat()
+        end = (datetime(day.year, day.month, day.day) + timedelta(days=1)).isoformat()
+        readings.append(
+            {
+                "zeitVon": f"{start}.000+01:00",
+                "zeitBis": f"{end}.000+01:00",
+                "messwert": 1.0,
+                "qualitaet": "VAL",
+            }
+        )
+        day += timedelta(days=1)
+    return {"obisCode": "1-1:1.8.0", "einheit": "kWh", "messwerte": readings}
+
+
+@pytest.fixture
+def mock_api_client():
+    """Return an API client streaming one reading per day."""
+    client = MagicMock()
+
+    async def stream(meter_point, date_from, date_to, granularity, priority):
+        yield make_zaehlwerk(date_from, date_to)
+
+    client.stream_consumption_data = MagicMock(side_effect=stream)
+    return client
+
+
+@pytest.fixture
+def history_store(hass: HomeAssistant) -> WienerNetzeHistoryStore:
+    """Return a history store."""
+    return WienerNetzeHistoryStore(hass, ENTRY_ID)
+
+
+def test_plan_chunks_quarter_hour():
+    """Test splitting a range into calendar months."""
+    assert plan_chunks(
+        date(2023, 11, 15), date(2024, 2, 10), GRANULARITY_QUARTER_HOUR
+    ) == [
+        (date(2023, 11, 15), date(2023, 11, 30)),
+        (date(2023, 12, 1), date(2023, 12, 31)),
+        (date(2024, 1, 1), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 2, 10)),
+    ]
+
+
+def test_plan_chunks_day():
+    """Test splitting a range into calendar years."""
+    assert plan_chunks(date(2022, 6, 1), date(2024, 3, 1), GRANULARITY_DAY) == [
+        (date(2022, 6, 1), date(2022, 12, 31)),
+        (date(2023, 1, 1), date(2023, 12, 31)),
+        (date(2024, 1, 1), date(2024, 3, 1)),
+    ]
+    assert plan_chunks(date(2024, 3, 2), date(2024, 3, 1), GRANULARITY_DAY) == []
+
+
+async def test_backfill(hass: HomeAssistant, mock_api_client, history_store):
+    """Test backfilling chunks into the history store."""
+    backfill = WienerNetzeBackfill(mock_api_client, history_store)
+
+    changed = await backfill.async_backfill(
+        [METER_ID], date(2024, 1, 1), date(2024, 3, 31), GRANULARITY_QUARTER_HOUR
+    )
+
+    assert changed == 91
+    assert mock_api_client.stream_consumption_data.call_count == 3
+    assert not backfill.is_running
+
+    series = history_store.get_series(METER_ID, GRANULARITY_QUARTER_HOUR)
+    assert series.total(date(2024, 2, 29)) == 1.0
+    assert len(series.registers["1-1:1.8.0"]) == 91
+
+
+async def test_backfill_resume(
+    hass: HomeAssistant, hass_storage, mock_api_client, history_store
+):
+    """Test that completed chunks are skipped after a restart."""
+    backfill = WienerNetzeBackfill(mock_api_client, history_store)
+    await backfill.async_backfill(
+        [METER_ID], date(2024, 1, 1), date(2024, 2, 29), GRANULARITY_QUARTER_HOUR
+    )
+    await hass.async_block_till_done()
+    await history_store._store.async_save(history_store._data_to_save())
+
+    # Restart with the stored history
+    mock_api_client.stream_consumption_data.reset_mock()
+    restored = WienerNetzeHistoryStore(hass, ENTRY_ID)
+    backfill = WienerNetzeBackfill(mock_api_client, restored)
+
+    changed = await backfill.async_backfill(
+        [METER_ID], date(2024, 1, 1), date(2024, 3, 31), GRANULARITY_QUARTER_HOUR
+    )
+
+    assert changed == 31
+    mock_api_client.stream_consumption_data.assert_called_once_with(
+        METER_ID,
+        "2024-03-01",
+        "2024-03-31",
+        GRANULARITY_QUARTER_HOUR,
+        priority=PRIORITY_BACKFILL,
+    )
+    series = restored.get_series(METER_ID, GRANULARITY_QUARTER_HOUR)
+    assert len(series.registers["1-1:1.8.0"]) == 91
+
+
+async def test_backfill_recent_chunk_not_checkpointed(
+    hass: HomeAssistant, mock_api_client, history_store
+):
+    """Test that chunks that might still be revised are fetched again."""
+    backfill = WienerNetzeBackfill(mock_api_client, history_store)
+    today = date.today()
+
+    await backfill.async_backfill([METER_ID], today, today, GRANULARITY_DAY)
+    await backfill.async_backfill([METER_ID], today, today, GRANULARITY_DAY)
+
+    assert mock_api_client.stream_consumption_data.call_count == 2
+
+
+async def test_backfill_rate_limit_retry(
+    hass: HomeAssistant, mock_api_client, history_store
+):
+    """Test that rate limited chunks are retried with backoff."""
+    calls = 0
+
+    async def stream(meter_point, date_from, date_to, granularity, priority):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise WienerNetzeRateLimitError("Rate limit exceeded")
+        yield make_zaehlwerk(date_from, date_to)
+
+    mock_api_client.stream_consumption_data.side_effect = stream
+    backfill = WienerNetzeBackfill(mock_api_client, history_store)
+
+    with patch("custom_components.wiener_netze.backfill.asyncio.sleep") as mock_sleep:
+        changed = await backfill.async_backfill(
+            [METER_ID], date(2024, 1, 1), date(2024, 1, 31), GRANULARITY_QUARTER_HOUR
+        )
+
+    assert changed == 31
+    mock_sleep.assert_called_once_with(30)
+
+
+async def test_backfill_rate_limit_retry_after(
+    hass: HomeAssistant, mock_api_client, history_store
+):
+    """Test that the server's retry delay is used without blocking a slot."""
+    requested = []
+
+    async def stream(meter_point, date_from, date_to, granularity, priority):
+        requested.append(date_from)
+        if len(requested) == 1:
+            raise WienerNetzeRateLimitError("Rate limit exceeded", retry_after=120)
+        yield make_zaehlwerk(date_from, date_to)
+
+    async def sleep(delay):
+        await real_sleep(0)
+
+    real_sleep = asyncio.sleep
+    mock_api_client.stream_consumption_data.side_effect = stream
+    backfill = WienerNetzeBackfill(mock_api_client, history_store)
+
+    with patch(
+        "custom_components.wiener_netze.backfill.BACKFILL_MAX_CONCURRENT", 1
+    ), patch(
+        "custom_components.wiener_netze.backfill.asyncio.sleep", side_effect=sleep
+    ) as mock_sleep:
+        changed = await backfill.async_backfill(
+            [METER_ID], date(2024, 1, 1), date(2024, 2, 29), GRANULARITY_QUARTER_HOUR
+        )
+
+    assert changed == 60
+    mock_sleep.assert_called_once_with(120)
+    # The next chunk was fetched while the first one was waiting
+    assert requested == ["2024-01-01", "2024-02-01", "2024-01-01"]
+
+
+async def test_backfill_partial_failure(
+    hass: HomeAssistant, mock_api_client, history_store
+):
+    """Test that failed chunks are reported and not checkpointed."""
+
+    async def stream(meter_point, date_from, date_to, granularity, priority):
+        if date_from == "2024-02-01":
+            raise WienerNetzeApiError("Server error")
+        yield make_zaehlwerk(date_from, date_to)
+
+    mock_api_client.stream_consumption_data.side_effect = stream
+    backfill = WienerNetzeBackfill(mock_api_client, history_store)
+
+    with pytest.raises(WienerNetzeApiError, match="1 of 2 chunk"):
+        await backfill.async_backfill(
+            [METER_ID], date(2024, 1, 1), date(2024, 2, 29), GRANULARITY_QUARTER_HOUR
+        )
+
+    assert history_store.is_chunk_done(
+        METER_ID, GRANULARITY_QUARTER_HOUR, (date(2024, 1, 1), date(2024, 1, 31))
+    )
+    assert not history_store.is_chunk_done(
+        METER_ID, GRANULARITY_QUARTER_HOUR, (date(2024, 2, 1), date(2024, 2, 29))
+    )
+
+
+async def test_backfill_auth_error(hass: HomeAssistant, mock_api_client, history_store):
+    """Test that authentication errors abort the backfill."""
+
+    async def stream(meter_point, date_from, date_to, granularity, priority):
+        raise WienerNetzeAuthError("Invalid credentials")
+        yield  # pragma: no cover
+
+    mock_api_client.stream_consumption_data.side_effect = stream
+    backfill = WienerNetzeBackfill(mock_api_client, history_store)
+
+    with pytest.raises(WienerNetzeAuthError):
+        await backfill.async_backfill(
+            [METER_ID], date(2024, 1, 1), date(2024, 1, 31), GRANULARITY_QUARTER_HOUR
+        )
+
+
+async def test_backfill_service(hass: HomeAssistant, mock_api_client, history_store):
+    """Test starting a backfill with the service."""
+    entry = MagicMock()
+    entry.async_create_background_task = lambda hass, target, name: (
+        hass.async_create_task(target)
+    )
+    coordinator = MagicMock()
+    coordinator.entry_meter_points = MagicMock(
+        return_value=[{"zaehlpunktnummer": METER_ID}]
+    )
+    coordinator.backfills = {
+        ENTRY_ID: WienerNetzeBackfill(mock_api_client, history_store)
+    }
+    coordinator.entries = {ENTRY_ID: entry}
+    coordinator.async_apply_backfill = AsyncMock()
+    hass.data[DOMAIN] = {ENTRY_ID: coordinator}
+    async_setup_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "backfill",
+        {"start_date": "2024-01-01", "end_date": "2024-01-31"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    mock_api_client.stream_consumption_data.assert_called_once_with(
+        METER_ID,
+        "2024-01-01",
+        "2024-01-31",
+        GRANULARITY_QUARTER_HOUR,
+        priority=PRIORITY_BACKFILL,
+    )
+    # The backfilled history is handed to the coordinator
+    coordinator.async_apply_backfill.assert_awaited_once_with(
+        coordinator.backfills[ENTRY_ID],
+        [METER_ID],
+        date(2024, 1, 1),
+        GRANULARITY_QUARTER_HOUR,
+    )
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "backfill",
+            {"start_date": "2024-01-01", "meter_point": "AT999"},
+            blocking=True,
+        )
@@ -0,0 +1,174 @@
+"""Tests for cache.py."""
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import ClientSession
+from multidict import CIMultiDict
+
+from custom_components.wiener_netze.api import WienerNetzeApiClient
+from custom_components.wiener_netze.cache import (
+    ResponseCache,
+    consumption_cache_ttl,
+)
+from custom_components.wiener_netze.const import CACHE_TTL_RECENT
+
+METER_ID = "AT0010000000000000001000000000001"
+
+
+def make_zaehlwerke(*qualities: str, last: date | None = None) -> list[dict]:
+    """Create a Zählwerk with one day value per quality, ending on last."""
+    if last is None:
+        last = date.today() - timedelta(days=1)
+    first = last - timedelta(days=len(qualities) - 1)
+    return [
+        {
+            "obisCode": "1-1:1.8.0",
+            "messwerte": [
+                {
+                    "zeitVon": f"{first + timedelta(days=i)}T00:00:00.000+01:00",
+                    "zeitBis": f"{first + timedelta(days=i + 1)}T00:00:00.000+01:00",
+                    "messwert": 0.1,
+                    "qualitaet": q,
+                }
+                for i, q in enumerate(qualities)
+            ],
+        }
+    ]
+
+
+def make_response(status: int, data: dict | None = None, headers=None) -> AsyncMock:
+    """Return a mock response."""
+    mock_response = AsyncMock()
+    mock_response.status = status
+    mock_response.headers = CIMultiDict(headers or {})
+    mock_response.read = AsyncMock(return_value=b"{}")
+    mock_response.json = AsyncMock(return_value=data)
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    return mock_response
+
+
+@pytest.fixture
+def client():
+    """Return an API client with a valid token."""
+    session = MagicMock(spec=ClientSession)
+    client = WienerNetzeApiClient(session, "id", "secret", "key")
+    client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+    return client
+
+
+def test_consumption_cache_ttl():
+    """Test that only validated past days never expire."""
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    today = date.today().isoformat()
+
+    assert consumption_cache_ttl(yesterday, make_zaehlwerke("VAL", "VAL")) is None
+    assert consumption_cache_ttl(yesterday, make_zaehlwerke("VAL", "EST")) == (
+        CACHE_TTL_RECENT
+    )
+    assert consumption_cache_ttl(yesterday, make_zaehlwerke()) == CACHE_TTL_RECENT
+    assert consumption_cache_ttl(today, make_zaehlwerke("VAL")) == CACHE_TTL_RECENT
+
+
+def test_consumption_cache_ttl_incomplete():
+    """Test that validated past days missing readings expire."""
+    yesterday = date.today() - timedelta(days=1)
+
+    # Yesterday's value is not published yet
+    missing_last_day = make_zaehlwerke("VAL", "VAL", last=yesterday - timedelta(days=1))
+    assert consumption_cache_ttl(yesterday.isoformat(), missing_last_day) == (
+        CACHE_TTL_RECENT
+    )
+
+    # A day in between is missing
+    gap = make_zaehlwerke("VAL", "VAL", "VAL")
+    del gap[0]["messwerte"][1]
+    assert consumption_cache_ttl(yesterday.isoformat(), gap) == CACHE_TTL_RECENT
+
+    # Every Zählwerk has to be complete
+    complete = make_zaehlwerke("VAL", "VAL")
+    partial = {**complete[0], "obisCode": "1-1:2.8.0", "messwerte": []}
+    assert consumption_cache_ttl(yesterday.isoformat(), complete) is None
+    assert consumption_cache_ttl(yesterday.isoformat(), [*complete, partial]) == (
+        CACHE_TTL_RECENT
+    )
+
+
+def test_response_cache_lru():
+    """Test key normalization and eviction of the least recently used entry."""
+    cache = ResponseCache(max_entries=2)
+    key_a = cache.key("/zaehlpunkte", {"b": "2", "a": "1"})
+
+    assert key_a == cache.key("zaehlpunkte", [("a", "1"), ("b", "2")])
+
+    cache.put(key_a, "a", {}, None)
+    cache.put(cache.key("b"), "b", {}, None)
+    assert cache.get(key_a).data == "a"
+    cache.put(cache.key("c"), "c", {}, 60)
+
+    assert cache.get(cache.key("b")) is None
+    assert cache.stats["entries"] == 2
+    assert cache.stats["permanent"] == 1
+
+
+async def test_past_validated_days_cached(client):
+    """Test that validated past days are only requested once."""
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    data = {"zaehlpunkt": METER_ID, "zaehlwerke": make_zaehlwerke("VAL")}
+    client._session.request = MagicMock(return_value=make_response(200, data))
+
+    for _ in range(2):
+        assert await client.get_consumption_data(METER_ID, yesterday, yesterday) == data
+
+    client._session.request.assert_called_once()
+    assert client.cache.hits == 1
+
+
+async def test_meter_points_revalidated(client):
+    """Test that a fresh meter point list is revalidated on request."""
+    data = {"items": [{"zaehlpunktnummer": METER_ID}]}
+    client._session.request = MagicMock(
+        side_effect=[
+            make_response(200, data, {"ETag": '"v1"'}),
+            make_response(304),
+        ]
+    )
+
+    assert await client.get_meter_points() == data["items"]
+    assert await client.get_meter_points() == data["items"]
+    assert client._session.request.call_count == 1
+
+    assert await client.get_meter_points(revalidate=True) == data["items"]
+    assert client._session.request.call_count == 2
+    headers = client._session.request.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+
+
+async def test_today_revalidated(client):
+    """Test that stale data is revalidated with its ETag."""
+    today = date.today().isoformat()
+    data = {"zaehlpunkt": METER_ID, "zaehlwerke": make_zaehlwerke("VAL")}
+    client._session.request = MagicMock(
+        side_effect=[
+            make_response(200, data, {"ETag": '"v1"'}),
+            make_response(304),
+        ]
+    )
+
+    await client.get_consumption_data(METER_ID, today, today)
+    # Within the TTL the cache answers
+    assert await client.get_consumption_data(METER_ID, today, today) == data
+    assert client._session.request.call_count == 1
+
+    with patch(
+        "custom_components.wiener_netze.cache.time.monotonic",
+        return_value=10**9,
+    ):
+        assert await client.get_consumption_data(METER_ID, today, today) == data
+
+    assert client._session.request.call_count == 2
+    headers = client._session.request.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["Authorization"] == "Bearer test_token"
+    assert client.cache.not_modified == 1
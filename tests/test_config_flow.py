@@ -1,12 +1,15 @@
 """Tests for config_flow.py."""
 from homeassistant import config_entries, data_entry_flow
 from homeassistant.core import HomeAssistant
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from custom_components.wiener_netze.const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_API_KEY,
     CONF_CLIENT_ID,
     CONF_CLIENT_SECRET,
+    CONF_DEDICATED_SESSION,
+    DATA_HUBS,
     DOMAIN,
 )
 from tests.utils import load_json_fixture
@@ -243,3 +246,57 @@ async def test_duplicate_meter_point(hass: HomeAssistant, mock_config_entry):
 
         assert result["type"] == data_entry_flow.FlowResultType.ABORT
         assert result["reason"] == "already_configured"
+
+
+async def test_form_user_reuses_hub_client(hass: HomeAssistant):
+    """Test that the client of a set up account is reused without login."""
+    hub = MagicMock()
+    hub.api_client.token_manager.has_valid_token = True
+    hub.api_client.authenticate = AsyncMock()
+    hub.api_client.get_meter_points = AsyncMock(
+        return_value=load_json_fixture("meter_points.json")["items"][:1]
+    )
+    hass.data[DATA_HUBS] = {("test_client", "test_secret", "test_key"): hub}
+
+    with patch(
+        "custom_components.wiener_netze.config_flow.WienerNetzeApiClient"
+    ) as mock_client_class:
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                CONF_CLIENT_ID: "test_client",
+                CONF_CLIENT_SECRET: "test_secret",
+                CONF_API_KEY: "test_key",
+            },
+        )
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    mock_client_class.assert_not_called()
+    hub.api_client.authenticate.assert_not_called()
+    # The cached list of the hub might miss a just added meter point
+    hub.api_client.get_meter_points.assert_called_once_with(revalidate=True)
+    del hass.data[DATA_HUBS]
+
+
+async def test_options_flow(hass: HomeAssistant, mock_config_entry):
+    """Test setting the connection and polling options."""
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    with patch("custom_components.wiener_netze.async_setup_entry", return_value=True):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {CONF_DEDICATED_SESSION: True, CONF_ADAPTIVE_POLLING: False},
+        )
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options == {
+        CONF_DEDICATED_SESSION: True,
+        CONF_ADAPTIVE_POLLING: False,
+    }
@@ -1,10 +1,12 @@
 """Tests for coordinator.py."""
+import asyncio
 import pytest
-from datetime import timedelta
+from datetime import date, datetime, timedelta
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import UpdateFailed
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.wiener_netze.coordinator import (
@@ -14,11 +16,40 @@ from custom_components.wiener_netze.api import (
     WienerNetzeAuthError,
     WienerNetzeConnectionError,
     WienerNetzeApiError,
+    WienerNetzeNotFoundError,
 )
-from custom_components.wiener_netze.const import DOMAIN, CONF_METER_POINTS
+from custom_components.wiener_netze.backfill import WienerNetzeBackfill
+from custom_components.wiener_netze.const import (
+    CONF_METER_POINTS,
+    DOMAIN,
+    GRANULARITY_DAY,
+    GRANULARITY_QUARTER_HOUR,
+)
+from custom_components.wiener_netze.entity import meter_device_info
+from custom_components.wiener_netze.planner import FetchPlanner
+from custom_components.wiener_netze.storage import (
+    WienerNetzeHistoryStore,
+    WienerNetzeStore,
+)
+from tests.synthetic import SyntheticConfig, consumption_data as synthetic_data
 from tests.utils import load_json_fixture
 
 
+@pytest.fixture(autouse=True)
+def mock_batch_unavailable(mock_api_client):
+    """Make the batch endpoint unavailable unless a test mocks it."""
+    mock_api_client.get_consumption_data_batch = AsyncMock(
+        side_effect=WienerNetzeNotFoundError("Resource not found")
+    )
+
+
+@pytest.fixture(autouse=True)
+def quarter_hours_only():
+    """Only plan quarter hour requests unless a test patches this again."""
+    with patch.object(FetchPlanner, "coarse_granularities", []):
+        yield
+
+
 def create_mock_config_entry(meter_points=None):
     """Create a mock config entry with optional meter points."""
     data = {
@@ -337,8 +368,10 @@ async def test_get_latest_reading_no_messwerte(
 async def test_get_total_consumption_today(
     hass: HomeAssistant,
     mock_api_client,
+    freezer,
 ):
     """Test getting total consumption."""
+    freezer.move_to("2024-11-10 12:00:00")
     meter_points_data = load_json_fixture("meter_points.json")
     meter_points = meter_points_data.get("items", meter_points_data)
     consumption_data = load_json_fixture("consumption_quarter_hour.json")
@@ -405,3 +438,832 @@ async def test_coordinator_empty_meter_points(
     await coordinator.async_refresh()
 
     assert coordinator.data == {}
+
+
+async def test_coordinator_partial_failure(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that one failing meter point does not fail the whole refresh."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    failing_id = meter_points[1]["zaehlpunktnummer"]
+
+    async def get_consumption_data(meter_point, **kwargs):
+        if meter_point == failing_id:
+            raise WienerNetzeConnectionError("Connection failed")
+        return consumption_data
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(side_effect=get_consumption_data)
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is True
+    assert meter_points[0]["zaehlpunktnummer"] in coordinator.data
+    assert failing_id not in coordinator.data
+    assert isinstance(coordinator.meter_errors[failing_id], WienerNetzeConnectionError)
+
+
+async def test_coordinator_partial_failure_keeps_previous_data(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that a failing meter point keeps its last known data."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    failing_id = meter_points[1]["zaehlpunktnummer"]
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+    await coordinator.async_refresh()
+
+    async def get_consumption_data(meter_point, **kwargs):
+        if meter_point == failing_id:
+            raise WienerNetzeApiError("Server error")
+        return consumption_data
+
+    mock_api_client.get_consumption_data = AsyncMock(side_effect=get_consumption_data)
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is True
+    assert (
+        coordinator.data[failing_id]["consumption"]["zaehlwerke"]
+        == consumption_data["zaehlwerke"]
+    )
+    assert coordinator.data[failing_id]["error"] == "Server error"
+    assert "error" not in coordinator.data[meter_points[0]["zaehlpunktnummer"]]
+
+
+async def test_coordinator_concurrent_fetch_limit(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that meter points are fetched concurrently with an upper limit."""
+    meter_points = [
+        {"zaehlpunktnummer": f"AT00100000000000000010000000000{i:02d}"}
+        for i in range(10)
+    ]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get_consumption_data(meter_point, **kwargs):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return consumption_data
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(side_effect=get_consumption_data)
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    with patch("custom_components.wiener_netze.coordinator.MAX_CONCURRENT_REQUESTS", 3):
+        await coordinator.async_refresh()
+
+    assert len(coordinator.data) == 10
+    assert 1 < max_in_flight <= 3
+
+
+async def test_coordinator_uses_batch_for_multiple_meters(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that entries with several meter points use one batch request."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    batch_data = {
+        mp["zaehlpunktnummer"]: {
+            **consumption_data,
+            "zaehlpunkt": mp["zaehlpunktnummer"],
+        }
+        for mp in meter_points
+    }
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data_batch = AsyncMock(return_value=batch_data)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    await coordinator.async_refresh()
+
+    mock_api_client.get_consumption_data_batch.assert_called_once()
+    assert mock_api_client.get_consumption_data_batch.call_args.kwargs[
+        "meter_points"
+    ] == [mp["zaehlpunktnummer"] for mp in meter_points]
+    mock_api_client.get_consumption_data.assert_not_called()
+    for meter_point in meter_points:
+        meter_id = meter_point["zaehlpunktnummer"]
+        assert coordinator.data[meter_id]["consumption"] == batch_data[meter_id]
+        assert coordinator.data[meter_id]["meter_point"] == meter_point
+
+
+async def test_coordinator_batch_missing_meter_fetched_individually(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that meter points missing from the batch are fetched individually."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    first_id = meter_points[0]["zaehlpunktnummer"]
+    second_id = meter_points[1]["zaehlpunktnummer"]
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data_batch = AsyncMock(
+        return_value={first_id: consumption_data}
+    )
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    await coordinator.async_refresh()
+
+    mock_api_client.get_consumption_data.assert_called_once()
+    assert (
+        mock_api_client.get_consumption_data.call_args.kwargs["meter_point"]
+        == second_id
+    )
+    assert set(coordinator.data) == {first_id, second_id}
+
+
+async def test_coordinator_batch_unavailable_falls_back(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test fallback to per meter requests when the batch endpoint is missing."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    # The unsupported batch endpoint is only tried once
+    mock_api_client.get_consumption_data_batch.assert_called_once()
+    assert mock_api_client.get_consumption_data.call_count == 2 * len(meter_points)
+    assert len(coordinator.data) == len(meter_points)
+
+
+async def test_coordinator_batch_auth_error(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that an auth error from the batch request fails the refresh."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data_batch = AsyncMock(
+        side_effect=WienerNetzeAuthError("Invalid credentials")
+    )
+    mock_api_client.get_consumption_data = AsyncMock()
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success is False
+    assert isinstance(coordinator.last_exception, ConfigEntryAuthFailed)
+    mock_api_client.get_consumption_data.assert_not_called()
+
+
+async def test_get_total_consumption_today_ignores_earlier_days(
+    hass: HomeAssistant,
+    mock_api_client,
+    freezer,
+):
+    """Test that revisable readings of earlier days are not counted as today."""
+    freezer.move_to("2024-11-11 12:00:00")
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    consumption_data["zaehlwerke"][0]["messwerte"].append(
+        {
+            "zeitVon": "2024-11-11T00:00:00.000+01:00",
+            "zeitBis": "2024-11-11T00:15:00.000+01:00",
+            "messwert": 0.2,
+            "qualitaet": "VAL",
+        }
+    )
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    await coordinator.async_refresh()
+
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+    # The estimated value of the previous day is still open for revision
+    assert (
+        len(coordinator.data[meter_id]["consumption"]["zaehlwerke"][0]["messwerte"])
+        == 4
+    )
+    assert coordinator.get_total_consumption_today(meter_id) == pytest.approx(0.2)
+
+
+async def test_get_total_consumption_today_ignores_other_obis_codes(
+    hass: HomeAssistant,
+    mock_api_client,
+    freezer,
+):
+    """Test that fed-in energy is not counted as consumption."""
+    freezer.move_to("2024-11-10 12:00:00")
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    consumption = consumption_data["zaehlwerke"][0]
+    consumption_data["zaehlwerke"].insert(
+        0,
+        {
+            **consumption,
+            "obisCode": "1-1:2.8.0",
+            "messwerte": [{**r, "messwert": 5.0} for r in consumption["messwerte"]],
+        },
+    )
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+    await coordinator.async_refresh()
+
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+    expected = sum(r["messwert"] for r in consumption["messwerte"])
+    assert coordinator.get_total_consumption_today(meter_id) == pytest.approx(expected)
+    assert coordinator.get_total_consumption_today(
+        meter_id, "1-1:2.8.0"
+    ) == pytest.approx(5.0 * len(consumption["messwerte"]))
+
+
+async def test_coordinator_fetch_window_widens_for_estimated_values(
+    hass: HomeAssistant,
+    mock_api_client,
+    freezer,
+):
+    """Test that the fetch window only widens while values can be revised."""
+    freezer.move_to("2024-11-11 12:00:00")
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    # First refresh only requests today
+    await coordinator.async_refresh()
+    call_kwargs = mock_api_client.get_consumption_data.call_args.kwargs
+    assert call_kwargs["date_from"] == "2024-11-11"
+    assert call_kwargs["date_to"] == "2024-11-11"
+
+    # The previous day holds an estimated value, so it is requested again
+    await coordinator.async_refresh()
+    call_kwargs = mock_api_client.get_consumption_data.call_args.kwargs
+    assert call_kwargs["date_from"] == "2024-11-10"
+    assert call_kwargs["date_to"] == "2024-11-11"
+
+    # Once validated and complete, the window shrinks back to today
+    revised = load_json_fixture("consumption_quarter_hour.json")
+    revised["zaehlwerke"][0]["messwerte"][2]["qualitaet"] = "VAL"
+    start = datetime.fromisoformat("2024-11-10T00:45:00+01:00")
+    step = timedelta(minutes=15)
+    revised["zaehlwerke"][0]["messwerte"].extend(
+        {
+            "zeitVon": (start + i * step).isoformat(),
+            "zeitBis": (start + (i + 1) * step).isoformat(),
+            "messwert": 0.2,
+            "qualitaet": "VAL",
+        }
+        for i in range(94)
+    )
+    mock_api_client.get_consumption_data = AsyncMock(return_value=revised)
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    call_kwargs = mock_api_client.get_consumption_data.call_args.kwargs
+    assert call_kwargs["date_from"] == "2024-11-11"
+
+
+async def test_coordinator_restore_cache(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test restoring data from the persistent cache."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+
+    store = WienerNetzeStore(hass, "test_entry")
+    store.set_consumption(meter_id, "QUARTER_HOUR", consumption_data)
+    store.set_metadata_checked(datetime.now())
+
+    config_entry = create_mock_config_entry(meter_points)
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry, store)
+
+    assert coordinator.async_restore_cache() is True
+    assert coordinator.data[meter_id]["consumption"] == consumption_data
+
+    # Cached intervals are not reported as changed again
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+    mock_api_client.access_token = None
+    with patch.object(store, "async_schedule_save") as mock_save:
+        await coordinator.async_refresh()
+
+    assert coordinator._changed_meters == set()
+    mock_save.assert_not_called()
+
+
+async def test_coordinator_restore_cache_empty(
+    hass: HomeAssistant,
+    mock_config_entry,
+    mock_api_client,
+):
+    """Test restoring without cached data."""
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, mock_config_entry)
+    assert coordinator.async_restore_cache() is False
+
+    store = WienerNetzeStore(hass, "test_entry")
+    coordinator = WienerNetzeDataCoordinator(
+        hass, mock_api_client, mock_config_entry, store
+    )
+    assert coordinator.async_restore_cache() is False
+    assert coordinator.data is None
+
+
+async def test_coordinator_saves_cache(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that changed data and the token are written to the cache."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+    expires_at = datetime.now() + timedelta(hours=1)
+
+    store = WienerNetzeStore(hass, "test_entry")
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+    mock_api_client.access_token = "test_token"
+    mock_api_client.token_expires_at = expires_at
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry, store)
+
+    with patch.object(store, "async_schedule_save") as mock_save:
+        await coordinator.async_refresh()
+
+    mock_save.assert_called_once()
+    assert store.get_token() == ("test_token", expires_at)
+    stored = store.get_consumption(meter_id, "QUARTER_HOUR")
+    assert stored[0]["zaehlwerke"] == consumption_data["zaehlwerke"]
+
+
+async def test_coordinator_restores_coarse_series(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test day values and meter readings survive a restart."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+    history = SyntheticConfig(last_day=date.today() - timedelta(days=1))
+
+    def get_consumption_data(meter_point, granularity, **kwargs):
+        if granularity == GRANULARITY_QUARTER_HOUR:
+            return consumption_data
+        return synthetic_data(history, meter_point, granularity)
+
+    def date_from(granularity):
+        return next(
+            call.kwargs["date_from"]
+            for call in mock_api_client.get_consumption_data.call_args_list
+            if call.kwargs["granularity"] == granularity
+        )
+
+    store = WienerNetzeStore(hass, "test_entry")
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(side_effect=get_consumption_data)
+    mock_api_client.access_token = None
+    with patch.object(
+        FetchPlanner, "coarse_granularities", [GRANULARITY_DAY, "METER_READ"]
+    ), patch("custom_components.wiener_netze.coordinator.reconcile", return_value=[]):
+        coordinator = WienerNetzeDataCoordinator(
+            hass, mock_api_client, config_entry, store
+        )
+        await coordinator.async_refresh()
+        day_values = coordinator.get_series(meter_id, GRANULARITY_DAY)
+        first_from = date_from(GRANULARITY_DAY)
+
+        # A restarted coordinator has the history and requests the recent days
+        mock_api_client.get_consumption_data.reset_mock()
+        restarted = WienerNetzeDataCoordinator(
+            hass, mock_api_client, config_entry, store
+        )
+        assert restarted.async_restore_cache() is True
+        restored = restarted.get_series(meter_id, GRANULARITY_DAY)
+        for obis, register in day_values.registers.items():
+            assert list(restored.registers[obis].values) == list(register.values)
+        assert restarted.get_series(meter_id, "METER_READ") is not None
+
+        await restarted.async_refresh()
+        assert date_from(GRANULARITY_DAY) > first_from
+
+
+async def test_coordinator_hub_entries(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that entries sharing a coordinator are fetched in one pass."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_ids = [meter_point["zaehlpunktnummer"] for meter_point in meter_points]
+
+    first = create_mock_config_entry(meter_points[:1])
+    second = create_mock_config_entry(meter_points[1:])
+    store = WienerNetzeStore(hass, second.entry_id)
+    store.set_consumption(
+        meter_ids[1], "QUARTER_HOUR", {**consumption_data, "zaehlpunkt": meter_ids[1]}
+    )
+
+    mock_api_client.access_token = None
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, first)
+    coordinator.async_add_entry(second, store)
+
+    assert coordinator.meter_points == meter_points
+    assert coordinator.entry_meter_points(second.entry_id) == meter_points[1:]
+
+    # Only the cache of the joined entry is restored
+    assert coordinator.async_restore_cache(second.entry_id)
+    assert list(coordinator.data) == [meter_ids[1]]
+
+    mock_api_client.get_consumption_data_batch = AsyncMock(
+        return_value={
+            meter_id: {**consumption_data, "zaehlpunkt": meter_id}
+            for meter_id in meter_ids
+        }
+    )
+    await coordinator.async_refresh()
+
+    mock_api_client.get_consumption_data_batch.assert_called_once()
+    assert set(coordinator.data) == set(meter_ids)
+
+    # The first entry leaves, the second one becomes the primary entry
+    assert not coordinator.async_remove_entry(first.entry_id)
+    assert coordinator.config_entry is second
+    assert coordinator.meter_points == meter_points[1:]
+    assert list(coordinator.data) == [meter_ids[1]]
+
+    assert coordinator.async_remove_entry(second.entry_id)
+
+
+async def test_coordinator_hub_auth_failed(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that an authentication failure starts reauth for all entries."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+
+    first = create_mock_config_entry(meter_points[:1])
+    second = create_mock_config_entry(meter_points[1:])
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, first)
+    coordinator.async_add_entry(second)
+
+    mock_api_client.get_consumption_data_batch = AsyncMock(
+        side_effect=WienerNetzeAuthError("Invalid credentials")
+    )
+
+    with patch.object(second, "async_start_reauth") as mock_reauth:
+        with pytest.raises(ConfigEntryAuthFailed):
+            await coordinator._async_update_data()
+
+    mock_reauth.assert_called_once_with(hass)
+
+
+async def test_coordinator_metadata_checked_daily(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that metadata is requested at most once a day for tracked meters."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+
+    store = WienerNetzeStore(hass, "test_entry")
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+    mock_api_client.get_meter_points = AsyncMock(return_value=meter_points)
+    mock_api_client.access_token = None
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry, store)
+
+    with patch.object(store, "async_schedule_save"):
+        await coordinator.async_refresh()
+        await coordinator.async_refresh()
+
+    mock_api_client.get_meter_points.assert_called_once()
+    assert mock_api_client.get_meter_points.call_args.kwargs["meter_ids"] == [meter_id]
+    assert store.get_metadata_checked() is not None
+
+    # A failed check is retried with the next refresh
+    coordinator._metadata_checked[config_entry.entry_id] = datetime.now() - (
+        timedelta(days=2)
+    )
+    mock_api_client.get_meter_points = AsyncMock(
+        side_effect=WienerNetzeConnectionError("Connection failed")
+    )
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator._metadata_due()
+
+
+async def test_coordinator_metadata_chunked(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that metadata of many meter points is requested in chunks."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+    meter_ids = [mp["zaehlpunktnummer"] for mp in meter_points]
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_meter_points = AsyncMock(
+        side_effect=lambda priority, meter_ids: [
+            mp for mp in meter_points if mp["zaehlpunktnummer"] in meter_ids
+        ]
+    )
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    with patch("custom_components.wiener_netze.coordinator.MAX_BATCH_METER_POINTS", 1):
+        assert await coordinator._async_fetch_metadata() == meter_points
+
+    assert [
+        call.kwargs["meter_ids"]
+        for call in mock_api_client.get_meter_points.call_args_list
+    ] == [[meter_id] for meter_id in meter_ids]
+
+
+async def test_coordinator_metadata_changed(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that changed metadata updates the entry and the device."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+
+    config_entry = create_mock_config_entry(meter_points)
+    config_entry.add_to_hass(hass)
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        **meter_device_info(meter_points[0]),
+    )
+
+    renamed = {**meter_points[0], "zaehlpunktname": "Wohnung"}
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+    mock_api_client.get_meter_points = AsyncMock(return_value=[renamed])
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+    with patch.object(device_registry, "async_update_device") as mock_update:
+        await coordinator.async_refresh()
+
+    mock_update.assert_called_once_with(device.id, name="Wohnung")
+    assert coordinator.meter_points == [renamed]
+    assert coordinator.data[meter_id]["meter_point"] == renamed
+    assert config_entry.data[CONF_METER_POINTS] == [renamed]
+
+
+async def test_coordinator_adaptive_polling(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that the update interval follows the poll scheduler."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    with patch.object(
+        coordinator.scheduler, "next_interval", return_value=timedelta(hours=2)
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.update_interval == timedelta(hours=2)
+    assert coordinator.scheduler.meters[meter_id].data_end is not None
+
+    # Failed refreshes are retried at the regular interval
+    mock_api_client.get_consumption_data = AsyncMock(
+        side_effect=WienerNetzeConnectionError("Connection failed")
+    )
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(minutes=15)
+
+    # Fixed interval when disabled
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=dict(config_entry.data),
+        options={"adaptive_polling": False},
+    )
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+    with patch.object(
+        coordinator.scheduler, "next_interval", return_value=timedelta(hours=2)
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.update_interval == timedelta(minutes=15)
+
+
+async def test_coordinator_fetches_coarse_granularities(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test that day values and meter readings are fetched when due."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    def granularities():
+        return [
+            call.kwargs["granularity"]
+            for call in mock_api_client.get_consumption_data.call_args_list
+        ]
+
+    with patch.object(
+        FetchPlanner, "coarse_granularities", ["DAY", "METER_READ"]
+    ), patch(
+        "custom_components.wiener_netze.coordinator.reconcile", return_value=[]
+    ) as mock_reconcile:
+        await coordinator.async_refresh()
+        assert set(granularities()) == {"QUARTER_HOUR", "DAY", "METER_READ"}
+        assert coordinator.get_series(meter_id, "DAY") is not None
+        mock_reconcile.assert_called_once()
+
+        # Nothing new published: quarter hours only
+        mock_api_client.get_consumption_data.reset_mock()
+        await coordinator.async_refresh()
+        assert granularities() == ["QUARTER_HOUR"]
+
+    assert coordinator.mismatches == {meter_id: []}
+
+
+async def test_coordinator_imports_statistics(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test changed meter points are imported into long-term statistics."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    with patch.object(
+        coordinator.statistics, "async_import", AsyncMock(return_value=4)
+    ) as mock_import:
+        await coordinator.async_refresh()
+        mock_import.assert_awaited_once_with(meter_id, coordinator.get_series(meter_id))
+
+        # Unchanged readings are not imported again
+        await coordinator.async_refresh()
+        mock_import.assert_awaited_once()
+
+        # A failed import does not fail the refresh
+        mock_import.side_effect = RuntimeError("database is locked")
+        coordinator._changed_meters = {meter_id}
+        await coordinator._async_import_statistics()
+
+    assert coordinator.last_update_success
+
+
+async def test_coordinator_apply_backfill(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test backfilled history reaches the series and the statistics."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:1]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+    await coordinator.async_refresh()
+
+    store = WienerNetzeHistoryStore(hass, "test_entry")
+    backfill = WienerNetzeBackfill(mock_api_client, store)
+    history = SyntheticConfig(last_day=date(2024, 11, 9))
+
+    # Day values are merged into the series of the long-range totals
+    store.get_series(meter_id, GRANULARITY_DAY).merge(
+        synthetic_data(history, meter_id, GRANULARITY_DAY)
+    )
+    with patch.object(coordinator, "async_update_listeners") as mock_update:
+        await coordinator.async_apply_backfill(
+            backfill, [meter_id], history.first_day, GRANULARITY_DAY
+        )
+    mock_update.assert_called_once()
+    assert coordinator.changed_meters == {meter_id}
+    day_values = coordinator.get_series(meter_id, GRANULARITY_DAY)
+    assert day_values.registers["1-1:1.8.0"].day_range(date(2024, 1, 1)) != (0, 0)
+
+    # Quarter hours are imported into the statistics from the history, which
+    # gets the known recent quarter hours
+    store.get_series(meter_id, GRANULARITY_QUARTER_HOUR).merge(
+        synthetic_data(
+            history, meter_id, GRANULARITY_QUARTER_HOUR, first=date(2024, 11, 1)
+        )
+    )
+    with patch.object(
+        coordinator.statistics, "async_import", AsyncMock(return_value=240)
+    ) as mock_import:
+        await coordinator.async_apply_backfill(
+            backfill, [meter_id], date(2024, 11, 1), GRANULARITY_QUARTER_HOUR
+        )
+    quarter_hours = store.get_series(meter_id, GRANULARITY_QUARTER_HOUR)
+    assert quarter_hours.latest_day() == date(2024, 11, 10)
+    mock_import.assert_awaited_once_with(
+        meter_id, quarter_hours, since=datetime(2024, 11, 1).astimezone()
+    )
+
+
+async def test_coordinator_changed_meters(
+    hass: HomeAssistant,
+    mock_api_client,
+):
+    """Test unchanged meter points keep their snapshot."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)[:2]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    first_id, second_id = (mp["zaehlpunktnummer"] for mp in meter_points)
+
+    config_entry = create_mock_config_entry(meter_points)
+    mock_api_client.get_consumption_data = AsyncMock(
+        side_effect=lambda meter_point, **kwargs: {
+            **consumption_data,
+            "zaehlpunkt": meter_point,
+        }
+    )
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, config_entry)
+
+    await coordinator.async_refresh()
+    assert coordinator.changed_meters == {first_id, second_id}
+    snapshot = coordinator.get_meter_data(first_id)
+    with pytest.raises(TypeError):
+        snapshot["error"] = "immutable"
+
+    await coordinator.async_refresh()
+    assert coordinator.changed_meters == set()
+    assert coordinator.get_meter_data(first_id) is snapshot
+
+    # Only the failing meter point gets a new snapshot, once
+    async def fail_first(meter_point, **kwargs):
+        if meter_point == first_id:
+            raise WienerNetzeApiError("Server error")
+        return {**consumption_data, "zaehlpunkt": meter_point}
+
+    mock_api_client.get_consumption_data.side_effect = fail_first
+    await coordinator.async_refresh()
+    assert coordinator.changed_meters == {first_id}
+    assert coordinator.get_meter_data(first_id)["error"] == "Server error"
+
+    await coordinator.async_refresh()
+    assert coordinator.changed_meters == set()
@@ -0,0 +1,38 @@
+"""Tests for entity.py."""
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.wiener_netze.coordinator import WienerNetzeDataCoordinator
+from custom_components.wiener_netze.entity import WienerNetzeMeterEntity
+from tests.utils import load_json_fixture
+
+
+async def test_meter_entity_writes_changed_state_only(
+    hass: HomeAssistant, mock_config_entry, mock_api_client
+):
+    """Test meter point entities skip refreshes that left their data unchanged."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_point = meter_points_data.get("items", meter_points_data)[0]
+    meter_id = meter_point["zaehlpunktnummer"]
+
+    coordinator = WienerNetzeDataCoordinator(hass, mock_api_client, mock_config_entry)
+    coordinator.data = {meter_id: {"meter_point": meter_point}}
+    entity = WienerNetzeMeterEntity(coordinator, meter_point)
+    entity._written_available = True
+
+    with patch.object(entity, "async_write_ha_state") as mock_write:
+        coordinator.changed_meters = {"AT0010000000000000001000000000999"}
+        entity._handle_coordinator_update()
+        mock_write.assert_not_called()
+
+        coordinator.changed_meters = {meter_id}
+        entity._handle_coordinator_update()
+        mock_write.assert_called_once()
+
+        # Becoming unavailable is always written
+        coordinator.changed_meters = set()
+        coordinator.last_update_success = False
+        entity._handle_coordinator_update()
+        assert mock_write.call_count == 2
+        assert not entity.available
@@ -1,20 +1,32 @@
 """Tests for __init__.py."""
+from datetime import datetime, timedelta
+
 import pytest
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from unittest.mock import AsyncMock, MagicMock, patch
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.wiener_netze import (
+    async_get_token_manager,
+    async_remove_entry,
     async_setup_entry,
     async_unload_entry,
-    async_reload_entry,
 )
 from custom_components.wiener_netze.api import (
     WienerNetzeAuthError,
     WienerNetzeConnectionError,
+    WienerNetzeNotFoundError,
+)
+from custom_components.wiener_netze.const import (
+    CONF_DEDICATED_SESSION,
+    DATA_API_SESSION,
+    DATA_HUBS,
+    DATA_TOKEN_MANAGERS,
+    DOMAIN,
 )
-from custom_components.wiener_netze.const import DOMAIN
+from tests.utils import load_json_fixture
 
 
 async def test_setup_entry_success(
@@ -35,6 +47,7 @@ async def test_setup_entry_success(
         mock_client_class.return_value = mock_client
 
         mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_cache = MagicMock(return_value=False)
         mock_coordinator.async_config_entry_first_refresh = AsyncMock()
         mock_coordinator_class.return_value = mock_coordinator
 
@@ -119,9 +132,11 @@ async def test_setup_entry_first_refresh_failed(
         mock_client_class.return_value = mock_client
 
         mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_cache = MagicMock(return_value=False)
         mock_coordinator.async_config_entry_first_refresh = AsyncMock(
             side_effect=Exception("API error")
         )
+        mock_coordinator.async_shutdown = AsyncMock()
         mock_coordinator_class.return_value = mock_coordinator
 
         mock_config_entry.add_to_hass(hass)
@@ -151,7 +166,9 @@ async def test_unload_entry(
         mock_client_class.return_value = mock_client
 
         mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_cache = MagicMock(return_value=False)
         mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_shutdown = AsyncMock()
         mock_coordinator_class.return_value = mock_coordinator
 
         mock_forward.return_value = None
@@ -175,20 +192,359 @@ async def test_unload_entry(
         mock_unload_platforms.assert_called_once()
 
 
-async def test_reload_entry(
+async def test_reload_entry(hass: HomeAssistant, mock_config_entry: ConfigEntry):
+    """Test reloads go through Home Assistant and leave one update listener."""
+    with patch(
+        "custom_components.wiener_netze.WienerNetzeApiClient"
+    ) as mock_client_class, patch(
+        "custom_components.wiener_netze.WienerNetzeDataCoordinator"
+    ) as mock_coordinator_class, patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ), patch(
+        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
+        return_value=True,
+    ):
+        mock_client_class.return_value = AsyncMock()
+        mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_cache = MagicMock(return_value=False)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_shutdown = AsyncMock()
+        mock_coordinator_class.return_value = mock_coordinator
+
+        mock_config_entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        assert len(mock_config_entry.update_listeners) == 1
+
+        # Changed options reload the entry
+        hass.config_entries.async_update_entry(
+            mock_config_entry, options={CONF_DEDICATED_SESSION: True}
+        )
+        await hass.async_block_till_done()
+        assert mock_coordinator_class.call_count == 2
+        assert len(mock_config_entry.update_listeners) == 1
+
+        assert await hass.config_entries.async_reload(mock_config_entry.entry_id)
+        assert mock_coordinator_class.call_count == 3
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert len(mock_config_entry.update_listeners) == 1
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_data_update_after_options_change(
+    hass: HomeAssistant, mock_config_entry: ConfigEntry
+):
+    """Test metadata updates after an options change do not reload the entry."""
+    with patch(
+        "custom_components.wiener_netze.WienerNetzeApiClient"
+    ) as mock_client_class, patch(
+        "custom_components.wiener_netze.WienerNetzeDataCoordinator"
+    ) as mock_coordinator_class, patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ), patch(
+        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
+        return_value=True,
+    ):
+        mock_client_class.return_value = AsyncMock()
+        mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_cache = MagicMock(return_value=False)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_shutdown = AsyncMock()
+        mock_coordinator_class.return_value = mock_coordinator
+
+        mock_config_entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+        hass.config_entries.async_update_entry(
+            mock_config_entry, options={CONF_DEDICATED_SESSION: True}
+        )
+        await hass.async_block_till_done()
+        assert mock_coordinator_class.call_count == 2
+
+        # As done by the daily metadata check
+        hass.config_entries.async_update_entry(
+            mock_config_entry,
+            data={**mock_config_entry.data, "meter_points": []},
+        )
+        await hass.async_block_till_done()
+        assert mock_coordinator_class.call_count == 2
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+
+
+async def test_setup_entry_with_cache(
     hass: HomeAssistant,
+    hass_storage,
     mock_config_entry: ConfigEntry,
 ):
-    """Test reloading entry."""
-    with patch("custom_components.wiener_netze.async_setup_entry") as mock_setup, patch(
-        "custom_components.wiener_netze.async_unload_entry"
-    ) as mock_unload:
-        mock_setup.return_value = True
-        mock_unload.return_value = True
+    """Test setup serves cached data and refreshes in the background."""
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    meter_id = consumption_data["zaehlpunkt"]
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            "token": {
+                "access_token": "stored_token",
+                "expires_at": (datetime.now() + timedelta(hours=1)).isoformat(),
+            },
+            "consumption": {
+                meter_id: {
+                    "QUARTER_HOUR": {"2024-11-10": consumption_data["zaehlwerke"]}
+                }
+            },
+        },
+    }
+
+    with patch(
+        "custom_components.wiener_netze.WienerNetzeApiClient"
+    ) as mock_client_class, patch(
+        "custom_components.wiener_netze.WienerNetzeDataCoordinator"
+    ) as mock_coordinator_class, patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        mock_client = AsyncMock()
+        mock_client.restore_token = MagicMock(return_value=True)
+        mock_client_class.return_value = mock_client
+
+        mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_cache = MagicMock(return_value=True)
+        mock_coordinator.async_refresh = AsyncMock()
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator_class.return_value = mock_coordinator
 
         mock_config_entry.add_to_hass(hass)
 
-        await async_reload_entry(hass, mock_config_entry)
+        assert await async_setup_entry(hass, mock_config_entry)
+        await hass.async_block_till_done()
+
+        # Stored token is reused instead of authenticating again
+        assert mock_client.restore_token.call_args.args[0] == "stored_token"
+        mock_client.authenticate.assert_not_called()
+
+        # Cached data is served, the refresh runs in the background
+        mock_coordinator.async_config_entry_first_refresh.assert_not_called()
+        mock_coordinator.async_refresh.assert_called_once()
+
+
+async def test_setup_entry_expired_stored_token(
+    hass: HomeAssistant,
+    hass_storage,
+    mock_config_entry: ConfigEntry,
+):
+    """Test setup authenticates when the stored token has expired."""
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            "token": {
+                "access_token": "stored_token",
+                "expires_at": (datetime.now() - timedelta(hours=1)).isoformat(),
+            },
+        },
+    }
+
+    with patch(
+        "custom_components.wiener_netze.WienerNetzeApiClient"
+    ) as mock_client_class, patch(
+        "custom_components.wiener_netze.WienerNetzeDataCoordinator"
+    ) as mock_coordinator_class, patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        mock_client = AsyncMock()
+        mock_client.restore_token = MagicMock(return_value=False)
+        mock_client_class.return_value = mock_client
+
+        mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_cache = MagicMock(return_value=False)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator_class.return_value = mock_coordinator
+
+        mock_config_entry.add_to_hass(hass)
+
+        assert await async_setup_entry(hass, mock_config_entry)
+
+        mock_client.authenticate.assert_called_once()
+        mock_coordinator.async_config_entry_first_refresh.assert_called_once()
+
+
+async def test_remove_entry(
+    hass: HomeAssistant,
+    hass_storage,
+    mock_config_entry: ConfigEntry,
+):
+    """Test removing an entry removes its persistent cache and history."""
+    key = f"{DOMAIN}.{mock_config_entry.entry_id}"
+    hass_storage[key] = {"version": 1, "key": key, "data": {}}
+
+    with patch(
+        "custom_components.wiener_netze.storage.Store.async_remove"
+    ) as mock_remove:
+        await async_remove_entry(hass, mock_config_entry)
+
+    # Cache and history store
+    assert mock_remove.call_count == 2
+
+
+async def test_shared_token_manager(
+    hass: HomeAssistant,
+    mock_config_entry: ConfigEntry,
+):
+    """Test that config entries of one account share the access token."""
+    token_manager = async_get_token_manager(hass, "client", "secret")
+
+    assert async_get_token_manager(hass, "client", "secret") is token_manager
+    assert async_get_token_manager(hass, "other", "secret") is not token_manager
+
+    # Changed credentials replace the token manager
+    assert async_get_token_manager(hass, "client", "new") is not token_manager
+
+
+async def test_setup_entry_shared_token(
+    hass: HomeAssistant,
+    mock_config_entry: ConfigEntry,
+):
+    """Test that setup reuses a valid token of the account and releases it."""
+    token_manager = async_get_token_manager(
+        hass,
+        mock_config_entry.data["client_id"],
+        mock_config_entry.data["client_secret"],
+    )
+    token_manager.restore("shared_token", datetime.now() + timedelta(hours=1))
+
+    with patch(
+        "custom_components.wiener_netze.WienerNetzeApiClient"
+    ) as mock_client_class, patch(
+        "custom_components.wiener_netze.WienerNetzeDataCoordinator"
+    ) as mock_coordinator_class, patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ), patch(
+        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
+        return_value=True,
+    ):
+        mock_client = AsyncMock()
+        mock_client_class.return_value = mock_client
+
+        mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_cache = MagicMock(return_value=False)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.config_entry = mock_config_entry
+        mock_coordinator.async_shutdown = AsyncMock()
+        mock_coordinator_class.return_value = mock_coordinator
+
+        mock_config_entry.add_to_hass(hass)
+
+        assert await async_setup_entry(hass, mock_config_entry)
+
+        mock_client.authenticate.assert_not_called()
+        assert mock_client_class.call_args.kwargs["token_manager"] is token_manager
+
+        assert await async_unload_entry(hass, mock_config_entry)
+
+    assert mock_config_entry.data["client_id"] not in hass.data[DATA_TOKEN_MANAGERS]
+
+
+async def test_setup_entries_share_coordinator(hass: HomeAssistant):
+    """Test that entries with the same credentials share client and coordinator."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    credentials = {
+        "client_id": "test_client_id",
+        "client_secret": "test_client_secret",
+        "api_key": "test_api_key",
+    }
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={**credentials, "meter_points": [meter_point]},
+            unique_id=meter_point["zaehlpunktnummer"],
+        )
+        for meter_point in meter_points
+    ]
+    other = MockConfigEntry(
+        domain=DOMAIN,
+        data={**credentials, "client_id": "other", "meter_points": meter_points[:1]},
+        unique_id="other",
+    )
+
+    with patch(
+        "custom_components.wiener_netze.WienerNetzeApiClient"
+    ) as mock_client_class, patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ), patch(
+        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
+        return_value=True,
+    ):
+        mock_client = AsyncMock()
+        mock_client.access_token = None
+        mock_client.get_consumption_data = AsyncMock(return_value=consumption_data)
+        mock_client.get_consumption_data_batch = AsyncMock(
+            side_effect=WienerNetzeNotFoundError("Resource not found")
+        )
+        mock_client_class.return_value = mock_client
+
+        for entry in [*entries, other]:
+            entry.add_to_hass(hass)
+            assert await async_setup_entry(hass, entry)
+        await hass.async_block_till_done()
+
+        first, second = (hass.data[DOMAIN][entry.entry_id] for entry in entries)
+        assert first is second
+        assert first is not hass.data[DOMAIN][other.entry_id]
+        assert mock_client_class.call_count == 2
+        mock_client.authenticate.assert_called()
+        assert first.meter_points == meter_points
+        assert set(first.backfills) == {entry.entry_id for entry in entries}
+
+        # The coordinator is shut down when its last entry unloads
+        assert await async_unload_entry(hass, entries[0])
+        assert first.entries == {entries[1].entry_id: entries[1]}
+        assert len(hass.data[DATA_HUBS]) == 2
+
+        assert await async_unload_entry(hass, entries[1])
+        assert await async_unload_entry(hass, other)
+        assert hass.data[DATA_HUBS] == {}
+        assert hass.data[DATA_TOKEN_MANAGERS] == {}
+
+
+async def test_setup_entry_dedicated_session(hass: HomeAssistant):
+    """Test that the dedicated session is used and closed with the last hub."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "api_key": "test_api_key",
+        },
+        options={CONF_DEDICATED_SESSION: True},
+    )
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.wiener_netze.WienerNetzeApiClient"
+    ) as mock_client_class, patch(
+        "custom_components.wiener_netze.WienerNetzeDataCoordinator"
+    ) as mock_coordinator_class, patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ), patch(
+        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
+        return_value=True,
+    ):
+        mock_client_class.return_value = AsyncMock()
+        mock_coordinator = MagicMock()
+        mock_coordinator.async_restore_cache = MagicMock(return_value=False)
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_shutdown = AsyncMock()
+        mock_coordinator_class.return_value = mock_coordinator
+
+        assert await async_setup_entry(hass, entry)
+
+        session = hass.data[DATA_API_SESSION]
+        assert mock_client_class.call_args.kwargs["session"] is session
+        assert hass.data[DATA_TOKEN_MANAGERS]["test_client_id"]._session is session
+
+        assert await async_unload_entry(hass, entry)
 
-        mock_unload.assert_called_once()
-        mock_setup.assert_called_once()
+    assert session.closed
+    assert DATA_API_SESSION not in hass.data
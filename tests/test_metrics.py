@@ -0,0 +1,118 @@
+"""Tests for metrics.py."""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientSession
+
+from custom_components.wiener_netze.api import (
+    RetryPolicy,
+    WienerNetzeApiClient,
+    WienerNetzeRateLimitError,
+)
+from custom_components.wiener_netze.metrics import (
+    ApiMetrics,
+    LatencyHistogram,
+    endpoint_name,
+)
+
+METER_ID = "AT0010000000000000001000000000001"
+
+
+def make_response(status: int, body: bytes = b"{}") -> AsyncMock:
+    """Return a mock response with the given status and body."""
+    mock_response = AsyncMock()
+    mock_response.status = status
+    mock_response.headers = {}
+    mock_response.read = AsyncMock(return_value=body)
+    mock_response.json = AsyncMock(return_value={})
+    mock_response.text = AsyncMock(return_value="error")
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    return mock_response
+
+
+def test_endpoint_name():
+    """Test that meter point numbers are replaced by a placeholder."""
+    assert endpoint_name(f"zaehlpunkte/{METER_ID}/messwerte") == (
+        "zaehlpunkte/{zaehlpunkt}/messwerte"
+    )
+    assert endpoint_name("/zaehlpunkte/messwerte") == "zaehlpunkte/messwerte"
+
+
+def test_latency_histogram():
+    """Test bucket counts and percentile estimates."""
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+
+    assert histogram.mean is None
+    assert histogram.percentile(95) is None
+
+    for seconds in (0.05, 0.05, 0.5, 2.0):
+        histogram.observe(seconds)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.mean == 0.65
+    assert histogram.percentile(50) == 0.1
+    assert histogram.percentile(75) == 1.0
+    assert histogram.percentile(95) == 2.0
+    assert histogram.as_dict()["buckets"] == {"<=0.1": 2, "<=1.0": 1, ">1.0": 1}
+
+
+def test_api_metrics_totals():
+    """Test that calls are summed over endpoints."""
+    metrics = ApiMetrics()
+    for endpoint, attempts, reauthenticated in (
+        ("zaehlpunkte", 1, False),
+        (f"zaehlpunkte/{METER_ID}/messwerte", 3, True),
+    ):
+        metrics.record_call(
+            {
+                "method": "GET",
+                "endpoint": endpoint,
+                "attempts": attempts,
+                "reauthenticated": reauthenticated,
+                "retry_wait": 0.0,
+                "duration": 0.2,
+                "error": None,
+            }
+        )
+
+    assert metrics.total("calls") == 2
+    assert metrics.total("retries") == 1
+    assert metrics.total("reauthentications") == 1
+    assert metrics.latency.count == 2
+    assert set(metrics.as_dict()["endpoints"]) == {
+        "zaehlpunkte",
+        "zaehlpunkte/{zaehlpunkt}/messwerte",
+    }
+
+
+async def test_client_records_metrics():
+    """Test that the client records statuses, body sizes and rate limits."""
+    session = MagicMock(spec=ClientSession)
+    client = WienerNetzeApiClient(
+        session, "id", "secret", "key", retry_policy=RetryPolicy(base_delay=0)
+    )
+    client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+    session.request = MagicMock(
+        side_effect=[make_response(503), make_response(200, b'{"items": []}')]
+    )
+
+    await client._get(f"zaehlpunkte/{METER_ID}/messwerte")
+
+    metrics = client.metrics.endpoints["zaehlpunkte/{zaehlpunkt}/messwerte"]
+    assert metrics.calls == 1
+    assert metrics.errors == 0
+    assert metrics.statuses == {503: 1, 200: 1}
+    assert metrics.retries == 1
+    assert metrics.bytes_received == 13
+    assert metrics.latency.count == 1
+    assert client.metrics.requests_last_minute == 2
+
+    session.request = MagicMock(return_value=make_response(429))
+    with pytest.raises(WienerNetzeRateLimitError):
+        await client._get("zaehlpunkte")
+
+    metrics = client.metrics.endpoints["zaehlpunkte"]
+    assert metrics.rate_limited == 1
+    assert metrics.errors == 1
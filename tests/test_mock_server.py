@@ -0,0 +1,112 @@
+"""Tests for the local mock API (tests/mock_server.py)."""
+from datetime import date, timedelta
+
+from aiohttp import ClientSession
+import pytest
+
+from custom_components.wiener_netze.api import (
+    RateLimiter,
+    RetryPolicy,
+    WienerNetzeApiClient,
+    WienerNetzeNotFoundError,
+    WienerNetzeRateLimitError,
+    WienerNetzeServerError,
+)
+from tests.mock_server import MockWienerNetzeApi
+
+
+@pytest.fixture
+async def client(mock_api_server: MockWienerNetzeApi) -> WienerNetzeApiClient:
+    """Return a real API client of the mock API, without retries."""
+    async with ClientSession() as session:
+        client = WienerNetzeApiClient(
+            session,
+            "client_id",
+            "client_secret",
+            "api_key",
+            RateLimiter(requests_per_minute=10**6, burst=10**3),
+            RetryPolicy(attempts=1),
+        )
+        yield client
+        client.token_manager.close()
+
+
+async def test_meter_points(
+    client: WienerNetzeApiClient, mock_api_server: MockWienerNetzeApi
+):
+    """Test the meter points are listed and filtered."""
+    mock_api_server.config.meters = 3
+
+    meter_points = await client.get_meter_points()
+    assert [mp["zaehlpunktnummer"] for mp in meter_points] == list(
+        mock_api_server.meter_ids
+    )
+
+    filtered = await client.get_meter_points(meter_ids=[mock_api_server.meter_ids[1]])
+    assert [mp["zaehlpunktnummer"] for mp in filtered] == [mock_api_server.meter_ids[1]]
+
+
+async def test_consumption_granularities(
+    client: WienerNetzeApiClient, mock_api_server: MockWienerNetzeApi
+):
+    """Test readings are consistent across granularities and DST days."""
+    mock_api_server.config.registers = 2
+    meter_id = mock_api_server.meter_ids[0]
+
+    # Spring forward, fall back and a normal day
+    for day, intervals in (("2024-03-31", 92), ("2024-10-27", 100), ("2024-11-10", 96)):
+        quarter_hours = await client.get_consumption_data(meter_id, day, day)
+        assert [zw["obisCode"] for zw in quarter_hours["zaehlwerke"]] == [
+            "1-1:1.8.0",
+            "1-1:2.8.0",
+        ]
+        readings = quarter_hours["zaehlwerke"][0]["messwerte"]
+        assert len(readings) == intervals
+        assert {r["qualitaet"] for r in readings} == {"VAL"}
+
+        days = await client.get_consumption_data(meter_id, day, day, "DAY")
+        total = days["zaehlwerke"][0]["messwerte"][0]["messwert"]
+        assert total == pytest.approx(sum(r["messwert"] for r in readings), abs=1e-6)
+
+    reads = await client.get_consumption_data(
+        meter_id, "2024-11-09", "2024-11-10", "METER_READ"
+    )
+    counters = [r["messwert"] for r in reads["zaehlwerke"][0]["messwerte"]]
+    assert counters[1] - counters[0] == pytest.approx(total, abs=1e-6)
+
+
+async def test_batch_and_today(
+    client: WienerNetzeApiClient, mock_api_server: MockWienerNetzeApi
+):
+    """Test the batch endpoint and estimated readings of today."""
+    mock_api_server.config.meters = 2
+    today = date.today().isoformat()
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+
+    result = await client.get_consumption_data_batch(
+        list(mock_api_server.meter_ids), yesterday, today
+    )
+
+    assert set(result) == set(mock_api_server.meter_ids)
+    readings = result[mock_api_server.meter_ids[0]]["zaehlwerke"][0]["messwerte"]
+    assert readings[0]["qualitaet"] == "VAL"
+    assert len(readings) < 2 * 96 + 4
+
+
+async def test_injected_failures(
+    client: WienerNetzeApiClient, mock_api_server: MockWienerNetzeApi
+):
+    """Test injected failures are mapped by the client."""
+    with pytest.raises(WienerNetzeNotFoundError):
+        await client.get_consumption_data("AT0", "2024-11-10", "2024-11-10")
+
+    mock_api_server.config.rate_limit_rate = 1.0
+    with pytest.raises(WienerNetzeRateLimitError):
+        await client.get_meter_points()
+
+    mock_api_server.config.rate_limit_rate = 0.0
+    mock_api_server.config.error_rate = 1.0
+    with pytest.raises(WienerNetzeServerError):
+        await client.get_meter_points()
+
+    assert mock_api_server.requests["/oauth2/token"] == 1
@@ -0,0 +1,164 @@
+"""Tests for planner.py."""
+from datetime import date, datetime, timedelta
+
+from custom_components.wiener_netze.const import (
+    DAILY_HISTORY_DAYS,
+    GRANULARITY_DAY,
+    GRANULARITY_METER_READ,
+    MAX_REVISION_DAYS,
+)
+from custom_components.wiener_netze.planner import (
+    CHECK_DAY_QUARTER_HOURS,
+    CHECK_METER_READ_DAYS,
+    CONSUMER_RECENT,
+    CONSUMER_TOTALS,
+    FetchPlanner,
+    FetchRequest,
+    reconcile,
+)
+from custom_components.wiener_netze.series import ConsumptionSeries
+
+METER_ID = "AT0010000000000000001000000000001"
+OBIS_CODE = "1-1:1.8.0"
+TODAY = date(2024, 11, 12)
+DAY = datetime.fromisoformat("2024-11-10T00:00:00+01:00")
+
+
+def reading(start: datetime, end: datetime, value: float, quality: str = "VAL"):
+    """Return an API reading."""
+    return {
+        "zeitVon": start.isoformat(),
+        "zeitBis": end.isoformat(),
+        "messwert": value,
+        "qualitaet": quality,
+    }
+
+
+def make_series(readings: list[dict], einheit: str = "kWh") -> ConsumptionSeries:
+    """Return a series with the given readings."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(
+        {
+            "zaehlpunkt": METER_ID,
+            "zaehlwerke": [
+                {"obisCode": OBIS_CODE, "einheit": einheit, "messwerte": readings}
+            ],
+        }
+    )
+    return series
+
+
+def quarter_hours(value: float = 0.25, quality: str = "VAL") -> ConsumptionSeries:
+    """Return the quarter hours of DAY."""
+    step = timedelta(minutes=15)
+    return make_series(
+        [
+            reading(DAY + i * step, DAY + (i + 1) * step, value, quality)
+            for i in range(96)
+        ]
+    )
+
+
+def test_plan_consumers():
+    """Test that only the granularities of the consumers are planned."""
+    assert FetchPlanner().coarse_granularities == [
+        GRANULARITY_DAY,
+        GRANULARITY_METER_READ,
+    ]
+    planner = FetchPlanner([CONSUMER_RECENT, CONSUMER_TOTALS])
+    assert planner.coarse_granularities == [GRANULARITY_DAY]
+
+
+def test_plan_day_values():
+    """Test that day values are fetched once and then when data arrives."""
+    planner = FetchPlanner()
+    series = ConsumptionSeries(METER_ID)
+
+    requests = planner.plan(METER_ID, GRANULARITY_DAY, series, False, TODAY)
+    assert requests[0].date_from == TODAY - timedelta(days=DAILY_HISTORY_DAYS)
+    assert requests[-1].date_to == TODAY - timedelta(days=1)
+    # One request per calendar year
+    assert [r.date_from.year for r in requests] == [2023, 2024]
+
+    planner.mark_fetched(METER_ID, GRANULARITY_DAY)
+    assert planner.plan(METER_ID, GRANULARITY_DAY, series, False, TODAY) == []
+
+    # Only the open days once new data was published
+    series = make_series([reading(DAY, DAY + timedelta(days=1), 24.0)])
+    assert planner.plan(METER_ID, GRANULARITY_DAY, series, True, TODAY) == [
+        FetchRequest(GRANULARITY_DAY, date(2024, 11, 11), date(2024, 11, 11))
+    ]
+
+
+def test_plan_meter_reads():
+    """Test that meter readings are fetched for the revision window only."""
+    planner = FetchPlanner()
+    series = ConsumptionSeries(METER_ID)
+
+    assert planner.plan(METER_ID, GRANULARITY_METER_READ, series, False, TODAY) == [
+        FetchRequest(
+            GRANULARITY_METER_READ,
+            TODAY - timedelta(days=MAX_REVISION_DAYS),
+            TODAY,
+        )
+    ]
+
+    planner.mark_fetched(METER_ID, GRANULARITY_METER_READ)
+    planner.remove(METER_ID)
+    assert planner.plan(METER_ID, GRANULARITY_METER_READ, series, False, TODAY)
+
+
+def test_reconcile_day_with_quarter_hours():
+    """Test that day values are checked against complete quarter hour days."""
+    days = make_series([reading(DAY, DAY + timedelta(days=1), 24.0)])
+
+    assert reconcile(quarter_hours(0.25), days) == []
+
+    mismatches = reconcile(quarter_hours(0.26), days)
+    assert len(mismatches) == 1
+    assert mismatches[0].check == CHECK_DAY_QUARTER_HOURS
+    assert mismatches[0].obis_code == OBIS_CODE
+    assert mismatches[0].start == DAY
+    assert (mismatches[0].expected, mismatches[0].actual) == (24.0, 24.96)
+
+    # Estimated or incomplete days are not checked
+    assert reconcile(quarter_hours(0.26, "EST"), days) == []
+    incomplete = quarter_hours(0.26)
+    incomplete.registers[OBIS_CODE].drop_before(1)
+    assert reconcile(incomplete, days) == []
+
+
+def test_reconcile_meter_reads_with_days():
+    """Test that counter differences are checked against day values."""
+    midnight = DAY + timedelta(days=1)
+    days = make_series(
+        [
+            reading(DAY, midnight, 24.0),
+            reading(midnight, midnight + timedelta(days=1), 20.0),
+        ]
+    )
+    meter_reads = make_series(
+        [
+            reading(DAY, DAY, 1_000_000.0),
+            reading(
+                midnight + timedelta(days=1), midnight + timedelta(days=1), 1_044_000.0
+            ),
+        ],
+        einheit="Wh",
+    )
+
+    assert reconcile(ConsumptionSeries(METER_ID), days, meter_reads) == []
+
+    meter_reads = make_series(
+        [
+            reading(DAY, DAY, 1_000_000.0),
+            reading(
+                midnight + timedelta(days=1), midnight + timedelta(days=1), 1_050_000.0
+            ),
+        ],
+        einheit="Wh",
+    )
+    mismatches = reconcile(ConsumptionSeries(METER_ID), days, meter_reads)
+    assert [(m.check, m.expected, m.actual) for m in mismatches] == [
+        (CHECK_METER_READ_DAYS, 50.0, 44.0)
+    ]
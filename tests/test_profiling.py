@@ -0,0 +1,126 @@
+"""Tests for profiling.py."""
+from unittest.mock import AsyncMock
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.wiener_netze.api import WienerNetzeConnectionError
+from custom_components.wiener_netze.const import CONF_METER_POINTS, DOMAIN
+from custom_components.wiener_netze.coordinator import WienerNetzeDataCoordinator
+from custom_components.wiener_netze.profiling import (
+    PHASE_DECODE,
+    PHASE_NETWORK,
+    PHASE_PROCESS,
+    PHASE_STATE_WRITE,
+    CycleProfile,
+    RefreshProfiler,
+    record_phase,
+)
+from custom_components.wiener_netze.services import async_setup_services
+from tests.utils import load_json_fixture
+
+
+def create_coordinator(hass: HomeAssistant, mock_api_client):
+    """Create a coordinator for the fixture meter points."""
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_points = meter_points_data.get("items", meter_points_data)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "api_key": "test_api_key",
+            CONF_METER_POINTS: meter_points,
+        },
+    )
+    mock_api_client.get_consumption_data = AsyncMock(
+        return_value=load_json_fixture("consumption_quarter_hour.json")
+    )
+    mock_api_client.get_consumption_data_batch = AsyncMock(return_value={})
+    return WienerNetzeDataCoordinator(hass, mock_api_client, entry), meter_points
+
+
+def test_cycle_profile_request():
+    """Test that client phases are taken out of the network time."""
+    profile = CycleProfile()
+
+    with profile.request(["meter_a", "meter_b"]):
+        record_phase(PHASE_DECODE, 0.5)
+
+    # Outside a profiled request phases are ignored
+    record_phase(PHASE_DECODE, 1.0)
+    profile.finish()
+
+    assert profile.phases[PHASE_DECODE] == 0.5
+    assert profile.phases[PHASE_NETWORK] < 0.1
+    assert profile.meters["meter_a"][PHASE_DECODE] == 0.5
+    assert profile.meters["meter_b"][PHASE_DECODE] == 0.5
+    assert profile.as_dict()["phases_ms"][PHASE_DECODE] == 500.0
+
+
+def test_refresh_profiler_window():
+    """Test that only the last cycles are kept."""
+    profiler = RefreshProfiler(size=2)
+    cycles = [profiler.start_cycle() for _ in range(3)]
+
+    assert list(profiler.cycles) == cycles[1:]
+
+    cycles[2].finish(WienerNetzeConnectionError("Connection error"))
+    assert profiler.as_dict()["cycles"][1]["error"] == "Connection error"
+
+
+def test_refresh_profiler_state_write():
+    """Test state writes are recorded per cycle and per meter point."""
+    profiler = RefreshProfiler()
+    profiler.record_state_write(1.0)  # Before the first cycle
+    cycle = profiler.start_cycle()
+
+    profiler.record_state_write(0.25, "meter_a")
+    profiler.record_state_write(0.5)
+
+    assert cycle.phases[PHASE_STATE_WRITE] == 0.5
+    assert cycle.meters["meter_a"][PHASE_STATE_WRITE] == 0.25
+
+
+async def test_coordinator_records_cycles(hass: HomeAssistant, mock_api_client):
+    """Test that a refresh records phase timings per meter point."""
+    coordinator, meter_points = create_coordinator(hass, mock_api_client)
+
+    await coordinator.async_refresh()
+
+    assert len(coordinator.profiler.cycles) == 1
+    cycle = coordinator.profiler.cycles[0]
+    assert cycle.duration is not None
+    assert cycle.error is None
+    for meter_point in meter_points:
+        phases = cycle.meters[meter_point["zaehlpunktnummer"]]
+        assert PHASE_NETWORK in phases
+        assert PHASE_PROCESS in phases
+
+    mock_api_client.get_consumption_data.side_effect = WienerNetzeConnectionError(
+        "Connection error"
+    )
+    await coordinator.async_refresh()
+
+    assert coordinator.profiler.cycles[-1].error is not None
+
+
+async def test_profile_service(hass: HomeAssistant, mock_api_client):
+    """Test reading the timings and capturing a profile with the service."""
+    coordinator, _ = create_coordinator(hass, mock_api_client)
+    hass.data[DOMAIN] = {coordinator.config_entry.entry_id: coordinator}
+    async_setup_services(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN, "profile", {}, blocking=True, return_response=True
+    )
+    assert response == {
+        coordinator.config_entry.entry_id: {"cycles": [], "last_capture": None}
+    }
+
+    response = await hass.services.async_call(
+        DOMAIN, "profile", {"capture": True}, blocking=True, return_response=True
+    )
+    result = response[coordinator.config_entry.entry_id]
+    assert len(result["cycles"]) == 1
+    assert "function calls" in result["last_capture"]
@@ -0,0 +1,160 @@
+"""Tests for rate limiting."""
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientSession
+from homeassistant.core import HomeAssistant
+
+from custom_components.wiener_netze import async_get_rate_limiter
+from custom_components.wiener_netze.api import (
+    RateLimiter,
+    WienerNetzeApiClient,
+    WienerNetzeRateLimitError,
+)
+from custom_components.wiener_netze.const import (
+    PRIORITY_BACKFILL,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_UPDATE,
+)
+
+
+async def test_rate_limiter_burst():
+    """Test that a burst of requests is not delayed."""
+    limiter = RateLimiter(requests_per_minute=60, burst=5)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    for _ in range(5):
+        await limiter.acquire()
+
+    assert loop.time() - start < 0.1
+    assert limiter.stats["total_requests"] == 5
+    assert limiter.stats["tokens"] < 1
+
+
+async def test_rate_limiter_throttles():
+    """Test that requests beyond the burst wait for new tokens."""
+    limiter = RateLimiter(requests_per_minute=3000, burst=1)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    for _ in range(3):
+        await limiter.acquire()
+
+    # Two refills of 20 ms each
+    assert loop.time() - start >= 0.035
+    assert limiter.total_wait > 0
+
+
+async def test_rate_limiter_priority():
+    """Test that interactive requests go ahead of queued background requests."""
+    limiter = RateLimiter(requests_per_minute=1200, burst=1)
+    await limiter.acquire()
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    tasks = [
+        asyncio.create_task(request("backfill", PRIORITY_BACKFILL)),
+        asyncio.create_task(request("update", PRIORITY_UPDATE)),
+    ]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("setup", PRIORITY_INTERACTIVE)))
+    await asyncio.gather(*tasks)
+
+    assert order == ["setup", "update", "backfill"]
+
+
+async def test_rate_limiter_cancelled_waiter():
+    """Test that a cancelled waiter does not take a token."""
+    limiter = RateLimiter(requests_per_minute=1200, burst=1)
+    await limiter.acquire()
+
+    cancelled = asyncio.create_task(limiter.acquire(PRIORITY_INTERACTIVE))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    await limiter.acquire(PRIORITY_BACKFILL)
+
+    assert cancelled.cancelled()
+    assert limiter.total_requests == 2
+    assert limiter.stats["waiting"] == 0
+
+
+async def test_update_from_headers_retry_after():
+    """Test that Retry-After blocks all requests."""
+    limiter = RateLimiter(requests_per_minute=6000, burst=10)
+    loop = asyncio.get_running_loop()
+
+    assert limiter.update_from_headers({}) is None
+    assert limiter.update_from_headers({"Retry-After": "0.05"}) == 0.05
+
+    start = loop.time()
+    await limiter.acquire()
+    assert loop.time() - start >= 0.04
+
+
+async def test_update_from_headers_http_date():
+    """Test parsing Retry-After as HTTP date."""
+    limiter = RateLimiter()
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+
+    retry_after = limiter.update_from_headers(
+        {"Retry-After": format_datetime(retry_at, usegmt=True)}
+    )
+
+    assert 100 < retry_after <= 120
+
+
+async def test_update_from_headers_remaining():
+    """Test that the remaining quota drains the bucket."""
+    limiter = RateLimiter(requests_per_minute=60, burst=10)
+
+    assert limiter.update_from_headers({"X-RateLimit-Remaining": "3"}) is None
+    assert limiter.stats["tokens"] <= 3
+
+    assert (
+        limiter.update_from_headers(
+            {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"}
+        )
+        == 30
+    )
+    assert limiter.stats["tokens"] == 0
+
+    # Invalid values are ignored
+    assert limiter.update_from_headers({"X-RateLimit-Remaining": "n/a"}) is None
+
+
+async def test_client_rate_limited_response():
+    """Test that a 429 response blocks the shared limiter."""
+    limiter = RateLimiter()
+    session = MagicMock(spec=ClientSession)
+    client = WienerNetzeApiClient(session, "id", "secret", "key", limiter)
+    client.restore_token("test_token", datetime.now() + timedelta(hours=1))
+
+    mock_response = AsyncMock()
+    mock_response.status = 429
+    mock_response.headers = {}
+    mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+    mock_response.__aexit__ = AsyncMock(return_value=None)
+    session.request = MagicMock(return_value=mock_response)
+
+    with pytest.raises(WienerNetzeRateLimitError) as exc_info:
+        await client.get_meter_points()
+
+    assert exc_info.value.retry_after == 60
+    assert limiter.stats["rate_limited"] == 1
+    assert limiter.stats["tokens"] == 0
+
+
+async def test_shared_rate_limiter(hass: HomeAssistant):
+    """Test that config entries of one account share a limiter."""
+    limiter = async_get_rate_limiter(hass, "client_a")
+
+    assert async_get_rate_limiter(hass, "client_a") is limiter
+    assert async_get_rate_limiter(hass, "client_b") is not limiter
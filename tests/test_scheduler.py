@@ -0,0 +1,94 @@
+"""Tests for scheduler.py."""
+from datetime import timedelta
+
+from custom_components.wiener_netze.scheduler import MeterSchedule, PollScheduler
+
+METER_ID = "AT0010000000000000001000000000001"
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+MIDNIGHT = 1_700_000_000.0  # End of the first published day
+
+
+def learn_daily_pattern(scheduler: PollScheduler) -> None:
+    """Observe two daily batches, each published around 06:00."""
+    scheduler.observe(METER_ID, MIDNIGHT, now=MIDNIGHT + 6 * HOUR)
+    scheduler.observe(METER_ID, MIDNIGHT, now=MIDNIGHT + DAY + 5.75 * HOUR)
+    scheduler.observe(METER_ID, MIDNIGHT + DAY, now=MIDNIGHT + DAY + 6.25 * HOUR)
+
+
+def test_learns_publication_pattern():
+    """Test that lag and period are learned from observed arrivals."""
+    scheduler = PollScheduler()
+    schedule = scheduler.meters.setdefault(METER_ID, MeterSchedule())
+
+    assert scheduler.observe(METER_ID, None, now=MIDNIGHT) is False
+    assert schedule.expected_arrival is None
+
+    learn_daily_pattern(scheduler)
+
+    assert schedule.period == DAY
+    assert schedule.lag == 6 * HOUR
+    assert schedule.expected_arrival == MIDNIGHT + 2 * DAY + 6 * HOUR
+
+
+def test_next_interval():
+    """Test sleeping before, polling during and backing off after the window."""
+    scheduler = PollScheduler()
+
+    # Unknown pattern: regular interval
+    assert scheduler.next_interval(now=MIDNIGHT) == timedelta(minutes=15)
+
+    learn_daily_pattern(scheduler)
+    arrival = MIDNIGHT + 2 * DAY + 6 * HOUR
+
+    # Right after a batch: sleep, at most POLL_MAX_INTERVAL
+    assert scheduler.next_interval(now=MIDNIGHT + DAY + 6.25 * HOUR) == timedelta(
+        hours=6
+    )
+    # Shortly before the window: sleep until it opens
+    assert scheduler.next_interval(now=arrival - 2 * HOUR) == timedelta(hours=1)
+    # Within the window: regular interval
+    assert scheduler.next_interval(now=arrival) == timedelta(minutes=15)
+
+    # Overdue: the interval doubles with every poll that finds nothing new
+    for polls, minutes in ((1, 30), (2, 60), (3, 120)):
+        now = arrival + (1 + polls) * HOUR
+        scheduler.observe(METER_ID, MIDNIGHT + DAY, now=now)
+        assert scheduler.meters[METER_ID].overdue_polls == polls
+        assert scheduler.next_interval(now=now) == timedelta(minutes=minutes)
+
+    # New readings reset the backoff
+    scheduler.observe(METER_ID, MIDNIGHT + 2 * DAY, now=arrival + 5 * HOUR)
+    assert scheduler.meters[METER_ID].overdue_polls == 0
+
+
+def test_next_interval_follows_first_meter():
+    """Test that the meter point due first sets the interval."""
+    scheduler = PollScheduler()
+    learn_daily_pattern(scheduler)
+    now = MIDNIGHT + DAY + 6.25 * HOUR
+
+    scheduler.observe("AT0010000000000000001000000000002", None, now=now)
+
+    assert scheduler.next_interval(now=now) == timedelta(minutes=15)
+
+
+def test_restore():
+    """Test restoring a learned pattern from storage."""
+    scheduler = PollScheduler()
+    learn_daily_pattern(scheduler)
+    stored = scheduler.meters[METER_ID].as_dict()
+
+    restored = PollScheduler()
+    restored.restore(METER_ID, stored)
+    restored.restore("AT0010000000000000001000000000002", None)
+
+    assert list(restored.meters) == [METER_ID]
+    assert restored.meters[METER_ID].expected_arrival == (
+        scheduler.meters[METER_ID].expected_arrival
+    )
+
+    # The first poll after a restart does not produce a lag sample
+    restored.observe(METER_ID, MIDNIGHT + 2 * DAY, now=MIDNIGHT + 3 * DAY)
+    assert restored.meters[METER_ID].lag == 6 * HOUR
@@ -1 +1,199 @@
 """Tests for sensor.py."""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.wiener_netze.api import WienerNetzeApiClient
+from custom_components.wiener_netze.const import CONF_METER_POINTS, DOMAIN
+from custom_components.wiener_netze.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.wiener_netze.planner import FetchPlanner
+from custom_components.wiener_netze.profiling import PHASE_PROCESS, PHASE_STATE_WRITE
+from custom_components.wiener_netze.statistics import statistic_id
+from tests.utils import load_json_fixture
+
+
+@pytest.fixture
+async def loaded_entry(hass: HomeAssistant) -> MockConfigEntry:
+    """Set up a config entry without meter points and a real API client."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Wiener Netze",
+        data={
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "api_key": "test_api_key",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    with patch.object(WienerNetzeApiClient, "authenticate", AsyncMock()):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    yield entry
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_api_sensors(hass: HomeAssistant, loaded_entry: MockConfigEntry):
+    """Test the diagnostic sensors of the API metrics."""
+    registry = er.async_get(hass)
+    entity_id = registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{loaded_entry.entry_id}_api_calls"
+    )
+    assert registry.async_get(entity_id).entity_category == EntityCategory.DIAGNOSTIC
+    assert hass.states.get(entity_id).state == "0"
+
+    coordinator = hass.data[DOMAIN][loaded_entry.entry_id]
+    coordinator.api_client.metrics.record_call(
+        {
+            "method": "GET",
+            "endpoint": "zaehlpunkte",
+            "attempts": 1,
+            "reauthenticated": False,
+            "retry_wait": 0.0,
+            "duration": 0.3,
+            "error": None,
+        }
+    )
+    coordinator.async_update_listeners()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(entity_id).state == "1"
+    latency_id = registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{loaded_entry.entry_id}_api_latency_mean"
+    )
+    assert hass.states.get(latency_id).state == "300.0"
+
+
+async def test_diagnostics(hass: HomeAssistant, loaded_entry: MockConfigEntry):
+    """Test that diagnostics contain metrics, no credentials or meter IDs."""
+    meter_points = load_json_fixture("meter_points.json")["items"]
+    meter_id = meter_points[0]["zaehlpunktnummer"]
+    hass.config_entries.async_update_entry(
+        loaded_entry, data={**loaded_entry.data, CONF_METER_POINTS: meter_points}
+    )
+
+    # Meter point numbers in keys, endpoints and statistic IDs
+    coordinator = hass.data[DOMAIN][loaded_entry.entry_id]
+    coordinator.meter_points = meter_points
+    coordinator.meter_errors[meter_id] = Exception("Not found")
+    coordinator.scheduler.observe(meter_id, None)
+    coordinator.statistics._last[statistic_id(meter_id, "1-1:1.8.0")] = (0, 0.0)
+    call = {
+        "method": "GET",
+        "endpoint": f"zaehlpunkte/{meter_id}/messwerte",
+        "attempts": 1,
+        "reauthenticated": False,
+        "retry_wait": 0.0,
+        "duration": 0.3,
+        "error": None,
+    }
+    coordinator.api_client._record_call(call)
+    with coordinator.profiler.start_cycle().phase(
+        PHASE_PROCESS, meter_points[1]["zaehlpunktnummer"]
+    ):
+        pass
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, loaded_entry)
+
+    assert diagnostics["entry"]["data"]["client_secret"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["api_key"] == "**REDACTED**"
+    meter_point = diagnostics["entry"]["data"][CONF_METER_POINTS][0]
+    assert meter_point["zaehlpunktnummer"] == "**REDACTED**"
+    assert meter_point["verbrauchsstelle"] == "**REDACTED**"
+    assert "Teststraße" not in str(diagnostics["entry"])
+    assert diagnostics["coordinator"]["entries"] == 1
+    assert diagnostics["coordinator"]["meter_errors"] == {"meter_1": "Not found"}
+    assert diagnostics["api"]["recent_calls"][0]["endpoint"] == (
+        "zaehlpunkte/meter_1/messwerte"
+    )
+    assert "meter_2" in diagnostics["profiling"]["cycles"][-1]["meters_ms"]
+    for meter_point in meter_points:
+        assert meter_point["zaehlpunktnummer"] not in str(diagnostics)
+        assert meter_point["zaehlpunktnummer"].lower() not in str(diagnostics)
+    assert diagnostics["api"]["rate_limiter"]["quota_remaining"] is None
+    assert "test_client_secret" not in str(diagnostics)
+
+
+async def test_meter_sensors(hass: HomeAssistant, freezer):
+    """Test the sensors of the derived values of a meter point."""
+    freezer.move_to("2024-11-10T12:00:00+01:00")
+    meter_points_data = load_json_fixture("meter_points.json")
+    meter_point = meter_points_data.get("items", meter_points_data)[0]
+    meter_id = meter_point["zaehlpunktnummer"]
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Wiener Netze",
+        data={
+            "client_id": "test_client_id",
+            "client_secret": "test_client_secret",
+            "api_key": "test_api_key",
+            CONF_METER_POINTS: [meter_point],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    with patch.object(WienerNetzeApiClient, "authenticate", AsyncMock()), patch.object(
+        WienerNetzeApiClient, "get_meter_points", AsyncMock(return_value=[meter_point])
+    ), patch.object(
+        WienerNetzeApiClient,
+        "get_consumption_data",
+        AsyncMock(return_value=consumption_data),
+    ), patch.object(
+        FetchPlanner, "coarse_granularities", []
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+
+    def state(key: str) -> str:
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{meter_id}_{key}")
+        return hass.states.get(entity_id).state
+
+    assert state("energy_today") == "0.45"
+    assert state("last_interval") == "0.18"
+    assert state("current_power") == "0.72"
+    assert state("peak_power_today") == "0.72"
+    assert state("meter_reading") == "unknown"
+
+    # All sensors share one set of values until the meter point changes
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    values = coordinator.get_values(meter_id)
+    coordinator.async_update_listeners()
+    await hass.async_block_till_done()
+    assert coordinator.get_values(meter_id) is values
+
+    # The values of the day start over at midnight, without new readings
+    with patch.object(
+        WienerNetzeApiClient,
+        "get_consumption_data",
+        AsyncMock(return_value=consumption_data),
+    ), patch.object(FetchPlanner, "coarse_granularities", []):
+        freezer.move_to("2024-11-11T01:30:00+01:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    assert state("energy_today") == "unknown"
+    assert state("energy_yesterday") == "0.45"
+    assert state("peak_power_today") == "unknown"
+    assert state("last_interval") == "0.18"
+    assert any(
+        PHASE_STATE_WRITE in cycle.meters.get(meter_id, {})
+        for cycle in coordinator.profiler.cycles
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
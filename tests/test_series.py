@@ -0,0 +1,237 @@
+"""Tests for series.py."""
+from datetime import date, datetime, timedelta, timezone
+
+from custom_components.wiener_netze.series import ConsumptionSeries
+from tests.utils import load_json_fixture
+
+METER_ID = "AT0010000000000000001000000000001"
+
+
+def make_reading(start: str, end: str, value: float, quality: str = "VAL") -> dict:
+    """Create a consumption reading."""
+    return {"zeitVon": start, "zeitBis": end, "messwert": value, "qualitaet": quality}
+
+
+def make_data(*readings: dict, obis_code: str = "1-1:1.8.0") -> dict:
+    """Create a consumption data response with one Zählwerk."""
+    return {
+        "zaehlpunkt": METER_ID,
+        "zaehlwerke": [
+            {"obisCode": obis_code, "einheit": "kWh", "messwerte": list(readings)}
+        ],
+    }
+
+
+def test_merge_new_readings():
+    """Test merging readings into an empty series."""
+    series = ConsumptionSeries(METER_ID)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+
+    assert series.is_empty
+    assert series.merge(consumption_data) == 3
+    assert not series.is_empty
+    assert series.as_consumption_data() == consumption_data
+
+
+def test_merge_unchanged_readings():
+    """Test that merging the same data again reports no changes."""
+    series = ConsumptionSeries(METER_ID)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+
+    series.merge(consumption_data)
+
+    assert series.merge(load_json_fixture("consumption_quarter_hour.json")) == 0
+
+
+def test_merge_revised_reading():
+    """Test that an estimated reading is replaced by its validated value."""
+    series = ConsumptionSeries(METER_ID)
+    series.merge(load_json_fixture("consumption_quarter_hour.json"))
+
+    revised = load_json_fixture("consumption_quarter_hour.json")
+    revised["zaehlwerke"][0]["messwerte"][2]["messwert"] = 0.2
+    revised["zaehlwerke"][0]["messwerte"][2]["qualitaet"] = "VAL"
+
+    assert series.merge(revised) == 1
+
+    readings = series.as_consumption_data()["zaehlwerke"][0]["messwerte"]
+    assert readings[2]["messwert"] == 0.2
+    assert readings[2]["qualitaet"] == "VAL"
+
+
+def test_watermark_skips_finalized_readings():
+    """Test that finalized intervals are not revised anymore."""
+    series = ConsumptionSeries(METER_ID)
+    series.merge(load_json_fixture("consumption_quarter_hour.json"))
+
+    # Watermark is the end of the last validated interval
+    assert series.watermark == datetime(
+        2024, 11, 10, 0, 30, tzinfo=timezone(timedelta(hours=1))
+    )
+
+    changed = load_json_fixture("consumption_quarter_hour.json")
+    changed["zaehlwerke"][0]["messwerte"][0]["messwert"] = 9.9
+
+    assert series.merge(changed) == 0
+    readings = series.as_consumption_data()["zaehlwerke"][0]["messwerte"]
+    assert readings[0]["messwert"] == 0.15
+
+
+def test_readings_sorted_across_dst_change():
+    """Test that readings are ordered by time on the DST change day."""
+    series = ConsumptionSeries(METER_ID)
+    series.merge(
+        make_data(
+            make_reading(
+                "2024-10-27T02:00:00.000+01:00", "2024-10-27T02:15:00.000+01:00", 0.3
+            ),
+            make_reading(
+                "2024-10-27T02:00:00.000+02:00", "2024-10-27T02:15:00.000+02:00", 0.1
+            ),
+        )
+    )
+
+    readings = series.as_consumption_data()["zaehlwerke"][0]["messwerte"]
+    assert [r["messwert"] for r in readings] == [0.1, 0.3]
+
+
+def test_fetch_start():
+    """Test the first day requested from the API."""
+    today = date(2024, 11, 11)
+    series = ConsumptionSeries(METER_ID)
+
+    # Nothing known yet
+    assert series.fetch_start(today) == today
+
+    # Estimated value on the previous day
+    series.merge(load_json_fixture("consumption_quarter_hour.json"))
+    assert series.fetch_start(today) == date(2024, 11, 10)
+
+    # Open values are only re-requested for a limited number of days
+    assert series.fetch_start(date(2024, 11, 20)) == date(2024, 11, 17)
+
+
+def test_fetch_start_missing_intervals():
+    """Test that missing intervals after the watermark are requested again."""
+    today = date(2024, 11, 11)
+    series = ConsumptionSeries(METER_ID)
+    series.merge(
+        make_data(
+            make_reading(
+                "2024-11-10T18:00:00.000+01:00", "2024-11-10T18:15:00.000+01:00", 0.3
+            )
+        )
+    )
+
+    assert series.fetch_start(today) == date(2024, 11, 10)
+
+    # The watermark stays before the missing intervals
+    series.merge(
+        make_data(
+            make_reading(
+                "2024-11-10T23:45:00.000+01:00", "2024-11-11T00:00:00.000+01:00", 0.3
+            )
+        )
+    )
+
+    watermark = datetime(2024, 11, 10, 18, 15, tzinfo=timezone(timedelta(hours=1)))
+    assert series.watermark == watermark
+    assert series.fetch_start(today) == date(2024, 11, 10)
+
+    step = timedelta(minutes=15)
+    series.merge(
+        make_data(
+            *(
+                make_reading(
+                    (watermark + i * step).isoformat(),
+                    (watermark + (i + 1) * step).isoformat(),
+                    0.1,
+                )
+                for i in range(22)
+            )
+        )
+    )
+
+    assert series.watermark == datetime(
+        2024, 11, 11, tzinfo=timezone(timedelta(hours=1))
+    )
+    assert series.fetch_start(today) == today
+
+
+def test_prune_finalized_days():
+    """Test that finalized earlier days are dropped from the series."""
+    series = ConsumptionSeries(METER_ID)
+    series.merge(
+        make_data(
+            make_reading(
+                "2024-11-10T23:45:00.000+01:00", "2024-11-11T00:00:00.000+01:00", 0.3
+            ),
+            make_reading(
+                "2024-11-11T00:00:00.000+01:00", "2024-11-11T00:15:00.000+01:00", 0.2
+            ),
+        )
+    )
+
+    readings = series.as_consumption_data()["zaehlwerke"][0]["messwerte"]
+    assert [r["zeitVon"][:10] for r in readings] == ["2024-11-11"]
+
+
+def test_estimated_register_holds_watermark():
+    """Test that an open interval in one register holds back the watermark."""
+    series = ConsumptionSeries(METER_ID)
+    consumption_data = make_data(
+        make_reading(
+            "2024-11-10T00:00:00.000+01:00", "2024-11-10T00:15:00.000+01:00", 0.1
+        ),
+        make_reading(
+            "2024-11-10T00:15:00.000+01:00", "2024-11-10T00:30:00.000+01:00", 0.1
+        ),
+    )
+    consumption_data["zaehlwerke"].append(
+        make_data(
+            make_reading(
+                "2024-11-10T00:00:00.000+01:00",
+                "2024-11-10T00:15:00.000+01:00",
+                0.0,
+                "EST",
+            ),
+            obis_code="1-1:2.8.0",
+        )["zaehlwerke"][0]
+    )
+    series.merge(consumption_data)
+
+    revised = make_data(
+        make_reading(
+            "2024-11-10T00:00:00.000+01:00", "2024-11-10T00:15:00.000+01:00", 0.05
+        ),
+        obis_code="1-1:2.8.0",
+    )
+
+    assert series.merge(revised) == 1
+
+
+def test_merge_force_below_watermark():
+    """Test that forced merges fill in history before the watermark."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(load_json_fixture("consumption_quarter_hour.json"))
+    older = make_data(
+        make_reading(
+            "2023-01-01T00:00:00.000+01:00", "2023-01-01T00:15:00.000+01:00", 0.3
+        )
+    )
+
+    assert series.merge(older) == 0
+    assert series.merge(older, force=True) == 1
+    assert series.total(date(2023, 1, 1)) == 0.3
+
+
+def test_as_dict_round_trip():
+    """Test serializing and restoring a series."""
+    series = ConsumptionSeries(METER_ID)
+    series.merge(load_json_fixture("consumption_quarter_hour.json"))
+
+    restored = ConsumptionSeries.from_dict(METER_ID, series.as_dict())
+
+    assert restored.watermark == series.watermark
+    assert restored.fetch_start(date(2024, 11, 11)) == date(2024, 11, 10)
+    assert restored.as_consumption_data() == series.as_consumption_data()
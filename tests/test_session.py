@@ -0,0 +1,50 @@
+"""Tests for session.py."""
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+
+from custom_components.wiener_netze.const import DATA_API_SESSION
+from custom_components.wiener_netze.session import (
+    ACCEPT_ENCODING,
+    CONNECTION_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    async_close_api_session,
+    async_get_api_session,
+    create_api_session,
+)
+
+
+async def test_create_api_session():
+    """Test the connector settings of the dedicated session."""
+    session = create_api_session()
+
+    assert session.connector.limit_per_host == CONNECTION_LIMIT_PER_HOST
+    assert session.connector.use_dns_cache
+    assert session.connector._cached_hosts._ttl == DNS_CACHE_TTL
+    assert not session.connector.force_close
+    assert session.headers["Accept-Encoding"] == ACCEPT_ENCODING
+
+    await session.close()
+
+
+async def test_async_get_api_session(hass: HomeAssistant):
+    """Test that the dedicated session is shared and closed."""
+    session = async_get_api_session(hass)
+
+    assert async_get_api_session(hass) is session
+
+    await async_close_api_session(hass)
+
+    assert session.closed
+    assert DATA_API_SESSION not in hass.data
+    assert async_get_api_session(hass) is not session
+    await async_close_api_session(hass)
+
+
+async def test_api_session_closed_on_stop(hass: HomeAssistant):
+    """Test that the dedicated session is closed with Home Assistant."""
+    session = async_get_api_session(hass)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+
+    assert session.closed
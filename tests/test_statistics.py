@@ -0,0 +1,219 @@
+"""Tests for statistics.py."""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.wiener_netze.series import ConsumptionSeries
+from custom_components.wiener_netze.statistics import (
+    StatisticsImporter,
+    hourly_statistics,
+    importable_end,
+    statistic_id,
+)
+
+METER_ID = "AT0010000000000000001000000000001"
+CONSUMPTION = "1-1:1.8.0"
+FEED_IN = "1-1:2.8.0"
+START = datetime.fromisoformat("2024-10-30T00:00:00+01:00")
+
+
+def consumption_data(
+    hours: int, first_hour: int = 0, qualitaet: str = "VAL", value: float = 0.25
+) -> dict:
+    """Return quarter hours of both Zählwerke for consecutive hours."""
+    step = timedelta(minutes=15)
+    first = START + timedelta(hours=first_hour)
+    readings = [
+        {
+            "zeitVon": (first + i * step).isoformat(),
+            "zeitBis": (first + (i + 1) * step).isoformat(),
+            "messwert": value,
+            "qualitaet": qualitaet,
+        }
+        for i in range(4 * hours)
+    ]
+    return {
+        "zaehlpunkt": METER_ID,
+        "zaehlwerke": [
+            {"obisCode": CONSUMPTION, "einheit": "kWh", "messwerte": readings},
+            {
+                "obisCode": FEED_IN,
+                "einheit": "kWh",
+                "messwerte": [{**r, "messwert": 1.0} for r in readings],
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def importer(hass: HomeAssistant) -> StatisticsImporter:
+    """Return an importer with the recorder calls mocked."""
+    hass.config.components.add("recorder")
+    importer = StatisticsImporter(hass)
+    with patch.object(
+        importer, "_async_last_statistic", AsyncMock(return_value=None)
+    ), patch.object(importer, "_async_add_statistics"):
+        yield importer
+
+
+def test_statistic_id():
+    """Test statistic IDs are valid external statistic IDs."""
+    assert statistic_id(METER_ID, CONSUMPTION) == (
+        "wiener_netze:at0010000000000000001000000000001_1_1_1_8_0"
+    )
+
+
+def test_hourly_statistics():
+    """Test quarter hours are summed into complete hours with a running sum."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(3))
+    register = series.registers[CONSUMPTION]
+
+    # The last hour is incomplete
+    rows = hourly_statistics(register, None, register.ends[-1] - 900, 10.0)
+
+    assert [row["start"] for row in rows] == [
+        START + timedelta(hours=hour) for hour in range(2)
+    ]
+    assert [row["state"] for row in rows] == [1.0, 1.0]
+    assert [row["sum"] for row in rows] == [11.0, 12.0]
+
+    # Continue after the last imported hour
+    rows = hourly_statistics(register, rows[-1]["start"].timestamp(), 1e12, 12.0)
+    assert [(row["start"], row["sum"]) for row in rows] == [
+        (START + timedelta(hours=2), 13.0)
+    ]
+
+
+def test_importable_end():
+    """Test estimated readings are only final outside the revision window."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(2))
+    series.merge(consumption_data(2, first_hour=2, qualitaet="EST"))
+    register = series.registers[CONSUMPTION]
+
+    cutoff = START.timestamp()
+    assert importable_end(register, cutoff) == register.starts[8]
+
+    cutoff = (START + timedelta(days=1)).timestamp()
+    assert importable_end(register, cutoff) == register.ends[-1]
+
+
+def test_importable_end_missing_readings():
+    """Test missing readings are only final outside the revision window."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(2))
+    series.merge(consumption_data(2, first_hour=3))
+    register = series.registers[CONSUMPTION]
+
+    # The third hour may still be delivered
+    cutoff = START.timestamp()
+    until = importable_end(register, cutoff)
+    assert until == (START + timedelta(hours=2)).timestamp()
+    assert len(hourly_statistics(register, None, until)) == 2
+
+    cutoff = (START + timedelta(days=1)).timestamp()
+    assert importable_end(register, cutoff) == register.ends[-1]
+
+
+async def test_import_incremental(importer: StatisticsImporter):
+    """Test imports continue after the last imported hour."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(2))
+    series.merge(consumption_data(2, first_hour=2, qualitaet="EST"))
+
+    # Estimated readings in the revision window wait for validation
+    assert await importer.async_import(METER_ID, series, START) == 4
+    add = importer._async_add_statistics
+    metadata, rows = add.call_args_list[0].args
+    assert metadata["statistic_id"] == statistic_id(METER_ID, CONSUMPTION)
+    assert metadata["unit_of_measurement"] == "kWh"
+    assert metadata["has_sum"] and not metadata["has_mean"]
+    assert [row["sum"] for row in rows] == [1.0, 2.0]
+
+    # Late validation lands at the real hours, nothing is imported twice
+    add.reset_mock()
+    series.merge(consumption_data(3, first_hour=2, qualitaet="VAL", value=0.5))
+    assert await importer.async_import(METER_ID, series, START) == 6
+    metadata, rows = add.call_args_list[0].args
+    assert [(row["start"], row["sum"]) for row in rows] == [
+        (START + timedelta(hours=hour), total)
+        for hour, total in ((2, 4.0), (3, 6.0), (4, 8.0))
+    ]
+
+    assert await importer.async_import(METER_ID, series, START) == 0
+    importer._async_last_statistic.assert_awaited()
+    assert importer._async_last_statistic.await_count == 2  # Once per Zählwerk
+
+
+async def test_import_batches_and_restart(importer: StatisticsImporter):
+    """Test large imports are batched and continue from the recorder."""
+    importer._async_last_statistic.return_value = (
+        (START + timedelta(hours=1)).timestamp(),
+        100.0,
+    )
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(48))
+
+    with patch("custom_components.wiener_netze.statistics.STATISTICS_BATCH_SIZE", 20):
+        assert await importer.async_import(METER_ID, series, START) == 2 * 46
+
+    batches = [call.args[1] for call in importer._async_add_statistics.call_args_list]
+    assert [len(batch) for batch in batches] == [20, 20, 6, 20, 20, 6]
+    assert batches[0][0]["start"] == START + timedelta(hours=2)
+    assert batches[0][0]["sum"] == 101.0
+
+
+async def test_import_without_recorder(hass: HomeAssistant):
+    """Test nothing is imported when the recorder is not loaded."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(2))
+
+    assert await StatisticsImporter(hass).async_import(METER_ID, series) == 0
+
+
+async def test_import_again_since(importer: StatisticsImporter):
+    """Test importing again from a time continues the sum of the readings before."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(4))
+    assert await importer.async_import(METER_ID, series, START) == 8
+
+    # Backfilled readings change the second hour
+    importer._async_add_statistics.reset_mock()
+    series.merge(consumption_data(1, first_hour=1, value=0.5), force=True)
+    since = START + timedelta(hours=1)
+    assert await importer.async_import(METER_ID, series, START, since=since) == 6
+    metadata, rows = importer._async_add_statistics.call_args_list[0].args
+    assert [(row["start"], row["sum"]) for row in rows] == [
+        (START + timedelta(hours=hour), total)
+        for hour, total in ((1, 3.0), (2, 4.0), (3, 5.0))
+    ]
+
+    # From the first reading on, the sum starts at 0
+    importer._async_add_statistics.reset_mock()
+    assert await importer.async_import(METER_ID, series, START, since=START) == 8
+    metadata, rows = importer._async_add_statistics.call_args_list[0].args
+    assert rows[0]["sum"] == 1.0
+
+
+async def test_import_again_since_gap(importer: StatisticsImporter):
+    """Test a backfill ending before the known readings is not imported again."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(4, first_hour=48))
+    assert await importer.async_import(METER_ID, series, START) == 8
+
+    # The hours between the backfill and the known readings would keep their
+    # old sums
+    importer._async_add_statistics.reset_mock()
+    series.merge(consumption_data(2), force=True)
+    assert await importer.async_import(METER_ID, series, START, since=START) == 0
+    importer._async_add_statistics.assert_not_called()
+
+    # Once the history reaches the known readings, it is imported again
+    series.merge(consumption_data(46, first_hour=2), force=True)
+    assert await importer.async_import(METER_ID, series, START, since=START) == 104
+    metadata, rows = importer._async_add_statistics.call_args_list[0].args
+    assert rows[0]["start"] == START
+    assert rows[-1]["sum"] == 52.0
@@ -0,0 +1,159 @@
+"""Tests for storage.py."""
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.wiener_netze.const import (
+    DOMAIN,
+    GRANULARITY_DAY,
+    GRANULARITY_QUARTER_HOUR,
+)
+from custom_components.wiener_netze.storage import WienerNetzeStore
+from tests.utils import load_json_fixture
+
+ENTRY_ID = "test_entry"
+METER_ID = "AT0010000000000000001000000000001"
+
+
+def make_reading(day: str, value: float) -> dict:
+    """Create a consumption reading on the given day."""
+    return {
+        "zeitVon": f"{day}T00:00:00.000+01:00",
+        "zeitBis": f"{day}T00:15:00.000+01:00",
+        "messwert": value,
+        "qualitaet": "VAL",
+    }
+
+
+async def test_load_empty(hass: HomeAssistant):
+    """Test loading when nothing is stored yet."""
+    store = WienerNetzeStore(hass, ENTRY_ID)
+    await store.async_load()
+
+    assert store.get_token() is None
+    assert store.get_consumption(METER_ID, GRANULARITY_QUARTER_HOUR) == []
+
+
+async def test_token_roundtrip(hass: HomeAssistant):
+    """Test storing and reading the access token."""
+    store = WienerNetzeStore(hass, ENTRY_ID)
+    expires_at = datetime.now() + timedelta(hours=1)
+
+    store.set_token("test_token", expires_at)
+
+    assert store.get_token() == ("test_token", expires_at)
+
+
+async def test_metadata_checked_roundtrip(hass: HomeAssistant):
+    """Test storing and reading the time of the last metadata check."""
+    store = WienerNetzeStore(hass, ENTRY_ID)
+    checked = datetime.now()
+
+    assert store.get_metadata_checked() is None
+
+    store.set_metadata_checked(checked)
+
+    assert store.get_metadata_checked() == checked
+
+
+async def test_schedule_roundtrip(hass: HomeAssistant):
+    """Test storing and reading the publication pattern of a meter point."""
+    store = WienerNetzeStore(hass, ENTRY_ID)
+    schedule = {"data_end": 1700000000.0, "lag": 21600.0, "period": 86400.0}
+
+    assert store.get_schedule(METER_ID) is None
+
+    store.set_schedule(METER_ID, schedule)
+
+    assert store.get_schedule(METER_ID) == schedule
+
+
+async def test_consumption_split_by_day(hass: HomeAssistant):
+    """Test that consumption data is stored per day."""
+    store = WienerNetzeStore(hass, ENTRY_ID)
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    consumption_data["zaehlwerke"][0]["messwerte"].append(
+        make_reading("2024-11-11", 0.2)
+    )
+
+    store.set_consumption(METER_ID, GRANULARITY_QUARTER_HOUR, consumption_data)
+
+    stored = store.get_consumption(METER_ID, GRANULARITY_QUARTER_HOUR)
+    assert [len(day["zaehlwerke"][0]["messwerte"]) for day in stored] == [3, 1]
+    assert stored[1]["zaehlwerke"][0]["obisCode"] == "1-1:1.8.0"
+    assert stored[1]["zaehlwerke"][0]["messwerte"][0]["messwert"] == 0.2
+
+
+async def test_consumption_replaces_days(hass: HomeAssistant):
+    """Test that newer data replaces stored days and keeps others."""
+    store = WienerNetzeStore(hass, ENTRY_ID)
+    data = {
+        "zaehlpunkt": METER_ID,
+        "zaehlwerke": [
+            {
+                "obisCode": "1-1:1.8.0",
+                "einheit": "kWh",
+                "messwerte": [
+                    make_reading("2024-11-10", 0.1),
+                    make_reading("2024-11-11", 0.1),
+                ],
+            }
+        ],
+    }
+    store.set_consumption(METER_ID, GRANULARITY_QUARTER_HOUR, data)
+
+    data["zaehlwerke"][0]["messwerte"] = [make_reading("2024-11-11", 0.3)]
+    store.set_consumption(METER_ID, GRANULARITY_QUARTER_HOUR, data)
+
+    stored = store.get_consumption(METER_ID, GRANULARITY_QUARTER_HOUR)
+    values = [day["zaehlwerke"][0]["messwerte"][0]["messwert"] for day in stored]
+    assert values == [0.1, 0.3]
+
+
+async def test_consumption_retention(hass: HomeAssistant):
+    """Test that days outside the retention window are dropped."""
+    store = WienerNetzeStore(hass, ENTRY_ID)
+
+    for day in ("2024-11-01", "2024-11-10", "2024-11-11"):
+        consumption_data = {
+            "zaehlpunkt": METER_ID,
+            "zaehlwerke": [
+                {
+                    "obisCode": "1-1:1.8.0",
+                    "einheit": "kWh",
+                    "messwerte": [make_reading(day, 0.1)],
+                }
+            ],
+        }
+        store.set_consumption(METER_ID, GRANULARITY_QUARTER_HOUR, consumption_data)
+        store.set_consumption(METER_ID, GRANULARITY_DAY, consumption_data, 400)
+
+    stored = store.get_consumption(METER_ID, GRANULARITY_QUARTER_HOUR)
+    assert [day["zaehlwerke"][0]["messwerte"][0]["zeitVon"][:10] for day in stored] == [
+        "2024-11-10",
+        "2024-11-11",
+    ]
+
+    # Day values are kept longer
+    assert len(store.get_consumption(METER_ID, GRANULARITY_DAY)) == 3
+
+
+async def test_save_and_load(hass: HomeAssistant, hass_storage):
+    """Test that the cache is written to disk and loaded again."""
+    store = WienerNetzeStore(hass, ENTRY_ID)
+    store.set_consumption(
+        METER_ID,
+        GRANULARITY_QUARTER_HOUR,
+        load_json_fixture("consumption_quarter_hour.json"),
+    )
+    store.async_schedule_save()
+    await hass.async_stop(force=True)
+
+    assert f"{DOMAIN}.{ENTRY_ID}" in hass_storage
+
+    loaded = WienerNetzeStore(hass, ENTRY_ID)
+    await loaded.async_load()
+
+    stored = loaded.get_consumption(METER_ID, GRANULARITY_QUARTER_HOUR)
+    assert len(stored) == 1
+    assert stored[0]["zaehlwerke"][0]["messwerte"][0]["messwert"] == 0.15
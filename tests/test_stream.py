@@ -0,0 +1,130 @@
+"""Tests for stream.py."""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.wiener_netze.stream import iter_zaehlwerke
+from tests.utils import load_json_fixture
+
+
+async def chunked(data: bytes, size: int):
+    """Yield data in chunks of a fixed size."""
+    for start in range(0, len(data), size):
+        end = start + size
+        yield data[start:end]
+
+
+async def decode(data: bytes, size: int, loads=None) -> list[dict]:
+    """Collect all Zählwerk parts of a streamed response."""
+    return [part async for part in iter_zaehlwerke(chunked(data, size), loads)]
+
+
+def merge_parts(parts: list[dict]) -> list[dict]:
+    """Merge consecutive parts of the same Zählwerk."""
+    zaehlwerke: dict[str, dict] = {}
+    for part in parts:
+        zaehlwerk = zaehlwerke.setdefault(part["obisCode"], {**part, "messwerte": []})
+        zaehlwerk["messwerte"].extend(part["messwerte"])
+    return list(zaehlwerke.values())
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 65536])
+async def test_iter_zaehlwerke(size):
+    """Test decoding a response split into chunks of any size."""
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    consumption_data["zaehlwerke"].append(
+        {
+            "obisCode": "1-1:2.8.0",
+            "einheit": "kWh",
+            "messwerte": [
+                {
+                    "zeitVon": "2024-11-10T00:00:00.000+01:00",
+                    "zeitBis": "2024-11-10T00:15:00.000+01:00",
+                    "messwert": 1234567.125,
+                    "qualitaet": "VAL",
+                }
+            ],
+        }
+    )
+    data = json.dumps(consumption_data, indent=2, ensure_ascii=False).encode()
+
+    parts = await decode(data, size)
+
+    assert merge_parts(parts) == consumption_data["zaehlwerke"]
+
+
+async def test_iter_zaehlwerke_incremental():
+    """Test that readings are yielded before the response is complete."""
+    consumption_data = load_json_fixture("consumption_quarter_hour.json")
+    readings = consumption_data["zaehlwerke"][0]["messwerte"]
+    readings *= 20
+    data = json.dumps(consumption_data).encode()
+
+    parts = await decode(data, 1000)
+
+    assert 1 < len(parts) < len(readings)
+    assert all(part["obisCode"] == "1-1:1.8.0" for part in parts)
+    # Readings following a chunk boundary are still decoded in runs
+    assert len(parts[-1]["messwerte"]) > 1
+    assert merge_parts(parts) == consumption_data["zaehlwerke"]
+
+
+async def test_iter_zaehlwerke_metadata_after_messwerte():
+    """Test that readings are held back until the OBIS code is known."""
+    data = (
+        b'{"zaehlwerke": [{"messwerte": [{"messwert": 1}, {"messwert": 2}],'
+        b' "obisCode": "1-1:1.8.0", "einheit": "kWh"}], "zaehlpunkt": "AT1"}'
+    )
+
+    parts = await decode(data, 5)
+
+    assert parts == [
+        {
+            "obisCode": "1-1:1.8.0",
+            "einheit": "kWh",
+            "messwerte": [{"messwert": 1}, {"messwert": 2}],
+        }
+    ]
+
+
+async def test_iter_zaehlwerke_nested_and_empty():
+    """Test nested reading objects and empty arrays."""
+    data = (
+        b'{"zaehlwerke": [{"obisCode": "A", "messwerte": [{"x": {"y": [1]}}]},'
+        b' {"obisCode": "B", "messwerte": []}]}'
+    )
+
+    parts = await decode(data, 3)
+
+    assert parts == [
+        {"obisCode": "A", "messwerte": [{"x": {"y": [1]}}]},
+        {"obisCode": "B", "messwerte": []},
+    ]
+    assert await decode(b'{"zaehlwerke": []}', 4) == []
+
+
+async def test_iter_zaehlwerke_custom_loads():
+    """Test that runs of readings are decoded with the given backend."""
+    data = json.dumps(load_json_fixture("consumption_quarter_hour.json")).encode()
+    loads = MagicMock(side_effect=json.loads)
+
+    parts = await decode(data, len(data), loads)
+
+    loads.assert_called_once()
+    assert len(parts[0]["messwerte"]) == 3
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"[]",
+        b'{"zaehlwerke": [{"obisCode": "A", "messwerte": [{"x": 1}',
+        b'{"zaehlwerke": [{"obisCode": "A", "messwerte": [{"x": }]}]}',
+        b'{"zaehlwerke": []} trailing',
+    ],
+)
+async def test_iter_zaehlwerke_invalid(data):
+    """Test that invalid or truncated responses raise ValueError."""
+    with pytest.raises(ValueError):
+        await decode(data, 4)
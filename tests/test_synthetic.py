@@ -0,0 +1,127 @@
+"""Tests for the synthetic data set generator and the paths it feeds."""
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+from custom_components.wiener_netze.aggregate import BUCKET_DAY, ConsumptionAggregator
+from custom_components.wiener_netze.series import ConsumptionSeries
+from tests.synthetic import (
+    OBIS_CODES,
+    SyntheticConfig,
+    consumption_data,
+    day_faults,
+    dst_days,
+    generate,
+    meter_id,
+    quarter_hours_of,
+)
+
+CONSUMPTION = OBIS_CODES[0]
+
+
+def test_dst_days():
+    """Test the DST transition days."""
+    assert dst_days(2024) == (date(2024, 3, 31), date(2024, 10, 27))
+    assert dst_days(2025) == (date(2025, 3, 30), date(2025, 10, 26))
+
+
+@pytest.mark.parametrize("years", [1, 2])
+def test_granularities_agree(years: int):
+    """Test quarter hours, day values and meter readings agree across DST."""
+    config = SyntheticConfig(
+        years=years, estimated_rate=0.0, gap_rate=0.0, missing_day_rate=0.0
+    )
+    zaehlpunkt = meter_id(0)
+    series = {}
+    for wertetyp in ("QUARTER_HOUR", "DAY", "METER_READ"):
+        series[wertetyp] = ConsumptionSeries(zaehlpunkt, retention_days=None)
+        series[wertetyp].merge(consumption_data(config, zaehlpunkt, wertetyp))
+
+    quarter_hours = series["QUARTER_HOUR"].registers[CONSUMPTION]
+    days = series["DAY"].registers[CONSUMPTION]
+    meter_reads = series["METER_READ"].registers[CONSUMPTION]
+    assert (
+        len(days) == len(meter_reads) == (config.last_day - config.first_day).days + 1
+    )
+
+    checked = 0
+    for year in range(config.first_day.year, config.last_day.year + 1):
+        dst_start, dst_end = dst_days(year)
+        if dst_start <= config.first_day:
+            continue
+        checked += 1
+        for day, count in (
+            (dst_start, 92),
+            (dst_end, 100),
+            (dst_start - timedelta(days=1), 96),
+        ):
+            first, last = quarter_hours.day_range(day)
+            assert last - first == count
+    assert checked == years
+
+    aggregator = ConsumptionAggregator(series["QUARTER_HOUR"])
+    totals = aggregator.totals(
+        CONSUMPTION, BUCKET_DAY, config.first_day, config.last_day
+    )
+    assert list(totals.values()) == pytest.approx(list(days.values))
+    assert [
+        meter_reads.values[i] - meter_reads.values[i - 1]
+        for i in range(1, len(meter_reads))
+    ] == pytest.approx(list(days.values)[1:])
+
+
+def test_faults():
+    """Test estimated readings, gaps and missing days are mixed in."""
+    config = SyntheticConfig(
+        meters=2,
+        registers=2,
+        estimated_rate=0.1,
+        gap_rate=0.05,
+        missing_day_rate=0.02,
+    )
+    payloads = list(generate(config))
+    assert [data["zaehlpunkt"] for data in payloads] == [meter_id(0), meter_id(1)]
+    assert payloads == list(generate(config))  # Deterministic
+    assert payloads[0] != payloads[1]
+
+    zaehlpunkt = meter_id(0)
+    days = [
+        config.first_day + timedelta(days=offset)
+        for offset in range((config.last_day - config.first_day).days + 1)
+    ]
+    faults = {day: day_faults(config, zaehlpunkt, day) for day in days}
+    assert any(fault.missing for fault in faults.values())
+    assert any(fault.gap for fault in faults.values())
+
+    expected = sum(
+        len(quarter_hours_of(day)) - len(fault.gap)
+        for day, fault in faults.items()
+        if not fault.missing
+    )
+    for zaehlwerk in payloads[0]["zaehlwerke"]:
+        readings = zaehlwerk["messwerte"]
+        assert len(readings) == expected
+        qualities = Counter(reading["qualitaet"] for reading in readings)
+        assert qualities["EST"] > 0.005 * qualities["VAL"]
+
+    # The newest days are not validated yet
+    series = ConsumptionSeries(zaehlpunkt, retention_days=None)
+    series.merge(payloads[0])
+    register = series.registers[CONSUMPTION]
+    assert all(
+        reading["qualitaet"] == "EST"
+        for reading in register.readings(
+            register.day_start_index(config.last_day - timedelta(days=1))
+        )
+    )
+    assert register.first_open_index() < register.day_start_index(config.last_day)
+
+    # Day values are missing for missing days and estimated with the quarter hours
+    day_values = consumption_data(config, zaehlpunkt, "DAY")["zaehlwerke"][0]
+    assert len(day_values["messwerte"]) == sum(
+        not fault.missing for fault in faults.values()
+    )
+    assert sum(
+        reading["qualitaet"] == "EST" for reading in day_values["messwerte"]
+    ) == sum(bool(fault.estimated) for fault in faults.values())
@@ -0,0 +1,188 @@
+"""Tests for timeseries.py."""
+from datetime import date, datetime
+
+import pytest
+
+from custom_components.wiener_netze.timeseries import (
+    QUALITY_FLAG_ESTIMATED,
+    QUALITY_FLAG_VALIDATED,
+    IntervalSeries,
+    quality_flag,
+)
+
+VAL = QUALITY_FLAG_VALIDATED
+EST = QUALITY_FLAG_ESTIMATED
+
+
+def epoch(timestamp: str) -> int:
+    """Convert an ISO 8601 timestamp to epoch seconds."""
+    return int(datetime.fromisoformat(timestamp).timestamp())
+
+
+def add(series: IntervalSeries, start: str, end: str, value: float, quality=VAL):
+    """Upsert an interval given as ISO 8601 timestamps."""
+    start_dt = datetime.fromisoformat(start)
+    end_dt = datetime.fromisoformat(end)
+    return series.upsert(
+        int(start_dt.timestamp()),
+        int(end_dt.timestamp()),
+        int(start_dt.utcoffset().total_seconds()) // 60,
+        int(end_dt.utcoffset().total_seconds()) // 60,
+        value,
+        quality,
+    )
+
+
+def test_quality_flag():
+    """Test mapping quality indicators to bitmasks."""
+    assert quality_flag("VAL") == VAL
+    assert quality_flag("EST") == EST
+    assert quality_flag("???") == 0
+
+
+def test_upsert_append_insert_update():
+    """Test appending, inserting and updating intervals."""
+    series = IntervalSeries("1-1:1.8.0", "kWh")
+
+    assert add(series, "2024-11-10T00:30:00+01:00", "2024-11-10T00:45:00+01:00", 0.3)
+    assert add(series, "2024-11-10T00:00:00+01:00", "2024-11-10T00:15:00+01:00", 0.1)
+    assert add(series, "2024-11-10T00:15:00+01:00", "2024-11-10T00:30:00+01:00", 0.2)
+    assert list(series.values) == [0.1, 0.2, 0.3]
+
+    # Same value and quality is no change
+    assert not add(
+        series, "2024-11-10T00:15:00+01:00", "2024-11-10T00:30:00+01:00", 0.2
+    )
+    assert add(
+        series, "2024-11-10T00:15:00+01:00", "2024-11-10T00:30:00+01:00", 0.2, EST
+    )
+    assert len(series) == 3
+    assert series.quality[1] == EST
+
+
+def test_first_open_index():
+    """Test finding the first interval that is not validated."""
+    series = IntervalSeries("1-1:1.8.0", "kWh")
+    assert series.first_open_index() == 0
+
+    add(series, "2024-11-10T00:00:00+01:00", "2024-11-10T00:15:00+01:00", 0.1)
+    add(series, "2024-11-10T00:15:00+01:00", "2024-11-10T00:30:00+01:00", 0.2)
+    assert series.first_open_index() == 2
+
+    add(series, "2024-11-10T00:30:00+01:00", "2024-11-10T00:45:00+01:00", 0.0, EST)
+    assert series.first_open_index() == 2
+
+
+def test_first_gap_index():
+    """Test finding the first interval after missing intervals."""
+    series = IntervalSeries("1-1:1.8.0", "kWh")
+    assert series.first_gap_index() == 0
+
+    add(series, "2024-11-10T00:00:00+01:00", "2024-11-10T00:15:00+01:00", 0.1)
+    add(series, "2024-11-10T00:15:00+01:00", "2024-11-10T00:30:00+01:00", 0.2)
+    assert series.first_gap_index() == 2
+
+    add(series, "2024-11-10T01:00:00+01:00", "2024-11-10T01:15:00+01:00", 0.3)
+    add(series, "2024-11-10T01:30:00+01:00", "2024-11-10T01:45:00+01:00", 0.3)
+    assert series.first_gap_index() == 2
+    assert series.first_gap_index(3) == 3
+
+    add(series, "2024-11-10T00:30:00+01:00", "2024-11-10T00:45:00+01:00", 0.2)
+    add(series, "2024-11-10T00:45:00+01:00", "2024-11-10T01:00:00+01:00", 0.2)
+    assert series.first_gap_index() == 5
+
+
+def test_day_range_across_dst_change():
+    """Test local day boundaries on the DST change day."""
+    series = IntervalSeries("1-1:1.8.0", "kWh")
+    add(series, "2024-10-26T23:45:00+02:00", "2024-10-27T00:00:00+02:00", 0.5)
+    add(series, "2024-10-27T00:00:00+02:00", "2024-10-27T00:15:00+02:00", 0.1)
+    add(series, "2024-10-27T02:00:00+02:00", "2024-10-27T02:15:00+02:00", 0.2)
+    add(series, "2024-10-27T02:00:00+01:00", "2024-10-27T02:15:00+01:00", 0.3)
+    add(series, "2024-10-27T23:45:00+01:00", "2024-10-28T00:00:00+01:00", 0.4)
+    add(series, "2024-10-28T00:00:00+01:00", "2024-10-28T00:15:00+01:00", 0.6)
+
+    assert series.day_range(date(2024, 10, 27)) == (1, 5)
+    assert series.local_day(4) == date(2024, 10, 27)
+    assert series.total(*series.day_range(date(2024, 10, 27))) == 1.0
+    assert series.total() == 2.1
+
+
+def test_reading_round_trip():
+    """Test that readings keep their original timestamps."""
+    series = IntervalSeries("1-1:1.8.0", "kWh")
+    add(series, "2024-03-31T01:45:00+01:00", "2024-03-31T03:00:00+02:00", 0.1)
+
+    assert series.reading(0) == {
+        "zeitVon": "2024-03-31T01:45:00.000+01:00",
+        "zeitBis": "2024-03-31T03:00:00.000+02:00",
+        "messwert": 0.1,
+        "qualitaet": "VAL",
+    }
+    assert series.readings() == [series.reading(0)]
+
+
+def test_drop_before():
+    """Test dropping intervals before an index."""
+    series = IntervalSeries("1-1:1.8.0", "kWh")
+    add(series, "2024-11-09T00:00:00+01:00", "2024-11-09T00:15:00+01:00", 0.1)
+    add(series, "2024-11-10T00:00:00+01:00", "2024-11-10T00:15:00+01:00", 0.2)
+
+    series.drop_before(series.day_start_index(date(2024, 11, 10)))
+
+    assert len(series) == 1
+    assert list(series.values) == [0.2]
+    assert series.starts[0] == epoch("2024-11-10T00:00:00+01:00")
+
+
+def test_nbytes():
+    """Test that a day of quarter hours fits in a few kilobytes."""
+    series = IntervalSeries("1-1:1.8.0", "kWh")
+    start = epoch("2024-11-10T00:00:00+01:00")
+    for i in range(96):
+        series.upsert(start + i * 900, start + (i + 1) * 900, 60, 60, 0.1, VAL)
+
+    # 8 + 8 + 2 + 2 + 8 + 1 bytes per interval
+    assert series.nbytes == 96 * 29
+
+
+def test_upsert_many_block_insert():
+    """Test splicing a block of rows into a gap."""
+    series = IntervalSeries("1-1:1.8.0", "kWh")
+    start = epoch("2024-11-10T00:00:00+01:00")
+    series.upsert(start, start + 900, 60, 60, 0.1, VAL)
+    series.upsert(start + 3600, start + 4500, 60, 60, 0.4, VAL)
+
+    rows = [
+        (start + i * 900, start + (i + 1) * 900, 60, 60, i / 10, VAL)
+        for i in range(1, 4)
+    ]
+    assert series.upsert_many(rows) == 3
+    assert list(series.values) == [0.1, 0.1, 0.2, 0.3, 0.4]
+    assert list(series.starts) == sorted(series.starts)
+
+    # Overlapping rows are upserted one by one
+    assert series.upsert_many(rows[:1] + [(start, start + 900, 60, 60, 0.5, VAL)]) == 1
+    assert series.values[0] == 0.5
+
+
+def test_as_dict_round_trip():
+    """Test serializing and restoring a series."""
+    series = IntervalSeries("1-1:1.8.0", "kWh")
+    add(series, "2024-03-31T01:45:00+01:00", "2024-03-31T03:00:00+02:00", 0.1)
+    add(series, "2024-03-31T03:00:00+02:00", "2024-03-31T03:15:00+02:00", 0.2, EST)
+
+    restored = IntervalSeries.from_dict(series.as_dict())
+
+    assert restored.obis_code == "1-1:1.8.0"
+    assert restored.einheit == "kWh"
+    assert restored.readings() == series.readings()
+
+
+def test_from_dict_inconsistent():
+    """Test that inconsistent buffers are rejected."""
+    data = IntervalSeries("1-1:1.8.0", "kWh").as_dict()
+    data["buffers"][0] = "AAAAAAAAAAA="
+
+    with pytest.raises(ValueError):
+        IntervalSeries.from_dict(data)
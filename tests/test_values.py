@@ -0,0 +1,103 @@
+"""Tests for values.py."""
+from datetime import date, datetime, timedelta
+
+from custom_components.wiener_netze.aggregate import ConsumptionAggregator
+from custom_components.wiener_netze.series import ConsumptionSeries
+from custom_components.wiener_netze.values import MeterValues
+
+METER_ID = "AT0010000000000000001000000000001"
+CONSUMPTION = "1-1:1.8.0"
+FEED_IN = "1-1:2.8.0"
+START = datetime.fromisoformat("2024-11-09T00:00:00+01:00")
+TODAY = date(2024, 11, 10)
+
+
+def consumption_data(quarter_hours: int, einheit: str = "kWh") -> dict:
+    """Return rising quarter hours of both Zählwerke, starting yesterday."""
+    step = timedelta(minutes=15)
+    readings = [
+        {
+            "zeitVon": (START + i * step).isoformat(),
+            "zeitBis": (START + (i + 1) * step).isoformat(),
+            "messwert": 0.25 if i < 96 else 0.01 * (i - 95),
+            "qualitaet": "VAL",
+        }
+        for i in range(quarter_hours)
+    ]
+    return {
+        "zaehlpunkt": METER_ID,
+        "zaehlwerke": [
+            {"obisCode": FEED_IN, "einheit": einheit, "messwerte": readings[:4]},
+            {"obisCode": CONSUMPTION, "einheit": einheit, "messwerte": readings},
+        ],
+    }
+
+
+def meter_reads() -> ConsumptionSeries:
+    """Return a series with the meter readings of two days."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(
+        {
+            "zaehlpunkt": METER_ID,
+            "zaehlwerke": [
+                {
+                    "obisCode": CONSUMPTION,
+                    "einheit": "kWh",
+                    "messwerte": [
+                        {
+                            "zeitVon": (START + timedelta(days=i)).isoformat(),
+                            "zeitBis": (START + timedelta(days=i + 1)).isoformat(),
+                            "messwert": 1000.0 + 24 * i,
+                            "qualitaet": "VAL",
+                        }
+                        for i in range(2)
+                    ],
+                }
+            ],
+        }
+    )
+    return series
+
+
+def test_meter_values():
+    """Test derived values of the consumption Zählwerk."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(96 + 4))
+    values = MeterValues(ConsumptionAggregator(series), meter_reads(), TODAY)
+
+    assert values.obis_code == CONSUMPTION
+    assert values.energy_yesterday == 24.0
+    assert values.energy_today == 0.1
+    assert values.last_interval == 0.04
+    assert values.last_interval_start == START + timedelta(days=1, minutes=45)
+    assert values.current_power == 0.16
+    assert values.peak_power_today == 0.16
+    assert values.meter_reading == 1024.0
+
+
+def test_meter_values_computed_once():
+    """Test values are computed on first access only."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    series.merge(consumption_data(96 + 4, einheit="Wh"))
+    aggregator = ConsumptionAggregator(series)
+    values = MeterValues(aggregator, None, TODAY)
+
+    assert values.energy_today == 0.0
+    assert values.energy_yesterday == 0.024
+    assert aggregator.misses == 2
+
+    for _ in range(3):
+        assert values.energy_today == 0.0
+    assert aggregator.hits == 0
+    assert values.meter_reading is None
+
+
+def test_meter_values_without_readings():
+    """Test values of a meter point without readings."""
+    series = ConsumptionSeries(METER_ID, retention_days=None)
+    values = MeterValues(ConsumptionAggregator(series), None, TODAY)
+
+    assert values.energy_today is None
+    assert values.last_interval is None
+    assert values.current_power is None
+    assert values.peak_power_today is None